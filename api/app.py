@@ -1,10 +1,55 @@
-from fastapi import FastAPI
-from controller.v1.user_controller import UserController
-
-app = FastAPI()
-
-app.include_router(UserController.router, prefix="/api/v1", tags=["Users"])
-
-@app.get("/")
-async def root():
-    return {"message": "Welcome to the FastAPI CRUD API"}
\ No newline at end of file
+import inspect
+from contextlib import asynccontextmanager
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
+from controller.v1.user_controller import UserController, build_user_service, build_user_export_service, build_user_import_service
+from infra.compression import CompressionMiddleware
+from infra.instrumentation import MetricsMiddleware, install_sqlalchemy_instrumentation
+from infra.metrics import MultiProcessMetrics, metrics_registry
+from infra.read_consistency import ReadYourWritesMiddleware
+from infra.settings import get_settings
+
+install_sqlalchemy_instrumentation()
+settings = get_settings()
+multiprocess_metrics = (MultiProcessMetrics(metrics_registry, settings.metrics_multiprocess_directory, settings.metrics_flush_interval)
+                        if settings.metrics_multiprocess_directory else None)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Monta os serviços de usuários, exportação e importação uma única vez por worker (após o fork) e inicia a gravação das métricas do worker. No desligamento, encerra os serviços, as conexões e grava as métricas finais."""
+    if multiprocess_metrics is not None:
+        multiprocess_metrics.start()
+    app.state.user_service = build_user_service()
+    app.state.user_export_service = build_user_export_service(app.state.user_service)
+    app.state.user_import_service = build_user_import_service(app.state.user_service)
+    yield
+    app.state.user_import_service.close()
+    stopped = app.state.user_export_service.close()
+    if inspect.isawaitable(stopped):
+        await stopped
+    closed = app.state.user_service.repository.close()
+    if inspect.isawaitable(closed):
+        await closed
+    if multiprocess_metrics is not None:
+        multiprocess_metrics.close()
+
+
+app = FastAPI(lifespan=lifespan)
+if settings.sqlite_replica_files or settings.postgres_replica_dsns:
+    app.add_middleware(ReadYourWritesMiddleware, window_seconds=settings.read_your_writes_seconds)
+if settings.response_compression:
+    app.add_middleware(CompressionMiddleware, minimum_size=settings.response_compression_minimum_size,
+                       encodings=settings.response_compression_encodings, offload_size=settings.response_compression_offload_size)
+app.add_middleware(MetricsMiddleware)
+
+app.include_router(UserController.router, prefix="/api/v1", tags=["Users"])
+
+@app.get("/")
+async def root():
+    return {"message": "Welcome to the FastAPI CRUD API"}
+
+@app.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+async def metrics():
+    output = multiprocess_metrics.render() if multiprocess_metrics is not None else metrics_registry.render()
+    return PlainTextResponse(output, media_type="text/plain; version=0.0.4")
\ No newline at end of file
@@ -0,0 +1,45 @@
+"""Execução da API em modo de produção: N processos (workers) do uvicorn, sem --reload.
+
+Cada worker é um processo independente, que monta no lifespan a própria engine, pool de conexões e serviço de usuários.
+
+Com mais de um worker, as métricas de cada processo são gravadas em um diretório compartilhado (METRICS_MULTIPROCESS_DIRECTORY) e combinadas na coleta do GET /metrics.
+
+Uso: python -m api.server --workers 4 --port 8080
+"""
+import argparse
+import os
+import shutil
+import tempfile
+from typing import List, Optional
+
+import uvicorn
+
+from infra.metrics import MultiProcessMetrics
+from infra.settings import get_settings
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--workers", type=int, default=get_settings().web_concurrency,
+                        help="Quantidade de workers. Padrão para WEB_CONCURRENCY ou a quantidade de núcleos.")
+    args = parser.parse_args(argv)
+
+    temporary_directory = None
+    if args.workers > 1:
+        # Os workers herdam o ambiente do processo principal: a variável é definida antes de iniciá-los.
+        if not get_settings().metrics_multiprocess_directory:
+            temporary_directory = tempfile.mkdtemp(prefix="metrics-")
+            os.environ["METRICS_MULTIPROCESS_DIRECTORY"] = temporary_directory
+        MultiProcessMetrics.prepare_directory(os.environ["METRICS_MULTIPROCESS_DIRECTORY"])
+    try:
+        uvicorn.run("api.app:app", host=args.host, port=args.port, workers=args.workers,
+                    access_log=False, proxy_headers=True, timeout_graceful_shutdown=30)
+    finally:
+        if temporary_directory is not None:
+            shutil.rmtree(temporary_directory, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""Benchmark de throughput de requisições concorrentes nas rotas do UserController, comparando:
+
+- blocking: UserService síncrono chamado diretamente no event loop (comportamento anterior do controller);
+- threadpool: UserService síncrono executado no threadpool pelo controller (USER_SERVICE_MODE=sync);
+- async: AsyncUserService com AsyncSession sobre aiosqlite (USER_SERVICE_MODE=async).
+
+Uso: python -m benchmarks.bench_async_throughput --users 10000 --requests 2000 --concurrency 50
+"""
+import argparse
+import asyncio
+import os
+import random
+import tempfile
+import time
+
+import httpx
+from fastapi import FastAPI
+from sqlalchemy import insert
+
+from controller.v1.user_controller import UserController, get_user_service
+from db.sqllite_client import SqLiteBase, SqLiteClient, AsyncSqLiteClient
+from models.user_model import UserModel
+from repositories.sqlite_user_repository import SQLiteUserRepository
+from repositories.async_sqlite_user_repository import AsyncSQLiteUserRepository
+from service.user_service import UserService
+from service.async_user_service import AsyncUserService
+
+
+class BlockingUserService:
+    """Simula o caminho anterior, em que o UserService síncrono era chamado diretamente dentro das rotas async def, bloqueando o event loop."""
+
+    def __init__(self, service: UserService) -> None:
+        self.service = service
+
+    async def get_user(self, user_id: int):
+        return self.service.get_user(user_id=user_id)
+
+    async def get_users_page(self, limit: int, after_id: int = None):
+        return self.service.get_users_page(limit=limit, after_id=after_id)
+
+
+def build_services(database_file: str) -> dict:
+    class BenchmarkSqLiteClient(SqLiteClient):
+        database_path = f"sqlite:///{database_file}"
+
+    class BenchmarkAsyncSqLiteClient(AsyncSqLiteClient):
+        database_path = f"sqlite+aiosqlite:///{database_file}"
+
+    sync_repository = SQLiteUserRepository()
+    sync_repository.db_client = BenchmarkSqLiteClient()
+    sync_service = UserService(sync_repository)
+
+    async_repository = AsyncSQLiteUserRepository()
+    async_repository.db_client = BenchmarkAsyncSqLiteClient()
+    async_service = AsyncUserService(async_repository)
+
+    return {"blocking": BlockingUserService(sync_service),
+            "threadpool": sync_service,
+            "async": async_service}
+
+
+def seed(database_file: str, users: int) -> None:
+    class BenchmarkSqLiteClient(SqLiteClient):
+        database_path = f"sqlite:///{database_file}"
+
+    client = BenchmarkSqLiteClient()
+    SqLiteBase.metadata.create_all(bind=client._engine)
+    with client._engine.begin() as connection:
+        connection.execute(insert(UserModel),
+                           [{"first_name": f"User{i}", "last_name": "Benchmark", "email": f"user{i}@example.com"}
+                            for i in range(users)])
+    client._engine.dispose()
+
+
+async def run_mode(service, users: int, requests: int, concurrency: int) -> dict:
+    app = FastAPI()
+    app.include_router(UserController.router, prefix="/api/v1")
+    app.dependency_overrides[get_user_service] = lambda: service
+
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def one_request(client: httpx.AsyncClient):
+        async with semaphore:
+            started = time.perf_counter()
+            if random.random() < 0.8:
+                response = await client.get(f"/api/v1/users/{random.randint(1, users)}")
+            else:
+                response = await client.get(f"/api/v1/users/?limit=100&after_id={random.randint(0, users)}")
+            latencies.append(time.perf_counter() - started)
+            response.raise_for_status()
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+        started = time.perf_counter()
+        await asyncio.gather(*(one_request(client) for _ in range(requests)))
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {"rps": requests / elapsed,
+            "p50_ms": latencies[len(latencies) // 2] * 1000,
+            "p99_ms": latencies[int(len(latencies) * 0.99) - 1] * 1000}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=10_000)
+    parser.add_argument("--requests", type=int, default=2_000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--modes", nargs="+", default=["blocking", "threadpool", "async"])
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        database_file = os.path.join(directory, "benchmark.db")
+        seed(database_file, args.users)
+        services = build_services(database_file)
+        for mode in args.modes:
+            result = asyncio.run(run_mode(services[mode], args.users, args.requests, args.concurrency))
+            print(f"{mode:<10} rps={result['rps']:>8.1f}  p50={result['p50_ms']:>7.2f}ms  p99={result['p99_ms']:>7.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
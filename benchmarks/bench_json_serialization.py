@@ -0,0 +1,76 @@
+"""Benchmark de CPU da listagem de usuários (GET /users sem paginação) por 10 mil usuários, comparando:
+
+- validated: objetos ORM (UserModel) validados pelo response_model (List[UserGeneralResponse]) e serializados pelo FastAPI;
+- fast: registros projetados como dicionários no repositório e serializados com orjson (USER_FAST_RESPONSE=true).
+
+As requisições são executadas no próprio processo (httpx ASGITransport), então o tempo de CPU medido (time.process_time) inclui consulta, hidratação, validação e serialização.
+
+Uso: python -m benchmarks.bench_json_serialization --users 10000 --requests 20
+"""
+import argparse
+import asyncio
+import io
+import os
+import tempfile
+import time
+
+import httpx
+from fastapi import FastAPI
+
+from controller.v1.user_controller import UserController, get_user_service
+from db.seed import seed_users
+from db.sqllite_client import SqLiteClient
+from repositories.sqlite_user_repository import SQLiteUserRepository
+from service.user_service import UserService
+
+
+async def measure(service: UserService, fast_response: bool, requests: int, users: int) -> dict:
+    UserController.fast_response = fast_response
+    app = FastAPI()
+    app.include_router(UserController.router, prefix="/api/v1")
+    app.dependency_overrides[get_user_service] = lambda: service
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+        response = await client.get("/api/v1/users/")
+        response.raise_for_status()
+        assert len(response.json()) == users
+        cpu_started, wall_started = time.process_time(), time.perf_counter()
+        for _ in range(requests):
+            response = await client.get("/api/v1/users/")
+            response.raise_for_status()
+        cpu_elapsed, wall_elapsed = time.process_time() - cpu_started, time.perf_counter() - wall_started
+
+    scale = 10_000 / users
+    return {"cpu_ms_per_10k": cpu_elapsed / requests * 1000 * scale,
+            "wall_ms_per_10k": wall_elapsed / requests * 1000 * scale,
+            "bytes": len(response.content)}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=10_000)
+    parser.add_argument("--requests", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        class BenchmarkSqLiteClient(SqLiteClient):
+            database_path = f"sqlite:///{os.path.join(directory, 'benchmark.db')}"
+
+        repository = SQLiteUserRepository()
+        repository.db_client = BenchmarkSqLiteClient()
+        seed_users(args.users, engine=repository.db_client._engine, full_text=False, out=io.StringIO())
+        service = UserService(repository)
+
+        results = {mode: asyncio.run(measure(service, mode == "fast", args.requests, args.users))
+                   for mode in ("validated", "fast")}
+        repository.db_client._engine.dispose()
+
+    for mode, result in results.items():
+        print(f"{mode:<10} cpu={result['cpu_ms_per_10k']:>8.1f}ms/10k usuários  "
+              f"wall={result['wall_ms_per_10k']:>8.1f}ms/10k usuários  bytes={result['bytes']}")
+    print(f"speedup (cpu): {results['validated']['cpu_ms_per_10k'] / results['fast']['cpu_ms_per_10k']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
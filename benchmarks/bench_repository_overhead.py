@@ -0,0 +1,146 @@
+"""Micro-benchmark do custo por chamada de cada método do IUserRepository no SQLiteUserRepository: cada operação é executada repetidas vezes sobre uma base pequena e local, de modo que o tempo medido seja dominado pelo overhead do SQLAlchemy (construção e compilação das consultas, ORM) e não pelo banco de dados.
+
+O resultado é salvo em JSON; com --baseline (o JSON de uma execução anterior, ex: antes de uma alteração no repositório), a saída inclui o tempo anterior e o ganho de cada método. A taxa de acertos do cache de statements compilados (db_statement_cache_total) também é informada.
+
+Uso: python -m benchmarks.bench_repository_overhead --users 1000 --calls 500 --repeat 5 --baseline benchmarks/results/repository_overhead_before.json
+"""
+import argparse
+import io
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from datetime import timedelta
+
+from benchmarks.load_test import ROOT_DIRECTORY, git_revision
+from db.seed import seed_users
+from db.sqllite_client import SqLiteClient
+from infra.instrumentation import DB_STATEMENT_CACHE, install_sqlalchemy_instrumentation
+from models.user_model import utc_now
+from repositories.sqlite_user_repository import SQLiteUserRepository
+
+
+BULK_SIZE = 10
+
+
+def build_repository(database_file: str) -> SQLiteUserRepository:
+    class BenchmarkSQLiteUserRepository(SQLiteUserRepository):
+        _instance = None
+    repository = BenchmarkSQLiteUserRepository()
+    repository.db_client = SqLiteClient(replica_files=[], database_file=database_file)
+    return repository
+
+
+def operations(repository: SQLiteUserRepository, users: int) -> dict:
+    """Operações medidas, por método. Cada uma recebe o número da chamada e atua sobre registros diferentes a cada chamada, sem alterar o tamanho da base das leituras."""
+    deletable_ids = []
+
+    def prepare_deletes(calls: int) -> None:
+        created, _, _ = repository.bulk_create([{"first_name": "Delete", "email": "delete@example.com"}] * (calls * (BULK_SIZE + 1)))
+        deletable_ids.extend(user.id for user, _, _ in created)
+
+    def user_id(call: int) -> int:
+        return call % users + 1
+
+    sample, _, _ = repository.select_by_id(1)
+
+    return {
+        "create": (None, lambda call: repository.create(first_name="Iury", last_name="Rosal", email="rosal@gmail.com")),
+        "select_all": (None, lambda call: repository.select_all()),
+        "select_page": (None, lambda call: repository.select_page(limit=10, after_id=user_id(call) % (users - 10))),
+        "select_rows": (None, lambda call: repository.select_rows(limit=10, after_id=user_id(call) % (users - 10))),
+        "stream_all": (None, lambda call: list(repository.stream_all(after_id=users - 10, chunk_size=100)[0])),
+        "select_version": (None, lambda call: repository.select_version(user_id(call))),
+        "select_collection_version": (None, lambda call: repository.select_collection_version()),
+        "select_changes": (None, lambda call: repository.select_changes(since=user_id(call), limit=10)),
+        "select_last_change_sequence": (None, lambda call: repository.select_last_change_sequence()),
+        "compact_changes": (None, lambda call: repository.compact_changes(utc_now() - timedelta(days=7))),
+        "select_by_id": (None, lambda call: repository.select_by_id(user_id(call))),
+        "select_row_by_id": (None, lambda call: repository.select_row_by_id(user_id(call))),
+        "select_by_email": (None, lambda call: repository.select_by_email(sample.email, limit=10)),
+        "select_by_name_prefix": (None, lambda call: repository.select_by_name_prefix(sample.first_name[:2], limit=10)),
+        "search_full_text": (None, lambda call: repository.search_full_text(sample.first_name, limit=10)),
+        "update": (None, lambda call: repository.update(user_id(call), {"first_name": f"Davi {call}"})),
+        "delete_by_id": (prepare_deletes, lambda call: repository.delete_by_id(deletable_ids.pop())),
+        "bulk_create": (None, lambda call: repository.bulk_create([{"first_name": "Iury", "email": "rosal@gmail.com"}] * BULK_SIZE)),
+        "bulk_update": (None, lambda call: repository.bulk_update([{"id": user_id(call + index), "first_name": f"Davi {call}"}
+                                                                   for index in range(BULK_SIZE)])),
+        "bulk_delete": (prepare_deletes, lambda call: repository.bulk_delete([deletable_ids.pop() for _ in range(BULK_SIZE)])),
+    }
+
+
+def statement_cache_hits() -> tuple:
+    return DB_STATEMENT_CACHE.value(result="hit"), sum(DB_STATEMENT_CACHE.value(result=result) for result in ("hit", "miss"))
+
+
+def measure(run, calls: int, warmup: int, repeat: int) -> float:
+    """Tempo por chamada, em microssegundos, da melhor de repeat rodadas: a menor medição é a menos afetada por interferências externas (outros processos, GC, threads de log)."""
+    for call in range(warmup):
+        run(call)
+    best = float("inf")
+    for round_number in range(repeat):
+        first_call = warmup + round_number * calls
+        started = time.perf_counter()
+        for call in range(first_call, first_call + calls):
+            run(call)
+        best = min(best, time.perf_counter() - started)
+    return best / calls * 1_000_000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=1000, help="Quantidade de usuários da base.")
+    parser.add_argument("--calls", type=int, default=500, help="Chamadas medidas por rodada de cada método.")
+    parser.add_argument("--warmup", type=int, default=50, help="Chamadas de aquecimento (não medidas) por método.")
+    parser.add_argument("--repeat", type=int, default=5, help="Rodadas medidas por método; vale a melhor.")
+    parser.add_argument("--methods", nargs="+", help="Métodos avaliados. Padrão para todos.")
+    parser.add_argument("--baseline", help="JSON de uma execução anterior, para comparação.")
+    parser.add_argument("--output", default=os.path.join(ROOT_DIRECTORY, "benchmarks", "results", "repository_overhead.json"))
+    args = parser.parse_args()
+    install_sqlalchemy_instrumentation()
+
+    baseline = {}
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as file:
+            baseline = {result["method"]: result["us_per_call"] for result in json.load(file)["results"]}
+
+    results = []
+    with tempfile.TemporaryDirectory() as directory:
+        database_file = os.path.join(directory, "benchmark.db")
+        repository = build_repository(database_file)
+        seed_users(args.users, engine=repository.db_client._engine, out=io.StringIO())
+        hits_before, lookups_before = statement_cache_hits()
+
+        for method, (prepare, run) in operations(repository, args.users).items():
+            if args.methods and method not in args.methods:
+                continue
+            if prepare is not None:
+                prepare(args.warmup + args.calls * args.repeat)
+            us_per_call = measure(run, args.calls, args.warmup, args.repeat)
+            result = {"method": method, "us_per_call": round(us_per_call, 1)}
+            line = f"{method:<28} {us_per_call:>9.1f}us/chamada"
+            if method in baseline:
+                result.update(baseline_us_per_call=baseline[method], speedup=round(baseline[method] / us_per_call, 2))
+                line += f"  antes={baseline[method]:>9.1f}us  ganho={result['speedup']:>5.2f}x"
+            results.append(result)
+            print(line, file=sys.stderr)
+
+        hits, lookups = statement_cache_hits()
+        repository.close()
+
+    hit_ratio = (hits - hits_before) / (lookups - lookups_before) if lookups > lookups_before else 0.0
+    print(f"cache de statements compilados: {hit_ratio:.2%} de acertos", file=sys.stderr)
+
+    metadata = {"timestamp": utc_now().isoformat(), "git_revision": git_revision(), "python": platform.python_version(),
+                "platform": platform.platform(), "users": args.users, "calls": args.calls, "warmup": args.warmup, "repeat": args.repeat,
+                "statement_cache_hit_ratio": round(hit_ratio, 4)}
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, "w", encoding="utf-8") as file:
+        json.dump({"metadata": metadata, "results": results}, file, indent=2)
+    print(f"Resultado salvo em {args.output}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
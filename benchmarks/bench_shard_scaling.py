@@ -0,0 +1,74 @@
+"""Benchmark de escalabilidade das escritas por quantidade de shards (ShardedUserRepository): várias threads criam usuários individualmente (um commit por criação) em bases com 1, 2, 4, ... arquivos SQLite.
+
+Com um único arquivo, os commits são serializados pelo lock de escrita do SQLite; com N shards, até N commits acontecem em paralelo. O ganho depende do custo do commit (perfil 'durable' faz fsync a cada commit) e dos núcleos disponíveis.
+
+Uso: python -m benchmarks.bench_shard_scaling --shards 1 2 4 --threads 32 --creates 3200 --profile durable
+"""
+import argparse
+import os
+import tempfile
+import threading
+import time
+
+from db.rebalance_shards import main as rebalance_shards
+from repositories.sharded_user_repository import ShardedUserRepository
+
+
+def build_repository(catalog_file: str, profile: str) -> ShardedUserRepository:
+    class BenchmarkShardedUserRepository(ShardedUserRepository):
+        _instance = None
+    return BenchmarkShardedUserRepository(catalog_file, profile)
+
+
+def run_creates(repository: ShardedUserRepository, threads: int, creates: int) -> dict:
+    latencies = []
+    lock = threading.Lock()
+
+    def worker(index: int) -> None:
+        local_latencies = []
+        for number in range(creates // threads):
+            started = time.perf_counter()
+            repository.create(first_name=f"User {index}-{number}", email=f"user{index}-{number}@example.com")
+            local_latencies.append(time.perf_counter() - started)
+        with lock:
+            latencies.extend(local_latencies)
+
+    workers = [threading.Thread(target=worker, args=(index,)) for index in range(threads)]
+    started = time.perf_counter()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {"creates_per_second": len(latencies) / elapsed,
+            "p50_ms": latencies[len(latencies) // 2] * 1000,
+            "p99_ms": latencies[int(len(latencies) * 0.99) - 1] * 1000}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--shards", nargs="+", type=int, default=[1, 2, 4], help="Quantidades de shards avaliadas.")
+    parser.add_argument("--threads", type=int, default=32, help="Threads criando usuários concorrentemente.")
+    parser.add_argument("--creates", type=int, default=3200, help="Total de criações por rodada.")
+    parser.add_argument("--profile", default="durable", help="Perfil de engine do SQLite dos shards.")
+    args = parser.parse_args()
+
+    baseline = None
+    for shards in args.shards:
+        with tempfile.TemporaryDirectory() as directory:
+            catalog_file = os.path.join(directory, "catalog.db")
+            rebalance_shards(["--catalog", catalog_file, "init", "--shards", str(shards)])
+            repository = build_repository(catalog_file, args.profile)
+            try:
+                result = run_creates(repository, args.threads, args.creates)
+            finally:
+                repository.close()
+        baseline = baseline or result["creates_per_second"]
+        print(f"shards={shards:<3} creates/s={result['creates_per_second']:>8.1f}  speedup={result['creates_per_second'] / baseline:>5.2f}x  "
+              f"p50={result['p50_ms']:>7.2f}ms  p99={result['p99_ms']:>7.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""Benchmark das projeções (fields=) na listagem de usuários (GET /users sem paginação), comparando por usuário o tempo de CPU e os bytes da resposta:
+
+- full: objetos ORM (UserModel) validados pelo response_model (List[UserGeneralResponse]), o comportamento padrão;
+- rows: todos os campos projetados como dicionários e serializados com orjson (USER_FAST_RESPONSE=true);
+- sparse: apenas os campos de --fields (padrão id,email), projetados no SQL e serializados com orjson.
+
+As requisições são executadas no próprio processo (httpx ASGITransport), então o tempo de CPU medido (time.process_time) inclui consulta, hidratação, validação e serialização.
+
+Uso: python -m benchmarks.bench_sparse_fields --users 100000 --requests 5 --fields id,email
+"""
+import argparse
+import asyncio
+import io
+import os
+import tempfile
+import time
+
+import httpx
+from fastapi import FastAPI
+
+from controller.v1.user_controller import UserController, get_user_service
+from db.seed import seed_users
+from db.sqllite_client import SqLiteClient
+from repositories.sqlite_user_repository import SQLiteUserRepository
+from service.user_service import UserService
+
+
+async def measure(service: UserService, url: str, fast_response: bool, requests: int, users: int) -> dict:
+    UserController.fast_response = fast_response
+    app = FastAPI()
+    app.include_router(UserController.router, prefix="/api/v1")
+    app.dependency_overrides[get_user_service] = lambda: service
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+        response = await client.get(url)
+        response.raise_for_status()
+        assert len(response.json()) == users
+        cpu_started = time.process_time()
+        for _ in range(requests):
+            response = await client.get(url)
+            response.raise_for_status()
+        cpu_elapsed = time.process_time() - cpu_started
+
+    return {"cpu_us_per_user": cpu_elapsed / requests / users * 1_000_000,
+            "bytes": len(response.content),
+            "bytes_per_user": len(response.content) / users}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=100_000)
+    parser.add_argument("--requests", type=int, default=5)
+    parser.add_argument("--fields", default="id,email", help="Campos da projeção do modo sparse.")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        repository = SQLiteUserRepository()
+        repository.db_client = SqLiteClient(replica_files=[], database_file=os.path.join(directory, "benchmark.db"))
+        seed_users(args.users, engine=repository.db_client._engine, full_text=False, out=io.StringIO())
+        service = UserService(repository, single_flight=False)
+
+        modes = {"full": ("/api/v1/users/", False),
+                 "rows": ("/api/v1/users/", True),
+                 "sparse": (f"/api/v1/users/?fields={args.fields}", False)}
+        results = {mode: asyncio.run(measure(service, url, fast_response, args.requests, args.users))
+                   for mode, (url, fast_response) in modes.items()}
+        repository.db_client._engine.dispose()
+
+    for mode, result in results.items():
+        print(f"{mode:<7} cpu={result['cpu_us_per_user']:>6.2f}us/usuário  bytes={result['bytes']:>10}  "
+              f"bytes/usuário={result['bytes_per_user']:>6.1f}")
+    print(f"sparse vs full: cpu {results['full']['cpu_us_per_user'] / results['sparse']['cpu_us_per_user']:.1f}x menor, "
+          f"bytes {results['full']['bytes'] / results['sparse']['bytes']:.1f}x menores")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""Benchmark de escalabilidade por workers: mede o throughput da API com 1, 2, 4, ... processos do uvicorn sobre a mesma base.
+
+Para que o gerador de carga não seja o gargalo, as requisições partem de vários processos clientes (--clients), cada um com a sua concorrência (--concurrency). O resultado de cada quantidade de workers traz RPS agregado, p50/p95/p99, o ganho (speedup) em relação a 1 worker e a eficiência (speedup / workers). Os clientes disputam os núcleos com o servidor: em máquinas pequenas, a escala observada é menor que a real.
+
+Uso: python -m benchmarks.bench_worker_scaling --users 100000 --workers 1 2 4 8 --clients 4 --requests 5000
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Tuple
+
+import httpx
+
+from benchmarks.load_test import (DEFAULT_DATA_DIRECTORY, ROOT_DIRECTORY, SCENARIOS, ScenarioState, environment_metadata,
+                                  free_port, run_requests, sample_users, seed_database, start_server, stop_server, summarize)
+
+
+READ_SCENARIOS = ["get_user", "list_page", "search_email", "search_name_prefix", "search_full_text"]
+
+
+def default_worker_counts() -> List[int]:
+    counts, workers = [], 1
+    while workers <= (os.cpu_count() or 1):
+        counts.append(workers)
+        workers *= 2
+    return counts
+
+
+def run_client(base_url: str, users: int, samples: List[dict], scenario: str, requests: int, concurrency: int, seed: int) -> Tuple[List[float], int, float]:
+    """Processo cliente: executa as requisições do cenário e devolve as latências, os erros e o tempo total."""
+    async def run() -> Tuple[List[float], int, float]:
+        state = ScenarioState(users, samples, random.Random(seed))
+        limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+        async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+            return await run_requests(client, SCENARIOS[scenario]["build"], None, state, requests, concurrency)
+    return asyncio.run(run())
+
+
+def run_load(executor: ProcessPoolExecutor, base_url: str, users: int, samples: List[dict], scenario: str,
+             clients: int, requests: int, concurrency: int, seed: int) -> dict:
+    """Distribui as requisições entre os processos clientes e agrega as latências de todos eles. O tempo considerado é o do cliente mais lento."""
+    futures = [executor.submit(run_client, base_url, users, samples, scenario, requests // clients, concurrency, seed + index)
+               for index in range(clients)]
+    latencies, errors, elapsed = [], 0, 0.0
+    for future in futures:
+        client_latencies, client_errors, client_elapsed = future.result()
+        latencies.extend(client_latencies)
+        errors += client_errors
+        elapsed = max(elapsed, client_elapsed)
+    return summarize(latencies, errors, elapsed)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=100_000, help="Quantidade de usuários da base.")
+    parser.add_argument("--workers", nargs="+", type=int, default=default_worker_counts(), help="Quantidades de workers avaliadas.")
+    parser.add_argument("--clients", type=int, default=max(1, (os.cpu_count() or 1) // 2), help="Processos geradores de carga.")
+    parser.add_argument("--concurrency", type=int, default=16, help="Requisições simultâneas por processo cliente.")
+    parser.add_argument("--requests", type=int, default=5000, help="Requisições medidas por quantidade de workers.")
+    parser.add_argument("--warmup", type=int, default=200, help="Requisições de aquecimento por quantidade de workers.")
+    parser.add_argument("--scenario", default="get_user", choices=READ_SCENARIOS)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--data-dir", default=DEFAULT_DATA_DIRECTORY)
+    parser.add_argument("--output", default=os.path.join(ROOT_DIRECTORY, "benchmarks", "results", "worker_scaling.json"))
+    args = parser.parse_args()
+
+    os.makedirs(args.data_dir, exist_ok=True)
+    database_file = os.path.join(args.data_dir, f"users_{args.users}.db")
+    seed_database(database_file, args.users)
+    samples = sample_users(database_file, 1000, random.Random(args.seed))
+
+    results = []
+    with ProcessPoolExecutor(args.clients) as executor:
+        for workers in args.workers:
+            port = free_port()
+            process = start_server(database_file, port, workers)
+            try:
+                base_url = f"http://127.0.0.1:{port}"
+                if args.warmup:
+                    run_load(executor, base_url, args.users, samples, args.scenario, args.clients, args.warmup, args.concurrency, args.seed)
+                summary = run_load(executor, base_url, args.users, samples, args.scenario, args.clients, args.requests,
+                                   args.concurrency, args.seed)
+            finally:
+                stop_server(process)
+            speedup = summary["rps"] / results[0]["rps"] if results and results[0]["rps"] else 1.0
+            results.append({"workers": workers, "scenario": args.scenario, **summary,
+                            "speedup": round(speedup, 2), "efficiency": round(speedup / workers, 2)})
+            print(f"workers={workers:<3} rps={summary['rps']:>9.1f}  p50={summary['p50_ms']:>8.2f}ms  p95={summary['p95_ms']:>8.2f}ms  "
+                  f"speedup={speedup:.2f}x  errors={summary['errors']}", file=sys.stderr)
+
+    metadata = {**environment_metadata(args), "users": args.users, "clients": args.clients, "concurrency": args.concurrency}
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, "w", encoding="utf-8") as file:
+        json.dump({"metadata": metadata, "results": results}, file, indent=2)
+    print(f"Resultado salvo em {args.output}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
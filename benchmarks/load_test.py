@@ -0,0 +1,353 @@
+"""Suíte de carga e benchmark das rotas do UserController contra um servidor uvicorn iniciado localmente.
+
+Para cada tamanho de base (ex: 10k, 1M e 10M usuários) o banco de dados é populado (e reaproveitado em execuções seguintes), o servidor é iniciado apontando para ele (SQLITE_DATABASE_FILE) e cada cenário é executado em cada nível de concorrência configurado. O resultado (p50/p95/p99 de latência, RPS e erros) é salvo em JSON e, opcionalmente, comparado com um baseline armazenado para detectar regressões (código de saída 1).
+
+Uso:
+    python -m benchmarks.load_test --sizes 10000 1000000 --concurrency 1 10 50 --requests 1000 --output benchmarks/results/latest.json
+    python -m benchmarks.load_test --requests 1000 --save-baseline benchmarks/baselines/load_test.json
+    python -m benchmarks.load_test --requests 1000 --baseline benchmarks/baselines/load_test.json
+"""
+import argparse
+import asyncio
+import json
+import math
+import os
+import platform
+import random
+import socket
+import sqlite3
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional, Tuple
+
+import httpx
+
+from db.seed import seed_users
+from db.sqllite_client import SqLiteClient
+from models.user_model import migrate_user_table
+
+
+ROOT_DIRECTORY = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_DATA_DIRECTORY = os.path.join(ROOT_DIRECTORY, "benchmarks", ".data")
+API_PREFIX = "/api/v1/users"
+BATCH_ROUTE_SIZE = 100
+COMPARED_METRICS = {"p95_ms": "lower", "rps": "higher"}
+# Metadados que precisam coincidir com os do baseline: em outra máquina ou configuração, as diferenças não indicam regressões.
+COMPARED_METADATA = ("cpu_count", "workers", "requests", "python", "settings")
+# Com menos requisições por cenário, o p95 (nearest-rank) depende de poucas amostras e varia mais que a tolerância entre execuções.
+MIN_BASELINE_REQUESTS = 1000
+
+
+def percentile(sorted_values: List[float], percent: float) -> float:
+    """Calcula o percentil pelo método nearest-rank sobre uma lista já ordenada."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(percent / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def summarize(latencies: List[float], errors: int, elapsed: float) -> dict:
+    """Agrega as latências (em segundos) de um cenário nas métricas reportadas: RPS, p50/p95/p99 e máximo em milissegundos."""
+    ordered = sorted(latencies)
+    return {"requests": len(ordered),
+            "errors": errors,
+            "rps": round(len(ordered) / elapsed, 2) if elapsed > 0 else 0.0,
+            "p50_ms": round(percentile(ordered, 50) * 1000, 3),
+            "p95_ms": round(percentile(ordered, 95) * 1000, 3),
+            "p99_ms": round(percentile(ordered, 99) * 1000, 3),
+            "max_ms": round(ordered[-1] * 1000, 3) if ordered else 0.0}
+
+
+def result_key(result: dict) -> tuple:
+    return (result["users"], result["scenario"], result["concurrency"])
+
+
+def compare_with_baseline(report: dict, baseline: dict, tolerance: float) -> List[str]:
+    """Compara o relatório com o baseline, retornando a descrição de cada regressão encontrada: latência p95 acima de (1 + tolerance) vezes o baseline ou RPS abaixo de (1 - tolerance) vezes o baseline. Cenários ausentes no baseline são ignorados."""
+    baseline_results = {result_key(result): result for result in baseline.get("results", [])}
+    regressions = []
+    for result in report["results"]:
+        reference = baseline_results.get(result_key(result))
+        if reference is None:
+            continue
+        for metric, better in COMPARED_METRICS.items():
+            current, expected = result[metric], reference[metric]
+            if better == "lower" and current > expected * (1 + tolerance):
+                regressions.append(f"{result['scenario']} (users={result['users']}, concurrency={result['concurrency']}): "
+                                   f"{metric} {current} > baseline {expected}")
+            elif better == "higher" and current < expected * (1 - tolerance):
+                regressions.append(f"{result['scenario']} (users={result['users']}, concurrency={result['concurrency']}): "
+                                   f"{metric} {current} < baseline {expected}")
+        if result["errors"] > reference["errors"]:
+            regressions.append(f"{result['scenario']} (users={result['users']}, concurrency={result['concurrency']}): "
+                               f"errors {result['errors']} > baseline {reference['errors']}")
+    return regressions
+
+
+def metadata_mismatches(metadata: dict, baseline_metadata: dict) -> List[str]:
+    """Lista os metadados da execução (COMPARED_METADATA) diferentes dos do baseline."""
+    return [f"{name}: {metadata.get(name)!r} != baseline {baseline_metadata.get(name)!r}"
+            for name in COMPARED_METADATA if metadata.get(name) != baseline_metadata.get(name)]
+
+
+def seed_database(database_file: str, users: int) -> None:
+    """Popula o banco com a quantidade de usuários informada através do db.seed. Bases já populadas com o mesmo tamanho são reaproveitadas, apenas migradas para o schema atual."""
+    class SeedSqLiteClient(SqLiteClient):
+        database_path = f"sqlite:///{database_file}"
+
+    if os.path.exists(database_file):
+        with sqlite3.connect(database_file) as connection:
+            try:
+                reusable = connection.execute("SELECT count(*) FROM user").fetchone()[0] >= users
+            except sqlite3.OperationalError:
+                reusable = False
+        if reusable:
+            client = SeedSqLiteClient(profile="throughput")
+            migrate_user_table(client._engine)
+            client._engine.dispose()
+            return
+        os.remove(database_file)
+
+    client = SeedSqLiteClient(profile="throughput")
+    seed_users(users, engine=client._engine, full_text=True)
+    client._engine.dispose()
+
+
+def sample_users(database_file: str, size: int, rng: random.Random) -> List[dict]:
+    """Recupera uma amostra de usuários existentes, utilizada para montar buscas por e-mail, prefixo de nome e texto."""
+    with sqlite3.connect(database_file) as connection:
+        max_id = connection.execute("SELECT max(id) FROM user").fetchone()[0] or 0
+        ids = [rng.randint(1, max_id) for _ in range(size)] if max_id else []
+        rows = []
+        for start in range(0, len(ids), 500):
+            chunk = ids[start:start + 500]
+            rows.extend(connection.execute(
+                f"SELECT id, first_name, last_name, email FROM user WHERE id IN ({','.join('?' * len(chunk))})", chunk))
+    return [{"id": row[0], "first_name": row[1], "last_name": row[2], "email": row[3]} for row in rows]
+
+
+class ScenarioState:
+    """Estado compartilhado entre os cenários de uma mesma base: amostra de usuários, maior id e ids criados pelos cenários de escrita (consumidos pelos cenários de remoção)."""
+
+    def __init__(self, users: int, samples: List[dict], rng: random.Random) -> None:
+        self.users = users
+        self.samples = samples
+        self.rng = rng
+        self.created_ids: List[int] = []
+        self.batch_created_ids: List[int] = []
+        self.sequence = 0
+
+    def random_id(self) -> int:
+        return self.rng.randint(1, self.users)
+
+    def sample(self) -> dict:
+        return self.rng.choice(self.samples)
+
+    def new_user_payload(self) -> dict:
+        self.sequence += 1
+        template = self.sample()
+        local_part, domain = template["email"].split("@", 1)
+        return {"first_name": template["first_name"],
+                "last_name": template["last_name"],
+                "email": f"{local_part}.load{self.sequence}.{self.rng.getrandbits(32)}@{domain}"}
+
+
+def first_search_term(user: dict) -> str:
+    return (user["last_name"] or user["first_name"]).split(" ")[0]
+
+
+SCENARIOS: Dict[str, dict] = {
+    "get_user": {"build": lambda state: ("GET", f"{API_PREFIX}/{state.random_id()}", None)},
+    "list_page": {"build": lambda state: ("GET", f"{API_PREFIX}/?limit=100&after_id={state.random_id()}", None)},
+    "list_all": {"build": lambda state: ("GET", f"{API_PREFIX}/", None), "max_users": 100_000},
+    "stream_tail": {"build": lambda state: ("GET", f"{API_PREFIX}/?stream=true&after_id={max(0, state.users - 1000)}", None)},
+    "search_email": {"build": lambda state: ("GET", f"{API_PREFIX}/search", {"params": {"email": state.sample()["email"]}})},
+    "search_name_prefix": {"build": lambda state: ("GET", f"{API_PREFIX}/search", {"params": {"name_prefix": state.sample()["first_name"][:3]}})},
+    "search_full_text": {"build": lambda state: ("GET", f"{API_PREFIX}/search", {"params": {"q": first_search_term(state.sample())}})},
+    "create_user": {"build": lambda state: ("POST", f"{API_PREFIX}/", {"json": state.new_user_payload()}),
+                    "collect": lambda state, body: state.created_ids.append(body["id"])},
+    "update_user": {"build": lambda state: ("PUT", f"{API_PREFIX}/{state.random_id()}", {"json": {"last_name": state.sample()["last_name"]}})},
+    "delete_user": {"build": lambda state: ("DELETE", f"{API_PREFIX}/{state.created_ids.pop() if state.created_ids else state.users + 1}", None)},
+    "batch_create": {"build": lambda state: ("POST", f"{API_PREFIX}/batch", {"json": [state.new_user_payload() for _ in range(BATCH_ROUTE_SIZE)]}),
+                     "collect": lambda state, body: state.batch_created_ids.extend(item["user"]["id"] for item in body["items"] if item["user"])},
+    "batch_update": {"build": lambda state: ("PATCH", f"{API_PREFIX}/batch", {"json": [{"id": state.random_id(), "last_name": state.sample()["last_name"]}
+                                                                                         for _ in range(BATCH_ROUTE_SIZE)]})},
+    "batch_delete": {"build": lambda state: ("DELETE", f"{API_PREFIX}/batch", {"json": [state.batch_created_ids.pop()
+                                                                                         for _ in range(min(BATCH_ROUTE_SIZE, len(state.batch_created_ids)))] or [state.users + 1]})},
+}
+
+
+async def run_scenario(client: httpx.AsyncClient, build: Callable, collect: Optional[Callable], state: ScenarioState,
+                       requests: int, concurrency: int) -> dict:
+    """Executa a quantidade de requisições do cenário com a concorrência informada e agrega o resultado (summarize)."""
+    return summarize(*await run_requests(client, build, collect, state, requests, concurrency))
+
+
+async def run_requests(client: httpx.AsyncClient, build: Callable, collect: Optional[Callable], state: ScenarioState,
+                       requests: int, concurrency: int) -> Tuple[List[float], int, float]:
+    """Executa a quantidade de requisições do cenário com a concorrência informada (workers disputando um contador compartilhado), retornando as latências, a quantidade de erros e o tempo total. Respostas com status >= 400 ou exceções de transporte são contabilizadas como erro."""
+    latencies: List[float] = []
+    errors = 0
+    remaining = requests
+
+    async def worker():
+        nonlocal remaining, errors
+        while remaining > 0:
+            remaining -= 1
+            method, url, options = build(state)
+            started = time.perf_counter()
+            try:
+                response = await client.request(method, url, **(options or {}))
+                await response.aread()
+            except httpx.HTTPError:
+                errors += 1
+                continue
+            latencies.append(time.perf_counter() - started)
+            if response.status_code >= 400:
+                errors += 1
+            elif collect is not None:
+                collect(state, response.json())
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return (latencies, errors, time.perf_counter() - started)
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(database_file: str, port: int, workers: int) -> subprocess.Popen:
+    """Inicia o uvicorn com a API apontando para o banco de dados do benchmark e aguarda até que responda."""
+    env = {**os.environ, "SQLITE_DATABASE_FILE": database_file, "LOG_LEVEL": os.environ.get("LOG_LEVEL", "WARNING")}
+    process = subprocess.Popen([sys.executable, "-m", "uvicorn", "api.app:app", "--host", "127.0.0.1", "--port", str(port),
+                                "--workers", str(workers), "--log-level", "warning", "--no-access-log"],
+                               cwd=ROOT_DIRECTORY, env=env)
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"uvicorn exited with code {process.returncode}")
+        try:
+            if httpx.get(f"http://127.0.0.1:{port}/", timeout=1).status_code == 200:
+                return process
+        except httpx.HTTPError:
+            time.sleep(0.2)
+    stop_server(process)
+    raise RuntimeError("uvicorn did not become ready in 30 seconds")
+
+
+def stop_server(process: subprocess.Popen) -> None:
+    process.terminate()
+    try:
+        process.wait(timeout=10)
+    except subprocess.TimeoutExpired:
+        process.kill()
+
+
+async def run_size(base_url: str, users: int, scenarios: List[str], concurrency_levels: List[int],
+                   requests: int, warmup: int, rng: random.Random, samples: List[dict]) -> List[dict]:
+    state = ScenarioState(users, samples, rng)
+    results = []
+    limits = httpx.Limits(max_connections=max(concurrency_levels), max_keepalive_connections=max(concurrency_levels))
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+        for name in scenarios:
+            scenario = SCENARIOS[name]
+            if users > scenario.get("max_users", users):
+                continue
+            for concurrency in concurrency_levels:
+                if warmup:
+                    await run_scenario(client, scenario["build"], scenario.get("collect"), state, warmup, concurrency)
+                summary = await run_scenario(client, scenario["build"], scenario.get("collect"), state, requests, concurrency)
+                results.append({"users": users, "scenario": name, "concurrency": concurrency, **summary})
+                print(f"[{users}] {name:<20} c={concurrency:<4} rps={summary['rps']:>9.1f}  p50={summary['p50_ms']:>8.2f}ms  "
+                      f"p95={summary['p95_ms']:>8.2f}ms  p99={summary['p99_ms']:>8.2f}ms  errors={summary['errors']}",
+                      file=sys.stderr)
+    return results
+
+
+def git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT_DIRECTORY, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def environment_metadata(args: argparse.Namespace) -> dict:
+    return {"timestamp": datetime.now(timezone.utc).isoformat(),
+            "git_revision": git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "workers": args.workers,
+            "requests": args.requests,
+            "seed": args.seed,
+            "settings": {name: os.environ[name] for name in ("USER_SERVICE_MODE", "SQLITE_PROFILE", "USER_CACHE_ENABLED")
+                         if name in os.environ}}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", nargs="+", type=int, default=[10_000], help="Quantidades de usuários das bases (ex: 10000 1000000 10000000).")
+    parser.add_argument("--concurrency", nargs="+", type=int, default=[1, 10, 50], help="Níveis de concorrência de cada cenário.")
+    parser.add_argument("--requests", type=int, default=500, help="Requisições medidas por cenário e nível de concorrência.")
+    parser.add_argument("--warmup", type=int, default=20, help="Requisições de aquecimento (não medidas) antes de cada medição.")
+    parser.add_argument("--scenarios", nargs="+", default=list(SCENARIOS), choices=list(SCENARIOS))
+    parser.add_argument("--workers", type=int, default=1, help="Quantidade de workers do uvicorn.")
+    parser.add_argument("--seed", type=int, default=42, help="Semente dos geradores aleatórios, para execuções reprodutíveis.")
+    parser.add_argument("--data-dir", default=DEFAULT_DATA_DIRECTORY, help="Diretório das bases populadas (reaproveitadas entre execuções).")
+    parser.add_argument("--output", default=os.path.join(ROOT_DIRECTORY, "benchmarks", "results", "latest.json"))
+    parser.add_argument("--baseline", help="Arquivo JSON de baseline para comparação; regressões retornam código de saída 1.")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Variação relativa tolerada em relação ao baseline.")
+    parser.add_argument("--allow-metadata-mismatch", action="store_true",
+                        help="Compara com o baseline mesmo que a máquina ou a configuração (COMPARED_METADATA) sejam diferentes.")
+    parser.add_argument("--save-baseline", help=f"Salva o resultado também como baseline no caminho informado (exige --requests >= {MIN_BASELINE_REQUESTS}).")
+    args = parser.parse_args()
+    if args.save_baseline and args.requests < MIN_BASELINE_REQUESTS:
+        parser.error(f"--save-baseline requires --requests >= {MIN_BASELINE_REQUESTS} for a stable p95")
+
+    os.makedirs(args.data_dir, exist_ok=True)
+    rng = random.Random(args.seed)
+    results = []
+    for users in args.sizes:
+        database_file = os.path.join(args.data_dir, f"users_{users}.db")
+        seed_database(database_file, users)
+        samples = sample_users(database_file, 1000, rng)
+        port = free_port()
+        process = start_server(database_file, port, args.workers)
+        try:
+            results.extend(asyncio.run(run_size(f"http://127.0.0.1:{port}", users, args.scenarios, args.concurrency,
+                                                args.requests, args.warmup, rng, samples)))
+        finally:
+            stop_server(process)
+
+    report = {"metadata": environment_metadata(args), "results": results}
+    for path in filter(None, (args.output, args.save_baseline)):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(report, file, indent=2)
+    print(f"Resultado salvo em {args.output}", file=sys.stderr)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as file:
+            baseline = json.load(file)
+        mismatches = metadata_mismatches(report["metadata"], baseline.get("metadata", {}))
+        for mismatch in mismatches:
+            print(f"BASELINE INCOMPATÍVEL: {mismatch}", file=sys.stderr)
+        if mismatches and not args.allow_metadata_mismatch:
+            print("Comparação cancelada: gere o baseline nesta máquina e configuração (--save-baseline) ou use --allow-metadata-mismatch.", file=sys.stderr)
+            sys.exit(2)
+        regressions = compare_with_baseline(report, baseline, args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSÃO: {regression}", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+        print("Nenhuma regressão em relação ao baseline.", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
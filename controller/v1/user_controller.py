@@ -1,18 +1,105 @@
+import asyncio
 import http
-from fastapi import APIRouter, Depends
-from typing import List, Tuple
-from schemas.user_schema import UserCreateRequest, UserGeneralResponse, UserUpdateRequest
+import inspect
+import time
+from datetime import datetime, timezone
+from email.utils import format_datetime
+from functools import lru_cache
+from fastapi import APIRouter, Body, Depends, Header, Query, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from pydantic import ValidationError
+from typing import Any, Callable, Dict, List, Tuple, Optional, Iterator, AsyncIterator, Union
+from schemas.user_schema import (UserCreateRequest, UserGeneralResponse, UserUpdateRequest,
+                                 UserBatchUpdateRequest, UserBatchItemResponse, UserBatchResponse,
+                                 UserChangeResponse, UserChangesResponse, UserChangesHeadResponse,
+                                 UserExportRequest, UserExportResponse, UserImportResponse)
 from schemas.api_schema import GenericErrorResponse, GenericOkResponse
-from fastapi.responses import JSONResponse
-from models.user_model import UserModel
+from fastapi.responses import FileResponse, JSONResponse, StreamingResponse
+from models.user_model import UserModel, UserChangeModel
 from service.meta.interface_user_service import IUserService
+from service.meta.interface_async_user_service import IAsyncUserService
 from service.user_service import UserService
-from repositories.sqlite_user_repository import SQLiteUserRepository
+from service.async_user_service import AsyncUserService
+from service.user_export_service import UserExportService, AsyncUserExportService, UserExportJob
+from service.user_import_service import UserImportService, UserImportJob
+from repositories.backends import get_user_repository_backend, has_change_feed
+from repositories.cached_user_repository import CachedUserRepository
+from repositories.batching_user_repository import BatchingUserRepository, AsyncBatchingUserRepository
+from infra.cache import ICacheBackend, InMemoryLRUCache
+from infra.settings import get_settings
+from infra.responses import FastJSONResponse, dumps_json
 
 
-def get_user_service() -> IUserService:
-    user_repo = SQLiteUserRepository()
-    return UserService(user_repo)
+@lru_cache
+def get_user_cache() -> ICacheBackend:
+    settings = get_settings()
+    return InMemoryLRUCache(max_size=settings.user_cache_max_size,
+                            ttl_seconds=settings.user_cache_ttl_seconds,
+                            name="user")
+
+
+def build_user_service() -> Union[IUserService, IAsyncUserService]:
+    """Monta a camada de serviço (e o repositório do banco de dados DATABASE_BACKEND, com sua engine e pool de conexões) conforme as configurações. Chamado uma única vez por processo, no lifespan da aplicação."""
+    settings = get_settings()
+    repository_class, async_repository_class = get_user_repository_backend(settings.database_backend)
+    batch_options = {"max_batch_size": settings.user_create_batch_max_size, "max_delay": settings.user_create_batch_max_delay_ms / 1000}
+    if settings.service_mode == "async":
+        if async_repository_class is None:
+            raise ValueError(f"Database backend '{settings.database_backend}' does not support USER_SERVICE_MODE=async")
+        if settings.user_cache_enabled:
+            raise ValueError("USER_CACHE_ENABLED is not supported with USER_SERVICE_MODE=async")
+        async_user_repo = async_repository_class()
+        if settings.user_create_batching:
+            async_user_repo = AsyncBatchingUserRepository(async_user_repo, **batch_options)
+        return AsyncUserService(async_user_repo, single_flight=settings.user_single_flight)
+    user_repo = repository_class()
+    if settings.user_create_batching:
+        user_repo = BatchingUserRepository(user_repo, **batch_options)
+    if settings.user_cache_enabled:
+        # Sem log de alterações, a invalidação esvaziaria o cache a cada leitura do log: as alterações dos demais workers valem após o TTL.
+        invalidation_interval = (settings.user_cache_invalidation_interval or None) if has_change_feed(settings.database_backend) else None
+        user_repo = CachedUserRepository(user_repo, get_user_cache(), invalidation_interval=invalidation_interval)
+    return UserService(user_repo, single_flight=settings.user_single_flight)
+
+
+def get_user_service(request: Request) -> Union[IUserService, IAsyncUserService]:
+    """Dependência das rotas: retorna o serviço montado no lifespan (app.state.user_service). Aplicações sem o lifespan montam o serviço no primeiro acesso."""
+    service = getattr(request.app.state, "user_service", None)
+    if service is None:
+        service = request.app.state.user_service = build_user_service()
+    return service
+
+
+def build_user_export_service(user_service: Union[IUserService, IAsyncUserService]) -> Union[UserExportService, AsyncUserExportService]:
+    """Monta o serviço de exportações sobre a camada de serviço de usuários, no mesmo modo (síncrono ou assíncrono)."""
+    settings = get_settings()
+    export_service_class = AsyncUserExportService if isinstance(user_service, IAsyncUserService) else UserExportService
+    return export_service_class(user_service, settings.user_export_directory,
+                                chunk_size=settings.user_export_chunk_size, max_concurrent=settings.user_export_max_concurrent)
+
+
+def get_user_export_service(request: Request,
+                            user_service: Union[IUserService, IAsyncUserService] = Depends(get_user_service)) -> Union[UserExportService, AsyncUserExportService]:
+    """Dependência das rotas de exportação: retorna o serviço montado no lifespan (app.state.user_export_service) ou o monta no primeiro acesso, sobre o serviço de usuários da dependência get_user_service."""
+    service = getattr(request.app.state, "user_export_service", None)
+    if service is None:
+        service = request.app.state.user_export_service = build_user_export_service(user_service)
+    return service
+
+
+def build_user_import_service(user_service: Union[IUserService, IAsyncUserService]) -> UserImportService:
+    settings = get_settings()
+    return UserImportService(user_service, settings.user_import_directory,
+                             chunk_size=settings.user_import_chunk_size, validation_workers=settings.user_import_validation_workers)
+
+
+def get_user_import_service(request: Request,
+                            user_service: Union[IUserService, IAsyncUserService] = Depends(get_user_service)) -> UserImportService:
+    """Dependência das rotas de importação: retorna o serviço montado no lifespan (app.state.user_import_service) ou o monta no primeiro acesso."""
+    service = getattr(request.app.state, "user_import_service", None)
+    if service is None:
+        service = request.app.state.user_import_service = build_user_import_service(user_service)
+    return service
 
 
 class UserController:
@@ -21,6 +108,14 @@ class UserController:
     Após validada, utilizará a camada service para estabelecer lógicas de negócio e, posteriormente, comunicação com a camada repositório.
     """
     router = APIRouter()
+    page_max_limit = 1000
+    page_default_limit = 100
+    stream_chunk_size = 1000
+    batch_max_size = 1000
+    changes_max_wait = 60
+    changes_poll_interval = 0.5
+    changes_heartbeat_interval = 15
+    fast_response = get_settings().user_fast_response
 
     def __verify_error_tuple(error_tuple:  Tuple[str, str]):
         def is_tuple(obj):
@@ -52,75 +147,474 @@ class UserController:
         """
         UserController.__verify_error_tuple(error_tuple)
 
-        if error_tuple[0] == "UserDoesNotExist":
-            http_status_obj = http.HTTPStatus.NOT_FOUND
-            response = GenericErrorResponse(
-                status=http_status_obj.phrase,
-                code=error_tuple[0],
-                msg=error_tuple[1],
-                detail=None
-            )
-            return JSONResponse(status_code=http_status_obj,
-                                content=response.dict())
-        elif error_tuple[0] == "UnexpectedError":
-            http_status_obj = http.HTTPStatus.INTERNAL_SERVER_ERROR
-            response = GenericErrorResponse(
-                status=http_status_obj.phrase,
-                code=error_tuple[0],
-                msg=error_tuple[1],
-                detail=None
-            )
-            return JSONResponse(status_code=http_status_obj,
-                                content=response.dict())
+        http_status_obj = UserController.__http_status_from_error_code(error_tuple[0])
+        response = GenericErrorResponse(
+            status=http_status_obj.phrase,
+            code=error_tuple[0],
+            msg=error_tuple[1],
+            detail=None
+        )
+        return JSONResponse(status_code=http_status_obj,
+                            content=response.dict())
+
+    def __http_status_from_error_code(error_code: str) -> http.HTTPStatus:
+        """Relaciona o título do erro retornado pela camada de serviço ao status HTTP da resposta."""
+        if error_code in ("UserDoesNotExist", "ExportDoesNotExist", "ImportDoesNotExist"):
+            return http.HTTPStatus.NOT_FOUND
+        elif error_code in ("VersionConflict", "PreconditionFailed"):
+            return http.HTTPStatus.PRECONDITION_FAILED
+        elif error_code == "ChangesCompacted":
+            return http.HTTPStatus.GONE
+        elif error_code in ("ExportNotReady", "ImportInProgress"):
+            return http.HTTPStatus.CONFLICT
+        elif error_code == "InvalidImportFormat":
+            return http.HTTPStatus.UNSUPPORTED_MEDIA_TYPE
+        elif error_code in ("ChangesUnavailable", "ExportFormatUnavailable"):
+            return http.HTTPStatus.NOT_IMPLEMENTED
+        elif error_code == "UnexpectedError":
+            return http.HTTPStatus.INTERNAL_SERVER_ERROR
         else:
-            http_status_obj = http.HTTPStatus.BAD_REQUEST
-            response = GenericErrorResponse(
-                status=http_status_obj.phrase,
-                code=error_tuple[0],
-                msg=error_tuple[1],
-                detail=None
-            )
-            return JSONResponse(status_code=http_status_obj,
-                                content=response.dict())
+            return http.HTTPStatus.BAD_REQUEST
+
+    async def __call_service(method, *args, **kwargs):
+        """Executa um método da camada de serviço sem bloquear o event loop: métodos assíncronos (IAsyncUserService) são aguardados diretamente e métodos síncronos (IUserService) são executados no threadpool."""
+        if inspect.iscoroutinefunction(method):
+            return await method(*args, **kwargs)
+        return await run_in_threadpool(method, *args, **kwargs)
+
+    def __is_error_tuple(response: Any) -> bool:
+        return isinstance(response, tuple) and len(response) == 2 and all(isinstance(item, str) for item in response)
+
+    def __version_headers(etag: str, updated_at: Optional[datetime]) -> Dict[str, str]:
+        """Monta os cabeçalhos de validação de cache (ETag e Last-Modified) a partir da versão e da data da última alteração."""
+        headers = {"ETag": etag}
+        if updated_at is not None:
+            if updated_at.tzinfo is None:
+                updated_at = updated_at.replace(tzinfo=timezone.utc)
+            headers["Last-Modified"] = format_datetime(updated_at.astimezone(timezone.utc), usegmt=True)
+        return headers
+
+    def __user_version_headers(user_id: int, version: Optional[int], updated_at: Optional[datetime]) -> Dict[str, str]:
+        if version is None:
+            return {}
+        return UserController.__version_headers(f'"{user_id}-{version}"', updated_at)
+
+    def __etag_matches(if_none_match: str, etag: str) -> bool:
+        """Compara o cabeçalho If-None-Match (lista de ETags separadas por vírgula, ou *) com o ETag atual, utilizando a comparação fraca da RFC 9110 (o prefixo W/ é ignorado)."""
+        for tag in if_none_match.split(","):
+            tag = tag.strip()
+            if tag == "*" or tag.removeprefix("W/") == etag:
+                return True
+        return False
+
+    def __expected_version_from_if_match(if_match: Optional[str], user_id: int) -> Union[Optional[int], Tuple[str, str]]:
+        """Extrai a versão esperada do cabeçalho If-Match de uma atualização. Retorna None quando não há condição (cabeçalho ausente ou *) e uma tupla de erro PreconditionFailed quando o ETag é inválido, fraco ou de outro usuário."""
+        if if_match is None or if_match.strip() == "*":
+            return None
+        prefix = f'"{user_id}-'
+        tag = if_match.strip()
+        if tag.startswith(prefix) and tag.endswith('"') and tag[len(prefix):-1].isdigit():
+            return int(tag[len(prefix):-1])
+        return ("PreconditionFailed", f"If-Match header {if_match} does not match any version of user with id {user_id}.")
+
+    def __user_to_json_line(user: UserModel) -> bytes:
+        return dumps_json({"id": user.id,
+                           "first_name": user.first_name,
+                           "last_name": user.last_name,
+                           "email": user.email})
+
+    def __users_to_ndjson(users: Iterator[UserModel]) -> Iterator[bytes]:
+        """Serializa o iterador de usuários no formato NDJSON (um objeto JSON por linha), agrupando as linhas em blocos de stream_chunk_size usuários para reduzir a quantidade de envios ao cliente."""
+        lines = []
+        for user in users:
+            lines.append(UserController.__user_to_json_line(user))
+            if len(lines) >= UserController.stream_chunk_size:
+                yield b"\n".join(lines) + b"\n"
+                lines = []
+        if lines:
+            yield b"\n".join(lines) + b"\n"
+
+    async def __async_users_to_ndjson(users: AsyncIterator[UserModel]) -> AsyncIterator[bytes]:
+        """Equivalente ao __users_to_ndjson para iteradores assíncronos, retornados pela IAsyncUserService."""
+        lines = []
+        async for user in users:
+            lines.append(UserController.__user_to_json_line(user))
+            if len(lines) >= UserController.stream_chunk_size:
+                yield b"\n".join(lines) + b"\n"
+                lines = []
+        if lines:
+            yield b"\n".join(lines) + b"\n"
+
+    def __change_to_dict(change: UserChangeModel) -> Dict[str, Any]:
+        return {"sequence": change.sequence,
+                "user_id": change.user_id,
+                "operation": change.operation,
+                "version": change.version,
+                "first_name": change.first_name,
+                "last_name": change.last_name,
+                "email": change.email,
+                "changed_at": change.changed_at.isoformat()}
+
+    async def __wait_for_changes(service: Union[IUserService, IAsyncUserService], since: int, limit: int, wait: float):
+        """Long-poll: consulta o log de alterações a cada changes_poll_interval segundos até que surjam alterações posteriores a since ou até que wait segundos se passem."""
+        deadline = time.monotonic() + wait
+        while True:
+            changes = await UserController.__call_service(service.get_changes, since=since, limit=limit)
+            remaining = deadline - time.monotonic()
+            if not isinstance(changes, list) or changes or remaining <= 0:
+                return changes
+            await asyncio.sleep(min(UserController.changes_poll_interval, remaining))
+
+    async def __changes_to_sse(service: Union[IUserService, IAsyncUserService], since: int, limit: int, duration: float) -> AsyncIterator[bytes]:
+        """Server-Sent Events: envia as alterações posteriores a since (id do evento = sequência) e acompanha o log por duration segundos, com comentários de keep-alive. Ao fim, o cliente reconecta enviando o cabeçalho Last-Event-ID."""
+        deadline = time.monotonic() + duration
+        last_sent = time.monotonic()
+        yield b"retry: 1000\n\n"
+        while True:
+            changes = await UserController.__call_service(service.get_changes, since=since, limit=limit)
+            if not isinstance(changes, list):
+                yield b"event: error\ndata: " + dumps_json({"code": changes[0], "msg": changes[1]}) + b"\n\n"
+                return
+            if changes:
+                yield b"".join(b"id: %d\nevent: change\ndata: %s\n\n" % (change.sequence, dumps_json(UserController.__change_to_dict(change)))
+                               for change in changes)
+                since = changes[-1].sequence
+                last_sent = time.monotonic()
+
+            now = time.monotonic()
+            if now >= deadline:
+                return
+            if len(changes) == limit:
+                continue
+            if now - last_sent >= UserController.changes_heartbeat_interval:
+                yield b": keep-alive\n\n"
+                last_sent = now
+            await asyncio.sleep(min(UserController.changes_poll_interval, deadline - now))
+
+    def __parse_fields(fields: Optional[str]) -> Optional[List[str]]:
+        """Converte o parâmetro fields (campos separados por vírgula) na lista de campos da projeção. A validação dos nomes é feita pela camada de serviço."""
+        if fields is None:
+            return None
+        return [field.strip() for field in fields.split(",") if field.strip()]
+
+    async def __get_user_rows_response(service: Union[IUserService, IAsyncUserService], limit: Optional[int], after_id: Optional[int], headers: Dict[str, str], fields: Optional[List[str]] = None):
+        """Modo de resposta rápida da listagem (e projeções com fields=): os usuários chegam como dicionários e são serializados diretamente com orjson (FastJSONResponse), sem validação pelo response_model."""
+        if limit is not None or after_id is not None:
+            limit = limit or UserController.page_default_limit
+        rows = await UserController.__call_service(service.get_user_rows, limit=limit, after_id=after_id, fields=fields)
+        if not isinstance(rows, list):
+            return UserController.__handle_error_response_from_service(rows)
+        if limit is not None and len(rows) == limit:
+            headers = {**headers, "X-Next-After-Id": str(rows[-1]["id"])}
+        return FastJSONResponse(rows, headers=headers)
+
+    def __export_response(request: Request, job: UserExportJob) -> UserExportResponse:
+        file_url = str(request.url_for("download_user_export", export_id=job.id)) if job.status == "completed" else None
+        return UserExportResponse(**job.to_dict(), file_url=file_url)
+
+    def __import_format(content_type: Optional[str]) -> str:
+        """Formato do arquivo importado a partir do Content-Type: text/csv ou application/x-ndjson (também aceitos application/ndjson e application/jsonl)."""
+        media_type = (content_type or "").split(";")[0].strip().lower()
+        if media_type == "text/csv":
+            return "csv"
+        if media_type in ("application/x-ndjson", "application/ndjson", "application/jsonl"):
+            return "ndjson"
+        return media_type or "unknown"
+
+    def __import_response(request: Request, job: UserImportJob) -> JSONResponse:
+        """Resultado da importação. Quando interrompida, o status HTTP corresponde ao erro (error_code), e o corpo mantém o id e o checkpoint para a retomada."""
+        content = UserImportResponse(**{field: value for field, value in job.to_dict().items() if field != "errors_bytes"},
+                                     errors_url=str(request.url_for("get_user_import_errors", import_id=job.id)))
+        status_code = http.HTTPStatus.OK if job.error_code is None else UserController.__http_status_from_error_code(job.error_code)
+        return JSONResponse(status_code=status_code, content=content.model_dump(mode="json"),
+                            headers={"Location": str(request.url_for("get_user_import", import_id=job.id))})
+
+    async def __process_batch(items: List[Any],
+                              schema: Optional[type],
+                              service_method: Callable,
+                              success_status: http.HTTPStatus) -> Union[UserBatchResponse, JSONResponse]:
+        """Processa uma requisição em lote: valida cada item individualmente (quando schema é fornecido), envia os itens válidos em uma única chamada para a camada de serviço e monta o resultado por item, preservando o índice de cada item na requisição.
+
+        Args:
+            items (List[Any]): Itens recebidos no corpo da requisição.
+            schema (Optional[type]): Schema Pydantic utilizado para validar cada item. Se None, os itens são enviados sem validação adicional.
+            service_method (Callable): Método em lote da camada de serviço que recebe a lista de itens válidos.
+            success_status (http.HTTPStatus): Status atribuído aos itens processados com sucesso.
+
+        Returns:
+            Union[UserBatchResponse, JSONResponse]: Resultado por item ou resposta de erro padronizada caso a operação como um todo falhe.
+        """
+        results = {}
+        valid_indexes, valid_items = [], []
+        for index, item in enumerate(items):
+            if schema is None:
+                valid_indexes.append(index)
+                valid_items.append(item)
+                continue
+            try:
+                valid_items.append(schema.model_validate(item).model_dump())
+                valid_indexes.append(index)
+            except ValidationError as error:
+                first_error = error.errors()[0]
+                location = ".".join(str(part) for part in first_error["loc"])
+                results[index] = UserBatchItemResponse(index=index,
+                                                       status=http.HTTPStatus.UNPROCESSABLE_ENTITY,
+                                                       code="ValidationError",
+                                                       msg=f"{location}: {first_error['msg']}" if location else first_error["msg"])
+
+        if valid_items:
+            response = await UserController.__call_service(service_method, valid_items)
+            if not isinstance(response, list):
+                return UserController.__handle_error_response_from_service(response)
+
+            for index, item_response in zip(valid_indexes, response):
+                if isinstance(item_response, UserModel):
+                    results[index] = UserBatchItemResponse(index=index,
+                                                           status=success_status,
+                                                           user=UserGeneralResponse.model_validate(item_response, from_attributes=True))
+                else:
+                    results[index] = UserBatchItemResponse(index=index,
+                                                           status=UserController.__http_status_from_error_code(item_response[0]),
+                                                           code=item_response[0],
+                                                           msg=item_response[1])
+
+        items_response = [results[index] for index in range(len(items))]
+        failed = sum(1 for item in items_response if item.code is not None)
+        return UserBatchResponse(succeeded=len(items_response) - failed,
+                                 failed=failed,
+                                 items=items_response)
+
+    @router.post("/users/batch", status_code=200, response_model=UserBatchResponse)
+    async def create_users(users: List[Dict[str, Any]] = Body(..., max_length=batch_max_size),
+                           service: Union[IUserService, IAsyncUserService] = Depends(get_user_service)):
+        return await UserController.__process_batch(users, UserCreateRequest, service.create_users, http.HTTPStatus.CREATED)
+
+    @router.patch("/users/batch", status_code=200, response_model=UserBatchResponse)
+    async def update_users(users: List[Dict[str, Any]] = Body(..., max_length=batch_max_size),
+                           service: Union[IUserService, IAsyncUserService] = Depends(get_user_service)):
+        return await UserController.__process_batch(users, UserBatchUpdateRequest, service.update_users, http.HTTPStatus.OK)
+
+    @router.delete("/users/batch", status_code=200, response_model=UserBatchResponse)
+    async def delete_users(user_ids: List[int] = Body(..., max_length=batch_max_size),
+                           service: Union[IUserService, IAsyncUserService] = Depends(get_user_service)):
+        return await UserController.__process_batch(user_ids, None, service.delete_users, http.HTTPStatus.OK)
 
     @router.post("/users/", status_code=201, response_model=UserGeneralResponse)
-    async def create_user(user: UserCreateRequest, service: IUserService = Depends(get_user_service)):
-        response = service.create_user(**user.dict())
-        if isinstance(response, UserModel):
-            return response
+    async def create_user(user: UserCreateRequest, response: Response, service: Union[IUserService, IAsyncUserService] = Depends(get_user_service)):
+        created_user = await UserController.__call_service(service.create_user, **user.dict())
+        if isinstance(created_user, UserModel):
+            response.headers.update(UserController.__user_version_headers(created_user.id, created_user.version, created_user.updated_at))
+            return created_user
         else:
-            return UserController.__handle_error_response_from_service(response)
+            return UserController.__handle_error_response_from_service(created_user)
 
     @router.get("/users/", status_code=200, response_model=List[UserGeneralResponse])
-    async def get_users(service: IUserService = Depends(get_user_service)):
-        response = service.get_all_users()
-        if isinstance(response, list) and all(isinstance(item, UserModel) for item in response):
-            return response
+    async def get_users(response: Response,
+                        limit: Optional[int] = Query(None, ge=1, le=page_max_limit),
+                        after_id: Optional[int] = Query(None, ge=0),
+                        stream: bool = False,
+                        fields: Optional[str] = None,
+                        if_none_match: Optional[str] = Header(None),
+                        service: Union[IUserService, IAsyncUserService] = Depends(get_user_service)):
+        if stream:
+            if fields is not None:
+                return UserController.__handle_error_response_from_service(("InvalidFields", "The fields parameter is not supported with stream=true."))
+            users = await UserController.__call_service(service.stream_users,
+                                                        after_id=after_id,
+                                                        chunk_size=UserController.stream_chunk_size)
+            if isinstance(users, tuple):
+                return UserController.__handle_error_response_from_service(users)
+            if hasattr(users, "__aiter__"):
+                content = UserController.__async_users_to_ndjson(users)
+            else:
+                content = UserController.__users_to_ndjson(users)
+            return StreamingResponse(content, media_type="application/x-ndjson")
+
+        # A versão da coleção é lida antes dos usuários: se houver alteração entre as duas leituras, o ETag fica defasado e a próxima revalidação baixa a lista novamente, nunca o contrário.
+        collection_version = await UserController.__call_service(service.get_collection_version)
+        if UserController.__is_error_tuple(collection_version):
+            return UserController.__handle_error_response_from_service(collection_version)
+        version_headers = UserController.__version_headers(f'"users-{collection_version[0]}"', collection_version[1])
+        if if_none_match is not None and UserController.__etag_matches(if_none_match, version_headers["ETag"]):
+            return Response(status_code=http.HTTPStatus.NOT_MODIFIED, headers=version_headers)
+
+        if UserController.fast_response or fields is not None:
+            return await UserController.__get_user_rows_response(service, limit, after_id, version_headers, UserController.__parse_fields(fields))
+
+        if limit is None and after_id is None:
+            users = await UserController.__call_service(service.get_all_users)
         else:
-            return UserController.__handle_error_response_from_service(response)
+            limit = limit or UserController.page_default_limit
+            users = await UserController.__call_service(service.get_users_page, limit=limit, after_id=after_id)
+            if isinstance(users, list) and len(users) == limit:
+                response.headers["X-Next-After-Id"] = str(users[-1].id)
 
+        if isinstance(users, list) and all(isinstance(item, UserModel) for item in users):
+            response.headers.update(version_headers)
+            return users
+        else:
+            return UserController.__handle_error_response_from_service(users)
+
+
+    @router.get("/users/search", status_code=200, response_model=List[UserGeneralResponse])
+    async def search_users(email: Optional[str] = None,
+                           name_prefix: Optional[str] = Query(None, min_length=1),
+                           q: Optional[str] = Query(None, min_length=1),
+                           limit: int = Query(50, ge=1, le=page_max_limit),
+                           service: Union[IUserService, IAsyncUserService] = Depends(get_user_service)):
+        users = await UserController.__call_service(service.search_users,
+                                                    email=email,
+                                                    name_prefix=name_prefix,
+                                                    query=q,
+                                                    limit=limit)
+        if isinstance(users, list):
+            return users
+        else:
+            return UserController.__handle_error_response_from_service(users)
+
+    @router.get("/users/changes", status_code=200, response_model=UserChangesResponse)
+    async def get_user_changes(since: int = Query(0, ge=0),
+                               limit: int = Query(page_default_limit, ge=1, le=page_max_limit),
+                               wait: Optional[float] = Query(None, ge=0, le=changes_max_wait),
+                               stream: bool = False,
+                               last_event_id: Optional[str] = Header(None),
+                               service: Union[IUserService, IAsyncUserService] = Depends(get_user_service)):
+        if stream:
+            if last_event_id is not None and last_event_id.strip().isdigit():
+                since = int(last_event_id)
+            content = UserController.__changes_to_sse(service, since, limit, UserController.changes_max_wait if wait is None else wait)
+            return StreamingResponse(content, media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
+
+        changes = await UserController.__wait_for_changes(service, since, limit, wait or 0)
+        if not isinstance(changes, list):
+            return UserController.__handle_error_response_from_service(changes)
+        return UserChangesResponse(changes=[UserChangeResponse.model_validate(change, from_attributes=True) for change in changes],
+                                   next_since=changes[-1].sequence if changes else since,
+                                   has_more=len(changes) == limit)
+
+    @router.get("/users/changes/head", status_code=200, response_model=UserChangesHeadResponse)
+    async def get_user_changes_head(service: Union[IUserService, IAsyncUserService] = Depends(get_user_service)):
+        sequence = await UserController.__call_service(service.get_last_change_sequence)
+        if isinstance(sequence, int):
+            return UserChangesHeadResponse(last_sequence=sequence)
+        else:
+            return UserController.__handle_error_response_from_service(sequence)
+
+    @router.post("/users/exports", status_code=202, response_model=UserExportResponse)
+    async def create_user_export(request: Request,
+                                 response: Response,
+                                 export: UserExportRequest = Body(UserExportRequest()),
+                                 export_service: Union[UserExportService, AsyncUserExportService] = Depends(get_user_export_service)):
+        job = await UserController.__call_service(export_service.create_export, export_format=export.format)
+        if isinstance(job, UserExportJob):
+            response.headers["Location"] = str(request.url_for("get_user_export", export_id=job.id))
+            return UserController.__export_response(request, job)
+        else:
+            return UserController.__handle_error_response_from_service(job)
+
+    @router.get("/users/exports/{export_id}", status_code=200, response_model=UserExportResponse)
+    async def get_user_export(export_id: str,
+                              request: Request,
+                              export_service: Union[UserExportService, AsyncUserExportService] = Depends(get_user_export_service)):
+        job = await UserController.__call_service(export_service.get_export, export_id)
+        if isinstance(job, UserExportJob):
+            return UserController.__export_response(request, job)
+        else:
+            return UserController.__handle_error_response_from_service(job)
+
+    @router.get("/users/exports/{export_id}/file", status_code=200, response_class=FileResponse)
+    async def download_user_export(export_id: str,
+                                   export_service: Union[UserExportService, AsyncUserExportService] = Depends(get_user_export_service)):
+        """Arquivo de uma exportação concluída, com suporte a requisições parciais (Range) e condicionais. O Cache-Control: no-transform impede a compressão da resposta, pois os intervalos do Range são posições do arquivo original."""
+        job = await UserController.__call_service(export_service.get_export_file, export_id)
+        if isinstance(job, UserExportJob):
+            return FileResponse(export_service.store.file_path(job), media_type=job.media_type, filename=job.file_name,
+                                headers={"Cache-Control": "no-transform"})
+        else:
+            return UserController.__handle_error_response_from_service(job)
+
+    @router.post("/users/import", status_code=200, response_model=UserImportResponse)
+    async def import_users(request: Request,
+                           import_id: Optional[str] = None,
+                           content_type: Optional[str] = Header(None),
+                           import_service: UserImportService = Depends(get_user_import_service)):
+        """Importa usuários de um arquivo CSV (Content-Type: text/csv, com cabeçalho) ou NDJSON (application/x-ndjson), lido do corpo da requisição em streaming. Com import_id, retoma uma importação interrompida, reenviando o mesmo arquivo."""
+        job = await import_service.import_users(request.stream(), UserController.__import_format(content_type), import_id=import_id)
+        if isinstance(job, UserImportJob):
+            return UserController.__import_response(request, job)
+        else:
+            return UserController.__handle_error_response_from_service(job)
+
+    @router.get("/users/import/{import_id}", status_code=200, response_model=UserImportResponse)
+    async def get_user_import(import_id: str,
+                              request: Request,
+                              import_service: UserImportService = Depends(get_user_import_service)):
+        job = await import_service.get_import(import_id)
+        if isinstance(job, UserImportJob):
+            return UserController.__import_response(request, job)
+        else:
+            return UserController.__handle_error_response_from_service(job)
+
+    @router.get("/users/import/{import_id}/errors", status_code=200, response_class=FileResponse)
+    async def get_user_import_errors(import_id: str,
+                                     import_service: UserImportService = Depends(get_user_import_service)):
+        """Relatório de erros por linha (NDJSON: row, code e msg), atualizado a cada bloco confirmado."""
+        job = await import_service.get_import(import_id)
+        if isinstance(job, UserImportJob):
+            return FileResponse(import_service.store.errors_path(job), media_type="application/x-ndjson", filename=f"users-import-{job.id}-errors.ndjson")
+        else:
+            return UserController.__handle_error_response_from_service(job)
 
     @router.get("/users/{user_id}", status_code=200, response_model=UserGeneralResponse)
-    async def get_user(user_id: int, service: IUserService = Depends(get_user_service)):
-        response = service.get_user(user_id=user_id)
-        if isinstance(response, UserModel):
-            return response
+    async def get_user(user_id: int,
+                       response: Response,
+                       fields: Optional[str] = None,
+                       if_none_match: Optional[str] = Header(None),
+                       service: Union[IUserService, IAsyncUserService] = Depends(get_user_service)):
+        if if_none_match is not None:
+            version = await UserController.__call_service(service.get_user_version, user_id=user_id)
+            if UserController.__is_error_tuple(version):
+                return UserController.__handle_error_response_from_service(version)
+            version_headers = UserController.__user_version_headers(user_id, *version)
+            if UserController.__etag_matches(if_none_match, version_headers["ETag"]):
+                return Response(status_code=http.HTTPStatus.NOT_MODIFIED, headers=version_headers)
+
+        if fields is not None:
+            row = await UserController.__call_service(service.get_user_row, user_id=user_id, fields=UserController.__parse_fields(fields))
+            if not isinstance(row, dict):
+                return UserController.__handle_error_response_from_service(row)
+            version_headers = UserController.__user_version_headers(user_id, row.pop("version"), row.pop("updated_at"))
+            return FastJSONResponse(row, headers=version_headers)
+
+        user = await UserController.__call_service(service.get_user, user_id=user_id)
+        if isinstance(user, UserModel):
+            response.headers.update(UserController.__user_version_headers(user.id, user.version, user.updated_at))
+            return user
         else:
-            return UserController.__handle_error_response_from_service(response)
+            return UserController.__handle_error_response_from_service(user)
 
 
     @router.put("/users/{user_id}", status_code=200, response_model=UserGeneralResponse)
-    async def update_user(user_id: int, user_update: UserUpdateRequest, service: IUserService = Depends(get_user_service)):
-        response = service.update_user(user_id, user_update.dict())
-        if isinstance(response, UserModel):
-            return response
+    async def update_user(user_id: int,
+                          user_update: UserUpdateRequest,
+                          response: Response,
+                          if_match: Optional[str] = Header(None),
+                          service: Union[IUserService, IAsyncUserService] = Depends(get_user_service)):
+        expected_version = UserController.__expected_version_from_if_match(if_match, user_id)
+        if isinstance(expected_version, tuple):
+            return UserController.__handle_error_response_from_service(expected_version)
+
+        user = await UserController.__call_service(service.update_user, user_id, user_update.dict(), expected_version=expected_version)
+        if isinstance(user, UserModel):
+            response.headers.update(UserController.__user_version_headers(user.id, user.version, user.updated_at))
+            return user
         else:
-            return UserController.__handle_error_response_from_service(response)
+            return UserController.__handle_error_response_from_service(user)
 
 
     @router.delete("/users/{user_id}", status_code=200, response_model=GenericOkResponse)
-    async def delete_user(user_id: int, service: IUserService = Depends(get_user_service)):
-        response = service.delete_user(user_id)
+    async def delete_user(user_id: int, service: Union[IUserService, IAsyncUserService] = Depends(get_user_service)):
+        response = await UserController.__call_service(service.delete_user, user_id)
         if isinstance(response, UserModel):
             generic_response = GenericOkResponse(
                 code="UserDeleted",
@@ -0,0 +1,32 @@
+"""Compactação do log de alterações de usuários (user_change).
+
+Remove as alterações mais antigas que o período de retenção (USER_CHANGES_RETENTION_DAYS), preservando sempre a mais recente, e registra a marca d'água da compactação. Pensado para execução periódica (ex: cron).
+
+Uso: python -m db.compact_changes --retention-days 7
+"""
+import argparse
+import sys
+from typing import List, Optional
+
+from infra.settings import get_settings
+from repositories.backends import get_user_repository_backend
+from service.user_service import UserService
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--retention-days", type=int, default=get_settings().user_changes_retention_days,
+                        help="Período de retenção das alterações, em dias.")
+    args = parser.parse_args(argv)
+
+    repository_class, _ = get_user_repository_backend(get_settings().database_backend)
+    deleted = UserService(repository_class()).compact_changes(args.retention_days)
+    if isinstance(deleted, tuple):
+        print(f"[compact_changes] falha na compactação: {deleted[0]} - {deleted[1]}", file=sys.stderr)
+        return 1
+    print(f"[compact_changes] {deleted} alterações removidas (retenção de {args.retention_days} dias)", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
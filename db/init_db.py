@@ -1,15 +1,18 @@
 from faker import Faker
-from db.sqllite_client import SqLiteClient, SqLiteBase
-from models.user_model import UserModel
+from db.seed import main as seed_main
+
+
+fake = Faker("pt_BR")
 
 
 def generate_fake_data():
-    """Função que irá gerar dados fictícios para usuário (User), envolvendo Email, Primeiro Nome (first_name) e Sobrenome (last_name)
+    """Função que irá gerar dados fictícios para usuário (User), envolvendo Email, Primeiro Nome (first_name) e Sobrenome (last_name). A instância do Faker é reaproveitada entre as chamadas.
+
+    Para cargas em massa, utilize o db.seed, que gera os usuários em lotes.
 
     Returns:
         dict: Dicionário com os dados fictícios gerados. Chaves: first_name, last_name, email
     """
-    fake = Faker("pt_BR")
     name = fake.name()
     fake_data = {
         "first_name": name.split(" ")[0],
@@ -20,14 +23,6 @@ def generate_fake_data():
 
 
 if __name__ == "__main__":
-    sqlite_client = SqLiteClient()
-    SqLiteBase.metadata.create_all(bind=sqlite_client._engine)
-    for _ in range(100):
-        fake_user = generate_fake_data()
-        with next(sqlite_client()) as db_session:
-            user = UserModel(first_name=fake_user["first_name"],
-                            last_name=fake_user["last_name"],
-                            email=fake_user["email"])
-            db_session.add(user)
-            db_session.commit()
-            db_session.refresh(user)
\ No newline at end of file
+    # Mantido por compatibilidade (Makefile/Dockerfile): cria o banco de dados e insere 100 usuários via db.seed.
+    # Argumentos do db.seed também são aceitos, ex: python -m db.init_db --rows 1000000
+    seed_main()
\ No newline at end of file
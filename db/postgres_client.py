@@ -0,0 +1,145 @@
+from typing import List, Optional
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm.session import Session
+from sqlalchemy.pool import QueuePool
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from db.sqllite_client import dispose_pool_after_fork
+from db.replicas import ReplicaSet, replica_name, sync_database_url
+from infra.settings import get_settings
+
+
+# Os timestamps são armazenados em UTC sem fuso (como no SQLite): a sessão em UTC faz o CURRENT_TIMESTAMP dos padrões das colunas seguir o mesmo formato.
+POSTGRES_CONNECT_ARGS = {"options": "-c timezone=UTC"}
+
+
+class PostgresClient:
+    """Cliente para realizar conexão com o banco de dados PostgreSQL responsável por dados de usuários (User), atrelado à URL POSTGRES_DSN (driver psycopg). Segue o mesmo contrato do SqLiteClient: o uso do objeto como função (__call__) retorna um gerador que ativa e encerra a sessão.
+
+    Diferente do SQLite, o PostgreSQL aceita escritas concorrentes de várias conexões, então o pool (POSTGRES_POOL_SIZE e POSTGRES_MAX_OVERFLOW, por processo) é a principal forma de controlar a concorrência no banco de dados. As conexões são verificadas antes do uso (pool_pre_ping), descartando as encerradas pelo servidor.
+
+    Com réplicas de leitura configuradas (POSTGRES_REPLICA_DSNS, ex: standbys da replicação por streaming), _get_read_session retorna uma sessão na réplica escolhida pelo ReplicaSet (ou no principal), como no SqLiteClient.
+
+    Atributos de Instância:
+        _engine: Responsável por instanciar um objeto engine atrelado ao banco de dados e drivers necessários.
+        _session: Responsável por instanciar um objeto Session utilizando o _engine para realizar as operações necessárias.
+        _read_sessions: Fábricas de Session das réplicas de leitura.
+        _replicas: ReplicaSet das réplicas de leitura, ou None quando não há réplicas.
+    """
+    database_path = None
+    _replicas = None
+
+    def __init__(self, replica_dsns: Optional[List[str]] = None) -> None:
+        settings = get_settings()
+        self.database_path = self.database_path or settings.postgres_dsn
+        self._engine = create_engine(self.database_path,
+                                     poolclass=QueuePool,
+                                     pool_size=settings.postgres_pool_size,
+                                     max_overflow=settings.postgres_max_overflow,
+                                     pool_pre_ping=True,
+                                     query_cache_size=settings.sqlalchemy_query_cache_size,
+                                     connect_args=POSTGRES_CONNECT_ARGS)
+        dispose_pool_after_fork(self._engine)
+        self._session = sessionmaker(bind=self._engine, autocommit=False, autoflush=False, expire_on_commit=False)
+
+        replica_dsns = settings.postgres_replica_dsns if replica_dsns is None else replica_dsns
+        read_engines = []
+        for replica_dsn in replica_dsns:
+            read_engine = create_engine(replica_dsn,
+                                        poolclass=QueuePool,
+                                        pool_size=settings.postgres_pool_size,
+                                        max_overflow=settings.postgres_max_overflow,
+                                        pool_pre_ping=True,
+                                        query_cache_size=settings.sqlalchemy_query_cache_size,
+                                        connect_args=POSTGRES_CONNECT_ARGS)
+            dispose_pool_after_fork(read_engine)
+            read_engines.append(read_engine)
+        self._read_sessions = [sessionmaker(bind=read_engine, autocommit=False, autoflush=False, expire_on_commit=False)
+                               for read_engine in read_engines]
+        if read_engines:
+            self._replicas = ReplicaSet(self._engine, read_engines, [replica_name(replica_dsn) for replica_dsn in replica_dsns],
+                                        settings.replica_max_lag_seconds, settings.replica_lag_check_interval)
+
+    def __call__(self) -> Session:
+        session_local = self._session()
+        try:
+            yield session_local
+        finally:
+            session_local.close()
+
+    def _get_session(self):
+        return next(self.__call__())
+
+    def _get_read_session(self) -> Session:
+        """Sessão para operações somente leitura: em uma réplica de leitura, quando configuradas e disponíveis, ou no principal."""
+        replica = self._replicas.choose() if self._replicas is not None else None
+        if replica is None:
+            return self._get_session()
+        return self._read_sessions[replica]()
+
+    def pool_stats(self) -> dict:
+        """Coleta estatísticas do pool de conexões da engine, no mesmo formato do SqLiteClient.pool_stats."""
+        pool = self._engine.pool
+        return {"profile": None,
+                "status": pool.status(),
+                "size": pool.size(),
+                "checked_in": pool.checkedin(),
+                "checked_out": pool.checkedout(),
+                "overflow": pool.overflow()}
+
+
+class AsyncPostgresClient:
+    """Cliente assíncrono para realizar conexão com o banco de dados PostgreSQL (POSTGRES_DSN) utilizando o modo assíncrono do driver psycopg, com as mesmas configurações de pool do PostgresClient.
+
+    As réplicas de leitura (POSTGRES_REPLICA_DSNS) são tratadas como no PostgresClient; o atraso é medido por engines síncronas, na thread do ReplicaSet, sem ocupar o event loop.
+
+    Atributos de Instância:
+        _engine: Responsável por instanciar um objeto AsyncEngine atrelado ao banco de dados e drivers necessários.
+        _session: Responsável por instanciar um objeto AsyncSession utilizando o _engine para realizar as operações necessárias.
+        _read_sessions: Fábricas de AsyncSession das réplicas de leitura.
+        _replicas: ReplicaSet das réplicas de leitura, ou None quando não há réplicas.
+    """
+    database_path = None
+    _replicas = None
+
+    def __init__(self, replica_dsns: Optional[List[str]] = None) -> None:
+        settings = get_settings()
+        self.database_path = self.database_path or settings.postgres_dsn
+        self._engine = create_async_engine(self.database_path,
+                                           pool_size=settings.postgres_pool_size,
+                                           max_overflow=settings.postgres_max_overflow,
+                                           pool_pre_ping=True,
+                                           query_cache_size=settings.sqlalchemy_query_cache_size,
+                                           connect_args=POSTGRES_CONNECT_ARGS)
+        dispose_pool_after_fork(self._engine.sync_engine)
+        self._session = async_sessionmaker(bind=self._engine, autoflush=False, expire_on_commit=False)
+
+        replica_dsns = settings.postgres_replica_dsns if replica_dsns is None else replica_dsns
+        read_engines = []
+        for replica_dsn in replica_dsns:
+            read_engine = create_async_engine(replica_dsn,
+                                              pool_size=settings.postgres_pool_size,
+                                              max_overflow=settings.postgres_max_overflow,
+                                              pool_pre_ping=True,
+                                              query_cache_size=settings.sqlalchemy_query_cache_size,
+                                              connect_args=POSTGRES_CONNECT_ARGS)
+            dispose_pool_after_fork(read_engine.sync_engine)
+            read_engines.append(read_engine)
+        self._read_sessions = [async_sessionmaker(bind=read_engine, autoflush=False, expire_on_commit=False)
+                               for read_engine in read_engines]
+        if read_engines:
+            self._replicas = ReplicaSet(create_engine(sync_database_url(self.database_path), pool_size=1, connect_args=POSTGRES_CONNECT_ARGS),
+                                        [create_engine(sync_database_url(replica_dsn), pool_size=1, connect_args=POSTGRES_CONNECT_ARGS)
+                                         for replica_dsn in replica_dsns],
+                                        [replica_name(replica_dsn) for replica_dsn in replica_dsns],
+                                        settings.replica_max_lag_seconds, settings.replica_lag_check_interval)
+
+    def _get_session(self) -> AsyncSession:
+        return self._session()
+
+    def _get_read_session(self) -> AsyncSession:
+        """Sessão para operações somente leitura: em uma réplica de leitura, quando configuradas e disponíveis, ou no principal."""
+        replica = self._replicas.choose() if self._replicas is not None else None
+        if replica is None:
+            return self._get_session()
+        return self._read_sessions[replica]()
@@ -0,0 +1,207 @@
+"""Administração dos shards de usuários (DATABASE_BACKEND=sqlite_sharded).
+
+Subcomandos:
+- init: cria os arquivos dos shards (schema completo, como o db.init_db) e o catálogo (USER_SHARD_CATALOG_FILE), distribuindo os slots entre eles.
+- status: mostra os slots e a quantidade de usuários de cada shard.
+- split: cria um novo shard e move para ele metade dos slots de um shard existente.
+- rebalance: distribui os slots igualmente entre os shards atuais e os adicionados com --add.
+
+Os usuários de um slot são copiados para o shard de destino, o slot passa a apontar para o destino no catálogo e só então as cópias antigas são removidas. Execute split/rebalance com a aplicação parada; uma execução interrompida pode ser repetida.
+
+Uso:
+    python -m db.rebalance_shards init --shards 4
+    python -m db.rebalance_shards split --source db/shards/shard-0.db --target db/shards/shard-4.db
+    python -m db.rebalance_shards rebalance --add db/shards/shard-5.db
+"""
+import argparse
+import io
+import os
+import sys
+from collections import Counter
+from typing import Dict, List, Optional
+from sqlalchemy import delete, insert, select
+from sqlalchemy.engine import Engine
+
+from db.seed import seed_users
+from db.sqllite_client import SqLiteClient
+from infra.settings import get_settings
+from models.user_model import UserModel
+from repositories.shard_catalog_repository import ShardCatalogRepository
+
+
+MOVE_CHUNK_SIZE = 10_000
+
+
+def shard_engine(shard_file: str) -> Engine:
+    return SqLiteClient(profile="durable", replica_files=[], database_file=shard_file)._engine
+
+
+def create_shard(shard_file: str) -> None:
+    """Cria o arquivo do shard com o schema completo (tabela, índices, log de alterações e, com USER_FTS_ENABLED, a busca textual)."""
+    os.makedirs(os.path.dirname(shard_file) or ".", exist_ok=True)
+    engine = shard_engine(shard_file)
+    seed_users(0, engine=engine, out=io.StringIO())
+    engine.dispose()
+
+
+def slots_of(slot_map: List[str], shard_file: str) -> List[int]:
+    return [slot for slot, owner in enumerate(slot_map) if owner == shard_file]
+
+
+def move_slots(catalog: ShardCatalogRepository, slot_map: List[str], slots: List[int], target_file: str,
+               chunk_size: int = MOVE_CHUNK_SIZE, out=sys.stderr) -> int:
+    """Copia os usuários dos slots para o shard de destino e atualiza o catálogo. As cópias na origem são removidas depois, por remove_orphans.
+
+    Returns:
+        int: Usuários copiados.
+    """
+    slot_count = len(slot_map)
+    copied = 0
+    target = shard_engine(target_file)
+    for source_file in sorted({slot_map[slot] for slot in slots} - {target_file}):
+        source_slots = [slot for slot in slots if slot_map[slot] == source_file]
+        source = shard_engine(source_file)
+        last_id = 0
+        while True:
+            with source.connect() as connection:
+                rows = connection.execute(select(UserModel.__table__)
+                                          .where((UserModel.id % slot_count).in_(source_slots), UserModel.id > last_id)
+                                          .order_by(UserModel.id)
+                                          .limit(chunk_size)).mappings().all()
+            if not rows:
+                break
+            with target.begin() as connection:
+                connection.execute(insert(UserModel).prefix_with("OR REPLACE"), [dict(row) for row in rows])
+            copied += len(rows)
+            last_id = rows[-1]["id"]
+        source.dispose()
+        catalog.assign_slots(source_slots, target_file)
+        print(f"[rebalance_shards] {len(source_slots)} slots movidos de {source_file} para {target_file}", file=out)
+    target.dispose()
+    return copied
+
+
+def remove_orphans(slot_map: List[str], chunk_size: int = MOVE_CHUNK_SIZE) -> int:
+    """Remove de cada shard os usuários de slots que pertencem a outro shard (cópias deixadas por uma movimentação).
+
+    Returns:
+        int: Usuários removidos.
+    """
+    slot_count = len(slot_map)
+    removed = 0
+    for shard_file in dict.fromkeys(slot_map):
+        foreign_slots = [slot for slot, owner in enumerate(slot_map) if owner != shard_file]
+        if not foreign_slots:
+            continue
+        engine = shard_engine(shard_file)
+        while True:
+            with engine.begin() as connection:
+                ids = list(connection.scalars(select(UserModel.id).where((UserModel.id % slot_count).in_(foreign_slots)).limit(chunk_size)))
+                if ids:
+                    connection.execute(delete(UserModel).where(UserModel.id.in_(ids)))
+            removed += len(ids)
+            if len(ids) < chunk_size:
+                break
+        engine.dispose()
+    return removed
+
+
+def rebalance_plan(slot_map: List[str], shard_files: List[str]) -> Dict[str, List[int]]:
+    """Calcula os slots a mover para que cada shard fique com a mesma quantidade de slots (com diferença de no máximo 1), movendo o mínimo possível.
+
+    Returns:
+        Dict[str, List[int]]: Slots a mover por shard de destino.
+    """
+    target_counts = {shard_file: len(slot_map) // len(shard_files) + (1 if index < len(slot_map) % len(shard_files) else 0)
+                     for index, shard_file in enumerate(shard_files)}
+    available = []
+    counts = Counter(slot_map)
+    for shard_file in list(counts):
+        excess = counts[shard_file] - target_counts.get(shard_file, 0)
+        if excess > 0:
+            available.extend(slots_of(slot_map, shard_file)[-excess:])
+    plan = {}
+    for shard_file in shard_files:
+        missing = target_counts[shard_file] - counts.get(shard_file, 0)
+        if missing > 0:
+            plan[shard_file], available = available[:missing], available[missing:]
+    return plan
+
+
+def shard_status(slot_map: List[str]) -> List[dict]:
+    status = []
+    for shard_file, slots in Counter(slot_map).items():
+        engine = shard_engine(shard_file)
+        with engine.connect() as connection:
+            users = connection.exec_driver_sql('SELECT count(*) FROM "user"').scalar()
+        engine.dispose()
+        status.append({"shard": shard_file, "slots": slots, "users": users})
+    return status
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--catalog", default=get_settings().user_shard_catalog_file, help="Arquivo do catálogo dos shards.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    init_parser = subparsers.add_parser("init", help="Cria os shards e o catálogo.")
+    init_parser.add_argument("--shards", type=int, default=2, help="Quantidade de shards.")
+    init_parser.add_argument("--directory", default=None, help="Diretório dos arquivos dos shards. Padrão para o diretório do catálogo.")
+    init_parser.add_argument("--slots", type=int, default=256, help="Quantidade de slots (limite de shards). Não pode ser alterada depois.")
+    subparsers.add_parser("status", help="Mostra os slots e usuários de cada shard.")
+    split_parser = subparsers.add_parser("split", help="Move metade dos slots de um shard para um novo shard.")
+    split_parser.add_argument("--source", required=True, help="Arquivo do shard dividido.")
+    split_parser.add_argument("--target", required=True, help="Arquivo do novo shard.")
+    rebalance_parser = subparsers.add_parser("rebalance", help="Distribui os slots igualmente entre os shards.")
+    rebalance_parser.add_argument("--add", nargs="*", default=[], help="Arquivos de novos shards incluídos na distribuição.")
+    args = parser.parse_args(argv)
+
+    os.makedirs(os.path.dirname(args.catalog) or ".", exist_ok=True)
+    catalog = ShardCatalogRepository(args.catalog)
+    try:
+        if args.command == "init":
+            directory = args.directory or os.path.dirname(args.catalog) or "."
+            shard_files = [os.path.join(directory, f"shard-{index}.db") for index in range(args.shards)]
+            for shard_file in shard_files:
+                create_shard(shard_file)
+            slot_map, error_type, error_msg = catalog.initialize(shard_files, args.slots)
+            if error_type is not None:
+                print(f"[rebalance_shards] {error_type} - {error_msg}", file=sys.stderr)
+                return 1
+            print(f"[rebalance_shards] {args.shards} shards criados com {args.slots} slots", file=sys.stderr)
+            return 0
+
+        slot_map, error_type, error_msg = catalog.select_slot_map()
+        if error_type is not None:
+            print(f"[rebalance_shards] {error_type} - {error_msg}", file=sys.stderr)
+            return 1
+
+        if args.command == "split":
+            if args.source not in slot_map or args.target in slot_map:
+                print("[rebalance_shards] --source deve ser um shard do catálogo e --target um arquivo novo", file=sys.stderr)
+                return 1
+            source_slots = slots_of(slot_map, args.source)
+            plan = {args.target: source_slots[len(source_slots) // 2:]}
+        elif args.command == "rebalance":
+            plan = rebalance_plan(slot_map, list(dict.fromkeys(slot_map)) + [shard_file for shard_file in args.add if shard_file not in slot_map])
+        else:
+            plan = {}
+
+        for target_file, slots in plan.items():
+            if target_file not in slot_map:
+                create_shard(target_file)
+            copied = move_slots(catalog, slot_map, slots, target_file)
+            slot_map, _, _ = catalog.select_slot_map()
+            print(f"[rebalance_shards] {copied} usuários copiados para {target_file}", file=sys.stderr)
+        removed = remove_orphans(slot_map) if args.command != "status" else 0
+        if removed:
+            print(f"[rebalance_shards] {removed} cópias antigas removidas", file=sys.stderr)
+
+        for status in shard_status(slot_map):
+            print(f"{status['shard']}\t{status['slots']} slots\t{status['users']} usuários")
+        return 0
+    finally:
+        catalog.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
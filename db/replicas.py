@@ -0,0 +1,140 @@
+import itertools
+import threading
+import time
+from datetime import datetime, timezone
+from typing import List, Optional
+from sqlalchemy import DateTime, Integer, column, func, select, table
+from sqlalchemy.engine import Engine, make_url
+from infra.metrics import metrics_registry
+from infra.read_consistency import primary_reads_requested
+
+
+DB_READ_ROUTING = metrics_registry.counter(
+    "db_read_routing_total", "Leituras roteadas entre o banco de dados principal e as réplicas, por destino e motivo.", ("target", "reason"))
+DB_REPLICA_LAG_SECONDS = metrics_registry.gauge(
+    "db_replica_lag_seconds", "Atraso da réplica: idade da alteração mais antiga do principal ainda não presente na réplica, em segundos.", ("replica",),
+    multiprocess_mode="max")
+DB_REPLICA_LAG_CHANGES = metrics_registry.gauge(
+    "db_replica_lag_changes", "Alterações do log (user_change) do principal ainda não presentes na réplica.", ("replica",), multiprocess_mode="max")
+DB_REPLICA_HEALTHY = metrics_registry.gauge(
+    "db_replica_healthy", "Indica se a réplica recebe leituras (1) ou está atrasada/indisponível (0).", ("replica",), multiprocess_mode="min")
+
+# Apenas as colunas do log de alterações (UserChangeModel) usadas na medição do atraso; os clientes de banco de dados importam este módulo, então ele não pode depender dos modelos.
+user_change = table("user_change", column("sequence", Integer), column("changed_at", DateTime))
+
+LAST_SEQUENCE_STATEMENT = select(func.coalesce(func.max(user_change.c.sequence), 0))
+
+
+def oldest_pending_change_statement(replica_sequence: int):
+    return select(func.min(user_change.c.changed_at)).where(user_change.c.sequence > replica_sequence)
+
+
+def sqlite_read_only_url(database_file: str, drivername: str = "sqlite") -> str:
+    """URL de conexão somente leitura (mode=ro) a um arquivo SQLite: a réplica pode ser outro arquivo (mantido por uma ferramenta de replicação) ou o próprio arquivo do principal, lido por conexões separadas."""
+    return f"{drivername}:///file:{database_file}?mode=ro&uri=true"
+
+
+def sync_database_url(url: str) -> str:
+    """URL equivalente com driver síncrono, utilizada na medição do atraso das réplicas de clientes assíncronos."""
+    url = make_url(url)
+    return url.set(drivername=url.drivername.replace("+aiosqlite", "")).render_as_string(hide_password=False)
+
+
+def replica_name(url: str) -> str:
+    return make_url(url).render_as_string(hide_password=True)
+
+
+class ReplicaState:
+    __slots__ = ("name", "healthy", "lag_seconds", "lag_changes")
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.healthy = False
+        self.lag_seconds = None
+        self.lag_changes = None
+
+
+class ReplicaSet:
+    """Conjunto de réplicas de leitura de um banco de dados, responsável por escolher a réplica de cada leitura e por medir o atraso de cada uma.
+
+    As leituras são distribuídas entre as réplicas saudáveis (round-robin) e voltam ao principal após uma alteração do cliente (read-your-writes) ou quando nenhuma réplica está saudável. Uma réplica com atraso acima de max_lag_seconds, medido pelo log de alterações, deixa de receber leituras até se recuperar.
+
+    Args:
+        primary_engine (Engine): Engine síncrona do banco de dados principal.
+        replica_engines (List[Engine]): Engines síncronas das réplicas, na mesma ordem das sessões de leitura do cliente.
+        names (List[str]): Nomes das réplicas, utilizados no label das métricas.
+        max_lag_seconds (float): Atraso máximo para que a réplica receba leituras.
+        check_interval (float): Intervalo, em segundos, entre as medições de atraso.
+    """
+
+    def __init__(self, primary_engine: Engine, replica_engines: List[Engine], names: List[str],
+                 max_lag_seconds: float, check_interval: float) -> None:
+        self.primary_engine = primary_engine
+        self.replica_engines = replica_engines
+        self.states = [ReplicaState(name) for name in names]
+        self.max_lag_seconds = max_lag_seconds
+        self.check_interval = check_interval
+        self.__counter = itertools.count()
+        self.__monitor = None
+        self.__monitor_lock = threading.Lock()
+
+    def __ensure_monitor(self) -> None:
+        """Inicia a thread de medição no primeiro uso (e novamente após um fork, em que a thread não é herdada pelo processo filho)."""
+        if self.__monitor is not None and self.__monitor.is_alive():
+            return
+        with self.__monitor_lock:
+            if self.__monitor is None or not self.__monitor.is_alive():
+                self.__monitor = threading.Thread(target=self.__run_monitor, name="replica-lag-monitor", daemon=True)
+                self.__monitor.start()
+
+    def __run_monitor(self) -> None:
+        while True:
+            self.check_lag()
+            time.sleep(self.check_interval)
+
+    def check_lag(self) -> None:
+        """Mede o atraso de todas as réplicas e atualiza quais podem receber leituras."""
+        try:
+            with self.primary_engine.connect() as connection:
+                primary_sequence = connection.scalar(LAST_SEQUENCE_STATEMENT)
+        except Exception:
+            return
+
+        for engine, state in zip(self.replica_engines, self.states):
+            try:
+                with engine.connect() as connection:
+                    replica_sequence = connection.scalar(LAST_SEQUENCE_STATEMENT)
+                lag_seconds = 0.0
+                if replica_sequence < primary_sequence:
+                    with self.primary_engine.connect() as connection:
+                        oldest_pending = connection.scalar(oldest_pending_change_statement(replica_sequence))
+                    lag_seconds = max((datetime.now(timezone.utc).replace(tzinfo=None) - oldest_pending).total_seconds(), 0.0) if oldest_pending is not None else 0.0
+                state.lag_changes = max(primary_sequence - replica_sequence, 0)
+                state.lag_seconds = lag_seconds
+                state.healthy = lag_seconds <= self.max_lag_seconds
+                DB_REPLICA_LAG_SECONDS.set(lag_seconds, replica=state.name)
+                DB_REPLICA_LAG_CHANGES.set(state.lag_changes, replica=state.name)
+            except Exception:
+                state.healthy = False
+            DB_REPLICA_HEALTHY.set(1 if state.healthy else 0, replica=state.name)
+
+    def choose(self) -> Optional[int]:
+        """Escolhe a réplica da próxima leitura.
+
+        Returns:
+            Optional[int]: Índice da réplica escolhida, ou None quando a leitura deve ser feita no principal.
+        """
+        self.__ensure_monitor()
+        if primary_reads_requested():
+            DB_READ_ROUTING.inc(target="primary", reason="read_your_writes")
+            return None
+        healthy = [index for index, state in enumerate(self.states) if state.healthy]
+        if not healthy:
+            DB_READ_ROUTING.inc(target="primary", reason="replica_unavailable")
+            return None
+        DB_READ_ROUTING.inc(target="replica", reason="replica")
+        return healthy[next(self.__counter) % len(healthy)]
+
+    def stats(self) -> List[dict]:
+        return [{"replica": state.name, "healthy": state.healthy, "lag_seconds": state.lag_seconds, "lag_changes": state.lag_changes}
+                for state in self.states]
@@ -0,0 +1,267 @@
+"""Ferramenta de carga em massa de usuários fictícios no banco de dados (SQLite ou PostgreSQL).
+
+Os usuários são gerados em lotes a partir de amostras produzidas uma única vez pelo Faker e gravados com executemany (SQLite) ou COPY (PostgreSQL) em transações por lote. Os índices secundários e os triggers são removidos durante a carga e recriados ao final, e os usuários carregados não geram entradas no log de alterações.
+
+Uso: python -m db.seed --rows 10000000 --batch-size 100000 --workers 4
+"""
+import argparse
+import random
+import sys
+import time
+import unicodedata
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterator, List, Optional, Tuple
+
+from faker import Faker
+from sqlalchemy import Engine
+
+from db.sqllite_client import SqLiteClient, SqLiteBase
+from db.postgres_client import PostgresClient
+from models.user_model import (POSTGRES_USER_CHANGE_TRIGGERS, USER_CHANGE_TRIGGERS, USER_VERSION_TRIGGERS, UserModel, create_user_indexes,
+                               create_user_full_text_index, create_user_change_log, create_user_version_tracking,
+                               migrate_user_table)
+from infra.settings import get_settings
+
+
+INSERT_USER_STATEMENT = 'INSERT INTO "user" (first_name, last_name, email) VALUES (?, ?, ?)'
+COPY_USER_STATEMENT = 'COPY "user" (first_name, last_name, email) FROM STDIN'
+LOAD_PRAGMAS = {"journal_mode": "MEMORY", "synchronous": "OFF", "temp_store": "MEMORY",
+                "cache_size": -262144, "locking_mode": "EXCLUSIVE"}
+RESTORE_PRAGMAS = {"locking_mode": "NORMAL", "journal_mode": "WAL", "synchronous": "NORMAL"}
+POOL_SIZE = 5000
+
+
+def to_ascii_slug(value: str) -> str:
+    """Remove acentos e caracteres que não são letras ou números, para montar a parte local do e-mail."""
+    normalized = unicodedata.normalize("NFKD", value).encode("ascii", "ignore").decode("ascii")
+    return "".join(character for character in normalized.lower() if character.isalnum())
+
+
+class UserDataGenerator:
+    """Gerador de usuários fictícios em lotes, sorteados a partir de amostras de nomes e domínios geradas pelo Faker na construção.
+
+    O e-mail inclui a posição global do usuário na carga, garantindo unicidade entre lotes e processos.
+
+    Args:
+        seed (int, optional): Semente do Faker e do sorteio, tornando a carga reprodutível. Padrão para 42.
+        pool_size (int, optional): Tamanho das amostras de nomes. Padrão para POOL_SIZE.
+    """
+
+    def __init__(self, seed: int = 42, pool_size: int = POOL_SIZE) -> None:
+        fake = Faker("pt_BR")
+        fake.seed_instance(seed)
+        self.seed = seed
+        self.first_names = [fake.first_name() for _ in range(pool_size)]
+        self.last_names = [fake.last_name() + " " + fake.last_name() for _ in range(pool_size)]
+        self.domains = sorted({fake.free_email_domain() for _ in range(100)})
+        self.first_name_slugs = [to_ascii_slug(name) for name in self.first_names]
+        self.last_name_slugs = [to_ascii_slug(name.split(" ")[0]) for name in self.last_names]
+
+    def generate_batch(self, start: int, size: int) -> List[Tuple[str, str, str]]:
+        """Gera o lote de usuários das posições [start, start + size) como tuplas (first_name, last_name, email). O mesmo start gera sempre o mesmo lote, independente do processo."""
+        rng = random.Random(self.seed * 1_000_003 + start)
+        first_indexes = rng.choices(range(len(self.first_names)), k=size)
+        last_indexes = rng.choices(range(len(self.last_names)), k=size)
+        domains = rng.choices(self.domains, k=size)
+        first_names, last_names = self.first_names, self.last_names
+        first_slugs, last_slugs = self.first_name_slugs, self.last_name_slugs
+        return [(first_names[first], last_names[last], f"{first_slugs[first]}.{last_slugs[last]}{position}@{domain}")
+                for first, last, domain, position in zip(first_indexes, last_indexes, domains, range(start, start + size))]
+
+
+_worker_generator: Optional[UserDataGenerator] = None
+
+
+def _initialize_worker(seed: int) -> None:
+    global _worker_generator
+    _worker_generator = UserDataGenerator(seed)
+
+
+def _generate_batch_in_worker(batch: Tuple[int, int]) -> List[Tuple[str, str, str]]:
+    return _worker_generator.generate_batch(*batch)
+
+
+def batch_ranges(offset: int, rows: int, batch_size: int) -> Iterator[Tuple[int, int]]:
+    for start in range(0, rows, batch_size):
+        yield offset + start, min(batch_size, rows - start)
+
+
+def is_postgres(connection) -> bool:
+    return connection.dialect.name == "postgresql"
+
+
+def default_engine() -> Engine:
+    """Engine do banco de dados configurado em DATABASE_BACKEND: o SqLiteClient no perfil throughput ou o PostgresClient."""
+    if get_settings().database_backend == "postgres":
+        return PostgresClient()._engine
+    return SqLiteClient(profile="throughput")._engine
+
+
+def has_full_text_index(connection) -> bool:
+    if is_postgres(connection):
+        return connection.exec_driver_sql("SELECT 1 FROM information_schema.columns "
+                                          "WHERE table_name = 'user' AND column_name = 'search_vector'").first() is not None
+    return connection.exec_driver_sql("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'user_fts'").first() is not None
+
+
+def drop_secondary_structures(connection) -> bool:
+    """Remove os índices secundários e os triggers da busca textual, da versão da coleção e do log de alterações antes da carga. Retorna se a busca textual estava criada."""
+    for index in UserModel.__table__.indexes:
+        connection.exec_driver_sql(f"DROP INDEX IF EXISTS {index.name}")
+    has_full_text = has_full_text_index(connection)
+    if is_postgres(connection):
+        connection.exec_driver_sql("DROP INDEX IF EXISTS ix_user_search_vector")
+        for trigger in POSTGRES_USER_CHANGE_TRIGGERS:
+            connection.exec_driver_sql(f'DROP TRIGGER IF EXISTS {trigger} ON "user"')
+        return has_full_text
+    for trigger in ("user_fts_after_insert", "user_fts_after_delete", "user_fts_after_update") + USER_VERSION_TRIGGERS + USER_CHANGE_TRIGGERS:
+        connection.exec_driver_sql(f"DROP TRIGGER IF EXISTS {trigger}")
+    return has_full_text
+
+
+def write_users(connection, users: List[Tuple[str, str, str]]) -> None:
+    """Grava o lote de usuários: COPY no PostgreSQL, executemany no SQLite."""
+    if is_postgres(connection):
+        # O COPY utiliza o cursor do driver diretamente: a transação é iniciada pelo SQLAlchemy para que o connection.commit() a confirme.
+        if not connection.in_transaction():
+            connection.begin()
+        with connection.connection.cursor() as cursor:
+            with cursor.copy(COPY_USER_STATEMENT) as copy:
+                for user in users:
+                    copy.write_row(user)
+    else:
+        connection.exec_driver_sql(INSERT_USER_STATEMENT, users)
+
+
+def seed_users(rows: int,
+               batch_size: int = 100_000,
+               workers: int = 1,
+               seed: int = 42,
+               reset: bool = False,
+               engine: Optional[Engine] = None,
+               full_text: Optional[bool] = None,
+               report_every: int = 10,
+               out=sys.stderr) -> dict:
+    """Insere a quantidade de usuários fictícios informada.
+
+    Args:
+        rows (int): Quantidade de usuários a serem inseridos.
+        batch_size (int, optional): Usuários por lote (uma transação por lote). Padrão para 100000.
+        workers (int, optional): Processos utilizados na geração dos lotes. Com 1, a geração acontece no próprio processo. Padrão para 1.
+        seed (int, optional): Semente da geração, para cargas reprodutíveis. Padrão para 42.
+        reset (bool, optional): Remove os usuários existentes antes da carga. Padrão para False (os usuários são adicionados).
+        engine (Engine, optional): Engine do banco de dados. Padrão para a engine do banco de dados configurado em DATABASE_BACKEND (default_engine).
+        full_text (bool, optional): Cria/reconstrói a tabela FTS5 de busca textual. Padrão para USER_FTS_ENABLED.
+        report_every (int, optional): Intervalo, em lotes, dos relatórios de progresso. Padrão para 10.
+        out (optional): Arquivo em que o progresso é reportado. Padrão para sys.stderr.
+
+    Returns:
+        dict: Usuários inseridos, tempo total, tempo de geração, escrita e reconstrução dos índices (em segundos) e usuários por segundo.
+    """
+    engine = engine if engine is not None else default_engine()
+    full_text = get_settings().user_fts_enabled if full_text is None else full_text
+    SqLiteBase.metadata.create_all(bind=engine)
+    migrate_user_table(engine)
+    if rows <= 0:
+        # Sem usuários a inserir (ex: inicialização do container), apenas cria o que estiver faltando, sem reconstruir índices existentes.
+        create_user_indexes(engine)
+        with engine.connect() as connection:
+            missing_full_text = full_text and not has_full_text_index(connection)
+        if missing_full_text:
+            create_user_full_text_index(engine)
+        return {"rows": 0, "seconds": 0.0, "generation_seconds": 0.0, "write_seconds": 0.0, "index_seconds": 0.0, "rows_per_second": 0.0}
+    started = time.perf_counter()
+    generation_seconds = write_seconds = index_seconds = 0.0
+
+    # Os índices e triggers removidos são recriados mesmo que a carga falhe ou seja interrompida: sem eles, as escritas da aplicação deixariam de atualizar a busca textual, a versão da coleção e o log de alterações.
+    try:
+        with engine.connect() as connection:
+            postgres = is_postgres(connection)
+            full_text = has_full_text_index(connection) or full_text
+            if not postgres:
+                for name, value in LOAD_PRAGMAS.items():
+                    connection.exec_driver_sql(f"PRAGMA {name} = {value}")
+            executor = None
+            try:
+                drop_secondary_structures(connection)
+                if reset:
+                    connection.exec_driver_sql('TRUNCATE "user" RESTART IDENTITY' if postgres else 'DELETE FROM "user"')
+                connection.commit()
+                offset = connection.exec_driver_sql('SELECT coalesce(max(id), 0) FROM "user"').scalar()
+
+                ranges = list(batch_ranges(offset, rows, batch_size))
+                executor = ProcessPoolExecutor(workers, initializer=_initialize_worker, initargs=(seed,)) if workers > 1 else None
+                if executor is not None:
+                    batches = executor.map(_generate_batch_in_worker, ranges)
+                else:
+                    generator = UserDataGenerator(seed)
+                    batches = (generator.generate_batch(*batch) for batch in ranges)
+                inserted = 0
+                for number, batch in enumerate(_timed_iterator(batches), start=1):
+                    users, elapsed = batch
+                    generation_seconds += elapsed
+                    write_started = time.perf_counter()
+                    write_users(connection, users)
+                    connection.commit()
+                    write_seconds += time.perf_counter() - write_started
+                    inserted += len(users)
+                    if number % report_every == 0 or inserted == rows:
+                        elapsed_total = time.perf_counter() - started
+                        print(f"[seed] {inserted}/{rows} usuários ({inserted / elapsed_total:,.0f} usuários/s)", file=out)
+            finally:
+                if executor is not None:
+                    executor.shutdown(cancel_futures=True)
+                connection.rollback()
+                if not postgres:
+                    for name, value in RESTORE_PRAGMAS.items():
+                        connection.exec_driver_sql(f"PRAGMA {name} = {value}")
+                    connection.commit()
+    finally:
+        index_started = time.perf_counter()
+        create_user_indexes(engine)
+        if full_text:
+            create_user_full_text_index(engine)
+        with engine.begin() as connection:
+            create_user_version_tracking(connection)
+            create_user_change_log(connection)
+        index_seconds = time.perf_counter() - index_started
+
+    total_seconds = time.perf_counter() - started
+    report = {"rows": rows,
+              "seconds": round(total_seconds, 3),
+              "generation_seconds": round(generation_seconds, 3),
+              "write_seconds": round(write_seconds, 3),
+              "index_seconds": round(index_seconds, 3),
+              "rows_per_second": round(rows / total_seconds, 1) if total_seconds > 0 else 0.0}
+    print(f"[seed] {rows} usuários em {total_seconds:.1f}s ({report['rows_per_second']:,.0f} usuários/s; "
+          f"geração {generation_seconds:.1f}s, escrita {write_seconds:.1f}s, índices {index_seconds:.1f}s)", file=out)
+    return report
+
+
+def _timed_iterator(iterator):
+    """Mede o tempo de espera de cada item do iterador (tempo de geração do lote, ou de espera pelo pool de processos)."""
+    iterator = iter(iterator)
+    while True:
+        started = time.perf_counter()
+        try:
+            item = next(iterator)
+        except StopIteration:
+            return
+        yield item, time.perf_counter() - started
+
+
+def main(argv: Optional[List[str]] = None) -> dict:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100, help="Quantidade de usuários a serem inseridos.")
+    parser.add_argument("--batch-size", type=int, default=100_000, help="Usuários por lote/transação.")
+    parser.add_argument("--workers", type=int, default=1, help="Processos para geração dos lotes.")
+    parser.add_argument("--seed", type=int, default=42, help="Semente da geração, para cargas reprodutíveis.")
+    parser.add_argument("--reset", action="store_true", help="Remove os usuários existentes antes da carga.")
+    parser.add_argument("--report-every", type=int, default=10, help="Intervalo, em lotes, dos relatórios de progresso.")
+    args = parser.parse_args(argv)
+    return seed_users(args.rows, batch_size=args.batch_size, workers=args.workers, seed=args.seed, reset=args.reset,
+                      report_every=args.report_every)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,35 @@
+from sqlalchemy import create_engine
+from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm.session import Session
+from db.sqllite_client import apply_pragmas_on_connect, dispose_pool_after_fork, get_engine_profile
+from infra.settings import get_settings
+
+# Base separada da SqLiteBase: as tabelas do catálogo existem apenas no arquivo do catálogo, e não em cada shard.
+ShardCatalogBase = declarative_base()
+
+
+class ShardCatalogClient:
+    """Cliente para realizar conexão com o catálogo dos shards de usuários (USER_SHARD_CATALOG_FILE), que guarda o mapa de slots e o alocador global de ids. Utiliza sempre o perfil 'durable', para que um bloco de ids reservado nunca seja perdido.
+
+    Atributos de Instância:
+        _engine: Responsável por instanciar um objeto engine atrelado ao arquivo do catálogo.
+        _session: Responsável por instanciar um objeto Session utilizando o _engine para realizar as operações necessárias.
+    """
+
+    def __init__(self, catalog_file: str = None) -> None:
+        self.database_path = f"sqlite:///{catalog_file or get_settings().user_shard_catalog_file}"
+        self._engine = create_engine(self.database_path, pool_size=1, max_overflow=4, connect_args={"check_same_thread": False})
+        apply_pragmas_on_connect(self._engine, get_engine_profile("durable")["pragmas"])
+        dispose_pool_after_fork(self._engine)
+        self._session = sessionmaker(bind=self._engine, autocommit=False, autoflush=False, expire_on_commit=False)
+
+    def __call__(self) -> Session:
+        session_local = self._session()
+        try:
+            yield session_local
+        finally:
+            session_local.close()
+
+    def _get_session(self):
+        return next(self.__call__())
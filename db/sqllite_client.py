@@ -1,25 +1,155 @@
-from typing import Any
-from sqlalchemy import create_engine
+import os
+import weakref
+from typing import List, Optional
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.orm.session import Session
+from sqlalchemy.pool import QueuePool
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from infra.settings import get_settings
+from db.replicas import ReplicaSet, sqlite_read_only_url, sync_database_url
 
 SqLiteBase = declarative_base()
 
+SQLITE_ENGINE_PROFILES = {
+    # Nenhuma escrita confirmada é perdida, nem em queda de energia: fsync a cada commit.
+    "durable": {
+        "pragmas": {"journal_mode": "WAL", "synchronous": "FULL", "busy_timeout": 5000,
+                    "cache_size": -8000, "mmap_size": 0, "temp_store": "DEFAULT", "foreign_keys": "ON"},
+        "pool": {"pool_size": 5, "max_overflow": 5, "pool_timeout": 30},
+    },
+    # WAL + synchronous=NORMAL: commits não fazem fsync (apenas checkpoints), seguro contra queda do processo.
+    "balanced": {
+        "pragmas": {"journal_mode": "WAL", "synchronous": "NORMAL", "busy_timeout": 5000,
+                    "cache_size": -32000, "mmap_size": 134217728, "temp_store": "MEMORY", "foreign_keys": "ON"},
+        "pool": {"pool_size": 10, "max_overflow": 10, "pool_timeout": 30},
+    },
+    # Sem fsync: as últimas transações podem ser perdidas em queda do sistema operacional. Indicado para cargas e ambientes descartáveis.
+    "throughput": {
+        "pragmas": {"journal_mode": "WAL", "synchronous": "OFF", "busy_timeout": 10000,
+                    "cache_size": -128000, "mmap_size": 536870912, "temp_store": "MEMORY", "foreign_keys": "ON"},
+        "pool": {"pool_size": 20, "max_overflow": 20, "pool_timeout": 30},
+    },
+}
+
+
+def get_engine_profile(profile: str) -> dict:
+    """Recupera a configuração (PRAGMAs e pool de conexões) de um perfil de engine do SQLite.
+
+    Args:
+        profile (str): Nome do perfil: 'durable', 'balanced' ou 'throughput'.
+
+    Raises:
+        ValueError: Caso o perfil não exista.
+
+    Returns:
+        dict: Dicionário com as chaves 'pragmas' e 'pool'.
+    """
+    if profile not in SQLITE_ENGINE_PROFILES:
+        raise ValueError(f"Invalid SQLite engine profile '{profile}'. Options: {', '.join(SQLITE_ENGINE_PROFILES)}")
+    return SQLITE_ENGINE_PROFILES[profile]
+
+
+def apply_pragmas_on_connect(engine: Engine, pragmas: dict) -> None:
+    """Registra um listener no evento 'connect' da engine para aplicar os PRAGMAs em cada nova conexão DBAPI criada pelo pool."""
+    @event.listens_for(engine, "connect")
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for pragma, value in pragmas.items():
+            cursor.execute(f"PRAGMA {pragma}={value}")
+        cursor.close()
+
+
+def unicode_lower(value: Optional[str]) -> Optional[str]:
+    """Implementação da função SQL unicode_lower: o lower() nativo do SQLite converte apenas letras ASCII (ex: 'Á' permanece 'Á')."""
+    return value.lower() if isinstance(value, str) else value
+
+
+def register_functions_on_connect(engine: Engine) -> None:
+    """Registra um listener no evento 'connect' da engine para criar, em cada nova conexão DBAPI, as funções SQL implementadas em Python (unicode_lower).
+
+    As funções são determinísticas, requisito do SQLite para utilizá-las em índices de expressão (ix_user_first_name_lower).
+    """
+    @event.listens_for(engine, "connect")
+    def create_sqlite_functions(dbapi_connection, connection_record):
+        dbapi_connection.create_function("unicode_lower", 1, unicode_lower, deterministic=True)
+
+
+# PRAGMAs que alteram o arquivo do banco de dados (ou valem apenas para escritas) não são aplicados nas conexões somente leitura das réplicas.
+REPLICA_EXCLUDED_PRAGMAS = ("journal_mode", "synchronous", "foreign_keys")
+
+
+def replica_pragmas(pragmas: dict) -> dict:
+    return {pragma: value for pragma, value in pragmas.items() if pragma not in REPLICA_EXCLUDED_PRAGMAS}
+
+
+def dispose_pool_after_fork(engine: Engine) -> None:
+    """Descarta, no processo filho de um fork (ex: gunicorn com --preload), as conexões herdadas do pool da engine sem fechá-las, pois continuam pertencendo ao processo pai."""
+    engine_reference = weakref.ref(engine)
+
+    def dispose_in_child() -> None:
+        engine = engine_reference()
+        if engine is not None:
+            engine.dispose(close=False)
+
+    if hasattr(os, "register_at_fork"):
+        os.register_at_fork(after_in_child=dispose_in_child)
+
+
 class SqLiteClient:
-    """Cliente para realizar conexão com o banco de dados SqLite responsável por dados de usuários (User) atrelado ao caminho db/database.db,
+    """Cliente para realizar conexão com o banco de dados SqLite responsável por dados de usuários (User) atrelado ao caminho db/database.db (configurável pela variável de ambiente SQLITE_DATABASE_FILE),
 
     O uso do objeto instanciado dessa classe como uma execução de função (__call__) é retornado um gerador que é responsável por ativar a sessão e encerrando a sessão no final da iteração. Pode ser utilizado como gerenciador de contexto.
 
+    A engine é configurada a partir de um perfil (SQLITE_ENGINE_PROFILES), que define os PRAGMAs aplicados em cada conexão (WAL, synchronous, busy_timeout, mmap_size, etc.) e o dimensionamento do pool de conexões.
+
+    Com réplicas de leitura configuradas (SQLITE_REPLICA_FILES), o cliente mantém uma engine somente leitura por réplica, e _get_read_session retorna uma sessão na réplica escolhida pelo ReplicaSet (ou no principal); _get_session continua sempre no principal.
+
+    Um arquivo diferente do SQLITE_DATABASE_FILE pode ser informado em database_file (ex: cada shard do ShardedUserRepository).
+
     Atributos de Instância:
+        profile: Nome do perfil de engine utilizado. Padrão definido pela variável de ambiente SQLITE_PROFILE.
         _engine: Responsável por instanciar um objeto engine atrelado ao banco de dados e drivers necessários.
         _session: Responsável por instanciar um objeto Session utilizando o _engine para realizar as operações necessárias.
+        _read_sessions: Fábricas de Session das réplicas de leitura.
+        _replicas: ReplicaSet das réplicas de leitura, ou None quando não há réplicas.
     """
-    database_path = "sqlite:///db/database.db"
+    database_path = None
+    _replicas = None
+
+    def __init__(self, profile: str = None, replica_files: Optional[List[str]] = None, database_file: Optional[str] = None) -> None:
+        self.database_path = self.database_path or f"sqlite:///{database_file or get_settings().sqlite_database_file}"
+        self.profile = profile or get_settings().sqlite_profile
+        engine_profile = get_engine_profile(self.profile)
+        self._engine = create_engine(self.database_path,
+                                     poolclass=QueuePool,
+                                     connect_args={"check_same_thread": False},
+                                     query_cache_size=get_settings().sqlalchemy_query_cache_size,
+                                     **engine_profile["pool"])
+        apply_pragmas_on_connect(self._engine, engine_profile["pragmas"])
+        register_functions_on_connect(self._engine)
+        dispose_pool_after_fork(self._engine)
+        self._session = sessionmaker(bind=self._engine, autocommit=False, autoflush=False, expire_on_commit=False)
 
-    def __init__(self) -> None:
-        self._engine = create_engine(self.database_path)
-        self._session = sessionmaker(bind=self._engine, autocommit=False, autoflush=False)
+        replica_files = get_settings().sqlite_replica_files if replica_files is None else replica_files
+        read_engines = []
+        for replica_file in replica_files:
+            read_engine = create_engine(sqlite_read_only_url(replica_file),
+                                        poolclass=QueuePool,
+                                        connect_args={"check_same_thread": False},
+                                        query_cache_size=get_settings().sqlalchemy_query_cache_size,
+                                        **engine_profile["pool"])
+            apply_pragmas_on_connect(read_engine, replica_pragmas(engine_profile["pragmas"]))
+            register_functions_on_connect(read_engine)
+            dispose_pool_after_fork(read_engine)
+            read_engines.append(read_engine)
+        self._read_sessions = [sessionmaker(bind=read_engine, autocommit=False, autoflush=False, expire_on_commit=False)
+                               for read_engine in read_engines]
+        if read_engines:
+            self._replicas = ReplicaSet(self._engine, read_engines, replica_files,
+                                        get_settings().replica_max_lag_seconds, get_settings().replica_lag_check_interval)
     
     def __call__(self) -> Session:
         session_local = self._session()
@@ -29,4 +159,79 @@ class SqLiteClient:
             session_local.close()
     
     def _get_session(self):
-        return next(self.__call__())
\ No newline at end of file
+        return next(self.__call__())
+
+    def _get_read_session(self) -> Session:
+        """Sessão para operações somente leitura: em uma réplica de leitura, quando configuradas e disponíveis, ou no principal."""
+        replica = self._replicas.choose() if self._replicas is not None else None
+        if replica is None:
+            return self._get_session()
+        return self._read_sessions[replica]()
+
+    def pool_stats(self) -> dict:
+        """Coleta estatísticas do pool de conexões da engine.
+
+        Returns:
+            dict: Perfil utilizado, tamanho do pool, conexões disponíveis (checked_in), em uso (checked_out), conexões excedentes (overflow) e o status textual do pool.
+        """
+        pool = self._engine.pool
+        stats = {"profile": getattr(self, "profile", None), "status": pool.status()}
+        if isinstance(pool, QueuePool):
+            stats.update({"size": pool.size(),
+                          "checked_in": pool.checkedin(),
+                          "checked_out": pool.checkedout(),
+                          "overflow": pool.overflow()})
+        return stats
+
+
+class AsyncSqLiteClient:
+    """Cliente assíncrono para realizar conexão com o banco de dados SqLite (db/database.db ou SQLITE_DATABASE_FILE) utilizando o driver aiosqlite, permitindo que as operações de banco de dados não bloqueiem o event loop. Utiliza os mesmos perfis de engine do SqLiteClient.
+
+    As réplicas de leitura (SQLITE_REPLICA_FILES) são tratadas como no SqLiteClient; o atraso é medido por engines síncronas, na thread do ReplicaSet, sem ocupar o event loop.
+
+    Atributos de Instância:
+        profile: Nome do perfil de engine utilizado. Padrão definido pela variável de ambiente SQLITE_PROFILE.
+        _engine: Responsável por instanciar um objeto AsyncEngine atrelado ao banco de dados e drivers necessários.
+        _session: Responsável por instanciar um objeto AsyncSession utilizando o _engine para realizar as operações necessárias.
+        _read_sessions: Fábricas de AsyncSession das réplicas de leitura.
+        _replicas: ReplicaSet das réplicas de leitura, ou None quando não há réplicas.
+    """
+    database_path = None
+    _replicas = None
+
+    def __init__(self, profile: str = None, replica_files: Optional[List[str]] = None) -> None:
+        self.database_path = self.database_path or f"sqlite+aiosqlite:///{get_settings().sqlite_database_file}"
+        self.profile = profile or get_settings().sqlite_profile
+        engine_profile = get_engine_profile(self.profile)
+        self._engine = create_async_engine(self.database_path, query_cache_size=get_settings().sqlalchemy_query_cache_size, **engine_profile["pool"])
+        apply_pragmas_on_connect(self._engine.sync_engine, engine_profile["pragmas"])
+        register_functions_on_connect(self._engine.sync_engine)
+        dispose_pool_after_fork(self._engine.sync_engine)
+        self._session = async_sessionmaker(bind=self._engine, autoflush=False, expire_on_commit=False)
+
+        replica_files = get_settings().sqlite_replica_files if replica_files is None else replica_files
+        read_engines = []
+        for replica_file in replica_files:
+            read_engine = create_async_engine(sqlite_read_only_url(replica_file, "sqlite+aiosqlite"),
+                                              query_cache_size=get_settings().sqlalchemy_query_cache_size, **engine_profile["pool"])
+            apply_pragmas_on_connect(read_engine.sync_engine, replica_pragmas(engine_profile["pragmas"]))
+            register_functions_on_connect(read_engine.sync_engine)
+            dispose_pool_after_fork(read_engine.sync_engine)
+            read_engines.append(read_engine)
+        self._read_sessions = [async_sessionmaker(bind=read_engine, autoflush=False, expire_on_commit=False)
+                               for read_engine in read_engines]
+        if read_engines:
+            self._replicas = ReplicaSet(create_engine(sync_database_url(self.database_path)),
+                                        [create_engine(sqlite_read_only_url(replica_file)) for replica_file in replica_files],
+                                        replica_files,
+                                        get_settings().replica_max_lag_seconds, get_settings().replica_lag_check_interval)
+
+    def _get_session(self) -> AsyncSession:
+        return self._session()
+
+    def _get_read_session(self) -> AsyncSession:
+        """Sessão para operações somente leitura: em uma réplica de leitura, quando configuradas e disponíveis, ou no principal."""
+        replica = self._replicas.choose() if self._replicas is not None else None
+        if replica is None:
+            return self._get_session()
+        return self._read_sessions[replica]()
@@ -0,0 +1,192 @@
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional
+
+from infra.metrics import metrics_registry
+
+
+CACHE_REQUESTS = metrics_registry.counter(
+    "cache_requests_total", "Leituras dos caches em memória por resultado: 'hit' ou 'miss'.", ("cache", "result"))
+CACHE_EVICTIONS = metrics_registry.counter(
+    "cache_evictions_total", "Itens removidos dos caches em memória por motivo: 'capacity' (LRU) ou 'expired' (TTL).", ("cache", "reason"))
+CACHE_SIZE = metrics_registry.gauge(
+    "cache_size", "Itens armazenados nos caches em memória, incluindo lápides.", ("cache",), multiprocess_mode="sum")
+
+# Valor das lápides: marca uma chave removida (ou alterada) recentemente, sem valor a retornar.
+TOMBSTONE = object()
+
+
+class ICacheBackend(ABC):
+    """Interface que representa um backend de cache chave/valor, permitindo trocar o cache em memória do processo por um cache compartilhado (ex: Redis) sem alterar quem o utiliza."""
+
+    @abstractmethod
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Recupera o valor associado à chave.
+
+        Args:
+            key (Hashable): Chave do item no cache.
+
+        Returns:
+            Optional[Any]: Valor armazenado ou None caso a chave não exista (ou tenha expirado).
+        """
+        pass
+
+    @abstractmethod
+    def set(self, key: Hashable, value: Any) -> None:
+        """Armazena (ou substitui) o valor associado à chave.
+
+        Args:
+            key (Hashable): Chave do item no cache.
+            value (Any): Valor a ser armazenado. Não deve ser None.
+        """
+        pass
+
+    @abstractmethod
+    def set_if_newer(self, key: Hashable, value: Any, version: int) -> bool:
+        """Armazena o valor apenas se ele for mais recente que o item da chave, de forma atômica. Usado nas escritas e no preenchimento do cache, que não devem sobrescrever um valor mais recente gravado por uma operação concorrente.
+
+        Args:
+            key (Hashable): Chave do item no cache.
+            value (Any): Valor a ser armazenado. Não deve ser None.
+            version (int): Versão do valor.
+
+        Returns:
+            bool: True se o valor foi armazenado. False se a chave contém uma versão maior ou igual, um valor sem versão (gravado por set) ou uma lápide que bloqueia essa versão.
+        """
+        pass
+
+    @abstractmethod
+    def delete(self, key: Hashable) -> None:
+        """Remove a chave do cache, caso exista.
+
+        Args:
+            key (Hashable): Chave do item no cache.
+        """
+        pass
+
+    @abstractmethod
+    def tombstone(self, key: Hashable, min_version: Optional[int] = None) -> None:
+        """Substitui o item por uma lápide de curta duração. Enquanto ela existir, get retorna None e set_if_newer só armazena versões a partir de min_version. Um valor com versão maior ou igual a min_version é mantido.
+
+        Args:
+            key (Hashable): Chave do item no cache.
+            min_version (Optional[int], optional): Menor versão aceita pela chave. Padrão para None (nenhuma versão, ex: usuário removido).
+        """
+        pass
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Remove todos os itens do cache."""
+        pass
+
+    @abstractmethod
+    def stats(self) -> dict:
+        """Coleta os contadores do cache.
+
+        Returns:
+            dict: Contadores de acertos (hits), falhas (misses), remoções por capacidade (evictions), expirações (expirations) e tamanho atual (size).
+        """
+        pass
+
+
+class InMemoryLRUCache(ICacheBackend):
+    """Cache em memória do processo com capacidade limitada (LRU: o item menos recentemente utilizado é removido ao atingir max_size) e tempo de vida (TTL) por item. Seguro para uso entre threads.
+
+    Args:
+        max_size (int): Quantidade máxima de itens armazenados.
+        ttl_seconds (float): Tempo de vida de cada item, em segundos, a partir da escrita.
+        tombstone_ttl_seconds (float, optional): Tempo de vida das lápides, em segundos. Padrão para 5.
+        name (str, optional): Nome do cache no label 'cache' das métricas. Padrão para 'default'.
+        clock (Callable[[], float], optional): Fonte de tempo monotônica. Padrão para time.monotonic.
+    """
+
+    def __init__(self, max_size: int = 10000, ttl_seconds: float = 30.0, tombstone_ttl_seconds: float = 5.0, name: str = "default",
+                 clock: Callable[[], float] = time.monotonic) -> None:
+        self.name = name
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.tombstone_ttl_seconds = tombstone_ttl_seconds
+        self._clock = clock
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            item = self.__live_item(key)
+            if item is None or item[0] is TOMBSTONE:
+                self._misses += 1
+                CACHE_REQUESTS.inc(cache=self.name, result="miss")
+                return None
+
+            self._items.move_to_end(key)
+            self._hits += 1
+            CACHE_REQUESTS.inc(cache=self.name, result="hit")
+            return item[0]
+
+    def set(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self.__store(key, value, None, self.ttl_seconds)
+
+    def set_if_newer(self, key: Hashable, value: Any, version: int) -> bool:
+        with self._lock:
+            item = self.__live_item(key)
+            if item is not None:
+                stored_value, stored_version, _ = item
+                if stored_version is None:
+                    return False
+                if version < stored_version or (version == stored_version and stored_value is not TOMBSTONE):
+                    return False
+            self.__store(key, value, version, self.ttl_seconds)
+            return True
+
+    def delete(self, key: Hashable) -> None:
+        with self._lock:
+            self._items.pop(key, None)
+            CACHE_SIZE.set(len(self._items), cache=self.name)
+
+    def tombstone(self, key: Hashable, min_version: Optional[int] = None) -> None:
+        with self._lock:
+            item = self.__live_item(key)
+            if item is not None and item[0] is not TOMBSTONE and min_version is not None and item[1] is not None and item[1] >= min_version:
+                return
+            self.__store(key, TOMBSTONE, min_version, self.tombstone_ttl_seconds)
+
+    def __live_item(self, key: Hashable) -> Optional[tuple]:
+        item = self._items.get(key)
+        if item is not None and item[2] <= self._clock():
+            del self._items[key]
+            self._expirations += 1
+            CACHE_EVICTIONS.inc(cache=self.name, reason="expired")
+            CACHE_SIZE.set(len(self._items), cache=self.name)
+            return None
+        return item
+
+    def __store(self, key: Hashable, value: Any, version: Optional[int], ttl_seconds: float) -> None:
+        self._items[key] = (value, version, self._clock() + ttl_seconds)
+        self._items.move_to_end(key)
+        while len(self._items) > self.max_size:
+            self._items.popitem(last=False)
+            self._evictions += 1
+            CACHE_EVICTIONS.inc(cache=self.name, reason="capacity")
+        CACHE_SIZE.set(len(self._items), cache=self.name)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+            CACHE_SIZE.set(0, cache=self.name)
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {"hits": self._hits,
+                    "misses": self._misses,
+                    "evictions": self._evictions,
+                    "expirations": self._expirations,
+                    "size": len(self._items),
+                    "hit_ratio": self._hits / lookups if lookups else 0.0}
@@ -0,0 +1,227 @@
+import time
+import zlib
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers, MutableHeaders
+
+from infra.instrumentation import route_template
+from infra.metrics import metrics_registry
+
+try:
+    import brotli
+except ImportError:  # brotli é opcional (extra 'compression'): sem ele, 'br' não é negociado
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # zstandard é opcional (extra 'compression'): sem ele, 'zstd' não é negociado
+    zstandard = None
+
+
+HTTP_COMPRESSION_INPUT_BYTES = metrics_registry.counter(
+    "http_response_compression_input_bytes_total", "Bytes das respostas HTTP antes da compressão.", ("route", "encoding"))
+HTTP_COMPRESSION_OUTPUT_BYTES = metrics_registry.counter(
+    "http_response_compression_output_bytes_total", "Bytes das respostas HTTP enviados após a compressão.", ("route", "encoding"))
+HTTP_COMPRESSION_RATIO = metrics_registry.histogram(
+    "http_response_compression_ratio", "Razão entre o tamanho comprimido e o original de cada resposta HTTP (menor é melhor).", ("route", "encoding"),
+    buckets=(0.05, 0.1, 0.15, 0.2, 0.3, 0.4, 0.5, 0.75, 1.0))
+HTTP_COMPRESSION_CPU_SECONDS = metrics_registry.histogram(
+    "http_response_compression_cpu_seconds", "Tempo de CPU gasto na compressão de cada resposta HTTP, em segundos.", ("route", "encoding"),
+    buckets=(0.0001, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0))
+
+COMPRESSIBLE_CONTENT_TYPES = ("text/", "application/json", "application/x-ndjson", "application/javascript", "application/xml")
+# Server-Sent Events não são comprimidos: intermediários costumam acumular o corpo comprimido, atrasando eventos e keep-alives.
+EXCLUDED_CONTENT_TYPES = ("text/event-stream",)
+SKIPPED_STATUS_CODES = frozenset((204, 206, 304))
+
+
+class GzipStream:
+    """Compressão gzip (zlib) de um corpo, em um ou vários blocos."""
+
+    def __init__(self, level: int = 6) -> None:
+        self.compressor = zlib.compressobj(level, zlib.DEFLATED, zlib.MAX_WBITS | 16)
+
+    def compress(self, data: bytes, final: bool) -> bytes:
+        """Comprime o bloco e o libera para envio (flush); no último bloco, encerra o stream."""
+        return self.compressor.compress(data) + self.compressor.flush(zlib.Z_FINISH if final else zlib.Z_SYNC_FLUSH)
+
+
+class BrotliStream:
+    def __init__(self, level: int = 4) -> None:
+        self.compressor = brotli.Compressor(quality=level)
+
+    def compress(self, data: bytes, final: bool) -> bytes:
+        return self.compressor.process(data) + (self.compressor.finish() if final else self.compressor.flush())
+
+
+class ZstdStream:
+    def __init__(self, level: int = 3) -> None:
+        self.compressor = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, data: bytes, final: bool) -> bytes:
+        return self.compressor.compress(data) + self.compressor.flush(zstandard.COMPRESSOBJ_FLUSH_FINISH if final else zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+
+# Codificações disponíveis neste ambiente (Content-Encoding -> compressor).
+COMPRESSION_STREAMS = {"gzip": GzipStream}
+if brotli is not None:
+    COMPRESSION_STREAMS["br"] = BrotliStream
+if zstandard is not None:
+    COMPRESSION_STREAMS["zstd"] = ZstdStream
+
+
+def negotiate_encoding(accept_encoding: Optional[str], encodings: Sequence[str]) -> Optional[str]:
+    """Escolhe a codificação da resposta a partir do cabeçalho Accept-Encoding: a de maior qualidade (q) aceita pelo cliente e, em empate, a primeira em encodings (preferência do servidor). '*' vale para as codificações não listadas e q=0 as recusa.
+
+    Returns:
+        Optional[str]: Codificação escolhida ou None para enviar a resposta sem compressão.
+    """
+    if not accept_encoding:
+        return None
+    qualities = {}
+    for part in accept_encoding.split(","):
+        token, *params = (item.strip() for item in part.split(";"))
+        quality = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if token:
+            qualities[token.lower()] = quality
+
+    best, best_quality = None, 0.0
+    for encoding in encodings:
+        quality = qualities.get(encoding, qualities.get("*", 0.0))
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+def compress_chunk(stream, data: bytes, final: bool) -> Tuple[bytes, float]:
+    """Comprime o bloco, medindo o tempo de CPU da thread que o comprimiu."""
+    started = time.thread_time()
+    compressed = stream.compress(data, final)
+    return compressed, time.thread_time() - started
+
+
+class CompressedResponseSender:
+    """Intercepta as mensagens de uma resposta e as envia comprimidas quando o tipo de conteúdo e o tamanho permitem. Uma instância por requisição."""
+
+    def __init__(self, scope, send, encoding: str, minimum_size: int, offload_size: int, level: Optional[int]) -> None:
+        self.scope = scope
+        self.send = send
+        self.encoding = encoding
+        self.minimum_size = minimum_size
+        self.offload_size = offload_size
+        self.level = level
+        self.start_message = None
+        self.stream = None
+        self.passthrough = False
+        self.input_bytes = 0
+        self.output_bytes = 0
+        self.cpu_seconds = 0.0
+
+    def __should_compress(self, headers: Headers, body: bytes, more_body: bool) -> bool:
+        content_type = headers.get("content-type", "").lower()
+        return (self.start_message["status"] not in SKIPPED_STATUS_CODES
+                and "content-encoding" not in headers
+                and "content-range" not in headers
+                and "no-transform" not in headers.get("cache-control", "").lower()
+                and content_type.startswith(COMPRESSIBLE_CONTENT_TYPES)
+                and not content_type.startswith(EXCLUDED_CONTENT_TYPES)
+                and (more_body or len(body) >= self.minimum_size))
+
+    async def __compress(self, data: bytes, final: bool) -> bytes:
+        """Blocos a partir de offload_size bytes são comprimidos no threadpool, sem bloquear o event loop (o zlib, o brotli e o zstandard liberam o GIL durante a compressão)."""
+        if len(data) >= self.offload_size:
+            compressed, cpu_seconds = await run_in_threadpool(compress_chunk, self.stream, data, final)
+        else:
+            compressed, cpu_seconds = compress_chunk(self.stream, data, final)
+        self.input_bytes += len(data)
+        self.output_bytes += len(compressed)
+        self.cpu_seconds += cpu_seconds
+        if final:
+            labels = {"route": route_template(self.scope), "encoding": self.encoding}
+            HTTP_COMPRESSION_INPUT_BYTES.inc(self.input_bytes, **labels)
+            HTTP_COMPRESSION_OUTPUT_BYTES.inc(self.output_bytes, **labels)
+            HTTP_COMPRESSION_CPU_SECONDS.observe(self.cpu_seconds, **labels)
+            if self.input_bytes:
+                HTTP_COMPRESSION_RATIO.observe(self.output_bytes / self.input_bytes, **labels)
+        return compressed
+
+    async def __call__(self, message) -> None:
+        if message["type"] == "http.response.start":
+            self.start_message = message
+            return
+        if message["type"] != "http.response.body" or self.passthrough:
+            if self.start_message is not None:
+                await self.send(self.start_message)
+                self.start_message = None
+            await self.send(message)
+            return
+
+        body, more_body = message.get("body", b""), message.get("more_body", False)
+        if self.stream is None:
+            headers = MutableHeaders(raw=self.start_message["headers"])
+            if not self.__should_compress(headers, body, more_body):
+                self.passthrough = True
+                await self.send(self.start_message)
+                self.start_message = None
+                await self.send(message)
+                return
+
+            self.stream = COMPRESSION_STREAMS[self.encoding](**({"level": self.level} if self.level is not None else {}))
+            compressed = await self.__compress(body, final=not more_body)
+            headers["content-encoding"] = self.encoding
+            headers.add_vary_header("Accept-Encoding")
+            etag = headers.get("etag")
+            if etag is not None and not etag.startswith("W/"):
+                # A representação comprimida não é idêntica byte a byte: o ETag forte vira fraco (a comparação do If-None-Match é fraca).
+                headers["etag"] = f"W/{etag}"
+            if more_body:
+                del headers["content-length"]
+            else:
+                headers["content-length"] = str(len(compressed))
+            await self.send(self.start_message)
+            await self.send({"type": "http.response.body", "body": compressed, "more_body": more_body})
+            return
+
+        compressed = await self.__compress(body, final=not more_body)
+        await self.send({"type": "http.response.body", "body": compressed, "more_body": more_body})
+
+
+class CompressionMiddleware:
+    """Middleware ASGI de compressão negociada das respostas (Accept-Encoding): zstd e br quando os pacotes zstandard e brotli estão instalados, e gzip sempre. Respostas em streaming são comprimidas bloco a bloco.
+
+    Não são comprimidas respostas já codificadas, parciais (206), com Cache-Control: no-transform, requisições HEAD nem Server-Sent Events.
+
+    Args:
+        app: Aplicação ASGI.
+        minimum_size (int, optional): Tamanho mínimo, em bytes, das respostas comprimidas. Padrão para 1024.
+        encodings (Sequence[str], optional): Codificações oferecidas, em ordem de preferência do servidor. As indisponíveis no ambiente são ignoradas. Padrão para ("zstd", "br", "gzip").
+        offload_size (int, optional): Tamanho, em bytes, a partir do qual um bloco é comprimido no threadpool. Padrão para 65536.
+        levels (Dict[str, int], optional): Nível de compressão por codificação. Padrão para o nível padrão de cada compressor (gzip 6, br 4, zstd 3).
+    """
+
+    def __init__(self, app, minimum_size: int = 1024, encodings: Sequence[str] = ("zstd", "br", "gzip"),
+                 offload_size: int = 65536, levels: Optional[Dict[str, int]] = None) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+        self.encodings: List[str] = [encoding for encoding in encodings if encoding in COMPRESSION_STREAMS]
+        self.offload_size = offload_size
+        self.levels = levels or {}
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] == "HEAD":
+            await self.app(scope, receive, send)
+            return
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding"), self.encodings)
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        sender = CompressedResponseSender(scope, send, encoding, self.minimum_size, self.offload_size, self.levels.get(encoding))
+        await self.app(scope, receive, sender)
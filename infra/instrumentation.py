@@ -0,0 +1,209 @@
+import inspect
+import time
+from functools import wraps
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from infra.metrics import metrics_registry
+
+
+HTTP_REQUEST_DURATION = metrics_registry.histogram(
+    "http_request_duration_seconds", "Latência das requisições HTTP em segundos.", ("method", "route", "status"))
+HTTP_REQUESTS_IN_PROGRESS = metrics_registry.gauge(
+    "http_requests_in_progress", "Requisições HTTP em andamento.", ("method",), multiprocess_mode="sum")
+SERVICE_CALL_DURATION = metrics_registry.histogram(
+    "service_call_duration_seconds", "Latência das chamadas à camada de serviço em segundos.", ("service", "method"))
+REPOSITORY_CALL_DURATION = metrics_registry.histogram(
+    "repository_call_duration_seconds", "Latência das chamadas à camada de repositório em segundos.", ("repository", "method"))
+REPOSITORY_ROWS_RETURNED = metrics_registry.histogram(
+    "repository_rows_returned", "Quantidade de registros retornados por chamada ao repositório.", ("repository", "method"),
+    buckets=(0, 1, 5, 10, 50, 100, 500, 1000, 5000, 10000))
+DB_STATEMENT_DURATION = metrics_registry.histogram(
+    "db_statement_duration_seconds", "Latência de execução dos statements SQL em segundos.", ("operation",))
+DB_STATEMENT_ROWS_AFFECTED = metrics_registry.counter(
+    "db_statement_rows_affected_total", "Total de registros afetados por statements de escrita (rowcount do cursor).", ("operation",))
+DB_STATEMENT_ERRORS = metrics_registry.counter(
+    "db_statement_errors_total", "Total de statements SQL que falharam.", ("operation",))
+DB_STATEMENT_CACHE = metrics_registry.counter(
+    "db_statement_cache_total",
+    "Execuções de statements SQL por resultado da consulta ao cache de statements compilados do SQLAlchemy: 'hit', 'miss', 'caching_disabled', 'no_cache_key' (ex: textos SQL sem cache) ou 'no_dialect_support'.",
+    ("result",))
+DB_STATEMENT_CACHE_HIT_RATIO = metrics_registry.gauge(
+    "db_statement_cache_hit_ratio", "Fração das execuções de statements cacheáveis atendidas pelo cache de statements compilados (hit / (hit + miss)).")
+
+
+def rows_from_repository_result(result) -> Optional[int]:
+    """Extrai a quantidade de registros retornados a partir da Tupla (objeto, erro, mensagem) do repositório. Retorna None quando não aplicável (ex: geradores de streaming)."""
+    if not isinstance(result, tuple) or len(result) != 3:
+        return None
+    payload = result[0]
+    if payload is None:
+        return 0
+    if isinstance(payload, list):
+        return len(payload)
+    return 1
+
+
+def timed(histogram, labels: dict, on_result=None):
+    """Decorador que mede a duração da função (síncrona ou corrotina) e registra no histograma informado com os labels fixos. Opcionalmente, on_result recebe o retorno da função (ex: para contar registros retornados).
+
+    Geradores e iteradores retornados (ex: streaming) medem apenas a criação do iterador, não o consumo.
+    """
+    def decorator(func):
+        if inspect.iscoroutinefunction(func):
+            @wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                start = time.perf_counter()
+                try:
+                    result = await func(*args, **kwargs)
+                finally:
+                    histogram.observe(time.perf_counter() - start, **labels)
+                if on_result is not None:
+                    on_result(result)
+                return result
+            return async_wrapper
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                result = func(*args, **kwargs)
+            finally:
+                histogram.observe(time.perf_counter() - start, **labels)
+            if on_result is not None:
+                on_result(result)
+            return result
+        return wrapper
+    return decorator
+
+
+def public_methods(cls):
+    """Recupera os métodos públicos da classe, incluindo os herdados. Métodos herdados já instrumentados são devolvidos sem a instrumentação da classe base, para que sejam registrados com o nome da subclasse (e não duas vezes)."""
+    for name in dir(cls):
+        member = inspect.getattr_static(cls, name)
+        if name.startswith("_") or not inspect.isfunction(member):
+            continue
+        yield name, getattr(member, "__instrumented_function__", member)
+
+
+def instrumented(wrapper, function):
+    wrapper.__instrumented_function__ = function
+    return wrapper
+
+
+def instrument_service(cls):
+    """Decorador de classe que registra a latência de todos os métodos públicos do serviço em service_call_duration_seconds."""
+    for name, member in list(public_methods(cls)):
+        setattr(cls, name, instrumented(timed(SERVICE_CALL_DURATION, {"service": cls.__name__, "method": name})(member), member))
+    return cls
+
+
+def instrument_repository(cls):
+    """Decorador de classe que registra a latência e a quantidade de registros retornados de todos os métodos públicos do repositório."""
+    for name, member in list(public_methods(cls)):
+        labels = {"repository": cls.__name__, "method": name}
+
+        def record_rows(result, labels=labels):
+            rows = rows_from_repository_result(result)
+            if rows is not None:
+                REPOSITORY_ROWS_RETURNED.observe(rows, **labels)
+
+        setattr(cls, name, instrumented(timed(REPOSITORY_CALL_DURATION, labels, on_result=record_rows)(member), member))
+    return cls
+
+
+def statement_operation(statement: str) -> str:
+    """Recupera o tipo do statement SQL (SELECT, INSERT, UPDATE, DELETE, PRAGMA...) a partir da primeira palavra."""
+    parts = statement.lstrip().split(None, 1)
+    return parts[0].upper() if parts else "UNKNOWN"
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    start_times = conn.info.get("query_start_time")
+    if not start_times:
+        return
+    elapsed = time.perf_counter() - start_times.pop()
+    operation = statement_operation(statement)
+    DB_STATEMENT_DURATION.observe(elapsed, operation=operation)
+    if operation != "SELECT" and cursor.rowcount is not None and cursor.rowcount >= 0:
+        DB_STATEMENT_ROWS_AFFECTED.inc(cursor.rowcount, operation=operation)
+
+
+def statement_cache_hit_ratio() -> float:
+    hits = DB_STATEMENT_CACHE.value(result="hit")
+    lookups = hits + DB_STATEMENT_CACHE.value(result="miss")
+    return hits / lookups if lookups else 0.0
+
+
+DB_STATEMENT_CACHE_HIT_RATIO.set_function(statement_cache_hit_ratio)
+
+
+def _after_execute(conn, clauseelement, multiparams, params, execution_options, result):
+    """Registra o resultado da consulta ao cache de statements compilados uma vez por execução (os lotes de um executemany passam várias vezes pelo cursor). Textos SQL enviados diretamente ao driver (exec_driver_sql) não são compilados e não são contados."""
+    context = getattr(result, "context", None)
+    if context is not None and context.compiled is not None:
+        DB_STATEMENT_CACHE.inc(result=context.cache_hit.name.lower().removeprefix("cache_"))
+
+
+def _handle_error(exception_context):
+    connection = exception_context.connection
+    if connection is not None and connection.info.get("query_start_time"):
+        connection.info["query_start_time"].pop()
+    DB_STATEMENT_ERRORS.inc(operation=statement_operation(exception_context.statement or ""))
+
+
+def install_sqlalchemy_instrumentation(target=Engine) -> None:
+    """Registra os hooks de eventos do SQLAlchemy que medem a duração de cada statement e os acertos do cache de statements compilados. Chamadas repetidas não duplicam os hooks."""
+    for identifier, listener in (("before_cursor_execute", _before_cursor_execute),
+                                 ("after_cursor_execute", _after_cursor_execute),
+                                 ("after_execute", _after_execute),
+                                 ("handle_error", _handle_error)):
+        if not event.contains(target, identifier, listener):
+            event.listen(target, identifier, listener)
+
+
+def route_template(scope) -> str:
+    """Recupera o template da rota que atendeu a requisição. Rotas incluídas via include_router expõem o caminho completo (com prefixo) no contexto efetivo do FastAPI; caso contrário, utiliza o caminho da própria rota."""
+    route_context = scope.get("fastapi", {}).get("effective_route_context")
+    route_path = getattr(route_context, "path", None) or getattr(scope.get("route"), "path", None)
+    return route_path or "unmatched"
+
+
+class MetricsMiddleware:
+    """Middleware ASGI que mede a latência das requisições HTTP. O label route utiliza o template da rota (ex: /api/v1/users/{user_id}) para evitar uma série por ID; requisições sem rota correspondente são agrupadas em 'unmatched'.
+
+    Para respostas em streaming, a duração considera o envio completo do corpo.
+    """
+
+    def __init__(self, app, excluded_paths=("/metrics",)):
+        self.app = app
+        self.excluded_paths = set(excluded_paths)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] in self.excluded_paths:
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status_code = 500
+        start = time.perf_counter()
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        HTTP_REQUESTS_IN_PROGRESS.inc(method=method)
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            HTTP_REQUESTS_IN_PROGRESS.dec(method=method)
+            HTTP_REQUEST_DURATION.observe(time.perf_counter() - start, method=method,
+                                          route=route_template(scope), status=str(status_code))
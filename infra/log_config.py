@@ -1,22 +1,71 @@
+import atexit
+import json
 import logging
+import logging.handlers
+import os
+import queue
 import datetime
+import inspect
+import threading
 import pytz
 from functools import wraps
+from infra.settings import get_settings
+
+
+LOG_TIMEZONE = pytz.timezone("America/Sao_Paulo")
 
 
 class CustomFormatter(logging.Formatter):
+    """Formatter com horário no fuso de São Paulo. Como o datefmt tem resolução de segundos, o texto do horário é reaproveitado entre registros do mesmo segundo, evitando construir datetime e strftime a cada log."""
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self._cached_second = None
+        self._cached_time = None
+
     def formatTime(self, record, datefmt=None):
-        dt = datetime.datetime.fromtimestamp(record.created, tz=pytz.timezone("America/Sao_Paulo"))
+        if not datefmt:
+            return datetime.datetime.fromtimestamp(record.created, tz=LOG_TIMEZONE).isoformat()
 
-        if datefmt:
-            return dt.strftime(datefmt)
-        else:
-            return dt.isoformat()
+        second = int(record.created)
+        if second != self._cached_second:
+            self._cached_time = datetime.datetime.fromtimestamp(second, tz=LOG_TIMEZONE).strftime(datefmt)
+            self._cached_second = second
+        return self._cached_time
+
+
+class JsonFormatter(CustomFormatter):
+    """Formatter que gera uma linha JSON por registro (log estruturado), com horário, nível, nome do logger, mensagem e exceção (quando houver)."""
+
+    def format(self, record):
+        log_record = {"timestamp": self.formatTime(record, self.datefmt),
+                      "level": record.levelname,
+                      "logger": record.name,
+                      "message": record.getMessage()}
+        if record.exc_info:
+            log_record["exception"] = self.formatException(record.exc_info)
+        return json.dumps(log_record, ensure_ascii=False)
+
+
+class DeferredFormattingQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler que não formata a mensagem na thread da requisição: o registro é enfileirado como está e toda a formatação (mensagem, horário, exceção) acontece na thread do QueueListener. Os argumentos do log não devem ser alterados após a chamada."""
+
+    def prepare(self, record):
+        return record
+
+
+def build_formatter(log_format: str) -> logging.Formatter:
+    """Cria o formatter do formato de log configurado ('text' ou 'json')."""
+    formatter_class = JsonFormatter if log_format == "json" else CustomFormatter
+    return formatter_class(fmt="%(asctime)s : %(levelname)s : %(message)s",
+                           datefmt="%Y-%m-%d %H:%M:%S")
 
 
 class AppLogger(logging.Logger):
     """Classe personalizada de logger pra operações na camada de serviço dentro do contexto da API.
 
+    Com o log assíncrono habilitado (padrão), o logger apenas enfileira os registros por meio de um QueueHandler, e um QueueListener do LogService escreve no stderr em uma thread de background. Assim, as threads das requisições não bloqueiam na escrita do log.
+
     Args:
         name (str): O nome do logger.
         level (Union[int, str], optional): O nível de log. O padrão é logging.NOTSET.
@@ -25,17 +74,62 @@ class AppLogger(logging.Logger):
     def __init__(self, name: str, level: int | str = logging.NOTSET) -> None:
         super().__init__(name, level)
 
-        handler = logging.StreamHandler()
+        settings = get_settings()
+        if settings.log_async:
+            handler = DeferredFormattingQueueHandler(LogService.get_log_queue())
+        else:
+            handler = logging.StreamHandler()
+            handler.setFormatter(build_formatter(settings.log_format))
         handler.setLevel(level)
-        formatter = CustomFormatter(fmt="%(asctime)s : %(levelname)s : %(message)s",
-                                    datefmt="%Y-%m-%d %H:%M:%S")
-        
-        handler.setFormatter(formatter)
         self.addHandler(handler)
 
 
 class LogService:
     __loggers = {}
+    __log_queue = None
+    __listener = None
+    __lock = threading.Lock()
+
+    @classmethod
+    def get_log_queue(cls) -> queue.Queue:
+        """Recupera a fila compartilhada pelos loggers da aplicação, iniciando (uma única vez) o QueueListener que consome a fila e escreve os registros no stderr em uma thread de background. O listener é encerrado na saída do processo, escrevendo os registros pendentes.
+
+        Returns:
+            queue.Queue: Fila de registros de log.
+        """
+        with cls.__lock:
+            if cls.__log_queue is None:
+                cls.__log_queue = queue.SimpleQueue()
+                stream_handler = logging.StreamHandler()
+                stream_handler.setFormatter(build_formatter(get_settings().log_format))
+                cls.__listener = logging.handlers.QueueListener(cls.__log_queue, stream_handler, respect_handler_level=True)
+                cls.__listener.start()
+                atexit.register(cls.stop_listener)
+            return cls.__log_queue
+
+    @classmethod
+    def restart_listener_after_fork(cls) -> None:
+        """Recria, no processo filho de um fork, o lock e a fila dos loggers, consumida por um novo QueueListener."""
+        cls.__lock = threading.Lock()
+        if cls.__listener is None:
+            return
+        handlers = cls.__listener.handlers
+        cls.__log_queue = queue.SimpleQueue()
+        for logger in cls.__loggers.values():
+            for handler in logger.handlers:
+                if isinstance(handler, logging.handlers.QueueHandler):
+                    handler.queue = cls.__log_queue
+        cls.__listener = logging.handlers.QueueListener(cls.__log_queue, *handlers, respect_handler_level=True)
+        cls.__listener.start()
+
+    @classmethod
+    def stop_listener(cls) -> None:
+        """Encerra o QueueListener após escrever os registros pendentes na fila."""
+        with cls.__lock:
+            if cls.__listener is not None:
+                cls.__listener.stop()
+                cls.__listener = None
+                cls.__log_queue = None
 
     def get_logger(self, name: str):
         """Recupera ou cria um logger para a aplicação com um nome especifico
@@ -49,24 +143,40 @@ class LogService:
 
         if name not in self.__loggers:
             logger = AppLogger(name)
-            logger.setLevel(logging.INFO)
+            logger.setLevel(get_settings().log_level)
             self.__loggers[name] = logger
         return self.__loggers[name]
 
 
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=LogService.restart_listener_after_fork)
+
+
 def handle_exceptions(logger):
-    """Decorador para logar exceções e capturar erros inesperados que afetam execução conclusão da operação na camada de serviço."""
+    """Decorador para logar exceções e capturar erros inesperados que afetam execução conclusão da operação na camada de serviço. Suporta tanto métodos síncronos quanto corrotinas (async def)."""
+    def log_unexpected_error(func, error):
+        exception_type = error.__class__.__name__
+        logger.critical("Erro Inesperado em %s: %s",
+                        func.__name__,
+                        exception_type,
+                        exc_info=error)
+        return ("UnexpectedError", f"{exception_type}: {error}")
+
     def decorator(func):
+        if inspect.iscoroutinefunction(func):
+            @wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                try:
+                    return await func(*args, **kwargs)
+                except Exception as error:
+                    return log_unexpected_error(func, error)
+            return async_wrapper
+
         @wraps(func)
         def wrapper(*args, **kwargs):
             try:
                 return func(*args, **kwargs)
             except Exception as error:
-                exception_type = error.__class__.__name__
-                logger.critical("Erro Inesperado em %s: %s",
-                                func.__name__,
-                                exception_type,
-                                exc_info=error)
-                return ("UnexpectedError", f"{exception_type}: {error}")
+                return log_unexpected_error(func, error)
         return wrapper
-    return decorator
\ No newline at end of file
+    return decorator
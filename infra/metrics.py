@@ -0,0 +1,324 @@
+import bisect
+import glob
+import json
+import os
+import threading
+from abc import ABC, abstractmethod
+from typing import Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+
+DEFAULT_LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def escape_label_value(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{escape_label_value(value)}"' for name, value in labels.items()) + "}"
+
+
+def format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class Metric(ABC):
+    """Classe base das métricas expostas no formato texto do Prometheus. Cada combinação de valores de labels gera uma série independente.
+
+    Args:
+        name (str): Nome da métrica.
+        documentation (str): Descrição exibida na linha HELP.
+        labelnames (Iterable[str], optional): Nomes dos labels da métrica. Padrão para nenhum label.
+    """
+    metric_type = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _label_values(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"Metric {self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def _labels_dict(self, label_values: Tuple[str, ...]) -> Dict[str, str]:
+        return dict(zip(self.labelnames, label_values))
+
+    @abstractmethod
+    def samples(self) -> list:
+        """Amostras atuais da métrica como (labels, valor), serializáveis em JSON para a agregação entre processos (MultiProcessMetrics)."""
+        pass
+
+    def format_samples(self, samples: list) -> List[str]:
+        return [f"{self.name}{format_labels(labels)} {format_value(value)}" for labels, value in samples]
+
+    def collect(self) -> List[str]:
+        """Gera as linhas de amostras da métrica no formato texto do Prometheus (sem HELP/TYPE)."""
+        return self.format_samples(self.samples())
+
+    def render(self, samples: Optional[list] = None) -> str:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.metric_type}"]
+        lines.extend(self.collect() if samples is None else self.format_samples(samples))
+        return "\n".join(lines)
+
+
+class Counter(Metric):
+    """Métrica cumulativa que apenas aumenta (ex: quantidade de requisições)."""
+    metric_type = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()) -> None:
+        super().__init__(name, documentation, labelnames)
+        self._values = {}
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        key = self._label_values(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels) -> float:
+        with self._lock:
+            return self._values.get(self._label_values(labels), 0.0)
+
+    def samples(self) -> list:
+        with self._lock:
+            return [(self._labels_dict(key), value) for key, value in self._values.items()]
+
+
+class Gauge(Metric):
+    """Métrica com valor que pode subir e descer (ex: tamanho de fila). O valor pode ser definido diretamente (set) ou calculado no momento da coleta por uma função (set_function), que retorna um valor ou uma lista de (labels, valor).
+
+    Args:
+        multiprocess_mode (str, optional): Combinação dos valores dos workers na agregação entre processos: 'sum', 'max', 'min' ou 'all' (uma série por worker, com o label pid). Apenas workers em execução são considerados. Padrão para 'all'.
+    """
+    metric_type = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = (), multiprocess_mode: str = "all") -> None:
+        super().__init__(name, documentation, labelnames)
+        self.multiprocess_mode = multiprocess_mode
+        self._values = {}
+        self._function = None
+
+    def set(self, value: float, **labels) -> None:
+        key = self._label_values(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        key = self._label_values(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels) -> None:
+        self.inc(-amount, **labels)
+
+    def value(self, **labels) -> float:
+        with self._lock:
+            return self._values.get(self._label_values(labels), 0.0)
+
+    def set_function(self, function: Callable[[], Union[float, List[Tuple[Dict[str, str], float]]]]) -> None:
+        self._function = function
+
+    def samples(self) -> list:
+        if self._function is not None:
+            result = self._function()
+            return [({}, result)] if isinstance(result, (int, float)) else list(result)
+        with self._lock:
+            return [(self._labels_dict(key), value) for key, value in self._values.items()]
+
+
+class Histogram(Metric):
+    """Métrica que distribui as observações (ex: latências em segundos) em buckets cumulativos, permitindo calcular percentis (p50/p95/p99) no Prometheus com histogram_quantile."""
+    metric_type = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = (), buckets: Iterable[float] = DEFAULT_LATENCY_BUCKETS) -> None:
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._series = {}
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._label_values(labels)
+        bucket_index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = {"buckets": [0] * (len(self.buckets) + 1), "sum": 0.0, "count": 0}
+            series["buckets"][bucket_index] += 1
+            series["sum"] += value
+            series["count"] += 1
+
+    def snapshot(self, **labels) -> Optional[dict]:
+        """Recupera a contagem, soma e contagem por bucket (não cumulativa) da série com os labels informados."""
+        with self._lock:
+            series = self._series.get(self._label_values(labels))
+            return None if series is None else {"buckets": list(series["buckets"]), "sum": series["sum"], "count": series["count"]}
+
+    def samples(self) -> list:
+        """Amostras como (labels, {buckets (não cumulativos), sum, count})."""
+        with self._lock:
+            return [(self._labels_dict(key), {"buckets": list(series["buckets"]), "sum": series["sum"], "count": series["count"]})
+                    for key, series in self._series.items()]
+
+    def format_samples(self, samples: list) -> List[str]:
+        lines = []
+        for labels, series in samples:
+            cumulative = 0
+            for upper_bound, bucket_count in zip(self.buckets + (float("inf"),), series["buckets"]):
+                cumulative += bucket_count
+                lines.append(f"{self.name}_bucket{format_labels({**labels, 'le': format_value(upper_bound)})} {cumulative}")
+            lines.append(f"{self.name}_sum{format_labels(labels)} {format_value(series['sum'])}")
+            lines.append(f"{self.name}_count{format_labels(labels)} {series['count']}")
+        return lines
+
+
+class MetricsRegistry:
+    """Registro das métricas da aplicação, responsável por gerar a exposição completa no formato texto do Prometheus (versão 0.0.4), sem depender de serviços externos."""
+
+    def __init__(self) -> None:
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric: Metric) -> Metric:
+        """Registra a métrica. Caso já exista uma métrica com o mesmo nome, a existente é retornada (permitindo reimportar módulos sem duplicar métricas)."""
+        with self._lock:
+            return self._metrics.setdefault(metric.name, metric)
+
+    def counter(self, name: str, documentation: str, labelnames: Iterable[str] = ()) -> Counter:
+        return self.register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Iterable[str] = (), multiprocess_mode: str = "all") -> Gauge:
+        return self.register(Gauge(name, documentation, labelnames, multiprocess_mode))
+
+    def histogram(self, name: str, documentation: str, labelnames: Iterable[str] = (), buckets: Iterable[float] = DEFAULT_LATENCY_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def get(self, name: str) -> Optional[Metric]:
+        return self._metrics.get(name)
+
+    def metrics(self) -> List[Metric]:
+        with self._lock:
+            return list(self._metrics.values())
+
+    def render(self) -> str:
+        return "\n".join(metric.render() for metric in self.metrics()) + "\n"
+
+
+def is_process_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def merge_samples(metric: Metric, snapshots: List[Tuple[int, bool, list]]) -> list:
+    """Combina as amostras da métrica gravadas por cada worker (pid, em execução, amostras): contadores e histogramas somam todos os workers; gauges seguem o multiprocess_mode."""
+    merged = {}
+    for pid, alive, samples in snapshots:
+        if isinstance(metric, Gauge):
+            if not alive:
+                continue
+            for labels, value in samples:
+                if metric.multiprocess_mode == "all":
+                    labels = {**labels, "pid": str(pid)}
+                key = tuple(labels.items())
+                if key not in merged:
+                    merged[key] = (labels, value)
+                elif metric.multiprocess_mode == "max":
+                    merged[key] = (labels, max(merged[key][1], value))
+                elif metric.multiprocess_mode == "min":
+                    merged[key] = (labels, min(merged[key][1], value))
+                else:
+                    merged[key] = (labels, merged[key][1] + value)
+        elif isinstance(metric, Histogram):
+            for labels, series in samples:
+                key = tuple(labels.items())
+                if key not in merged:
+                    merged[key] = (labels, {"buckets": list(series["buckets"]), "sum": series["sum"], "count": series["count"]})
+                    continue
+                total = merged[key][1]
+                total["buckets"] = [current + added for current, added in zip(total["buckets"], series["buckets"])]
+                total["sum"] += series["sum"]
+                total["count"] += series["count"]
+        else:
+            for labels, value in samples:
+                key = tuple(labels.items())
+                merged[key] = (labels, merged[key][1] + value if key in merged else value)
+    return list(merged.values())
+
+
+class MultiProcessMetrics:
+    """Agregação das métricas entre os workers do servidor. Cada worker grava periodicamente as amostras do seu registro em {pid}.json no diretório compartilhado, e a coleta (GET /metrics) combina os arquivos de todos.
+
+    Args:
+        registry (MetricsRegistry): Registro das métricas do processo.
+        directory (str): Diretório compartilhado pelos workers, limpo pelo processo principal antes de iniciá-los (prepare_directory).
+        flush_interval (float, optional): Intervalo, em segundos, entre as gravações das amostras do processo. Padrão para 1.
+    """
+
+    def __init__(self, registry: MetricsRegistry, directory: str, flush_interval: float = 1.0) -> None:
+        self.registry = registry
+        self.directory = directory
+        self.flush_interval = flush_interval
+        self._stopped = threading.Event()
+        self._thread = None
+        self._write_lock = threading.Lock()
+
+    @staticmethod
+    def prepare_directory(directory: str) -> None:
+        """Cria o diretório e remove as amostras de execuções anteriores do servidor."""
+        os.makedirs(directory, exist_ok=True)
+        for path in glob.glob(os.path.join(directory, "*.json")):
+            os.remove(path)
+
+    def start(self) -> None:
+        """Grava as amostras do processo e inicia a thread de gravação periódica. Deve ser chamado em cada worker (após o fork)."""
+        self.write()
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self.__run, name="metrics-flush", daemon=True)
+        self._thread.start()
+
+    def close(self) -> None:
+        """Interrompe a gravação periódica e grava as amostras finais do processo, preservadas nos totais após o encerramento do worker."""
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.write()
+
+    def write(self) -> None:
+        snapshot = {metric.name: metric.samples() for metric in self.registry.metrics()}
+        path = os.path.join(self.directory, f"{os.getpid()}.json")
+        with self._write_lock:
+            with open(path + ".tmp", "w", encoding="utf-8") as file:
+                json.dump(snapshot, file)
+            os.replace(path + ".tmp", path)
+
+    def render(self) -> str:
+        self.write()
+        snapshots = []
+        for path in glob.glob(os.path.join(self.directory, "*.json")):
+            pid = int(os.path.basename(path).split(".")[0])
+            try:
+                with open(path, encoding="utf-8") as file:
+                    samples = json.load(file)
+            except (OSError, ValueError):
+                continue
+            snapshots.append((pid, pid == os.getpid() or is_process_alive(pid), samples))
+        return "\n".join(metric.render(merge_samples(metric, [(pid, alive, samples.get(metric.name, []))
+                                                              for pid, alive, samples in snapshots]))
+                         for metric in self.registry.metrics()) + "\n"
+
+    def __run(self) -> None:
+        while not self._stopped.wait(self.flush_interval):
+            self.write()
+
+
+metrics_registry = MetricsRegistry()
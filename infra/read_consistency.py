@@ -0,0 +1,74 @@
+import math
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from http.cookies import CookieError, SimpleCookie
+from typing import Optional
+
+# Definido pelo ReadYourWritesMiddleware: indica que as leituras da requisição atual devem ir ao banco de dados principal, e não às réplicas.
+_primary_reads = ContextVar("primary_reads", default=False)
+
+PRIMARY_READS_COOKIE = "primary_reads_until"
+PRIMARY_READS_HEADER = "x-primary-reads-until"
+MUTATION_METHODS = frozenset(("POST", "PUT", "PATCH", "DELETE"))
+
+
+def primary_reads_requested() -> bool:
+    """Indica se as leituras do contexto atual (requisição) devem ser feitas no banco de dados principal."""
+    return _primary_reads.get()
+
+
+@contextmanager
+def primary_reads(enabled: bool = True):
+    """Gerenciador de contexto que define se as leituras feitas dentro dele vão ao banco de dados principal, restaurando o valor anterior na saída."""
+    token = _primary_reads.set(enabled)
+    try:
+        yield
+    finally:
+        _primary_reads.reset(token)
+
+
+def parse_primary_reads_until(headers) -> Optional[float]:
+    """Recupera, do cookie ou do cabeçalho X-Primary-Reads-Until da requisição, o instante (epoch, em segundos) até o qual as leituras do cliente devem ir ao principal."""
+    for name, value in headers:
+        try:
+            if name == PRIMARY_READS_HEADER.encode():
+                return float(value.decode("latin-1"))
+            if name == b"cookie":
+                cookie = SimpleCookie(value.decode("latin-1"))
+                if PRIMARY_READS_COOKIE in cookie:
+                    return float(cookie[PRIMARY_READS_COOKIE].value)
+        except (CookieError, ValueError):
+            continue
+    return None
+
+
+class ReadYourWritesMiddleware:
+    """Middleware ASGI que garante read-your-writes quando as leituras são servidas por réplicas: após uma alteração bem-sucedida, o cookie primary_reads_until e o cabeçalho X-Primary-Reads-Until informam até quando as leituras do cliente devem ir ao banco de dados principal.
+
+    O estado fica com o cliente, então a garantia vale entre workers e processos diferentes sem nenhum estado compartilhado no servidor.
+    """
+
+    def __init__(self, app, window_seconds: float = 5.0):
+        self.app = app
+        self.window_seconds = window_seconds
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or self.window_seconds <= 0:
+            await self.app(scope, receive, send)
+            return
+
+        primary_reads_until = parse_primary_reads_until(scope["headers"])
+        mutation = scope["method"] in MUTATION_METHODS
+
+        async def send_wrapper(message):
+            if mutation and message["type"] == "http.response.start" and message["status"] < 400:
+                until = f"{time.time() + self.window_seconds:.3f}"
+                cookie = f"{PRIMARY_READS_COOKIE}={until}; Max-Age={math.ceil(self.window_seconds)}; Path=/; HttpOnly; SameSite=Lax"
+                message = {**message, "headers": [*message.get("headers", []),
+                                                  (b"set-cookie", cookie.encode("latin-1")),
+                                                  (PRIMARY_READS_HEADER.encode(), until.encode("latin-1"))]}
+            await send(message)
+
+        with primary_reads(primary_reads_until is not None and primary_reads_until > time.time()):
+            await self.app(scope, receive, send_wrapper)
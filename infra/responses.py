@@ -0,0 +1,23 @@
+import json
+from typing import Any
+
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # orjson é opcional: sem ele, a serialização utiliza o json da biblioteca padrão
+    orjson = None
+
+
+def dumps_json(content: Any) -> bytes:
+    """Serializa o conteúdo em JSON (bytes), utilizando o orjson quando disponível."""
+    if orjson is not None:
+        return orjson.dumps(content)
+    return json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """Resposta JSON serializada com orjson (quando instalado), utilizada para conteúdos já no formato final (dicionários e listas simples), sem passar pela validação do response_model nem pelo jsonable_encoder do FastAPI."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps_json(content)
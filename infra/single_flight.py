@@ -0,0 +1,120 @@
+import asyncio
+import threading
+from concurrent.futures import Future
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple
+
+from infra.metrics import metrics_registry
+
+
+SINGLE_FLIGHT_CALLS = metrics_registry.counter(
+    "service_single_flight_calls_total",
+    "Chamadas de leitura da camada de serviço por papel no single-flight: 'leader' executa a consulta e 'follower' aguarda e compartilha o resultado de uma consulta idêntica em andamento.",
+    ("service", "method", "role"))
+SINGLE_FLIGHT_COALESCING_RATIO = metrics_registry.gauge(
+    "service_single_flight_coalescing_ratio",
+    "Fração das chamadas de leitura atendidas por uma consulta idêntica já em andamento (followers / total de chamadas).",
+    ("service", "method"))
+
+
+def observe_call(service: str, method: str, role: str) -> None:
+    SINGLE_FLIGHT_CALLS.inc(service=service, method=method, role=role)
+    leaders = SINGLE_FLIGHT_CALLS.value(service=service, method=method, role="leader")
+    followers = SINGLE_FLIGHT_CALLS.value(service=service, method=method, role="follower")
+    SINGLE_FLIGHT_COALESCING_RATIO.set(followers / (leaders + followers), service=service, method=method)
+
+
+class SingleFlight:
+    """Agrupa chamadas idênticas e concorrentes (mesmo método e argumentos): a primeira executa a função e as demais recebem o mesmo resultado, ou a mesma exceção. Não é um cache. Seguro para uso entre threads.
+
+    Args:
+        service (str): Nome do serviço, utilizado nos labels das métricas.
+    """
+
+    def __init__(self, service: str) -> None:
+        self.service = service
+        self.__lock = threading.Lock()
+        self.__calls: Dict[Tuple[str, Hashable], Future] = {}
+
+    def do(self, method: str, key: Hashable, func: Callable[[], Any]) -> Any:
+        """Executa func, ou aguarda a execução idêntica em andamento.
+
+        Args:
+            method (str): Nome do método, parte da chave e label das métricas.
+            key (Hashable): Argumentos que identificam a chamada.
+            func (Callable[[], Any]): Função executada pelo leader.
+
+        Returns:
+            Any: Retorno de func, compartilhado entre o leader e os followers.
+        """
+        call_key = (method, key)
+        with self.__lock:
+            call = self.__calls.get(call_key)
+            leader = call is None
+            if leader:
+                call = self.__calls[call_key] = Future()
+        if not leader:
+            observe_call(self.service, method, "follower")
+            return call.result()
+
+        observe_call(self.service, method, "leader")
+        try:
+            result = func()
+        except BaseException as exception:
+            self.__release(call_key, call)
+            call.set_exception(exception)
+            raise
+        self.__release(call_key, call)
+        call.set_result(result)
+        return result
+
+    def __release(self, call_key: Tuple[str, Hashable], call: Future) -> None:
+        with self.__lock:
+            if self.__calls.get(call_key) is call:
+                del self.__calls[call_key]
+
+    def forget(self) -> None:
+        """Deixa de compartilhar as chamadas em andamento: chamadas seguintes executam uma nova consulta. Utilizado após escritas, para que leituras iniciadas depois delas não recebam o resultado de uma consulta anterior."""
+        with self.__lock:
+            self.__calls.clear()
+
+
+class AsyncSingleFlight:
+    """Versão assíncrona do SingleFlight: o leader executa a corrotina em uma task do event loop e todos (leader e followers) aguardam a task com asyncio.shield, de modo que o cancelamento de um chamador (ex: cliente desconectado) não interrompe a consulta dos demais.
+
+    Args:
+        service (str): Nome do serviço, utilizado nos labels das métricas.
+    """
+
+    def __init__(self, service: str) -> None:
+        self.service = service
+        self.__calls: Dict[Tuple[str, Hashable], asyncio.Task] = {}
+        self.__loop = None
+
+    async def do(self, method: str, key: Hashable, func: Callable[[], Awaitable[Any]]) -> Any:
+        """Executa a corrotina retornada por func, ou aguarda a execução idêntica em andamento. Ver SingleFlight.do."""
+        loop = asyncio.get_running_loop()
+        if self.__loop is not loop:
+            # As tasks pertencem ao event loop em execução; um novo event loop (ex: após o fork de um worker) recomeça sem chamadas em andamento.
+            self.__loop = loop
+            self.__calls = {}
+
+        call_key = (method, key)
+        task = self.__calls.get(call_key)
+        if task is not None:
+            observe_call(self.service, method, "follower")
+            return await asyncio.shield(task)
+
+        observe_call(self.service, method, "leader")
+        task = self.__calls[call_key] = loop.create_task(func())
+        task.add_done_callback(lambda done: self.__release(call_key, done))
+        return await asyncio.shield(task)
+
+    def __release(self, call_key: Tuple[str, Hashable], task: asyncio.Task) -> None:
+        if self.__calls.get(call_key) is task:
+            del self.__calls[call_key]
+        if not task.cancelled():
+            task.exception()  # Marca a exceção como recuperada caso todos os chamadores tenham sido cancelados.
+
+    def forget(self) -> None:
+        """Deixa de compartilhar as chamadas em andamento. Ver SingleFlight.forget."""
+        self.__calls = {}
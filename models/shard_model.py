@@ -0,0 +1,18 @@
+from sqlalchemy import Column, Integer, String
+from db.shard_catalog_client import ShardCatalogBase
+
+
+class UserIdAllocatorModel(ShardCatalogBase):
+    """Alocador global de ids de usuários (linha única, id = 1): próximo id ainda não reservado. Cada processo reserva blocos de ids incrementando next_id, então os ids são únicos entre todos os shards e workers."""
+    __tablename__ = "user_id_allocator"
+
+    id = Column(Integer, primary_key=True)
+    next_id = Column(Integer, nullable=False)
+
+
+class UserShardSlotModel(ShardCatalogBase):
+    """Mapa de slots dos shards: o usuário de id N pertence ao slot N % (quantidade de slots), armazenado no arquivo shard_file. Mover um slot entre arquivos (db/rebalance_shards.py) redistribui os usuários sem alterar os ids."""
+    __tablename__ = "user_shard_slot"
+
+    slot = Column(Integer, primary_key=True, autoincrement=False)
+    shard_file = Column(String, nullable=False)
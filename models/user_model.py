@@ -1,7 +1,16 @@
 import sqlalchemy 
-from sqlalchemy import Column, Integer, String
+from datetime import datetime, timezone
+from sqlalchemy import Column, DateTime, Integer, String, event, func, text
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.functions import FunctionElement
 from db.sqllite_client import SqLiteBase
 
+
+def utc_now() -> datetime:
+    """Data/hora atual em UTC, sem fuso (formato armazenado no SQLite)."""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
 class UserModel(SqLiteBase):
     __tablename__ = "user"
     __table_args__ = (
@@ -11,4 +20,256 @@ class UserModel(SqLiteBase):
     id = Column(Integer, primary_key=True, autoincrement=True)
     first_name = Column(String, nullable=False)
     last_name = Column(String, nullable=True)
-    email = Column(String, nullable=False)
\ No newline at end of file
+    email = Column(String, nullable=False)
+    version = Column(Integer, nullable=False, default=1, server_default=text("1"))
+    updated_at = Column(DateTime, nullable=True, default=utc_now, server_default=func.current_timestamp())
+
+
+# Campos públicos do usuário (UserGeneralResponse), na ordem das respostas. São também os campos aceitos nas projeções (fields=) das leituras.
+USER_ROW_FIELDS = ("id", "first_name", "last_name", "email")
+
+
+class UserCollectionVersionModel(SqLiteBase):
+    """Versão da coleção de usuários (linha única, id = 1), incrementada por triggers a cada inserção, atualização ou deleção na tabela user. Permite responder a listagem com 304 (Not Modified) sem consultar os usuários."""
+    __tablename__ = "user_collection_version"
+
+    id = Column(Integer, primary_key=True)
+    version = Column(Integer, nullable=False)
+    updated_at = Column(DateTime, nullable=False)
+
+
+class UserChangeModel(SqLiteBase):
+    """Log de alterações (append-only) da tabela user, preenchido por triggers na mesma transação da escrita. Cada entrada guarda o estado do usuário após a alteração (vazio em deleções).
+
+    O AUTOINCREMENT garante que sequências removidas pela compactação nunca sejam reutilizadas.
+    """
+    __tablename__ = "user_change"
+    __table_args__ = {"sqlite_autoincrement": True}
+
+    sequence = Column(Integer, primary_key=True, autoincrement=True)
+    user_id = Column(Integer, nullable=False)
+    operation = Column(String, nullable=False)
+    version = Column(Integer, nullable=True)
+    first_name = Column(String, nullable=True)
+    last_name = Column(String, nullable=True)
+    email = Column(String, nullable=True)
+    changed_at = Column(DateTime, nullable=False)
+
+
+class UserChangeCompactionModel(SqLiteBase):
+    """Marca d'água da compactação do log de alterações (linha única, id = 1): maior sequência já removida. Consumidores com cursor anterior a ela perderam alterações e precisam ressincronizar."""
+    __tablename__ = "user_change_compaction"
+
+    id = Column(Integer, primary_key=True)
+    compacted_until = Column(Integer, nullable=False)
+    compacted_at = Column(DateTime, nullable=False)
+
+
+class UnicodeLower(FunctionElement):
+    """lower() com as regras de caixa do Unicode, igual ao str.lower() do Python.
+
+    No SQLite é compilado para a função unicode_lower, registrada em cada conexão (register_functions_on_connect), pois o lower() nativo converte apenas letras ASCII. No PostgreSQL, o lower() nativo já converte letras acentuadas.
+    """
+    type = String()
+    inherit_cache = True
+
+
+@compiles(UnicodeLower)
+def compile_unicode_lower(element, compiler, **kw):
+    return f"lower({compiler.process(element.clauses, **kw)})"
+
+
+@compiles(UnicodeLower, "sqlite")
+def compile_unicode_lower_sqlite(element, compiler, **kw):
+    return f"unicode_lower({compiler.process(element.clauses, **kw)})"
+
+
+# No SQLite o rowid (id) faz parte de todo índice, então ix_user_email também cobre consultas que projetam apenas (id, email).
+sqlalchemy.Index("ix_user_email", UserModel.email)
+FIRST_NAME_LOWER_INDEX = sqlalchemy.Index("ix_user_first_name_lower", UnicodeLower(UserModel.first_name))
+
+
+USER_FTS_DDL = [
+    """CREATE VIRTUAL TABLE IF NOT EXISTS user_fts USING fts5(first_name, last_name, content='user', content_rowid='id')""",
+    """CREATE TRIGGER IF NOT EXISTS user_fts_after_insert AFTER INSERT ON "user" BEGIN
+        INSERT INTO user_fts(rowid, first_name, last_name) VALUES (new.id, new.first_name, new.last_name);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS user_fts_after_delete AFTER DELETE ON "user" BEGIN
+        INSERT INTO user_fts(user_fts, rowid, first_name, last_name) VALUES ('delete', old.id, old.first_name, old.last_name);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS user_fts_after_update AFTER UPDATE OF first_name, last_name ON "user" BEGIN
+        INSERT INTO user_fts(user_fts, rowid, first_name, last_name) VALUES ('delete', old.id, old.first_name, old.last_name);
+        INSERT INTO user_fts(rowid, first_name, last_name) VALUES (new.id, new.first_name, new.last_name);
+    END""",
+]
+
+
+USER_VERSION_TRIGGERS = ("user_version_after_insert", "user_version_after_update", "user_version_after_delete")
+
+USER_VERSION_DDL = [
+    """INSERT OR IGNORE INTO user_collection_version (id, version, updated_at) VALUES (1, 1, CURRENT_TIMESTAMP)""",
+] + [
+    f"""CREATE TRIGGER IF NOT EXISTS {trigger} AFTER {operation} ON "user" BEGIN
+        UPDATE user_collection_version SET version = version + 1, updated_at = CURRENT_TIMESTAMP WHERE id = 1;
+    END"""
+    for trigger, operation in zip(USER_VERSION_TRIGGERS, ("INSERT", "UPDATE", "DELETE"))
+]
+
+
+USER_CHANGE_TRIGGERS = ("user_change_after_insert", "user_change_after_update", "user_change_after_delete")
+
+USER_CHANGE_DDL = [
+    """CREATE TRIGGER IF NOT EXISTS user_change_after_insert AFTER INSERT ON "user" BEGIN
+        INSERT INTO user_change (user_id, operation, version, first_name, last_name, email, changed_at)
+        VALUES (new.id, 'create', new.version, new.first_name, new.last_name, new.email, strftime('%Y-%m-%d %H:%M:%f', 'now'));
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS user_change_after_update AFTER UPDATE ON "user" BEGIN
+        INSERT INTO user_change (user_id, operation, version, first_name, last_name, email, changed_at)
+        VALUES (new.id, 'update', new.version, new.first_name, new.last_name, new.email, strftime('%Y-%m-%d %H:%M:%f', 'now'));
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS user_change_after_delete AFTER DELETE ON "user" BEGIN
+        INSERT INTO user_change (user_id, operation, version, changed_at)
+        VALUES (old.id, 'delete', old.version, strftime('%Y-%m-%d %H:%M:%f', 'now'));
+    END""",
+]
+
+
+# PostgreSQL: a versão da coleção e o log de alterações são mantidos por triggers por statement (com tabelas de transição), que gravam em uma
+# única instrução todas as linhas afetadas, inclusive de cargas com COPY. O UPDATE da versão da coleção acontece antes da gravação no log e
+# mantém a linha bloqueada até o commit: com escritas concorrentes, as sequências do log são atribuídas na ordem dos commits, e um consumidor
+# nunca avança o cursor além de uma alteração ainda não confirmada.
+POSTGRES_USER_CHANGE_TRIGGERS = ("user_change_after_insert", "user_change_after_update", "user_change_after_delete")
+
+POSTGRES_USER_CHANGE_DDL = [
+    """INSERT INTO user_collection_version (id, version, updated_at) VALUES (1, 1, now() AT TIME ZONE 'utc') ON CONFLICT (id) DO NOTHING""",
+    """CREATE OR REPLACE FUNCTION user_change_capture() RETURNS trigger LANGUAGE plpgsql AS $$
+    BEGIN
+        UPDATE user_collection_version SET version = version + 1, updated_at = now() AT TIME ZONE 'utc' WHERE id = 1;
+        IF TG_OP = 'DELETE' THEN
+            INSERT INTO user_change (user_id, operation, version, changed_at)
+            SELECT id, 'delete', version, now() AT TIME ZONE 'utc' FROM old_rows ORDER BY id;
+        ELSE
+            INSERT INTO user_change (user_id, operation, version, first_name, last_name, email, changed_at)
+            SELECT id, CASE TG_OP WHEN 'INSERT' THEN 'create' ELSE 'update' END, version, first_name, last_name, email, now() AT TIME ZONE 'utc'
+            FROM new_rows ORDER BY id;
+        END IF;
+        RETURN NULL;
+    END
+    $$""",
+    """CREATE OR REPLACE TRIGGER user_change_after_insert AFTER INSERT ON "user"
+        REFERENCING NEW TABLE AS new_rows FOR EACH STATEMENT EXECUTE FUNCTION user_change_capture()""",
+    """CREATE OR REPLACE TRIGGER user_change_after_update AFTER UPDATE ON "user"
+        REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows FOR EACH STATEMENT EXECUTE FUNCTION user_change_capture()""",
+    """CREATE OR REPLACE TRIGGER user_change_after_delete AFTER DELETE ON "user"
+        REFERENCING OLD TABLE AS old_rows FOR EACH STATEMENT EXECUTE FUNCTION user_change_capture()""",
+]
+
+# PostgreSQL: a busca textual utiliza uma coluna tsvector gerada (sem triggers) e um índice GIN, no lugar da tabela FTS5 do SQLite.
+POSTGRES_USER_FTS_DDL = [
+    """ALTER TABLE "user" ADD COLUMN IF NOT EXISTS search_vector tsvector
+        GENERATED ALWAYS AS (to_tsvector('simple', first_name || ' ' || coalesce(last_name, ''))) STORED""",
+    """CREATE INDEX IF NOT EXISTS ix_user_search_vector ON "user" USING gin (search_vector)""",
+]
+
+
+@event.listens_for(SqLiteBase.metadata, "after_create")
+def _create_user_version_tracking(target, connection, **kwargs) -> None:
+    if connection.dialect.name == "sqlite":
+        for statement in USER_VERSION_DDL + USER_CHANGE_DDL:
+            connection.exec_driver_sql(statement)
+    elif connection.dialect.name == "postgresql":
+        for statement in POSTGRES_USER_CHANGE_DDL:
+            connection.exec_driver_sql(statement)
+
+
+def migrate_user_table(bind) -> None:
+    """Atualiza bancos de dados criados antes do versionamento de usuários: adiciona as colunas version e updated_at e cria a versão da coleção, o log de alterações e seus triggers.
+
+    No PostgreSQL, as tabelas já são criadas com as colunas atuais, restando criar as tabelas auxiliares e os triggers que ainda não existirem.
+
+    Args:
+        bind: Engine do SQLite ou do PostgreSQL.
+    """
+    with bind.begin() as connection:
+        if connection.dialect.name == "postgresql":
+            for model in (UserCollectionVersionModel, UserChangeModel, UserChangeCompactionModel):
+                model.__table__.create(connection, checkfirst=True)
+            for statement in POSTGRES_USER_CHANGE_DDL:
+                connection.exec_driver_sql(statement)
+            return
+        columns = {row[1] for row in connection.exec_driver_sql('PRAGMA table_info("user")')}
+        if "version" not in columns:
+            connection.exec_driver_sql('ALTER TABLE "user" ADD COLUMN version INTEGER NOT NULL DEFAULT 1')
+        if "updated_at" not in columns:
+            # O SQLite não aceita CURRENT_TIMESTAMP como padrão em ADD COLUMN, então os registros existentes são preenchidos em seguida.
+            connection.exec_driver_sql('ALTER TABLE "user" ADD COLUMN updated_at DATETIME')
+            connection.exec_driver_sql('UPDATE "user" SET updated_at = CURRENT_TIMESTAMP WHERE updated_at IS NULL')
+        for model in (UserCollectionVersionModel, UserChangeModel, UserChangeCompactionModel):
+            model.__table__.create(connection, checkfirst=True)
+        create_user_version_tracking(connection)
+        create_user_change_log(connection)
+        # Índice criado antes do unicode_lower, com o lower() nativo: as buscas por prefixo não o utilizariam (e não encontrariam nomes acentuados).
+        index_sql = connection.exec_driver_sql("SELECT sql FROM sqlite_master WHERE type = 'index' AND name = 'ix_user_first_name_lower'").scalar()
+        if index_sql is not None and "unicode_lower" not in index_sql:
+            connection.exec_driver_sql("DROP INDEX ix_user_first_name_lower")
+            FIRST_NAME_LOWER_INDEX.create(connection)
+
+
+def create_user_version_tracking(connection) -> None:
+    """Cria (se necessário) a linha de versão da coleção e os triggers que a incrementam, e incrementa a versão. Utilizado após cargas em massa, em que os triggers são removidos durante a carga.
+
+    Args:
+        connection: Conexão com o banco de dados SQLite ou PostgreSQL, em transação.
+    """
+    if connection.dialect.name == "postgresql":
+        for statement in POSTGRES_USER_CHANGE_DDL:
+            connection.exec_driver_sql(statement)
+    else:
+        for statement in USER_VERSION_DDL:
+            connection.exec_driver_sql(statement)
+    connection.exec_driver_sql("UPDATE user_collection_version SET version = version + 1, updated_at = CURRENT_TIMESTAMP WHERE id = 1")
+
+
+def create_user_change_log(connection) -> None:
+    """Cria (se necessário) os triggers que alimentam o log de alterações (user_change). Utilizado após cargas em massa, em que os triggers são removidos durante a carga: os usuários carregados não geram entradas no log.
+
+    Args:
+        connection: Conexão com o banco de dados SQLite ou PostgreSQL, em transação.
+    """
+    for statement in (POSTGRES_USER_CHANGE_DDL if connection.dialect.name == "postgresql" else USER_CHANGE_DDL):
+        connection.exec_driver_sql(statement)
+
+
+def create_user_indexes(bind) -> None:
+    """Cria os índices da tabela user que ainda não existem. Necessário para bancos de dados criados antes da inclusão dos índices, já que o create_all não altera tabelas existentes.
+
+    A existência é verificada pelo catálogo do banco de dados (sqlite_master ou pg_indexes), pois a reflexão do SQLAlchemy ignora índices de expressão (ex: unicode_lower(first_name)) e o checkfirst tentaria recriá-los.
+
+    Args:
+        bind: Engine do SQLite ou do PostgreSQL.
+    """
+    with bind.begin() as connection:
+        catalog_query = ("SELECT indexname FROM pg_indexes WHERE tablename = 'user'" if connection.dialect.name == "postgresql"
+                         else "SELECT name FROM sqlite_master WHERE type = 'index'")
+        existing = {name for (name,) in connection.exec_driver_sql(catalog_query)}
+        for index in UserModel.__table__.indexes:
+            if index.name not in existing:
+                index.create(connection)
+
+
+def create_user_full_text_index(bind) -> None:
+    """Cria a tabela FTS5 (user_fts) de busca textual por nome, no formato external content, e os triggers que a mantêm sincronizada. Por fim, reconstrói o índice a partir dos dados existentes.
+
+    No PostgreSQL, cria a coluna tsvector gerada (search_vector), calculada para os registros existentes na própria criação, e o seu índice GIN.
+
+    Args:
+        bind: Engine do SQLite ou do PostgreSQL.
+    """
+    with bind.begin() as connection:
+        if connection.dialect.name == "postgresql":
+            for statement in POSTGRES_USER_FTS_DDL:
+                connection.exec_driver_sql(statement)
+            return
+        for statement in USER_FTS_DDL:
+            connection.exec_driver_sql(statement)
+        connection.exec_driver_sql("INSERT INTO user_fts(user_fts) VALUES ('rebuild')")
@@ -0,0 +1,73 @@
+from sqlalchemy.exc import ProgrammingError
+from models.user_model import UserModel
+from db.postgres_client import AsyncPostgresClient
+from typing import Tuple, Optional, List, Sequence
+from repositories.async_sqlite_user_repository import AsyncSQLiteUserRepository
+from repositories.sqlite_user_repository import rows_to_dicts, select_rows_statement, SELECT_ALL_STATEMENT
+from repositories.postgres_user_repository import (full_text_query_expression, copy_rows, POSTGRES_SEARCH_FULL_TEXT_STATEMENT,
+                                                   COPY_STAGING_TABLE_STATEMENT, COPY_STAGING_STATEMENT, INSERT_USERS_FROM_STAGING_STATEMENT)
+from infra.instrumentation import instrument_repository
+
+
+@instrument_repository
+class AsyncPostgresUserRepository(AsyncSQLiteUserRepository):
+    """
+        Implementação da interface assíncrona do repositório de usuário (IAsyncUserRepository) sobre o PostgreSQL (utilizando o AsyncPostgresClient), com as mesmas especializações do PostgresUserRepository: busca textual por tsvector, COPY nas cargas em lote grandes e listagens completas por cursor do lado do servidor.
+    """
+    copy_threshold = 1000
+    listing_chunk_size = 1000
+
+    _instance = None
+    def __new__(cls, *args, **kwargs): # Singleton
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+        return cls._instance
+
+    def __init__(self) -> None:
+        self.db_client = AsyncPostgresClient()
+
+    async def select_all(self) -> Tuple[List[UserModel], Optional[str], Optional[str]]:
+        async with self.db_client._get_read_session() as db_session:
+            users = [user async for user in await db_session.stream_scalars(SELECT_ALL_STATEMENT,
+                                                                             execution_options={"yield_per": self.listing_chunk_size})]
+            return (users, None, None)
+
+    async def select_rows(self, limit: Optional[int] = None, after_id: Optional[int] = None, fields: Optional[Sequence[str]] = None) -> Tuple[List[dict], Optional[str], Optional[str]]:
+        async with self.db_client._get_read_session() as db_session:
+            statement, parameters = select_rows_statement(limit, after_id, fields)
+            if limit is not None:
+                rows = (await db_session.execute(statement, parameters)).all()
+            else:
+                rows = [row async for row in await db_session.stream(statement, parameters, execution_options={"yield_per": self.listing_chunk_size})]
+            return (rows_to_dicts(rows, fields), None, None)
+
+    async def search_full_text(self, query: str, limit: int = 50) -> Tuple[List[UserModel], Optional[str], Optional[str]]:
+        expression = full_text_query_expression(query)
+        if not expression:
+            return ([], None, None)
+
+        async with self.db_client._get_read_session() as db_session:
+            try:
+                users = list(await db_session.scalars(POSTGRES_SEARCH_FULL_TEXT_STATEMENT, {"query": expression, "limit": limit}))
+            except ProgrammingError as error:
+                if "search_vector" not in str(error):
+                    raise
+                return (None, "FullTextSearchUnavailable", "Full text search index (search_vector) is not enabled in the database.")
+            return (users, None, None)
+
+    async def bulk_create(self, users_data: List[dict]) -> Tuple[List[Tuple[Optional[UserModel], Optional[str], Optional[str]]], Optional[str], Optional[str]]:
+        if len(users_data) < self.copy_threshold:
+            return await super().bulk_create(users_data)
+
+        async with self.db_client._get_session() as db_session:
+            await db_session.execute(COPY_STAGING_TABLE_STATEMENT)
+            raw_connection = await (await db_session.connection()).get_raw_connection()
+            async with raw_connection.driver_connection.cursor() as cursor:
+                async with cursor.copy(COPY_STAGING_STATEMENT) as copy:
+                    for row in copy_rows(users_data):
+                        await copy.write_row(row)
+            # Ver SQLiteUserRepository.bulk_create sobre a ordenação pelo id.
+            users = sorted((await db_session.scalars(INSERT_USERS_FROM_STAGING_STATEMENT)).all(),
+                           key=lambda user: user.id)
+            await db_session.commit()
+            return ([(user, None, None) for user in users], None, None)
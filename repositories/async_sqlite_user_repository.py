@@ -0,0 +1,226 @@
+from sqlalchemy.exc import OperationalError
+from datetime import datetime
+from models.user_model import UserModel, UserChangeModel
+from db.sqllite_client import AsyncSqLiteClient
+from repositories.sqlite_user_repository import (chunked, rows_to_dicts, select_rows_statement, version_conflict,
+                                                 select_row_by_id_statement, row_by_id_to_dict,
+                                                 full_text_match_expression, changes_compacted,
+                                                 has_sequence_gap, compaction_boundary_statement,
+                                                 compaction_watermark_statement, compaction_chunk_statement,
+                                                 page_statement, stream_all_statement, update_user_statement, update_user_parameters, bulk_update_batches,
+                                                 name_prefix_query, INSERT_USER_STATEMENT, SELECT_ALL_STATEMENT, SELECT_BY_ID_STATEMENT,
+                                                 SELECT_VERSION_STATEMENT, SELECT_CURRENT_VERSION_STATEMENT, SELECT_COLLECTION_VERSION_STATEMENT,
+                                                 SELECT_BY_EMAIL_STATEMENT, SEARCH_FULL_TEXT_STATEMENT,
+                                                 DELETE_BY_ID_STATEMENT, SELECT_BY_IDS_STATEMENT, DELETE_BY_IDS_STATEMENT, SELECT_CHANGES_STATEMENT,
+                                                 COMPACTED_UNTIL_STATEMENT, LAST_CHANGE_SEQUENCE_STATEMENT)
+from typing import Tuple, Optional, List, AsyncIterator, Sequence
+from repositories.meta.interface_async_user_repository import IAsyncUserRepository
+from infra.instrumentation import instrument_repository
+from infra.read_consistency import primary_reads
+
+
+@instrument_repository
+class AsyncSQLiteUserRepository(IAsyncUserRepository):
+    """
+        Realiza implementação da interface assíncrona do repositório de usuário (IAsyncUserRepository), que irá estabelecer conexão com o banco de dados SQLite (utilizando o AsyncSqLiteClient sobre aiosqlite) e, por meio de ORM com AsyncSession, realizar as operações necessárias sem bloquear o event loop.
+    """
+
+    in_clause_chunk_size = 500
+    change_compaction_chunk_size = 10_000
+
+    _instance = None
+    def __new__(cls, *args, **kwargs): # Singleton
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+        return cls._instance
+
+    def __init__(self) -> None:
+        self.db_client = AsyncSqLiteClient()
+
+    async def create(self, first_name: str, email: str, last_name: str = None) -> Tuple[UserModel, Optional[str], Optional[str]]:
+        async with self.db_client._get_session() as db_session:
+            user = await db_session.scalar(INSERT_USER_STATEMENT, {"first_name": first_name, "last_name": last_name, "email": email})
+            await db_session.commit()
+            return (user, None, None)
+
+    async def select_all(self) -> Tuple[List[UserModel], Optional[str], Optional[str]]:
+        async with self.db_client._get_read_session() as db_session:
+            users = list(await db_session.scalars(SELECT_ALL_STATEMENT))
+            return (users, None, None)
+
+    async def select_page(self, limit: int, after_id: Optional[int] = None) -> Tuple[List[UserModel], Optional[str], Optional[str]]:
+        async with self.db_client._get_read_session() as db_session:
+            statement, parameters = page_statement(after_id)
+            users = list(await db_session.scalars(statement, {**parameters, "limit": limit}))
+            return (users, None, None)
+
+    async def select_rows(self, limit: Optional[int] = None, after_id: Optional[int] = None, fields: Optional[Sequence[str]] = None) -> Tuple[List[dict], Optional[str], Optional[str]]:
+        async with self.db_client._get_read_session() as db_session:
+            rows = (await db_session.execute(*select_rows_statement(limit, after_id, fields))).all()
+            return (rows_to_dicts(rows, fields), None, None)
+
+    async def select_row_by_id(self, user_id: int, fields: Optional[Sequence[str]] = None) -> Tuple[Optional[dict], Optional[str], Optional[str]]:
+        async with self.db_client._get_read_session() as db_session:
+            row = (await db_session.execute(*select_row_by_id_statement(user_id, fields))).first()
+            return row_by_id_to_dict(user_id, row, fields)
+
+    async def stream_all(self, after_id: Optional[int] = None, chunk_size: int = 1000) -> Tuple[AsyncIterator[UserModel], Optional[str], Optional[str]]:
+        return (self.__iterate_users(after_id, chunk_size), None, None)
+
+    async def __iterate_users(self, after_id: Optional[int], chunk_size: int) -> AsyncIterator[UserModel]:
+        async with self.db_client._get_read_session() as db_session:
+            statement, parameters = stream_all_statement(after_id)
+            async for user in await db_session.stream_scalars(statement, parameters, execution_options={"yield_per": chunk_size}):
+                yield user
+
+    async def select_version(self, user_id: int) -> Tuple[Optional[Tuple[int, Optional[datetime]]], Optional[str], Optional[str]]:
+        async with self.db_client._get_read_session() as db_session:
+            row = (await db_session.execute(SELECT_VERSION_STATEMENT, {"user_id": user_id})).first()
+            if row is None:
+                return (None, "UserDoesNotExist", f"User with id {user_id} does not exist.")
+            return (tuple(row), None, None)
+
+    async def select_collection_version(self) -> Tuple[Tuple[int, Optional[datetime]], Optional[str], Optional[str]]:
+        async with self.db_client._get_read_session() as db_session:
+            row = (await db_session.execute(SELECT_COLLECTION_VERSION_STATEMENT)).first()
+            return (tuple(row) if row is not None else (0, None), None, None)
+
+    async def select_changes(self, since: int, limit: int) -> Tuple[Optional[List[UserChangeModel]], Optional[str], Optional[str]]:
+        async with self.db_client._get_session() as db_session:
+            changes = list(await db_session.scalars(SELECT_CHANGES_STATEMENT, {"since": since, "limit": limit}))
+            if has_sequence_gap(changes, since):
+                compacted_until = await db_session.scalar(COMPACTED_UNTIL_STATEMENT)
+                if compacted_until is not None and since < compacted_until:
+                    return changes_compacted(compacted_until)
+            return (changes, None, None)
+
+    async def select_last_change_sequence(self) -> Tuple[int, Optional[str], Optional[str]]:
+        async with self.db_client._get_session() as db_session:
+            return (await db_session.scalar(LAST_CHANGE_SEQUENCE_STATEMENT), None, None)
+
+    async def compact_changes(self, before: datetime) -> Tuple[int, Optional[str], Optional[str]]:
+        async with self.db_client._get_session() as db_session:
+            boundary = await db_session.scalar(compaction_boundary_statement(before))
+            if boundary is None:
+                return (0, None, None)
+            await db_session.execute(compaction_watermark_statement(boundary - 1))
+            await db_session.commit()
+
+            deleted = 0
+            while True:
+                rowcount = (await db_session.execute(compaction_chunk_statement(boundary, self.change_compaction_chunk_size))).rowcount
+                await db_session.commit()
+                deleted += rowcount
+                if rowcount < self.change_compaction_chunk_size:
+                    return (deleted, None, None)
+
+    async def select_by_id(self, user_id: int) -> Tuple[Optional[UserModel], Optional[str], Optional[str]]:
+        async with self.db_client._get_read_session() as db_session:
+            user = await db_session.scalar(SELECT_BY_ID_STATEMENT, {"user_id": user_id})
+            if not user:
+                return (None, "UserDoesNotExist", f"User with id {user_id} does not exist.")
+            return (user, None, None)
+
+    async def select_by_email(self, email: str, limit: int = 50) -> Tuple[List[UserModel], Optional[str], Optional[str]]:
+        async with self.db_client._get_read_session() as db_session:
+            users = list(await db_session.scalars(SELECT_BY_EMAIL_STATEMENT, {"email": email, "limit": limit}))
+            return (users, None, None)
+
+    async def select_by_name_prefix(self, prefix: str, limit: int = 50) -> Tuple[List[UserModel], Optional[str], Optional[str]]:
+        async with self.db_client._get_read_session() as db_session:
+            users = list(await db_session.scalars(*name_prefix_query(prefix, limit)))
+            return (users, None, None)
+
+    async def search_full_text(self, query: str, limit: int = 50) -> Tuple[List[UserModel], Optional[str], Optional[str]]:
+        match = full_text_match_expression(query)
+        if not match:
+            return ([], None, None)
+
+        async with self.db_client._get_read_session() as db_session:
+            try:
+                users = list(await db_session.scalars(SEARCH_FULL_TEXT_STATEMENT, {"match": match, "limit": limit}))
+            except OperationalError as error:
+                if "no such table: user_fts" not in str(error):
+                    raise
+                return (None, "FullTextSearchUnavailable", "Full text search index (user_fts) is not enabled in the database.")
+            return (users, None, None)
+
+    async def update(self, user_id: int, new_user_data: dict, expected_version: Optional[int] = None) -> Tuple[Optional[UserModel], Optional[str], Optional[str]]:
+        values = {key: value for key, value in new_user_data.items() if value is not None}
+        if not values:
+            # A versão comparada deve ser a atual: a leitura não pode vir de uma réplica atrasada.
+            with primary_reads():
+                user, error_type, error_msg = await self.select_by_id(user_id)
+            if user is not None and expected_version is not None and user.version != expected_version:
+                return version_conflict(user_id, user.version, expected_version)
+            return (user, error_type, error_msg)
+
+        async with self.db_client._get_session() as db_session:
+            user = await db_session.scalar(update_user_statement(tuple(values), expected_version is not None),
+                                           update_user_parameters(user_id, values, expected_version))
+            if not user:
+                if expected_version is not None:
+                    current_version = await db_session.scalar(SELECT_CURRENT_VERSION_STATEMENT, {"user_id": user_id})
+                    if current_version is not None:
+                        return version_conflict(user_id, current_version, expected_version)
+                return (None, "UserDoesNotExist", f"User with id {user_id} does not exist.")
+
+            await db_session.commit()
+            return (user, None, None)
+
+    async def delete_by_id(self, user_id: int) -> Tuple[Optional[UserModel], Optional[str], Optional[str]]:
+        async with self.db_client._get_session() as db_session:
+            user = await db_session.scalar(DELETE_BY_ID_STATEMENT, {"user_id": user_id})
+            if not user:
+                return (None, "UserDoesNotExist", f"User with id {user_id} does not exist.")
+
+            await db_session.commit()
+            return (user, None, None)
+
+    async def bulk_create(self, users_data: List[dict]) -> Tuple[List[Tuple[Optional[UserModel], Optional[str], Optional[str]]], Optional[str], Optional[str]]:
+        if not users_data:
+            return ([], None, None)
+
+        async with self.db_client._get_session() as db_session:
+            # Ver SQLiteUserRepository.bulk_create sobre a ordenação pelo id.
+            users = sorted((await db_session.scalars(
+                INSERT_USER_STATEMENT,
+                [{"first_name": user_data["first_name"],
+                  "last_name": user_data.get("last_name"),
+                  "email": user_data["email"]} for user_data in users_data]
+            )).all(), key=lambda user: user.id)
+            await db_session.commit()
+            return ([(user, None, None) for user in users], None, None)
+
+    async def bulk_update(self, users_data: List[dict]) -> Tuple[List[Tuple[Optional[UserModel], Optional[str], Optional[str]]], Optional[str], Optional[str]]:
+        async with self.db_client._get_session() as db_session:
+            # Ver SQLiteUserRepository.bulk_update sobre a execução na conexão.
+            connection = await db_session.connection()
+            for statement, parameters in bulk_update_batches(users_data):
+                await connection.execute(statement, parameters)
+
+            users_by_id = {}
+            for ids in chunked(list(dict.fromkeys(user_data["id"] for user_data in users_data)), self.in_clause_chunk_size):
+                users = await db_session.scalars(SELECT_BY_IDS_STATEMENT, {"user_ids": ids})
+                users_by_id.update({user.id: user for user in users})
+            await db_session.commit()
+
+        return ([self.__bulk_item_result(users_by_id, user_data["id"]) for user_data in users_data], None, None)
+
+    async def bulk_delete(self, user_ids: List[int]) -> Tuple[List[Tuple[Optional[UserModel], Optional[str], Optional[str]]], Optional[str], Optional[str]]:
+        async with self.db_client._get_session() as db_session:
+            users_by_id = {}
+            for ids in chunked(list(dict.fromkeys(user_ids)), self.in_clause_chunk_size):
+                deleted_users = await db_session.scalars(DELETE_BY_IDS_STATEMENT, {"user_ids": ids})
+                users_by_id.update({user.id: user for user in deleted_users})
+            await db_session.commit()
+
+        return ([self.__bulk_item_result(users_by_id, user_id) for user_id in user_ids], None, None)
+
+    def __bulk_item_result(self, users_by_id: dict, user_id: int) -> Tuple[Optional[UserModel], Optional[str], Optional[str]]:
+        if user_id not in users_by_id:
+            return (None, "UserDoesNotExist", f"User with id {user_id} does not exist.")
+        return (users_by_id[user_id], None, None)
+
+    async def close(self) -> None:
+        await self.db_client._engine.dispose()
@@ -0,0 +1,41 @@
+from typing import Dict, Optional, Tuple, Type
+from repositories.meta.interface_user_repository import IUserRepository
+from repositories.meta.interface_async_user_repository import IAsyncUserRepository
+from repositories.sqlite_user_repository import SQLiteUserRepository
+from repositories.async_sqlite_user_repository import AsyncSQLiteUserRepository
+from repositories.postgres_user_repository import PostgresUserRepository
+from repositories.async_postgres_user_repository import AsyncPostgresUserRepository
+from repositories.sharded_user_repository import ShardedUserRepository
+
+
+# Bancos de dados sem implementação assíncrona (None) suportam apenas USER_SERVICE_MODE=sync.
+USER_REPOSITORY_BACKENDS: Dict[str, Tuple[Type[IUserRepository], Optional[Type[IAsyncUserRepository]]]] = {
+    "sqlite": (SQLiteUserRepository, AsyncSQLiteUserRepository),
+    "postgres": (PostgresUserRepository, AsyncPostgresUserRepository),
+    "sqlite_sharded": (ShardedUserRepository, None),
+}
+
+# Bancos de dados sem um log de alterações único (select_changes retorna ChangesUnavailable): cada shard mantém o próprio log, com sequências independentes.
+BACKENDS_WITHOUT_CHANGE_FEED = ("sqlite_sharded",)
+
+
+def has_change_feed(backend: str) -> bool:
+    """Indica se o repositório do banco de dados fornece o log de alterações (select_changes e select_last_change_sequence)."""
+    return backend not in BACKENDS_WITHOUT_CHANGE_FEED
+
+
+def get_user_repository_backend(backend: str) -> Tuple[Type[IUserRepository], Optional[Type[IAsyncUserRepository]]]:
+    """Recupera as implementações (síncrona e assíncrona) do repositório de usuário de um banco de dados.
+
+    Args:
+        backend (str): Nome do banco de dados: 'sqlite', 'postgres' ou 'sqlite_sharded'.
+
+    Raises:
+        ValueError: Caso o banco de dados não seja suportado.
+
+    Returns:
+        Tuple[Type[IUserRepository], Optional[Type[IAsyncUserRepository]]]: Classes do repositório síncrono e assíncrono (None quando não há implementação assíncrona), respectivamente.
+    """
+    if backend not in USER_REPOSITORY_BACKENDS:
+        raise ValueError(f"Invalid database backend '{backend}'. Options: {', '.join(USER_REPOSITORY_BACKENDS)}")
+    return USER_REPOSITORY_BACKENDS[backend]
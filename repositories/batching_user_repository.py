@@ -0,0 +1,343 @@
+import asyncio
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from datetime import datetime
+from typing import Tuple, Optional, List, Iterator, AsyncIterator, Sequence
+from models.user_model import UserModel, UserChangeModel
+from repositories.meta.interface_user_repository import IUserRepository
+from repositories.meta.interface_async_user_repository import IAsyncUserRepository
+from infra.instrumentation import instrument_repository
+from infra.metrics import metrics_registry
+
+
+USER_CREATE_BATCH_SIZE = metrics_registry.histogram(
+    "user_create_batch_size", "Quantidade de criações de usuário gravadas em cada transação do group commit.", ("repository",),
+    buckets=(1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 5000))
+USER_CREATE_FLUSH_DURATION = metrics_registry.histogram(
+    "user_create_flush_duration_seconds", "Duração da transação de cada lote do group commit, em segundos.", ("repository",))
+USER_CREATE_QUEUE_WAIT = metrics_registry.histogram(
+    "user_create_queue_wait_seconds", "Tempo entre o enfileiramento de uma criação e a confirmação do seu lote, em segundos.", ("repository",))
+USER_CREATE_QUEUE_DEPTH = metrics_registry.gauge(
+    "user_create_queue_depth", "Criações de usuário aguardando o próximo lote do group commit.", ("repository",), multiprocess_mode="sum")
+USER_CREATE_BATCH_FALLBACKS = metrics_registry.counter(
+    "user_create_batch_fallbacks_total", "Lotes do group commit que falharam e foram regravados com uma transação por usuário.", ("repository",))
+
+
+class PendingCreate:
+    """Criação enfileirada: dados do usuário, resultado a ser entregue ao chamador e instante do enfileiramento."""
+    __slots__ = ("user_data", "future", "enqueued_at")
+
+    def __init__(self, user_data: dict, future, enqueued_at: float) -> None:
+        self.user_data = user_data
+        self.future = future
+        self.enqueued_at = enqueued_at
+
+
+def observe_flush(repository: str, batch: List[PendingCreate], started: float) -> None:
+    finished = time.perf_counter()
+    USER_CREATE_BATCH_SIZE.observe(len(batch), repository=repository)
+    USER_CREATE_FLUSH_DURATION.observe(finished - started, repository=repository)
+    for pending in batch:
+        USER_CREATE_QUEUE_WAIT.observe(finished - pending.enqueued_at, repository=repository)
+
+
+@instrument_repository
+class BatchingUserRepository(IUserRepository):
+    """
+        Decorador da interface do repositório de usuário (IUserRepository) que agrupa as criações concorrentes em uma única transação (group commit / write-behind).
+
+        Cada create é enfileirado e gravado por uma thread de background com o bulk_create do repositório decorado, em lotes de até max_batch_size criações ou a cada max_delay segundos. Se o lote falhar, as criações são regravadas individualmente. As demais operações são delegadas diretamente.
+
+        Args:
+            repository (IUserRepository): Repositório decorado.
+            max_batch_size (int, optional): Quantidade máxima de criações por lote. Padrão para 500.
+            max_delay (float, optional): Tempo máximo, em segundos, que a primeira criação de um lote aguarda por outras. Padrão para 0.002.
+    """
+
+    def __init__(self, repository: IUserRepository, max_batch_size: int = 500, max_delay: float = 0.002) -> None:
+        self.repository = repository
+        self.max_batch_size = max_batch_size
+        self.max_delay = max_delay
+        self.__queue = queue.SimpleQueue()
+        self.__flusher = None
+        self.__flusher_lock = threading.Lock()
+        self.__closed = False
+
+    def __ensure_flusher(self) -> None:
+        if self.__flusher is not None and self.__flusher.is_alive():
+            return
+        with self.__flusher_lock:
+            if self.__flusher is None or not self.__flusher.is_alive():
+                self.__flusher = threading.Thread(target=self.__run, name="user-create-batcher", daemon=True)
+                self.__flusher.start()
+
+    def __run(self) -> None:
+        while True:
+            first = self.__queue.get()
+            if first is None:
+                return
+            batch, stop = [first], False
+            deadline = first.enqueued_at + self.max_delay
+            while len(batch) < self.max_batch_size:
+                timeout = deadline - time.perf_counter()
+                try:
+                    pending = self.__queue.get(block=timeout > 0, timeout=timeout if timeout > 0 else None)
+                except queue.Empty:
+                    break
+                if pending is None:
+                    stop = True
+                    break
+                batch.append(pending)
+            USER_CREATE_QUEUE_DEPTH.dec(len(batch), repository=type(self.repository).__name__)
+            self.__flush(batch)
+            if stop:
+                return
+
+    def __flush(self, batch: List[PendingCreate]) -> None:
+        repository_name = type(self.repository).__name__
+        started = time.perf_counter()
+        try:
+            results, error_type, _ = self.repository.bulk_create([pending.user_data for pending in batch])
+        except Exception:
+            results, error_type = None, "BatchFailed"
+        if error_type is None:
+            observe_flush(repository_name, batch, started)
+            for pending, result in zip(batch, results):
+                pending.future.set_result(result)
+            return
+
+        USER_CREATE_BATCH_FALLBACKS.inc(repository=repository_name)
+        for pending in batch:
+            try:
+                pending.future.set_result(self.repository.create(**pending.user_data))
+            except Exception as exception:
+                pending.future.set_exception(exception)
+
+    def create(self, first_name: str, email: str, last_name: str = None) -> Tuple[UserModel, Optional[str], Optional[str]]:
+        if self.__closed:
+            return self.repository.create(first_name=first_name, email=email, last_name=last_name)
+        pending = PendingCreate({"first_name": first_name, "last_name": last_name, "email": email}, Future(), time.perf_counter())
+        self.__ensure_flusher()
+        USER_CREATE_QUEUE_DEPTH.inc(repository=type(self.repository).__name__)
+        self.__queue.put(pending)
+        return pending.future.result()
+
+    def select_all(self) -> Tuple[List[UserModel], Optional[str], Optional[str]]:
+        return self.repository.select_all()
+
+    def select_page(self, limit: int, after_id: Optional[int] = None) -> Tuple[List[UserModel], Optional[str], Optional[str]]:
+        return self.repository.select_page(limit=limit, after_id=after_id)
+
+    def select_rows(self, limit: Optional[int] = None, after_id: Optional[int] = None, fields: Optional[Sequence[str]] = None) -> Tuple[List[dict], Optional[str], Optional[str]]:
+        return self.repository.select_rows(limit, after_id, fields)
+
+    def stream_all(self, after_id: Optional[int] = None, chunk_size: int = 1000) -> Tuple[Iterator[UserModel], Optional[str], Optional[str]]:
+        return self.repository.stream_all(after_id=after_id, chunk_size=chunk_size)
+
+    def select_version(self, user_id: int) -> Tuple[Optional[Tuple[int, Optional[datetime]]], Optional[str], Optional[str]]:
+        return self.repository.select_version(user_id)
+
+    def select_collection_version(self) -> Tuple[Tuple[int, Optional[datetime]], Optional[str], Optional[str]]:
+        return self.repository.select_collection_version()
+
+    def select_changes(self, since: int, limit: int) -> Tuple[Optional[List[UserChangeModel]], Optional[str], Optional[str]]:
+        return self.repository.select_changes(since, limit)
+
+    def select_last_change_sequence(self) -> Tuple[int, Optional[str], Optional[str]]:
+        return self.repository.select_last_change_sequence()
+
+    def compact_changes(self, before: datetime) -> Tuple[int, Optional[str], Optional[str]]:
+        return self.repository.compact_changes(before)
+
+    def select_by_id(self, user_id: int) -> Tuple[Optional[UserModel], Optional[str], Optional[str]]:
+        return self.repository.select_by_id(user_id)
+
+    def select_row_by_id(self, user_id: int, fields: Optional[Sequence[str]] = None) -> Tuple[Optional[dict], Optional[str], Optional[str]]:
+        return self.repository.select_row_by_id(user_id, fields)
+
+    def select_by_email(self, email: str, limit: int = 50) -> Tuple[List[UserModel], Optional[str], Optional[str]]:
+        return self.repository.select_by_email(email, limit=limit)
+
+    def select_by_name_prefix(self, prefix: str, limit: int = 50) -> Tuple[List[UserModel], Optional[str], Optional[str]]:
+        return self.repository.select_by_name_prefix(prefix, limit=limit)
+
+    def search_full_text(self, query: str, limit: int = 50) -> Tuple[List[UserModel], Optional[str], Optional[str]]:
+        return self.repository.search_full_text(query, limit=limit)
+
+    def update(self, user_id: int, new_user_data: dict, expected_version: Optional[int] = None) -> Tuple[Optional[UserModel], Optional[str], Optional[str]]:
+        return self.repository.update(user_id, new_user_data, expected_version)
+
+    def delete_by_id(self, user_id: int) -> Tuple[Optional[UserModel], Optional[str], Optional[str]]:
+        return self.repository.delete_by_id(user_id)
+
+    def bulk_create(self, users_data: List[dict]) -> Tuple[List[Tuple[Optional[UserModel], Optional[str], Optional[str]]], Optional[str], Optional[str]]:
+        return self.repository.bulk_create(users_data)
+
+    def bulk_update(self, users_data: List[dict]) -> Tuple[List[Tuple[Optional[UserModel], Optional[str], Optional[str]]], Optional[str], Optional[str]]:
+        return self.repository.bulk_update(users_data)
+
+    def bulk_delete(self, user_ids: List[int]) -> Tuple[List[Tuple[Optional[UserModel], Optional[str], Optional[str]]], Optional[str], Optional[str]]:
+        return self.repository.bulk_delete(user_ids)
+
+    def close(self) -> None:
+        """Grava as criações pendentes, encerra a thread de background e fecha o repositório decorado."""
+        self.__closed = True
+        if self.__flusher is not None and self.__flusher.is_alive():
+            self.__queue.put(None)
+            self.__flusher.join()
+        self.repository.close()
+
+
+@instrument_repository
+class AsyncBatchingUserRepository(IAsyncUserRepository):
+    """
+        Versão assíncrona do BatchingUserRepository, sobre a interface IAsyncUserRepository: as criações são enfileiradas em uma asyncio.Queue e gravadas por uma task de background no event loop, sem threads adicionais.
+
+        Args:
+            repository (IAsyncUserRepository): Repositório decorado.
+            max_batch_size (int, optional): Quantidade máxima de criações por lote. Padrão para 500.
+            max_delay (float, optional): Tempo máximo, em segundos, que a primeira criação de um lote aguarda por outras. Padrão para 0.002.
+    """
+
+    def __init__(self, repository: IAsyncUserRepository, max_batch_size: int = 500, max_delay: float = 0.002) -> None:
+        self.repository = repository
+        self.max_batch_size = max_batch_size
+        self.max_delay = max_delay
+        self.__queue = None
+        self.__flusher = None
+        self.__loop = None
+        self.__closed = False
+
+    def __ensure_flusher(self) -> asyncio.Queue:
+        """A fila e a task pertencem ao event loop em execução; um novo event loop (ex: após o fork de um worker) recebe fila e task próprias."""
+        loop = asyncio.get_running_loop()
+        if self.__loop is not loop or self.__flusher is None or self.__flusher.done():
+            self.__loop = loop
+            self.__queue = asyncio.Queue()
+            self.__flusher = loop.create_task(self.__run(self.__queue))
+        return self.__queue
+
+    async def __run(self, pending_queue: asyncio.Queue) -> None:
+        while True:
+            first = await pending_queue.get()
+            if first is None:
+                return
+            batch, stop = [first], False
+            deadline = first.enqueued_at + self.max_delay
+            while len(batch) < self.max_batch_size:
+                timeout = deadline - time.perf_counter()
+                try:
+                    pending = await asyncio.wait_for(pending_queue.get(), timeout) if timeout > 0 else pending_queue.get_nowait()
+                except (asyncio.TimeoutError, asyncio.QueueEmpty):
+                    break
+                if pending is None:
+                    stop = True
+                    break
+                batch.append(pending)
+            USER_CREATE_QUEUE_DEPTH.dec(len(batch), repository=type(self.repository).__name__)
+            await self.__flush(batch)
+            if stop:
+                return
+
+    async def __flush(self, batch: List[PendingCreate]) -> None:
+        repository_name = type(self.repository).__name__
+        started = time.perf_counter()
+        try:
+            results, error_type, _ = await self.repository.bulk_create([pending.user_data for pending in batch])
+        except Exception:
+            results, error_type = None, "BatchFailed"
+        if error_type is None:
+            observe_flush(repository_name, batch, started)
+            for pending, result in zip(batch, results):
+                if not pending.future.done():
+                    pending.future.set_result(result)
+            return
+
+        USER_CREATE_BATCH_FALLBACKS.inc(repository=repository_name)
+        for pending in batch:
+            try:
+                result = await self.repository.create(**pending.user_data)
+            except Exception as exception:
+                if not pending.future.done():
+                    pending.future.set_exception(exception)
+            else:
+                if not pending.future.done():
+                    pending.future.set_result(result)
+
+    async def create(self, first_name: str, email: str, last_name: str = None) -> Tuple[UserModel, Optional[str], Optional[str]]:
+        if self.__closed:
+            return await self.repository.create(first_name=first_name, email=email, last_name=last_name)
+        pending_queue = self.__ensure_flusher()
+        pending = PendingCreate({"first_name": first_name, "last_name": last_name, "email": email},
+                                self.__loop.create_future(), time.perf_counter())
+        USER_CREATE_QUEUE_DEPTH.inc(repository=type(self.repository).__name__)
+        pending_queue.put_nowait(pending)
+        # shield: o cancelamento do chamador (ex: cliente desconectado) não interrompe a gravação do lote.
+        return await asyncio.shield(pending.future)
+
+    async def select_all(self) -> Tuple[List[UserModel], Optional[str], Optional[str]]:
+        return await self.repository.select_all()
+
+    async def select_page(self, limit: int, after_id: Optional[int] = None) -> Tuple[List[UserModel], Optional[str], Optional[str]]:
+        return await self.repository.select_page(limit=limit, after_id=after_id)
+
+    async def select_rows(self, limit: Optional[int] = None, after_id: Optional[int] = None, fields: Optional[Sequence[str]] = None) -> Tuple[List[dict], Optional[str], Optional[str]]:
+        return await self.repository.select_rows(limit, after_id, fields)
+
+    async def stream_all(self, after_id: Optional[int] = None, chunk_size: int = 1000) -> Tuple[AsyncIterator[UserModel], Optional[str], Optional[str]]:
+        return await self.repository.stream_all(after_id=after_id, chunk_size=chunk_size)
+
+    async def select_version(self, user_id: int) -> Tuple[Optional[Tuple[int, Optional[datetime]]], Optional[str], Optional[str]]:
+        return await self.repository.select_version(user_id)
+
+    async def select_collection_version(self) -> Tuple[Tuple[int, Optional[datetime]], Optional[str], Optional[str]]:
+        return await self.repository.select_collection_version()
+
+    async def select_changes(self, since: int, limit: int) -> Tuple[Optional[List[UserChangeModel]], Optional[str], Optional[str]]:
+        return await self.repository.select_changes(since, limit)
+
+    async def select_last_change_sequence(self) -> Tuple[int, Optional[str], Optional[str]]:
+        return await self.repository.select_last_change_sequence()
+
+    async def compact_changes(self, before: datetime) -> Tuple[int, Optional[str], Optional[str]]:
+        return await self.repository.compact_changes(before)
+
+    async def select_by_id(self, user_id: int) -> Tuple[Optional[UserModel], Optional[str], Optional[str]]:
+        return await self.repository.select_by_id(user_id)
+
+    async def select_row_by_id(self, user_id: int, fields: Optional[Sequence[str]] = None) -> Tuple[Optional[dict], Optional[str], Optional[str]]:
+        return await self.repository.select_row_by_id(user_id, fields)
+
+    async def select_by_email(self, email: str, limit: int = 50) -> Tuple[List[UserModel], Optional[str], Optional[str]]:
+        return await self.repository.select_by_email(email, limit=limit)
+
+    async def select_by_name_prefix(self, prefix: str, limit: int = 50) -> Tuple[List[UserModel], Optional[str], Optional[str]]:
+        return await self.repository.select_by_name_prefix(prefix, limit=limit)
+
+    async def search_full_text(self, query: str, limit: int = 50) -> Tuple[List[UserModel], Optional[str], Optional[str]]:
+        return await self.repository.search_full_text(query, limit=limit)
+
+    async def update(self, user_id: int, new_user_data: dict, expected_version: Optional[int] = None) -> Tuple[Optional[UserModel], Optional[str], Optional[str]]:
+        return await self.repository.update(user_id, new_user_data, expected_version)
+
+    async def delete_by_id(self, user_id: int) -> Tuple[Optional[UserModel], Optional[str], Optional[str]]:
+        return await self.repository.delete_by_id(user_id)
+
+    async def bulk_create(self, users_data: List[dict]) -> Tuple[List[Tuple[Optional[UserModel], Optional[str], Optional[str]]], Optional[str], Optional[str]]:
+        return await self.repository.bulk_create(users_data)
+
+    async def bulk_update(self, users_data: List[dict]) -> Tuple[List[Tuple[Optional[UserModel], Optional[str], Optional[str]]], Optional[str], Optional[str]]:
+        return await self.repository.bulk_update(users_data)
+
+    async def bulk_delete(self, user_ids: List[int]) -> Tuple[List[Tuple[Optional[UserModel], Optional[str], Optional[str]]], Optional[str], Optional[str]]:
+        return await self.repository.bulk_delete(user_ids)
+
+    async def close(self) -> None:
+        """Grava as criações pendentes, encerra a task de background e fecha o repositório decorado."""
+        self.__closed = True
+        if self.__flusher is not None and not self.__flusher.done() and self.__loop is asyncio.get_running_loop():
+            self.__queue.put_nowait(None)
+            await self.__flusher
+        await self.repository.close()
@@ -0,0 +1,172 @@
+import threading
+import time
+from datetime import datetime
+from models.user_model import UserModel, UserChangeModel, USER_ROW_FIELDS
+from typing import Tuple, Optional, List, Iterator, Sequence
+from infra.cache import ICacheBackend
+from repositories.meta.interface_user_repository import IUserRepository
+from infra.instrumentation import instrument_repository
+from infra.read_consistency import primary_reads
+
+
+@instrument_repository
+class CachedUserRepository(IUserRepository):
+    """
+        Decorador da interface do repositório de usuário (IUserRepository) que adiciona um cache de leitura (read-through) em torno do select_by_id de outro repositório.
+
+        Escritas atualizam o cache com o usuário retornado (write-through) e deleções gravam uma lápide na chave; todo preenchimento é condicionado à versão do usuário (set_if_newer). Escritas de outros processos são refletidas após o TTL ou, com invalidation_interval, acompanhando o log de alterações.
+
+        Args:
+            repository (IUserRepository): Repositório decorado.
+            cache (ICacheBackend): Backend de cache.
+            invalidation_interval (float, optional): Intervalo máximo, em segundos, entre leituras do log de alterações (e, portanto, a defasagem máxima em relação às escritas de outros processos). Padrão para None (sem invalidação pelo log).
+    """
+    invalidation_batch_size = 1000
+
+    def __init__(self, repository: IUserRepository, cache: ICacheBackend, invalidation_interval: Optional[float] = None) -> None:
+        self.repository = repository
+        self.cache = cache
+        self.invalidation_interval = invalidation_interval
+        self.__last_change_sequence = None
+        self.__next_invalidation = 0.0
+        self.__invalidation_lock = threading.Lock()
+
+    def __cache_key(self, user_id: int) -> str:
+        return f"user:{user_id}"
+
+    def __invalidate_external_changes(self) -> None:
+        """Invalida as chaves dos usuários alterados desde a última leitura do log de alterações. Apenas uma thread lê o log por vez; as demais seguem utilizando o cache. Se o cursor foi compactado, não há como saber o que mudou e o cache é esvaziado."""
+        if self.invalidation_interval is None or time.monotonic() < self.__next_invalidation:
+            return
+        if not self.__invalidation_lock.acquire(blocking=False):
+            return
+        try:
+            self.__next_invalidation = time.monotonic() + self.invalidation_interval
+            while True:
+                if self.__last_change_sequence is None:
+                    self.cache.clear()
+                    self.__last_change_sequence, _, _ = self.repository.select_last_change_sequence()
+                    return
+                changes, error_type, _ = self.repository.select_changes(self.__last_change_sequence, self.invalidation_batch_size)
+                if error_type is not None:
+                    self.__last_change_sequence = None
+                    continue
+                for change in changes:
+                    self.cache.tombstone(self.__cache_key(change.user_id), change.version)
+                if changes:
+                    self.__last_change_sequence = changes[-1].sequence
+                if len(changes) < self.invalidation_batch_size:
+                    return
+        finally:
+            self.__invalidation_lock.release()
+
+    def create(self, first_name: str, email: str, last_name: str = None) -> Tuple[UserModel, Optional[str], Optional[str]]:
+        user, error_type, error_msg = self.repository.create(first_name=first_name, email=email, last_name=last_name)
+        if error_type is None:
+            self.cache.set_if_newer(self.__cache_key(user.id), user, user.version)
+        return (user, error_type, error_msg)
+
+    def select_all(self) -> Tuple[List[UserModel], Optional[str], Optional[str]]:
+        return self.repository.select_all()
+
+    def select_page(self, limit: int, after_id: Optional[int] = None) -> Tuple[List[UserModel], Optional[str], Optional[str]]:
+        return self.repository.select_page(limit=limit, after_id=after_id)
+
+    def select_rows(self, limit: Optional[int] = None, after_id: Optional[int] = None, fields: Optional[Sequence[str]] = None) -> Tuple[List[dict], Optional[str], Optional[str]]:
+        return self.repository.select_rows(limit, after_id, fields)
+
+    def stream_all(self, after_id: Optional[int] = None, chunk_size: int = 1000) -> Tuple[Iterator[UserModel], Optional[str], Optional[str]]:
+        return self.repository.stream_all(after_id=after_id, chunk_size=chunk_size)
+
+    def select_version(self, user_id: int) -> Tuple[Optional[Tuple[int, Optional[datetime]]], Optional[str], Optional[str]]:
+        self.__invalidate_external_changes()
+        user = self.cache.get(self.__cache_key(user_id))
+        if user is not None:
+            return ((user.version, user.updated_at), None, None)
+        return self.repository.select_version(user_id)
+
+    def select_collection_version(self) -> Tuple[Tuple[int, Optional[datetime]], Optional[str], Optional[str]]:
+        return self.repository.select_collection_version()
+
+    def select_changes(self, since: int, limit: int) -> Tuple[Optional[List[UserChangeModel]], Optional[str], Optional[str]]:
+        return self.repository.select_changes(since, limit)
+
+    def select_last_change_sequence(self) -> Tuple[int, Optional[str], Optional[str]]:
+        return self.repository.select_last_change_sequence()
+
+    def compact_changes(self, before: datetime) -> Tuple[int, Optional[str], Optional[str]]:
+        return self.repository.compact_changes(before)
+
+    def select_by_id(self, user_id: int) -> Tuple[Optional[UserModel], Optional[str], Optional[str]]:
+        self.__invalidate_external_changes()
+        user = self.cache.get(self.__cache_key(user_id))
+        if user is not None:
+            return (user, None, None)
+
+        # O preenchimento do cache lê do principal: um usuário lido de uma réplica atrasada ficaria no cache até o TTL, mesmo após a réplica se atualizar.
+        with primary_reads():
+            user, error_type, error_msg = self.repository.select_by_id(user_id)
+        # Uma escrita concluída durante a leitura já gravou no cache um usuário mais recente (ou a lápide da deleção), que não é sobrescrito.
+        if error_type is None:
+            self.cache.set_if_newer(self.__cache_key(user_id), user, user.version)
+        return (user, error_type, error_msg)
+
+    def select_row_by_id(self, user_id: int, fields: Optional[Sequence[str]] = None) -> Tuple[Optional[dict], Optional[str], Optional[str]]:
+        """Projeta o usuário do cache, quando presente; caso contrário, consulta a projeção no repositório, sem preencher o cache (que armazena apenas usuários completos)."""
+        self.__invalidate_external_changes()
+        user = self.cache.get(self.__cache_key(user_id))
+        if user is None:
+            return self.repository.select_row_by_id(user_id, fields)
+        keys = (USER_ROW_FIELDS if fields is None else tuple(fields)) + ("version", "updated_at")
+        return ({key: getattr(user, key) for key in keys}, None, None)
+
+    def select_by_email(self, email: str, limit: int = 50) -> Tuple[List[UserModel], Optional[str], Optional[str]]:
+        return self.repository.select_by_email(email, limit=limit)
+
+    def select_by_name_prefix(self, prefix: str, limit: int = 50) -> Tuple[List[UserModel], Optional[str], Optional[str]]:
+        return self.repository.select_by_name_prefix(prefix, limit=limit)
+
+    def search_full_text(self, query: str, limit: int = 50) -> Tuple[List[UserModel], Optional[str], Optional[str]]:
+        return self.repository.search_full_text(query, limit=limit)
+
+    def update(self, user_id: int, new_user_data: dict, expected_version: Optional[int] = None) -> Tuple[Optional[UserModel], Optional[str], Optional[str]]:
+        user, error_type, error_msg = self.repository.update(user_id, new_user_data, expected_version)
+        if error_type is None:
+            self.cache.set_if_newer(self.__cache_key(user_id), user, user.version)
+        else:
+            self.cache.delete(self.__cache_key(user_id))
+        return (user, error_type, error_msg)
+
+    def delete_by_id(self, user_id: int) -> Tuple[Optional[UserModel], Optional[str], Optional[str]]:
+        response = self.repository.delete_by_id(user_id)
+        self.cache.tombstone(self.__cache_key(user_id))
+        return response
+
+    def bulk_create(self, users_data: List[dict]) -> Tuple[List[Tuple[Optional[UserModel], Optional[str], Optional[str]]], Optional[str], Optional[str]]:
+        results, error_type, error_msg = self.repository.bulk_create(users_data)
+        if error_type is None:
+            self.__write_through(results)
+        return (results, error_type, error_msg)
+
+    def bulk_update(self, users_data: List[dict]) -> Tuple[List[Tuple[Optional[UserModel], Optional[str], Optional[str]]], Optional[str], Optional[str]]:
+        results, error_type, error_msg = self.repository.bulk_update(users_data)
+        if error_type is None:
+            self.__write_through(results)
+        else:
+            for user_data in users_data:
+                self.cache.delete(self.__cache_key(user_data["id"]))
+        return (results, error_type, error_msg)
+
+    def bulk_delete(self, user_ids: List[int]) -> Tuple[List[Tuple[Optional[UserModel], Optional[str], Optional[str]]], Optional[str], Optional[str]]:
+        response = self.repository.bulk_delete(user_ids)
+        for user_id in user_ids:
+            self.cache.tombstone(self.__cache_key(user_id))
+        return response
+
+    def __write_through(self, results: List[Tuple[Optional[UserModel], Optional[str], Optional[str]]]) -> None:
+        for user, item_error_type, _ in results:
+            if item_error_type is None:
+                self.cache.set_if_newer(self.__cache_key(user.id), user, user.version)
+
+    def close(self) -> None:
+        self.repository.close()
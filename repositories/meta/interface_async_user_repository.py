@@ -0,0 +1,168 @@
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Tuple, Optional, List, AsyncIterator, Sequence
+from models.user_model import UserModel, UserChangeModel
+
+
+class IAsyncUserRepository(ABC):
+    """Interface que representa uma visão genérica e assíncrona do repositório de Usuário, com os mesmos contratos da IUserRepository, mas com operações aguardáveis (awaitable) que não bloqueiam o event loop.
+
+        Estabelece dependência com a camada de serviço assíncrona que iteraje com a entidade usuário (User).
+    """
+    @abstractmethod
+    async def create(self, first_name: str, email: str, last_name: str = None) -> Tuple[UserModel, Optional[str], Optional[str]]:
+        """Versão assíncrona de IUserRepository.create.
+
+        Args:
+            first_name (str): Primeiro nome do usuário
+            email (str): Email atrelado ao usuário
+            last_name (str, optional): Sobrenome do usuário. Padrão para None.
+
+        Returns:
+            Tuple[UserModel, Optional[str], Optional[str]]: Tupla que conterá o objeto usuário criado (UserModel), título de erro (str) e descrição de erro (str), respectivamente.
+        """
+        pass
+
+    @abstractmethod
+    async def select_all(self) -> Tuple[List[UserModel], Optional[str], Optional[str]]:
+        """Versão assíncrona de IUserRepository.select_all.
+
+        Returns:
+            Tuple[List[UserModel], Optional[str], Optional[str]]: Tupla que conterá a lista de objetos usuário selecionados (List[UserModel]), título de erro (str) e descrição de erro (str), respectivamente.
+        """
+        pass
+
+    @abstractmethod
+    async def select_page(self, limit: int, after_id: Optional[int] = None) -> Tuple[List[UserModel], Optional[str], Optional[str]]:
+        """Versão assíncrona de IUserRepository.select_page.
+
+        Args:
+            limit (int): Quantidade máxima de usuários retornados na página.
+            after_id (int, optional): Último id recebido na página anterior. Padrão para None (primeira página).
+
+        Returns:
+            Tuple[List[UserModel], Optional[str], Optional[str]]: Tupla que conterá a lista de objetos usuário da página (List[UserModel]), título de erro (str) e descrição de erro (str), respectivamente.
+        """
+        pass
+
+    @abstractmethod
+    async def select_rows(self, limit: Optional[int] = None, after_id: Optional[int] = None, fields: Optional[Sequence[str]] = None) -> Tuple[List[dict], Optional[str], Optional[str]]:
+        """Versão assíncrona de IUserRepository.select_rows."""
+        pass
+
+    @abstractmethod
+    async def stream_all(self, after_id: Optional[int] = None, chunk_size: int = 1000) -> Tuple[AsyncIterator[UserModel], Optional[str], Optional[str]]:
+        """Versão assíncrona de IUserRepository.stream_all, retornando um iterador assíncrono (async for) que carrega os registros em blocos.
+
+        Args:
+            after_id (int, optional): Apenas usuários com id maior que esse valor serão selecionados. Padrão para None.
+            chunk_size (int, optional): Quantidade de registros carregados do cursor a cada bloco. Padrão para 1000.
+
+        Returns:
+            Tuple[AsyncIterator[UserModel], Optional[str], Optional[str]]: Tupla que conterá o iterador assíncrono de objetos usuário, título de erro (str) e descrição de erro (str), respectivamente.
+        """
+        pass
+
+    @abstractmethod
+    async def select_version(self, user_id: int) -> Tuple[Optional[Tuple[int, Optional[datetime]]], Optional[str], Optional[str]]:
+        """Versão assíncrona de IUserRepository.select_version."""
+        pass
+
+    @abstractmethod
+    async def select_collection_version(self) -> Tuple[Tuple[int, Optional[datetime]], Optional[str], Optional[str]]:
+        """Versão assíncrona de IUserRepository.select_collection_version."""
+        pass
+
+    @abstractmethod
+    async def select_changes(self, since: int, limit: int) -> Tuple[Optional[List[UserChangeModel]], Optional[str], Optional[str]]:
+        """Versão assíncrona de IUserRepository.select_changes."""
+        pass
+
+    @abstractmethod
+    async def select_last_change_sequence(self) -> Tuple[int, Optional[str], Optional[str]]:
+        """Versão assíncrona de IUserRepository.select_last_change_sequence."""
+        pass
+
+    @abstractmethod
+    async def compact_changes(self, before: datetime) -> Tuple[int, Optional[str], Optional[str]]:
+        """Versão assíncrona de IUserRepository.compact_changes."""
+        pass
+
+    @abstractmethod
+    async def select_by_id(self, user_id: int) -> Tuple[Optional[UserModel], Optional[str], Optional[str]]:
+        """Versão assíncrona de IUserRepository.select_by_id.
+
+        Args:
+            user_id (int): ID do usuário (User) que deseja selecionar.
+
+        Returns:
+            Tuple[Optional[UserModel], Optional[str], Optional[str]]: Tupla que conterá o objeto usuário selecionado (UserModel), título de erro (str) e descrição de erro (str), respectivamente.
+        """
+        pass
+
+    @abstractmethod
+    async def select_row_by_id(self, user_id: int, fields: Optional[Sequence[str]] = None) -> Tuple[Optional[dict], Optional[str], Optional[str]]:
+        """Versão assíncrona de IUserRepository.select_row_by_id."""
+        pass
+
+    @abstractmethod
+    async def select_by_email(self, email: str, limit: int = 50) -> Tuple[List[UserModel], Optional[str], Optional[str]]:
+        """Versão assíncrona de IUserRepository.select_by_email."""
+        pass
+
+    @abstractmethod
+    async def select_by_name_prefix(self, prefix: str, limit: int = 50) -> Tuple[List[UserModel], Optional[str], Optional[str]]:
+        """Versão assíncrona de IUserRepository.select_by_name_prefix."""
+        pass
+
+    @abstractmethod
+    async def search_full_text(self, query: str, limit: int = 50) -> Tuple[List[UserModel], Optional[str], Optional[str]]:
+        """Versão assíncrona de IUserRepository.search_full_text."""
+        pass
+
+    @abstractmethod
+    async def update(self, user_id: int, new_user_data: dict, expected_version: Optional[int] = None) -> Tuple[Optional[UserModel], Optional[str], Optional[str]]:
+        """Versão assíncrona de IUserRepository.update.
+
+        Args:
+            user_id (int): ID do usuário (User) que deseja realizar alguma atualicação no valor de atributo.
+            new_user_data(dict): Dicionário com os atributos e seus novos valores para serem atualizados. Os atributos faltantes serão considerados como inalterados.
+            expected_version (int, optional): Versão esperada do usuário (concorrência otimista). Padrão para None.
+
+        Returns:
+            Tuple[Optional[UserModel], Optional[str], Optional[str]]: Tupla que conterá o objeto usuário atualizado (UserModel), título de erro (str) e descrição de erro (str), respectivamente.
+        """
+        pass
+
+    @abstractmethod
+    async def delete_by_id(self, user_id: int) -> Tuple[Optional[UserModel], Optional[str], Optional[str]]:
+        """Versão assíncrona de IUserRepository.delete_by_id.
+
+        Args:
+            user_id (int): ID do usuário (User) que deseja deletar.
+
+        Returns:
+            Tuple[Optional[UserModel], Optional[str], Optional[str]]: Tupla que conterá o objeto usuário deletado do banco de dados (UserModel), título de erro (str) e descrição de erro (str), respectivamente.
+        """
+        pass
+
+
+    @abstractmethod
+    async def bulk_create(self, users_data: List[dict]) -> Tuple[List[Tuple[Optional[UserModel], Optional[str], Optional[str]]], Optional[str], Optional[str]]:
+        """Versão assíncrona de IUserRepository.bulk_create."""
+        pass
+
+    @abstractmethod
+    async def bulk_update(self, users_data: List[dict]) -> Tuple[List[Tuple[Optional[UserModel], Optional[str], Optional[str]]], Optional[str], Optional[str]]:
+        """Versão assíncrona de IUserRepository.bulk_update."""
+        pass
+
+    @abstractmethod
+    async def bulk_delete(self, user_ids: List[int]) -> Tuple[List[Tuple[Optional[UserModel], Optional[str], Optional[str]]], Optional[str], Optional[str]]:
+        """Versão assíncrona de IUserRepository.bulk_delete."""
+        pass
+
+    @abstractmethod
+    async def close(self) -> None:
+        """Versão assíncrona de IUserRepository.close."""
+        pass
@@ -1,6 +1,7 @@
 from abc import ABC, abstractmethod
-from typing import Tuple, Optional, List
-from models.user_model import UserModel
+from datetime import datetime
+from typing import Tuple, Optional, List, Iterator, Sequence
+from models.user_model import UserModel, UserChangeModel
 
 
 class IUserRepository(ABC):
@@ -31,6 +32,103 @@ class IUserRepository(ABC):
         """
         pass
 
+    @abstractmethod
+    def select_page(self, limit: int, after_id: Optional[int] = None) -> Tuple[List[UserModel], Optional[str], Optional[str]]:
+        """Seleciona uma página de usuários (User) ordenados pelo id, utilizando paginação por cursor (keyset) em vez de offset. Assim, o custo de cada página independe da posição dela na tabela.
+
+        Args:
+            limit (int): Quantidade máxima de usuários retornados na página.
+            after_id (int, optional): Cursor da página, sendo o último id recebido na página anterior. Apenas usuários com id maior que esse valor serão selecionados. Padrão para None (primeira página).
+
+        Returns:
+            Tuple[List[UserModel], Optional[str], Optional[str]]: Tupla que conterá a lista de objetos usuário da página (List[UserModel]), título de erro (str) e descrição de erro (str), respectivamente. Uma lista vazia indica que não existem mais páginas.
+        """
+        pass
+
+    @abstractmethod
+    def select_rows(self, limit: Optional[int] = None, after_id: Optional[int] = None, fields: Optional[Sequence[str]] = None) -> Tuple[List[dict], Optional[str], Optional[str]]:
+        """Seleciona usuários (User) ordenados pelo id como dicionários simples (id, first_name, last_name, email), projetando apenas as colunas, sem construir objetos ORM nem registrá-los no identity map da sessão. Utilizado pelo modo de resposta rápida e pelas projeções (fields=), em que os registros são serializados diretamente.
+
+        Args:
+            limit (int, optional): Quantidade máxima de usuários retornados. Padrão para None (todos os usuários).
+            after_id (int, optional): Cursor da página (último id recebido). Padrão para None (a partir do início).
+            fields (Sequence[str], optional): Campos selecionados (subconjunto de USER_ROW_FIELDS, já validado), que serão as chaves dos dicionários, na ordem informada. Padrão para None (todos os campos).
+
+        Returns:
+            Tuple[List[dict], Optional[str], Optional[str]]: Tupla que conterá a lista de usuários como dicionários, título de erro (str) e descrição de erro (str), respectivamente.
+        """
+        pass
+
+    @abstractmethod
+    def stream_all(self, after_id: Optional[int] = None, chunk_size: int = 1000) -> Tuple[Iterator[UserModel], Optional[str], Optional[str]]:
+        """Seleciona todos os usuários (User) ordenados pelo id de forma preguiçosa (lazy), utilizando um cursor no banco de dados que carrega os registros em blocos (chunks). O uso de memória se mantém constante independente do tamanho da tabela.
+
+        A sessão com o banco de dados permanece aberta enquanto o iterador estiver sendo consumido, sendo encerrada ao final da iteração (ou quando o iterador for fechado).
+
+        Args:
+            after_id (int, optional): Apenas usuários com id maior que esse valor serão selecionados. Padrão para None (todos os usuários).
+            chunk_size (int, optional): Quantidade de registros carregados do cursor a cada bloco. Padrão para 1000.
+
+        Returns:
+            Tuple[Iterator[UserModel], Optional[str], Optional[str]]: Tupla que conterá o iterador de objetos usuário (Iterator[UserModel]), título de erro (str) e descrição de erro (str), respectivamente.
+        """
+        pass
+
+    @abstractmethod
+    def select_version(self, user_id: int) -> Tuple[Optional[Tuple[int, Optional[datetime]]], Optional[str], Optional[str]]:
+        """Seleciona apenas a versão e a data da última alteração (updated_at) de um usuário (User), sem carregar o objeto. Utilizado para responder requisições condicionais (If-None-Match) sem hidratar o usuário.
+
+        Args:
+            user_id (int): ID do usuário (User).
+
+        Returns:
+            Tuple[Optional[Tuple[int, Optional[datetime]]], Optional[str], Optional[str]]: Tupla que conterá (versão, updated_at), título de erro (str) e descrição de erro (str), respectivamente.
+        """
+        pass
+
+    @abstractmethod
+    def select_collection_version(self) -> Tuple[Tuple[int, Optional[datetime]], Optional[str], Optional[str]]:
+        """Seleciona a versão da coleção de usuários e a data da última alteração, incrementada a cada inserção, atualização ou deleção na tabela user. Utilizado para responder a listagem com 304 quando nada mudou.
+
+        Returns:
+            Tuple[Tuple[int, Optional[datetime]], Optional[str], Optional[str]]: Tupla que conterá (versão, updated_at), título de erro (str) e descrição de erro (str), respectivamente.
+        """
+        pass
+
+    @abstractmethod
+    def select_changes(self, since: int, limit: int) -> Tuple[Optional[List[UserChangeModel]], Optional[str], Optional[str]]:
+        """Seleciona as entradas do log de alterações de usuários posteriores à sequência informada, em ordem de sequência.
+
+        Args:
+            since (int): Última sequência já consumida. As entradas retornadas terão sequência maior que ela.
+            limit (int): Quantidade máxima de entradas.
+
+        Returns:
+            Tuple[Optional[List[UserChangeModel]], Optional[str], Optional[str]]: Tupla que conterá a lista de alterações, título de erro (str) e descrição de erro (str), respectivamente. Retorna o erro ChangesCompacted quando entradas posteriores a since já foram removidas pela compactação.
+        """
+        pass
+
+    @abstractmethod
+    def select_last_change_sequence(self) -> Tuple[int, Optional[str], Optional[str]]:
+        """Seleciona a sequência da última entrada do log de alterações (0 se o log estiver vazio). Utilizado como ponto de partida da sincronização incremental após uma cópia completa dos usuários.
+
+        Returns:
+            Tuple[int, Optional[str], Optional[str]]: Tupla que conterá a última sequência, título de erro (str) e descrição de erro (str), respectivamente.
+        """
+        pass
+
+    @abstractmethod
+    def compact_changes(self, before: datetime) -> Tuple[int, Optional[str], Optional[str]]:
+        """Remove do log de alterações as entradas anteriores à data informada, preservando sempre a entrada mais recente, e registra a marca d'água da compactação.
+
+        Args:
+            before (datetime): Data limite (UTC). Entradas alteradas antes dela são removidas.
+
+        Returns:
+            Tuple[int, Optional[str], Optional[str]]: Tupla que conterá a quantidade de entradas removidas, título de erro (str) e descrição de erro (str), respectivamente.
+        """
+        pass
+
     @abstractmethod
     def select_by_id(self, user_id: int) -> Tuple[Optional[UserModel], Optional[str], Optional[str]]:
         """Seleciona usuário (User) pelo id especifico
@@ -44,12 +142,65 @@ class IUserRepository(ABC):
         pass
 
     @abstractmethod
-    def update(self, user_id: int, new_user_data: dict) -> Tuple[Optional[UserModel], Optional[str], Optional[str]]:
-        """Atualiza alguma informação de usuário (User) pelo id especifico dentro dos atributos disponiveis (first_name: str, last_name: str, email: str)
+    def select_row_by_id(self, user_id: int, fields: Optional[Sequence[str]] = None) -> Tuple[Optional[dict], Optional[str], Optional[str]]:
+        """Seleciona um usuário (User) pelo id como dicionário simples, projetando apenas as colunas informadas, sem construir o objeto ORM. O dicionário também contém a versão (version) e a data da última alteração (updated_at), utilizadas nos cabeçalhos de validação de cache.
+
+        Args:
+            user_id (int): ID do usuário (User) que deseja selecionar.
+            fields (Sequence[str], optional): Campos selecionados (subconjunto de USER_ROW_FIELDS, já validado). Padrão para None (todos os campos).
+
+        Returns:
+            Tuple[Optional[dict], Optional[str], Optional[str]]: Tupla que conterá o usuário como dicionário, título de erro (str) e descrição de erro (str), respectivamente. Caso o usuário não exista, retorna o erro UserDoesNotExist.
+        """
+        pass
+
+    @abstractmethod
+    def select_by_email(self, email: str, limit: int = 50) -> Tuple[List[UserModel], Optional[str], Optional[str]]:
+        """Seleciona os usuários (User) com o email exato informado, utilizando o índice ix_user_email.
+
+        Args:
+            email (str): Email a ser buscado.
+            limit (int, optional): Quantidade máxima de usuários retornados. Padrão para 50.
+
+        Returns:
+            Tuple[List[UserModel], Optional[str], Optional[str]]: Tupla que conterá a lista de objetos usuário encontrados (podendo ser vazia), título de erro (str) e descrição de erro (str), respectivamente.
+        """
+        pass
+
+    @abstractmethod
+    def select_by_name_prefix(self, prefix: str, limit: int = 50) -> Tuple[List[UserModel], Optional[str], Optional[str]]:
+        """Seleciona os usuários (User) cujo primeiro nome começa com o prefixo informado, sem diferenciar maiúsculas e minúsculas, utilizando o índice ix_user_first_name_lower.
+
+        Args:
+            prefix (str): Prefixo do primeiro nome.
+            limit (int, optional): Quantidade máxima de usuários retornados. Padrão para 50.
+
+        Returns:
+            Tuple[List[UserModel], Optional[str], Optional[str]]: Tupla que conterá a lista de objetos usuário encontrados, ordenados pelo primeiro nome, título de erro (str) e descrição de erro (str), respectivamente.
+        """
+        pass
+
+    @abstractmethod
+    def search_full_text(self, query: str, limit: int = 50) -> Tuple[List[UserModel], Optional[str], Optional[str]]:
+        """Busca textual nos nomes (first_name e last_name) dos usuários (User) por meio da tabela FTS5 user_fts. Cada termo da busca é tratado como prefixo.
+
+        Args:
+            query (str): Termos da busca.
+            limit (int, optional): Quantidade máxima de usuários retornados. Padrão para 50.
+
+        Returns:
+            Tuple[List[UserModel], Optional[str], Optional[str]]: Tupla que conterá a lista de objetos usuário encontrados, ordenados por relevância, título de erro (str) e descrição de erro (str), respectivamente. Caso a busca textual não esteja habilitada no banco de dados, retorna o erro 'FullTextSearchUnavailable'.
+        """
+        pass
+
+    @abstractmethod
+    def update(self, user_id: int, new_user_data: dict, expected_version: Optional[int] = None) -> Tuple[Optional[UserModel], Optional[str], Optional[str]]:
+        """Atualiza alguma informação de usuário (User) pelo id especifico dentro dos atributos disponiveis (first_name: str, last_name: str, email: str). A versão do usuário é incrementada e o updated_at atualizado.
 
         Args:
             user_id (int): ID do usuário (User) que deseja realizar alguma atualicação no valor de atributo.
             new_user_data(dict): Dicionário com os atributos e seus novos valores para serem atualizados. Os atributos faltantes serão considerados como inalterados, mantendo o valor original.
+            expected_version (int, optional): Controle de concorrência otimista: a atualização só é aplicada se a versão atual do usuário for igual a essa. Caso contrário, retorna o erro 'VersionConflict'. Padrão para None (sem verificação).
 
         Returns:
             Tuple[UserModel, Optional[str], Optional[str]]: Tupla que conterá o objeto usuário atualizado (UserModel), título de erro (str) e descrição de erro (str), respectivamente. Em caso de erros, o campo de usuário ficará nulo e teremos o título do erro (str) seguido da descrição do erro (str).
@@ -66,4 +217,45 @@ class IUserRepository(ABC):
         Returns:
             Tuple[UserModel, Optional[str], Optional[str]]: Tupla que conterá o objeto usuário deletado do banco de dados (UserModel), título de erro (str) e descrição de erro (str), respectivamente. Em caso de erros, o campo de usuário ficará nulo e teremos o título do erro (str) seguido da descrição do erro (str).
         """
-        pass
\ No newline at end of file
+        pass
+
+    @abstractmethod
+    def bulk_create(self, users_data: List[dict]) -> Tuple[List[Tuple[Optional[UserModel], Optional[str], Optional[str]]], Optional[str], Optional[str]]:
+        """Realiza a criação de vários usuários (User) em uma única transação, utilizando um INSERT em lote (executemany) com RETURNING para obter os ids gerados.
+
+        Args:
+            users_data (List[dict]): Lista de dicionários com os atributos de cada usuário (first_name, email e, opcionalmente, last_name).
+
+        Returns:
+            Tuple[List[Tuple[Optional[UserModel], Optional[str], Optional[str]]], Optional[str], Optional[str]]: Tupla que conterá a lista de resultados por item, na mesma ordem da entrada (cada resultado no formato (UserModel, título de erro, descrição de erro)), seguida do título e descrição de erro da operação como um todo.
+        """
+        pass
+
+    @abstractmethod
+    def bulk_update(self, users_data: List[dict]) -> Tuple[List[Tuple[Optional[UserModel], Optional[str], Optional[str]]], Optional[str], Optional[str]]:
+        """Atualiza vários usuários (User) em uma única transação. Cada item deve conter o id do usuário e os atributos a serem atualizados; atributos faltantes (ou nulos) são mantidos inalterados.
+
+        Args:
+            users_data (List[dict]): Lista de dicionários contendo a chave 'id' e os novos valores de first_name, last_name e/ou email.
+
+        Returns:
+            Tuple[List[Tuple[Optional[UserModel], Optional[str], Optional[str]]], Optional[str], Optional[str]]: Tupla que conterá a lista de resultados por item, na mesma ordem da entrada (usuários inexistentes retornam 'UserDoesNotExist'), seguida do título e descrição de erro da operação como um todo.
+        """
+        pass
+
+    @abstractmethod
+    def bulk_delete(self, user_ids: List[int]) -> Tuple[List[Tuple[Optional[UserModel], Optional[str], Optional[str]]], Optional[str], Optional[str]]:
+        """Deleta vários usuários (User) pelos ids em uma única transação, utilizando DELETE com RETURNING.
+
+        Args:
+            user_ids (List[int]): Lista de ids dos usuários que serão deletados.
+
+        Returns:
+            Tuple[List[Tuple[Optional[UserModel], Optional[str], Optional[str]]], Optional[str], Optional[str]]: Tupla que conterá a lista de resultados por item, na mesma ordem da entrada (usuários inexistentes retornam 'UserDoesNotExist'), seguida do título e descrição de erro da operação como um todo.
+        """
+        pass
+
+    @abstractmethod
+    def close(self) -> None:
+        """Encerra as conexões com o banco de dados abertas pelo repositório. Chamado no encerramento da aplicação (lifespan)."""
+        pass
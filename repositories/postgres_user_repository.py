@@ -0,0 +1,99 @@
+import re
+from sqlalchemy import select, text
+from sqlalchemy.exc import ProgrammingError
+from models.user_model import UserModel
+from db.postgres_client import PostgresClient
+from typing import Tuple, Optional, List, Sequence
+from repositories.sqlite_user_repository import SQLiteUserRepository, rows_to_dicts, select_rows_statement, SELECT_ALL_STATEMENT
+from infra.instrumentation import instrument_repository
+
+
+def full_text_query_expression(query: str) -> str:
+    """Converte os termos livres da busca em uma expressão to_tsquery do PostgreSQL, tratando cada termo como prefixo (termo:*) e exigindo todos os termos (&), como a expressão MATCH do FTS5."""
+    return " & ".join(f"{term}:*" for term in re.findall(r"\w+", query))
+
+
+USER_COLUMNS_SQL = ", ".join(f'"user".{column.key}' for column in UserModel.__table__.columns)
+
+POSTGRES_FULL_TEXT_SEARCH_STATEMENT = text(
+    f'SELECT {USER_COLUMNS_SQL} FROM "user", to_tsquery(\'simple\', :query) AS query '
+    "WHERE search_vector @@ query ORDER BY ts_rank(search_vector, query) DESC, id LIMIT :limit"
+)
+
+COPY_STAGING_TABLE_STATEMENT = text(
+    "CREATE TEMPORARY TABLE user_copy_staging (position integer, first_name text, last_name text, email text) ON COMMIT DROP"
+)
+COPY_STAGING_STATEMENT = "COPY user_copy_staging (position, first_name, last_name, email) FROM STDIN"
+INSERT_FROM_STAGING_STATEMENT = text(
+    'INSERT INTO "user" (first_name, last_name, email) SELECT first_name, last_name, email FROM user_copy_staging ORDER BY position '
+    f"RETURNING {USER_COLUMNS_SQL}"
+)
+
+POSTGRES_SEARCH_FULL_TEXT_STATEMENT = select(UserModel).from_statement(POSTGRES_FULL_TEXT_SEARCH_STATEMENT)
+INSERT_USERS_FROM_STAGING_STATEMENT = select(UserModel).from_statement(INSERT_FROM_STAGING_STATEMENT)
+
+
+def copy_rows(users_data: List[dict]):
+    return ((position, user_data["first_name"], user_data.get("last_name"), user_data["email"])
+            for position, user_data in enumerate(users_data))
+
+
+@instrument_repository
+class PostgresUserRepository(SQLiteUserRepository):
+    """
+        Implementação da interface do repositório de usuário (IUserRepository) sobre o PostgreSQL (utilizando o PostgresClient), selecionada com DATABASE_BACKEND=postgres.
+
+        Reaproveita as operações via ORM do SQLiteUserRepository; são específicas do PostgreSQL a busca textual (tsvector com índice GIN), as cargas em lote (COPY) e as listagens completas por cursor do lado do servidor.
+    """
+    copy_threshold = 1000
+    listing_chunk_size = 1000
+
+    _instance = None
+    def __new__(cls, *args, **kwargs): # Singleton
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+        return cls._instance
+
+    def __init__(self) -> None:
+        self.db_client = PostgresClient()
+
+    def select_all(self) -> Tuple[List[UserModel], Optional[str], Optional[str]]:
+        with self.db_client._get_read_session() as db_session:
+            users = db_session.scalars(SELECT_ALL_STATEMENT, execution_options={"yield_per": self.listing_chunk_size})
+            return (list(users), None, None)
+
+    def select_rows(self, limit: Optional[int] = None, after_id: Optional[int] = None, fields: Optional[Sequence[str]] = None) -> Tuple[List[dict], Optional[str], Optional[str]]:
+        with self.db_client._get_read_session() as db_session:
+            statement, parameters = select_rows_statement(limit, after_id, fields)
+            execution_options = {"yield_per": self.listing_chunk_size} if limit is None else {}
+            return (rows_to_dicts(db_session.execute(statement, parameters, execution_options=execution_options), fields), None, None)
+
+    def search_full_text(self, query: str, limit: int = 50) -> Tuple[List[UserModel], Optional[str], Optional[str]]:
+        expression = full_text_query_expression(query)
+        if not expression:
+            return ([], None, None)
+
+        with self.db_client._get_read_session() as db_session:
+            try:
+                users = list(db_session.scalars(POSTGRES_SEARCH_FULL_TEXT_STATEMENT, {"query": expression, "limit": limit}))
+            except ProgrammingError as error:
+                if "search_vector" not in str(error):
+                    raise
+                return (None, "FullTextSearchUnavailable", "Full text search index (search_vector) is not enabled in the database.")
+            return (users, None, None)
+
+    def bulk_create(self, users_data: List[dict]) -> Tuple[List[Tuple[Optional[UserModel], Optional[str], Optional[str]]], Optional[str], Optional[str]]:
+        if len(users_data) < self.copy_threshold:
+            return super().bulk_create(users_data)
+
+        with self.db_client._get_session() as db_session:
+            db_session.execute(COPY_STAGING_TABLE_STATEMENT)
+            with db_session.connection().connection.cursor() as cursor:
+                with cursor.copy(COPY_STAGING_STATEMENT) as copy:
+                    for row in copy_rows(users_data):
+                        copy.write_row(row)
+            # Ver SQLiteUserRepository.bulk_create sobre a ordenação pelo id.
+            users = sorted(db_session.scalars(INSERT_USERS_FROM_STAGING_STATEMENT).all(),
+                           key=lambda user: user.id)
+            db_session.commit()
+            return ([(user, None, None) for user in users], None, None)
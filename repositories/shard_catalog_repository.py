@@ -0,0 +1,72 @@
+from typing import List, Optional, Tuple
+from sqlalchemy import select, update
+from sqlalchemy.exc import OperationalError
+from db.shard_catalog_client import ShardCatalogBase, ShardCatalogClient
+from models.shard_model import UserIdAllocatorModel, UserShardSlotModel
+
+
+def catalog_not_initialized() -> Tuple[None, str, str]:
+    return (None, "ShardCatalogNotInitialized", "The shard catalog has no slots. Run 'python -m db.rebalance_shards init' first.")
+
+
+class ShardCatalogRepository:
+    """
+        Repositório do catálogo dos shards de usuários (ShardCatalogClient): mapa de slots e alocador global de ids. Não é singleton, pois cada ShardedUserRepository (e o db/rebalance_shards.py) utiliza o próprio catálogo.
+    """
+
+    def __init__(self, catalog_file: Optional[str] = None) -> None:
+        self.db_client = ShardCatalogClient(catalog_file)
+
+    def initialize(self, shard_files: List[str], slot_count: int, next_id: int = 1) -> Tuple[Optional[List[str]], Optional[str], Optional[str]]:
+        """Cria o catálogo e distribui os slots entre os shards (slot % quantidade de shards).
+
+        Returns:
+            Tuple[Optional[List[str]], Optional[str], Optional[str]]: Mapa de slots criado, ou o erro ShardCatalogAlreadyInitialized caso o catálogo já possua slots.
+        """
+        ShardCatalogBase.metadata.create_all(self.db_client._engine)
+        with self.db_client._get_session() as db_session:
+            if db_session.scalar(select(UserShardSlotModel.slot).limit(1)) is not None:
+                return (None, "ShardCatalogAlreadyInitialized", "The shard catalog already has a slot map.")
+            slot_map = [shard_files[slot % len(shard_files)] for slot in range(slot_count)]
+            db_session.add_all(UserShardSlotModel(slot=slot, shard_file=shard_file) for slot, shard_file in enumerate(slot_map))
+            db_session.merge(UserIdAllocatorModel(id=1, next_id=next_id))
+            db_session.commit()
+            return (slot_map, None, None)
+
+    def select_slot_map(self) -> Tuple[Optional[List[str]], Optional[str], Optional[str]]:
+        """Recupera o mapa de slots: na posição N, o arquivo do shard que armazena o slot N."""
+        with self.db_client._get_session() as db_session:
+            try:
+                slot_map = list(db_session.scalars(select(UserShardSlotModel.shard_file).order_by(UserShardSlotModel.slot)))
+            except OperationalError as error:
+                if "no such table" not in str(error):
+                    raise
+                slot_map = []
+            if not slot_map:
+                return catalog_not_initialized()
+            return (slot_map, None, None)
+
+    def assign_slots(self, slots: List[int], shard_file: str) -> Tuple[List[int], Optional[str], Optional[str]]:
+        with self.db_client._get_session() as db_session:
+            db_session.execute(update(UserShardSlotModel).where(UserShardSlotModel.slot.in_(slots)).values(shard_file=shard_file))
+            db_session.commit()
+            return (slots, None, None)
+
+    def allocate_ids(self, count: int) -> Tuple[Optional[range], Optional[str], Optional[str]]:
+        """Reserva count ids consecutivos, em uma única transação do catálogo.
+
+        Returns:
+            Tuple[Optional[range], Optional[str], Optional[str]]: Intervalo de ids reservado.
+        """
+        with self.db_client._get_session() as db_session:
+            next_id = db_session.scalar(update(UserIdAllocatorModel)
+                                        .where(UserIdAllocatorModel.id == 1)
+                                        .values(next_id=UserIdAllocatorModel.next_id + count)
+                                        .returning(UserIdAllocatorModel.next_id))
+            if next_id is None:
+                return catalog_not_initialized()
+            db_session.commit()
+            return (range(next_id - count, next_id), None, None)
+
+    def close(self) -> None:
+        self.db_client._engine.dispose()
@@ -0,0 +1,237 @@
+import heapq
+import itertools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+from models.user_model import UserModel, UserChangeModel
+from db.sqllite_client import SqLiteClient
+from repositories.meta.interface_user_repository import IUserRepository
+from repositories.sqlite_user_repository import SQLiteUserRepository, INSERT_USER_STATEMENT
+from repositories.shard_catalog_repository import ShardCatalogRepository
+from infra.instrumentation import instrument_repository
+from infra.settings import get_settings
+
+
+def changes_unavailable() -> Tuple[None, str, str]:
+    return (None, "ChangesUnavailable", "The change feed is not available with sharded user storage.")
+
+
+def interleave(results: List[List[UserModel]]) -> Iterator[UserModel]:
+    """Intercala os resultados dos shards (1º de cada shard, 2º de cada shard, ...), preservando a ordem de relevância de cada um."""
+    for users in itertools.zip_longest(*results):
+        yield from (user for user in users if user is not None)
+
+
+class ShardIdAllocator:
+    """Aloca ids globalmente únicos reservando blocos de block_size ids no catálogo (hi/lo): apenas uma transação no catálogo a cada block_size criações. Ids de um bloco não utilizado até o fim do processo são descartados (lacunas na sequência)."""
+
+    def __init__(self, catalog: ShardCatalogRepository, block_size: int) -> None:
+        self.catalog = catalog
+        self.block_size = block_size
+        self.__block = iter(())
+        self.__lock = threading.Lock()
+
+    def allocate(self, count: int) -> List[int]:
+        with self.__lock:
+            user_ids = list(itertools.islice(self.__block, count))
+            if len(user_ids) < count:
+                block, error_type, error_msg = self.catalog.allocate_ids(max(self.block_size, count - len(user_ids)))
+                if error_type is not None:
+                    raise RuntimeError(error_msg)
+                self.__block = iter(block)
+                user_ids.extend(itertools.islice(self.__block, count - len(user_ids)))
+            return user_ids
+
+
+@instrument_repository
+class SQLiteUserShardRepository(SQLiteUserRepository):
+    """
+        SQLiteUserRepository de um único shard (arquivo SQLite), utilizado pelo ShardedUserRepository. Não é singleton: há uma instância por arquivo. Os ids dos usuários são atribuídos pelo ShardedUserRepository e gravados explicitamente (insert_users).
+    """
+
+    def __new__(cls, *args, **kwargs):
+        return object.__new__(cls)
+
+    def __init__(self, shard_file: str, profile: Optional[str] = None) -> None:
+        self.shard_file = shard_file
+        self.db_client = SqLiteClient(profile=profile, replica_files=[], database_file=shard_file)
+
+    def insert_users(self, users_data: List[dict]) -> Tuple[List[UserModel], Optional[str], Optional[str]]:
+        """Insere os usuários com os ids informados (chave id de cada dicionário), em uma única transação."""
+        with self.db_client._get_session() as db_session:
+            users = db_session.scalars(INSERT_USER_STATEMENT, users_data).all()
+            db_session.commit()
+            return (users, None, None)
+
+
+@instrument_repository
+class ShardedUserRepository(IUserRepository):
+    """
+        Implementação da interface do repositório de usuário (IUserRepository) que distribui os usuários entre vários arquivos SQLite (shards), selecionada com DATABASE_BACKEND=sqlite_sharded.
+
+        O usuário de id N pertence ao slot N % (quantidade de slots), e o catálogo define o arquivo de cada slot e aloca os ids em blocos. Operações por id acessam apenas o shard do usuário; listagens e buscas consultam todos os shards e intercalam os resultados pelo id. O log de alterações não está disponível (ChangesUnavailable).
+
+        Args:
+            catalog_file (str, optional): Arquivo do catálogo dos shards. Padrão para USER_SHARD_CATALOG_FILE.
+            profile (str, optional): Perfil de engine do SQLite dos shards. Padrão para SQLITE_PROFILE.
+    """
+    _instance = None
+    def __new__(cls, *args, **kwargs): # Singleton
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+        return cls._instance
+
+    def __init__(self, catalog_file: Optional[str] = None, profile: Optional[str] = None) -> None:
+        settings = get_settings()
+        self.catalog = ShardCatalogRepository(catalog_file)
+        slot_map, error_type, error_msg = self.catalog.select_slot_map()
+        if error_type is not None:
+            raise ValueError(error_msg)
+        self.slot_map = slot_map
+        self.shards = {shard_file: SQLiteUserShardRepository(shard_file, profile) for shard_file in dict.fromkeys(slot_map)}
+        self.id_allocator = ShardIdAllocator(self.catalog, settings.user_shard_id_block_size)
+        self.executor = ThreadPoolExecutor(max_workers=len(self.shards), thread_name_prefix="user-shard")
+
+    def shard_for(self, user_id: int) -> SQLiteUserShardRepository:
+        return self.shards[self.slot_map[user_id % len(self.slot_map)]]
+
+    def __scatter(self, call: Callable[[SQLiteUserShardRepository], tuple]) -> List[tuple]:
+        """Executa a chamada em todos os shards concorrentemente e retorna os resultados na ordem dos shards."""
+        futures = [self.executor.submit(call, shard) for shard in self.shards.values()]
+        return [future.result() for future in futures]
+
+    def __group_by_shard(self, items: Iterable, user_id_of: Callable) -> Dict[SQLiteUserShardRepository, List[Tuple[int, object]]]:
+        groups = {}
+        for position, item in enumerate(items):
+            groups.setdefault(self.shard_for(user_id_of(item)), []).append((position, item))
+        return groups
+
+    def __gather_bulk(self, items: list, user_id_of: Callable, call: Callable) -> Tuple[list, Optional[str], Optional[str]]:
+        """Executa uma operação em lote agrupada por shard, concorrentemente, e devolve os resultados por item na ordem da entrada. Apenas os itens de um shard que falhou recebem o erro, pois os demais shards já confirmaram as suas transações."""
+        groups = self.__group_by_shard(items, user_id_of)
+        futures = {shard: self.executor.submit(call, shard, [item for _, item in group]) for shard, group in groups.items()}
+        results = [None] * len(items)
+        for shard, group in groups.items():
+            try:
+                shard_results, error_type, error_msg = futures[shard].result()
+            except Exception as error:
+                shard_results, error_type, error_msg = ([], "UnexpectedError", f"{error.__class__.__name__}: {error}")
+            if error_type is not None:
+                shard_results = [(None, error_type, error_msg)] * len(group)
+            for (position, _), result in zip(group, shard_results):
+                results[position] = result
+        return (results, None, None)
+
+    def __first_error(self, results: List[tuple]) -> Optional[Tuple[None, str, str]]:
+        for _, error_type, error_msg in results:
+            if error_type is not None:
+                return (None, error_type, error_msg)
+        return None
+
+    def __merge(self, results: List[tuple], key: Callable, limit: Optional[int] = None) -> Tuple[Optional[list], Optional[str], Optional[str]]:
+        error = self.__first_error(results)
+        if error is not None:
+            return error
+        merged = heapq.merge(*(items for items, _, _ in results), key=key)
+        return (list(itertools.islice(merged, limit)), None, None)
+
+    def create(self, first_name: str, email: str, last_name: str = None) -> Tuple[UserModel, Optional[str], Optional[str]]:
+        user_id, = self.id_allocator.allocate(1)
+        users, error_type, error_msg = self.shard_for(user_id).insert_users([{"id": user_id, "first_name": first_name,
+                                                                               "last_name": last_name, "email": email}])
+        if error_type is not None:
+            return (None, error_type, error_msg)
+        return (users[0], None, None)
+
+    def select_all(self) -> Tuple[List[UserModel], Optional[str], Optional[str]]:
+        results = self.__scatter(lambda shard: shard.select_all())
+        # O select_all de cada shard não é ordenado pelo id: os resultados são ordenados após a junção, e não intercalados (__merge).
+        error = self.__first_error(results)
+        if error is not None:
+            return error
+        return (sorted(itertools.chain.from_iterable(users for users, _, _ in results), key=lambda user: user.id), None, None)
+
+    def select_page(self, limit: int, after_id: Optional[int] = None) -> Tuple[List[UserModel], Optional[str], Optional[str]]:
+        return self.__merge(self.__scatter(lambda shard: shard.select_page(limit, after_id)), key=lambda user: user.id, limit=limit)
+
+    def select_rows(self, limit: Optional[int] = None, after_id: Optional[int] = None, fields: Optional[Sequence[str]] = None) -> Tuple[List[dict], Optional[str], Optional[str]]:
+        return self.__merge(self.__scatter(lambda shard: shard.select_rows(limit, after_id, fields)), key=lambda row: row["id"], limit=limit)
+
+    def stream_all(self, after_id: Optional[int] = None, chunk_size: int = 1000) -> Tuple[Iterator[UserModel], Optional[str], Optional[str]]:
+        """Intercala pelo id os cursores de todos os shards, consumidos sob demanda (sem a thread pool), mantendo em memória apenas um bloco por shard."""
+        iterators = [shard.stream_all(after_id=after_id, chunk_size=chunk_size)[0] for shard in self.shards.values()]
+        return (heapq.merge(*iterators, key=lambda user: user.id), None, None)
+
+    def select_version(self, user_id: int) -> Tuple[Optional[Tuple[int, Optional[datetime]]], Optional[str], Optional[str]]:
+        return self.shard_for(user_id).select_version(user_id)
+
+    def select_collection_version(self) -> Tuple[Tuple[int, Optional[datetime]], Optional[str], Optional[str]]:
+        versions = [version for version, _, _ in self.__scatter(lambda shard: shard.select_collection_version())]
+        updated_at = [updated_at for _, updated_at in versions if updated_at is not None]
+        return ((sum(version for version, _ in versions), max(updated_at, default=None)), None, None)
+
+    def select_changes(self, since: int, limit: int) -> Tuple[Optional[List[UserChangeModel]], Optional[str], Optional[str]]:
+        return changes_unavailable()
+
+    def select_last_change_sequence(self) -> Tuple[int, Optional[str], Optional[str]]:
+        return changes_unavailable()
+
+    def compact_changes(self, before: datetime) -> Tuple[int, Optional[str], Optional[str]]:
+        results = self.__scatter(lambda shard: shard.compact_changes(before))
+        return (sum(deleted for deleted, _, _ in results), None, None)
+
+    def select_by_id(self, user_id: int) -> Tuple[Optional[UserModel], Optional[str], Optional[str]]:
+        return self.shard_for(user_id).select_by_id(user_id)
+
+    def select_row_by_id(self, user_id: int, fields: Optional[Sequence[str]] = None) -> Tuple[Optional[dict], Optional[str], Optional[str]]:
+        return self.shard_for(user_id).select_row_by_id(user_id, fields)
+
+    def select_by_email(self, email: str, limit: int = 50) -> Tuple[List[UserModel], Optional[str], Optional[str]]:
+        return self.__merge(self.__scatter(lambda shard: shard.select_by_email(email, limit=limit)), key=lambda user: user.id, limit=limit)
+
+    def select_by_name_prefix(self, prefix: str, limit: int = 50) -> Tuple[List[UserModel], Optional[str], Optional[str]]:
+        return self.__merge(self.__scatter(lambda shard: shard.select_by_name_prefix(prefix, limit=limit)),
+                            key=lambda user: (user.first_name.lower(), user.id), limit=limit)
+
+    def search_full_text(self, query: str, limit: int = 50) -> Tuple[List[UserModel], Optional[str], Optional[str]]:
+        results = self.__scatter(lambda shard: shard.search_full_text(query, limit=limit))
+        error = self.__first_error(results)
+        if error is not None:
+            return error
+        return (list(itertools.islice(interleave([users for users, _, _ in results]), limit)), None, None)
+
+    def update(self, user_id: int, new_user_data: dict, expected_version: Optional[int] = None) -> Tuple[Optional[UserModel], Optional[str], Optional[str]]:
+        return self.shard_for(user_id).update(user_id, new_user_data, expected_version)
+
+    def delete_by_id(self, user_id: int) -> Tuple[Optional[UserModel], Optional[str], Optional[str]]:
+        return self.shard_for(user_id).delete_by_id(user_id)
+
+    def bulk_create(self, users_data: List[dict]) -> Tuple[List[Tuple[Optional[UserModel], Optional[str], Optional[str]]], Optional[str], Optional[str]]:
+        if not users_data:
+            return ([], None, None)
+
+        users_data = [{"id": user_id,
+                       "first_name": user_data["first_name"],
+                       "last_name": user_data.get("last_name"),
+                       "email": user_data["email"]} for user_id, user_data in zip(self.id_allocator.allocate(len(users_data)), users_data)]
+
+        def insert_users(shard: SQLiteUserShardRepository, shard_users_data: List[dict]):
+            users, error_type, error_msg = shard.insert_users(shard_users_data)
+            if error_type is not None:
+                return ([], error_type, error_msg)
+            users_by_id = {user.id: user for user in users}
+            return ([(users_by_id[user_data["id"]], None, None) for user_data in shard_users_data], None, None)
+        return self.__gather_bulk(users_data, lambda user_data: user_data["id"], insert_users)
+
+    def bulk_update(self, users_data: List[dict]) -> Tuple[List[Tuple[Optional[UserModel], Optional[str], Optional[str]]], Optional[str], Optional[str]]:
+        return self.__gather_bulk(users_data, lambda user_data: user_data["id"], lambda shard, items: shard.bulk_update(items))
+
+    def bulk_delete(self, user_ids: List[int]) -> Tuple[List[Tuple[Optional[UserModel], Optional[str], Optional[str]]], Optional[str], Optional[str]]:
+        return self.__gather_bulk(user_ids, lambda user_id: user_id, lambda shard, items: shard.bulk_delete(items))
+
+    def close(self) -> None:
+        self.executor.shutdown(wait=True)
+        for shard in self.shards.values():
+            shard.close()
+        self.catalog.close()
@@ -1,13 +1,250 @@
-from models.user_model import UserModel
+import re
+import sys
+from datetime import datetime
+from functools import lru_cache
+from sqlalchemy import select, insert, update, delete, func, text, bindparam, Select, Update
+from sqlalchemy.exc import OperationalError
+from models.user_model import UnicodeLower, UserModel, UserChangeModel, UserChangeCompactionModel, UserCollectionVersionModel, USER_ROW_FIELDS, utc_now
 from db.sqllite_client import SqLiteClient
-from typing import Tuple, Optional, List
+from typing import Tuple, Optional, List, Iterator, Sequence
 from repositories.meta.interface_user_repository import IUserRepository
+from infra.instrumentation import instrument_repository
+from infra.read_consistency import primary_reads
 
 
+def name_prefix_upper_bound(prefix: str) -> Optional[str]:
+    """Calcula o menor texto maior que todos os textos iniciados pelo prefixo, permitindo transformar a busca por prefixo em uma busca por intervalo (prefix <= valor < limite) que utiliza o índice.
+
+    Returns:
+        Optional[str]: O limite superior, ou None quando o prefixo termina apenas em U+10FFFF (último caractere do Unicode, que não pode ser incrementado) e o intervalo não tem limite superior.
+    """
+    prefix = prefix.rstrip(chr(sys.maxunicode))
+    if not prefix:
+        return None
+    return prefix[:-1] + chr(ord(prefix[-1]) + 1)
+
+
+def full_text_match_expression(query: str) -> str:
+    """Converte os termos livres da busca em uma expressão MATCH do FTS5, tratando cada termo como prefixo e escapando a sintaxe do FTS5 (ex: aspas, operadores)."""
+    return " ".join(f'"{term}"*' for term in re.findall(r"\w+", query))
+
+
+FULL_TEXT_SEARCH_STATEMENT = text(
+    'SELECT "user".* FROM user_fts JOIN "user" ON "user".id = user_fts.rowid '
+    "WHERE user_fts MATCH :match ORDER BY user_fts.rank LIMIT :limit"
+)
+
+
+USER_ROW_COLUMNS = tuple(getattr(UserModel, field) for field in USER_ROW_FIELDS)
+
+
+# Statements dos caminhos críticos, construídos uma única vez com parâmetros nomeados (bindparam) e executados com os valores de cada chamada.
+# Reutilizando o mesmo objeto, cada chamada deixa de construir a consulta e de recalcular a chave do cache de statements compilados (memoizada no
+# próprio statement), e a compilação é reaproveitada do cache da engine (query_cache_size).
+INSERT_USER_STATEMENT = insert(UserModel).returning(UserModel)
+SELECT_ALL_STATEMENT = select(UserModel)
+SELECT_BY_ID_STATEMENT = select(UserModel).where(UserModel.id == bindparam("user_id"))
+SELECT_PAGE_STATEMENT = select(UserModel).order_by(UserModel.id).limit(bindparam("limit"))
+SELECT_PAGE_AFTER_STATEMENT = select(UserModel).where(UserModel.id > bindparam("after_id")).order_by(UserModel.id).limit(bindparam("limit"))
+STREAM_ALL_STATEMENT = select(UserModel).order_by(UserModel.id)
+STREAM_ALL_AFTER_STATEMENT = select(UserModel).where(UserModel.id > bindparam("after_id")).order_by(UserModel.id)
+SELECT_VERSION_STATEMENT = select(UserModel.version, UserModel.updated_at).where(UserModel.id == bindparam("user_id"))
+SELECT_CURRENT_VERSION_STATEMENT = select(UserModel.version).where(UserModel.id == bindparam("user_id"))
+SELECT_COLLECTION_VERSION_STATEMENT = (select(UserCollectionVersionModel.version, UserCollectionVersionModel.updated_at)
+                                       .where(UserCollectionVersionModel.id == 1))
+SELECT_BY_EMAIL_STATEMENT = select(UserModel).where(UserModel.email == bindparam("email")).order_by(UserModel.id).limit(bindparam("limit"))
+LOWER_FIRST_NAME = UnicodeLower(UserModel.first_name)
+SELECT_BY_NAME_PREFIX_STATEMENT = (select(UserModel)
+                                   .where(LOWER_FIRST_NAME >= bindparam("prefix"), LOWER_FIRST_NAME < bindparam("upper_bound"))
+                                   .order_by(LOWER_FIRST_NAME, UserModel.id)
+                                   .limit(bindparam("limit")))
+SELECT_BY_NAME_FROM_STATEMENT = (select(UserModel)
+                                 .where(LOWER_FIRST_NAME >= bindparam("prefix"))
+                                 .order_by(LOWER_FIRST_NAME, UserModel.id)
+                                 .limit(bindparam("limit")))
+SEARCH_FULL_TEXT_STATEMENT = select(UserModel).from_statement(FULL_TEXT_SEARCH_STATEMENT)
+DELETE_BY_ID_STATEMENT = delete(UserModel).where(UserModel.id == bindparam("user_id")).returning(UserModel)
+# As cláusulas IN utilizam parâmetros expanding: a lista de ids é expandida na execução, sem gerar um statement (e uma compilação) por quantidade de ids.
+SELECT_BY_IDS_STATEMENT = select(UserModel).where(UserModel.id.in_(bindparam("user_ids", expanding=True)))
+DELETE_BY_IDS_STATEMENT = delete(UserModel).where(UserModel.id.in_(bindparam("user_ids", expanding=True))).returning(UserModel)
+SELECT_CHANGES_STATEMENT = (select(UserChangeModel)
+                            .where(UserChangeModel.sequence > bindparam("since"))
+                            .order_by(UserChangeModel.sequence)
+                            .limit(bindparam("limit")))
+
+
+def page_statement(after_id: Optional[int]) -> Tuple[Select, dict]:
+    """Statement da página de usuários ordenada pelo id e os parâmetros do cursor (sem o limite)."""
+    if after_id is None:
+        return SELECT_PAGE_STATEMENT, {}
+    return SELECT_PAGE_AFTER_STATEMENT, {"after_id": after_id}
+
+
+def stream_all_statement(after_id: Optional[int]) -> Tuple[Select, dict]:
+    if after_id is None:
+        return STREAM_ALL_STATEMENT, {}
+    return STREAM_ALL_AFTER_STATEMENT, {"after_id": after_id}
+
+
+def row_columns(fields: Optional[Sequence[str]] = None) -> tuple:
+    """Colunas da projeção: todos os campos públicos do usuário ou apenas os campos informados (subconjunto de USER_ROW_FIELDS), na ordem informada."""
+    if fields is None:
+        return USER_ROW_COLUMNS
+    return tuple(getattr(UserModel, field) for field in fields)
+
+
+@lru_cache(maxsize=256)
+def rows_statement(fields: Optional[Tuple[str, ...]], paginated: bool, after: bool) -> Select:
+    """Statement de projeção pré-construído por combinação de campos, limite e cursor (ver select_rows_statement)."""
+    statement = select(*row_columns(fields)).order_by(UserModel.id)
+    if after:
+        statement = statement.where(UserModel.id > bindparam("after_id"))
+    if paginated:
+        statement = statement.limit(bindparam("limit"))
+    return statement
+
+
+def select_rows_statement(limit: Optional[int] = None, after_id: Optional[int] = None, fields: Optional[Sequence[str]] = None) -> Tuple[Select, dict]:
+    """Monta a consulta de projeção das colunas do usuário (sem entidades ORM), ordenada pelo id e opcionalmente paginada por cursor.
+
+    Returns:
+        Tuple[Select, dict]: Statement pré-construído e os parâmetros da execução.
+    """
+    statement = rows_statement(None if fields is None else tuple(fields), limit is not None, after_id is not None)
+    parameters = {}
+    if after_id is not None:
+        parameters["after_id"] = after_id
+    if limit is not None:
+        parameters["limit"] = limit
+    return statement, parameters
+
+
+def rows_to_dicts(rows, fields: Optional[Sequence[str]] = None) -> List[dict]:
+    """Converte as linhas da projeção em dicionários simples (todos os campos públicos ou apenas os campos informados), prontos para serialização."""
+    keys = USER_ROW_FIELDS if fields is None else tuple(fields)
+    return [dict(zip(keys, row)) for row in rows]
+
+
+@lru_cache(maxsize=64)
+def row_by_id_statement(fields: Optional[Tuple[str, ...]]) -> Select:
+    return select(*row_columns(fields), UserModel.version, UserModel.updated_at).where(UserModel.id == bindparam("user_id"))
+
+
+def select_row_by_id_statement(user_id: int, fields: Optional[Sequence[str]] = None) -> Tuple[Select, dict]:
+    """Projeção de um usuário pelo id, acompanhada da versão e da data da última alteração (para os cabeçalhos ETag e Last-Modified)."""
+    return row_by_id_statement(None if fields is None else tuple(fields)), {"user_id": user_id}
+
+
+def row_by_id_to_dict(user_id: int, row, fields: Optional[Sequence[str]] = None) -> Tuple[Optional[dict], Optional[str], Optional[str]]:
+    if row is None:
+        return (None, "UserDoesNotExist", f"User with id {user_id} does not exist.")
+    keys = (USER_ROW_FIELDS if fields is None else tuple(fields)) + ("version", "updated_at")
+    return (dict(zip(keys, row)), None, None)
+
+
+@lru_cache(maxsize=128)
+def update_user_statement(columns: Tuple[str, ...], versioned: bool) -> Update:
+    """Statement de atualização pré-construído por conjunto de colunas alteradas (e com ou sem a versão esperada). Os valores são informados nos parâmetros new_<coluna>, pois os nomes das colunas são reservados pelo SQLAlchemy no SET."""
+    statement = update(UserModel).where(UserModel.id == bindparam("user_id"))
+    if versioned:
+        statement = statement.where(UserModel.version == bindparam("expected_version"))
+    return (statement
+            .values({**{column: bindparam(f"new_{column}") for column in columns},
+                     "version": UserModel.version + 1, "updated_at": bindparam("new_updated_at")})
+            .returning(UserModel))
+
+
+@lru_cache(maxsize=128)
+def bulk_update_statement(columns: Tuple[str, ...]) -> Update:
+    """Statement de atualização em lote (executemany) por conjunto de colunas alteradas. A nova versão é calculada pelo banco de dados (version + 1)."""
+    return (update(UserModel)
+            .where(UserModel.id == bindparam("b_id"))
+            .values({**{column: bindparam(f"new_{column}") for column in columns},
+                     "version": UserModel.version + 1, "updated_at": bindparam("new_updated_at")}))
+
+
+def bulk_update_batches(users_data: List[dict]) -> Iterator[Tuple[Update, List[dict]]]:
+    """Agrupa as atualizações consecutivas com o mesmo conjunto de colunas alteradas em um executemany, preservando a ordem da entrada. Itens sem colunas alteradas não são atualizados (nem têm a versão incrementada)."""
+    updated_at = utc_now()
+    columns, parameters = None, []
+    for user_data in users_data:
+        values = {key: value for key, value in user_data.items() if key != "id" and value is not None}
+        if not values:
+            continue
+        if tuple(values) != columns and parameters:
+            yield bulk_update_statement(columns), parameters
+            parameters = []
+        columns = tuple(values)
+        parameters.append({**{f"new_{column}": value for column, value in values.items()}, "b_id": user_data["id"], "new_updated_at": updated_at})
+    if parameters:
+        yield bulk_update_statement(columns), parameters
+
+
+def update_user_parameters(user_id: int, values: dict, expected_version: Optional[int]) -> dict:
+    parameters = {f"new_{column}": value for column, value in values.items()}
+    parameters.update(user_id=user_id, new_updated_at=utc_now())
+    if expected_version is not None:
+        parameters["expected_version"] = expected_version
+    return parameters
+
+
+def name_prefix_query(prefix: str, limit: int) -> Tuple[Select, dict]:
+    lower_prefix = prefix.lower()
+    upper_bound = name_prefix_upper_bound(lower_prefix)
+    if upper_bound is None:
+        return (SELECT_BY_NAME_FROM_STATEMENT, {"prefix": lower_prefix, "limit": limit})
+    return (SELECT_BY_NAME_PREFIX_STATEMENT, {"prefix": lower_prefix, "upper_bound": upper_bound, "limit": limit})
+
+
+def version_conflict(user_id: int, current_version: int, expected_version: int) -> Tuple[None, str, str]:
+    return (None, "VersionConflict", f"User with id {user_id} has version {current_version}, expected {expected_version}.")
+
+
+def changes_compacted(compacted_until: int) -> Tuple[None, str, str]:
+    return (None, "ChangesCompacted", f"Changes up to sequence {compacted_until} were compacted. Resynchronize from a full snapshot.")
+
+
+COMPACTED_UNTIL_STATEMENT = select(UserChangeCompactionModel.compacted_until).where(UserChangeCompactionModel.id == 1)
+LAST_CHANGE_SEQUENCE_STATEMENT = select(func.coalesce(func.max(UserChangeModel.sequence), 0))
+
+
+def has_sequence_gap(changes: List[UserChangeModel], since: int) -> bool:
+    """Indica se a marca d'água da compactação precisa ser consultada: apenas quando há um salto entre since e a primeira alteração retornada."""
+    return bool(changes) and changes[0].sequence != since + 1
+
+
+def compaction_boundary_statement(before: datetime):
+    """Primeira sequência que deve ser preservada: a primeira alterada a partir de before ou, se todas forem anteriores, a mais recente."""
+    return select(func.coalesce(select(func.min(UserChangeModel.sequence)).where(UserChangeModel.changed_at >= before).scalar_subquery(),
+                                func.max(UserChangeModel.sequence)))
+
+
+def compaction_watermark_statement(compacted_until: int):
+    """Registra a marca d'água antes da remoção das entradas: uma compactação interrompida nunca deixa entradas removidas sem a marca d'água correspondente."""
+    return text("INSERT INTO user_change_compaction (id, compacted_until, compacted_at) VALUES (1, :compacted_until, :compacted_at) "
+                "ON CONFLICT (id) DO UPDATE SET compacted_until = CASE WHEN excluded.compacted_until > user_change_compaction.compacted_until "
+                "THEN excluded.compacted_until ELSE user_change_compaction.compacted_until END, "
+                "compacted_at = excluded.compacted_at").bindparams(compacted_until=compacted_until, compacted_at=utc_now())
+
+
+def compaction_chunk_statement(boundary: int, chunk_size: int):
+    return delete(UserChangeModel).where(UserChangeModel.sequence.in_(
+        select(UserChangeModel.sequence).where(UserChangeModel.sequence < boundary).order_by(UserChangeModel.sequence).limit(chunk_size)))
+
+
+def chunked(values: list, size: int) -> Iterator[list]:
+    """Divide a lista em blocos de até size itens, respeitando o limite de parâmetros por instrução (cláusulas IN) do SQLite."""
+    for start in range(0, len(values), size):
+        yield values[start:start + size]
+
+
+@instrument_repository
 class SQLiteUserRepository(IUserRepository):
     """
         Realiza implementação da interface do repositório de usuário (IUserRepository), que irá estabelecer conexão com o banco de dados SQLite (utilizando o SQLiteClient) e, por meio de ORM, realizar as operações necessárias.
     """
+    in_clause_chunk_size = 500
+    change_compaction_chunk_size = 10_000
 
     _instance = None
     def __new__(cls, *args, **kwargs): # Singleton
@@ -20,46 +257,189 @@ class SQLiteUserRepository(IUserRepository):
     
     def create(self, first_name: str, email: str, last_name: str = None) -> Tuple[UserModel, Optional[str], Optional[str]]:
         with self.db_client._get_session() as db_session:
-            user = UserModel(first_name=first_name,
-                            last_name=last_name,
-                            email=email)
-            db_session.add(user)
+            user = db_session.scalar(INSERT_USER_STATEMENT, {"first_name": first_name, "last_name": last_name, "email": email})
             db_session.commit()
-            db_session.refresh(user) 
             return (user, None, None)
     
     def select_all(self) -> Tuple[List[UserModel], Optional[str], Optional[str]]:
-        with self.db_client._get_session() as db_session:
-            users = db_session.query(UserModel).all()
+        with self.db_client._get_read_session() as db_session:
+            users = list(db_session.scalars(SELECT_ALL_STATEMENT))
             return (users, None, None)
     
-    def select_by_id(self, user_id: int) -> Tuple[Optional[UserModel], Optional[str], Optional[str]]:
+    def select_page(self, limit: int, after_id: Optional[int] = None) -> Tuple[List[UserModel], Optional[str], Optional[str]]:
+        with self.db_client._get_read_session() as db_session:
+            statement, parameters = page_statement(after_id)
+            users = list(db_session.scalars(statement, {**parameters, "limit": limit}))
+            return (users, None, None)
+
+    def select_rows(self, limit: Optional[int] = None, after_id: Optional[int] = None, fields: Optional[Sequence[str]] = None) -> Tuple[List[dict], Optional[str], Optional[str]]:
+        with self.db_client._get_read_session() as db_session:
+            rows = db_session.execute(*select_rows_statement(limit, after_id, fields)).all()
+            return (rows_to_dicts(rows, fields), None, None)
+
+    def select_row_by_id(self, user_id: int, fields: Optional[Sequence[str]] = None) -> Tuple[Optional[dict], Optional[str], Optional[str]]:
+        with self.db_client._get_read_session() as db_session:
+            row = db_session.execute(*select_row_by_id_statement(user_id, fields)).first()
+            return row_by_id_to_dict(user_id, row, fields)
+
+    def stream_all(self, after_id: Optional[int] = None, chunk_size: int = 1000) -> Tuple[Iterator[UserModel], Optional[str], Optional[str]]:
+        return (self.__iterate_users(after_id, chunk_size), None, None)
+
+    def __iterate_users(self, after_id: Optional[int], chunk_size: int) -> Iterator[UserModel]:
+        """Gerador que mantém a sessão aberta durante a iteração. O yield_per faz o cursor ser consumido em blocos de chunk_size registros e, como o identity map da sessão guarda referências fracas, os objetos já entregues podem ser liberados da memória."""
+        with self.db_client._get_read_session() as db_session:
+            statement, parameters = stream_all_statement(after_id)
+            for user in db_session.scalars(statement, parameters, execution_options={"yield_per": chunk_size}):
+                yield user
+
+    def select_version(self, user_id: int) -> Tuple[Optional[Tuple[int, Optional[datetime]]], Optional[str], Optional[str]]:
+        with self.db_client._get_read_session() as db_session:
+            row = db_session.execute(SELECT_VERSION_STATEMENT, {"user_id": user_id}).first()
+            if row is None:
+                return (None, "UserDoesNotExist", f"User with id {user_id} does not exist.")
+            return (tuple(row), None, None)
+
+    def select_collection_version(self) -> Tuple[Tuple[int, Optional[datetime]], Optional[str], Optional[str]]:
+        with self.db_client._get_read_session() as db_session:
+            row = db_session.execute(SELECT_COLLECTION_VERSION_STATEMENT).first()
+            return (tuple(row) if row is not None else (0, None), None, None)
+
+    def select_changes(self, since: int, limit: int) -> Tuple[Optional[List[UserChangeModel]], Optional[str], Optional[str]]:
+        with self.db_client._get_session() as db_session:
+            changes = list(db_session.scalars(SELECT_CHANGES_STATEMENT, {"since": since, "limit": limit}))
+            if has_sequence_gap(changes, since):
+                compacted_until = db_session.scalar(COMPACTED_UNTIL_STATEMENT)
+                if compacted_until is not None and since < compacted_until:
+                    return changes_compacted(compacted_until)
+            return (changes, None, None)
+
+    def select_last_change_sequence(self) -> Tuple[int, Optional[str], Optional[str]]:
+        with self.db_client._get_session() as db_session:
+            return (db_session.scalar(LAST_CHANGE_SEQUENCE_STATEMENT), None, None)
+
+    def compact_changes(self, before: datetime) -> Tuple[int, Optional[str], Optional[str]]:
+        """A remoção é feita em blocos de change_compaction_chunk_size entradas, um por transação, para não bloquear as escritas de usuários por muito tempo."""
         with self.db_client._get_session() as db_session:
-            user = db_session.query(UserModel).filter(UserModel.id == user_id).first()
+            boundary = db_session.scalar(compaction_boundary_statement(before))
+            if boundary is None:
+                return (0, None, None)
+            db_session.execute(compaction_watermark_statement(boundary - 1))
+            db_session.commit()
+
+            deleted = 0
+            while True:
+                rowcount = db_session.execute(compaction_chunk_statement(boundary, self.change_compaction_chunk_size)).rowcount
+                db_session.commit()
+                deleted += rowcount
+                if rowcount < self.change_compaction_chunk_size:
+                    return (deleted, None, None)
+
+    def select_by_id(self, user_id: int) -> Tuple[Optional[UserModel], Optional[str], Optional[str]]:
+        with self.db_client._get_read_session() as db_session:
+            user = db_session.scalar(SELECT_BY_ID_STATEMENT, {"user_id": user_id})
             if not user:
                 return (None, "UserDoesNotExist", f"User with id {user_id} does not exist.")
             return (user, None, None)
 
-    def update(self, user_id: int, new_user_data: dict) -> Tuple[Optional[UserModel], Optional[str], Optional[str]]:
-        with self.db_client._get_session() as db_session:
-            result = db_session.query(UserModel).filter(UserModel.id == user_id).update(
-                {key: value for key, value in new_user_data.items() if value is not None}
-            )
+    def select_by_email(self, email: str, limit: int = 50) -> Tuple[List[UserModel], Optional[str], Optional[str]]:
+        with self.db_client._get_read_session() as db_session:
+            users = list(db_session.scalars(SELECT_BY_EMAIL_STATEMENT, {"email": email, "limit": limit}))
+            return (users, None, None)
 
-            if not result:
+    def select_by_name_prefix(self, prefix: str, limit: int = 50) -> Tuple[List[UserModel], Optional[str], Optional[str]]:
+        with self.db_client._get_read_session() as db_session:
+            users = list(db_session.scalars(*name_prefix_query(prefix, limit)))
+            return (users, None, None)
+
+    def search_full_text(self, query: str, limit: int = 50) -> Tuple[List[UserModel], Optional[str], Optional[str]]:
+        match = full_text_match_expression(query)
+        if not match:
+            return ([], None, None)
+
+        with self.db_client._get_read_session() as db_session:
+            try:
+                users = list(db_session.scalars(SEARCH_FULL_TEXT_STATEMENT, {"match": match, "limit": limit}))
+            except OperationalError as error:
+                if "no such table: user_fts" not in str(error):
+                    raise
+                return (None, "FullTextSearchUnavailable", "Full text search index (user_fts) is not enabled in the database.")
+            return (users, None, None)
+
+    def update(self, user_id: int, new_user_data: dict, expected_version: Optional[int] = None) -> Tuple[Optional[UserModel], Optional[str], Optional[str]]:
+        values = {key: value for key, value in new_user_data.items() if value is not None}
+        if not values:
+            # A versão comparada deve ser a atual: a leitura não pode vir de uma réplica atrasada.
+            with primary_reads():
+                user, error_type, error_msg = self.select_by_id(user_id)
+            if user is not None and expected_version is not None and user.version != expected_version:
+                return version_conflict(user_id, user.version, expected_version)
+            return (user, error_type, error_msg)
+
+        with self.db_client._get_session() as db_session:
+            user = db_session.scalar(update_user_statement(tuple(values), expected_version is not None),
+                                     update_user_parameters(user_id, values, expected_version))
+            if not user:
+                if expected_version is not None:
+                    current_version = db_session.scalar(SELECT_CURRENT_VERSION_STATEMENT, {"user_id": user_id})
+                    if current_version is not None:
+                        return version_conflict(user_id, current_version, expected_version)
                 return (None, "UserDoesNotExist", f"User with id {user_id} does not exist.")
 
             db_session.commit()
-
-            user = db_session.query(UserModel).filter(UserModel.id == user_id).first()
             return (user, None, None)
 
     def delete_by_id(self, user_id) -> Tuple[Optional[UserModel], Optional[str], Optional[str]]:
         with self.db_client._get_session() as db_session:
-            user = db_session.query(UserModel).filter(UserModel.id == user_id).first()
+            user = db_session.scalar(DELETE_BY_ID_STATEMENT, {"user_id": user_id})
             if not user:
                 return (None, "UserDoesNotExist", f"User with id {user_id} does not exist.")
-            
-            db_session.delete(user)
+
+            db_session.commit()
+            return (user, None, None)
+
+    def bulk_create(self, users_data: List[dict]) -> Tuple[List[Tuple[Optional[UserModel], Optional[str], Optional[str]]], Optional[str], Optional[str]]:
+        if not users_data:
+            return ([], None, None)
+
+        with self.db_client._get_session() as db_session:
+            # sort_by_parameter_order faria o SQLite voltar para um INSERT por linha. Como o id (rowid) é atribuído
+            # de forma crescente na ordem do VALUES de um INSERT de múltiplas linhas, ordenar pelo id restaura a ordem da entrada.
+            users = sorted(db_session.scalars(
+                INSERT_USER_STATEMENT,
+                [{"first_name": user_data["first_name"],
+                  "last_name": user_data.get("last_name"),
+                  "email": user_data["email"]} for user_data in users_data]
+            ).all(), key=lambda user: user.id)
             db_session.commit()
-            return (user, None, None)
\ No newline at end of file
+            return ([(user, None, None) for user in users], None, None)
+
+    def bulk_update(self, users_data: List[dict]) -> Tuple[List[Tuple[Optional[UserModel], Optional[str], Optional[str]]], Optional[str], Optional[str]]:
+        with self.db_client._get_session() as db_session:
+            # Executado na conexão (Core): pela sessão, um executemany de UPDATE seria tratado como bulk update do ORM por chave primária.
+            for statement, parameters in bulk_update_batches(users_data):
+                db_session.connection().execute(statement, parameters)
+
+            users_by_id = {}
+            for ids in chunked(list(dict.fromkeys(user_data["id"] for user_data in users_data)), self.in_clause_chunk_size):
+                users_by_id.update({user.id: user for user in db_session.scalars(SELECT_BY_IDS_STATEMENT, {"user_ids": ids})})
+            db_session.commit()
+
+        return ([self.__bulk_item_result(users_by_id, user_data["id"]) for user_data in users_data], None, None)
+
+    def bulk_delete(self, user_ids: List[int]) -> Tuple[List[Tuple[Optional[UserModel], Optional[str], Optional[str]]], Optional[str], Optional[str]]:
+        with self.db_client._get_session() as db_session:
+            users_by_id = {}
+            for ids in chunked(list(dict.fromkeys(user_ids)), self.in_clause_chunk_size):
+                deleted_users = db_session.scalars(DELETE_BY_IDS_STATEMENT, {"user_ids": ids})
+                users_by_id.update({user.id: user for user in deleted_users})
+            db_session.commit()
+
+        return ([self.__bulk_item_result(users_by_id, user_id) for user_id in user_ids], None, None)
+
+    def close(self) -> None:
+        self.db_client._engine.dispose()
+
+    def __bulk_item_result(self, users_by_id: dict, user_id: int) -> Tuple[Optional[UserModel], Optional[str], Optional[str]]:
+        if user_id not in users_by_id:
+            return (None, "UserDoesNotExist", f"User with id {user_id} does not exist.")
+        return (users_by_id[user_id], None, None)
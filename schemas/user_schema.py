@@ -1,5 +1,6 @@
+from datetime import datetime
 from pydantic import BaseModel, EmailStr
-from typing import Optional
+from typing import Literal, Optional, List
 
 
 class UserCreateRequest(BaseModel):
@@ -19,3 +20,75 @@ class UserGeneralResponse(BaseModel):
     first_name: str
     last_name: Optional[str] = None
     email: EmailStr
+
+
+class UserBatchUpdateRequest(UserUpdateRequest):
+    id: int
+
+
+class UserBatchItemResponse(BaseModel):
+    index: int
+    status: int
+    code: Optional[str] = None
+    msg: Optional[str] = None
+    user: Optional[UserGeneralResponse] = None
+
+
+class UserBatchResponse(BaseModel):
+    succeeded: int
+    failed: int
+    items: List[UserBatchItemResponse]
+
+
+class UserChangeResponse(BaseModel):
+    sequence: int
+    user_id: int
+    operation: str
+    version: Optional[int] = None
+    first_name: Optional[str] = None
+    last_name: Optional[str] = None
+    email: Optional[str] = None
+    changed_at: datetime
+
+
+class UserChangesResponse(BaseModel):
+    changes: List[UserChangeResponse]
+    next_since: int
+    has_more: bool
+
+
+class UserChangesHeadResponse(BaseModel):
+    last_sequence: int
+
+
+class UserExportRequest(BaseModel):
+    format: Literal["csv", "parquet"] = "csv"
+
+
+class UserExportResponse(BaseModel):
+    id: str
+    format: str
+    status: str
+    rows_written: int
+    bytes_written: int
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    error_code: Optional[str] = None
+    error_msg: Optional[str] = None
+    file_url: Optional[str] = None
+
+
+class UserImportResponse(BaseModel):
+    id: str
+    format: str
+    status: str
+    rows_processed: int
+    rows_imported: int
+    rows_failed: int
+    created_at: datetime
+    updated_at: datetime
+    finished_at: Optional[datetime] = None
+    error_code: Optional[str] = None
+    error_msg: Optional[str] = None
+    errors_url: str
@@ -0,0 +1,193 @@
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, List, Union, Tuple, Optional, AsyncIterator, Sequence
+from repositories.meta.interface_async_user_repository import IAsyncUserRepository
+from models.user_model import UserModel, UserChangeModel, utc_now
+from service.meta.interface_async_user_service import IAsyncUserService
+from service.user_service import normalize_fields
+
+from infra.log_config import LogService, handle_exceptions
+from infra.instrumentation import instrument_service
+from infra.read_consistency import primary_reads_requested
+from infra.single_flight import AsyncSingleFlight
+
+
+@instrument_service
+class AsyncUserService(IAsyncUserService):
+    __log_service = LogService()
+    _instance = None
+    def __new__(cls, *args, **kwargs): # Singleton
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+        return cls._instance
+
+    def __init__(self, repository: IAsyncUserRepository, single_flight: bool = True):
+        self.repository = repository
+        self.single_flight = AsyncSingleFlight(type(self).__name__) if single_flight else None
+        self.__logger = self.__log_service.get_logger(__name__)
+
+    def __handle_response_from_repository(self,
+                                         object_expected: Union[UserModel, List[UserModel], None],
+                                         error_type: Union[str, None],
+                                         error_msg: Union[str, None]) -> Union[UserModel, List[UserModel], Tuple[str, str]]:
+        """Adapta retorno do repositório para o formato da camada serviço, seguindo a mesma regra do UserService: objeto esperado em caso de sucesso ou Tupla de erro (título, descrição) em caso de falha."""
+        if error_type is None:
+            self.__logger.info("Operação bem sucedida!")
+            return object_expected
+        else:
+            self.__logger.info("Operação com falha detectada: %s - %s", error_type, error_msg)
+            return (error_type, error_msg)
+
+    def __handle_bulk_response_from_repository(self,
+                                              results: Union[List[Tuple[Optional[UserModel], Optional[str], Optional[str]]], None],
+                                              error_type: Union[str, None],
+                                              error_msg: Union[str, None]) -> Union[List[Union[UserModel, Tuple[str, str]]], Tuple[str, str]]:
+        """Adapta o retorno de operações em lote do repositório: cada item é convertido para o objeto esperado ou para a Tupla de erro do item (título, descrição). Falhas da operação como um todo retornam a Tupla de erro."""
+        if error_type is not None:
+            self.__logger.info("Operação em lote com falha detectada: %s - %s", error_type, error_msg)
+            return (error_type, error_msg)
+
+        items = [user if item_error_type is None else (item_error_type, item_error_msg)
+                 for user, item_error_type, item_error_msg in results]
+        failed = sum(1 for item in items if isinstance(item, tuple))
+        self.__logger.info("Operação em lote concluída: %s sucesso(s), %s falha(s)", len(items) - failed, failed)
+        return items
+
+    async def __coalesce(self, method: str, key, query: Callable[[], Awaitable[tuple]]) -> tuple:
+        """Executa a consulta ao repositório pelo single-flight, seguindo a mesma regra do UserService."""
+        if self.single_flight is None:
+            return await query()
+        return await self.single_flight.do(method, (key, primary_reads_requested()), query)
+
+    def __forget_in_flight(self) -> None:
+        if self.single_flight is not None:
+            self.single_flight.forget()
+
+    @handle_exceptions(__log_service.get_logger(__name__))
+    async def create_user(self, first_name: str, email: str, last_name: str = None) -> Union[UserModel, Tuple[str, str]]:
+        self.__logger.info("Iniciando criação de usuário na camada repositório")
+        user, error_type, error_msg = await self.repository.create(first_name=first_name,
+                                                                  last_name=last_name,
+                                                                  email=email)
+        self.__forget_in_flight()
+        return self.__handle_response_from_repository(user, error_type, error_msg)
+
+    @handle_exceptions(__log_service.get_logger(__name__))
+    async def get_user(self, user_id: int) -> Union[UserModel, Tuple[str, str]]:
+        self.__logger.info("Iniciando seleção do usuário %s na camada repositório", user_id)
+        user, error_type, error_msg = await self.__coalesce("get_user", user_id, lambda: self.repository.select_by_id(user_id))
+        return self.__handle_response_from_repository(user, error_type, error_msg)
+
+    @handle_exceptions(__log_service.get_logger(__name__))
+    async def get_user_row(self, user_id: int, fields: Optional[Sequence[str]] = None) -> Union[dict, Tuple[str, str]]:
+        fields = normalize_fields(fields)
+        if isinstance(fields, tuple):
+            return self.__handle_response_from_repository(None, *fields)
+        self.__logger.info("Iniciando seleção dos campos %s do usuário %s na camada repositório", fields, user_id)
+        row, error_type, error_msg = await self.repository.select_row_by_id(user_id, fields)
+        return self.__handle_response_from_repository(row, error_type, error_msg)
+
+    @handle_exceptions(__log_service.get_logger(__name__))
+    async def get_user_version(self, user_id: int) -> Union[Tuple[int, Optional[datetime]], Tuple[str, str]]:
+        version, error_type, error_msg = await self.repository.select_version(user_id)
+        return self.__handle_response_from_repository(version, error_type, error_msg)
+
+    @handle_exceptions(__log_service.get_logger(__name__))
+    async def get_collection_version(self) -> Union[Tuple[int, Optional[datetime]], Tuple[str, str]]:
+        version, error_type, error_msg = await self.repository.select_collection_version()
+        return self.__handle_response_from_repository(version, error_type, error_msg)
+
+    @handle_exceptions(__log_service.get_logger(__name__))
+    async def get_changes(self, since: int, limit: int) -> Union[List[UserChangeModel], Tuple[str, str]]:
+        changes, error_type, error_msg = await self.repository.select_changes(since=since, limit=limit)
+        return self.__handle_response_from_repository(changes, error_type, error_msg)
+
+    @handle_exceptions(__log_service.get_logger(__name__))
+    async def get_last_change_sequence(self) -> Union[int, Tuple[str, str]]:
+        sequence, error_type, error_msg = await self.repository.select_last_change_sequence()
+        return self.__handle_response_from_repository(sequence, error_type, error_msg)
+
+    @handle_exceptions(__log_service.get_logger(__name__))
+    async def compact_changes(self, retention_days: int) -> Union[int, Tuple[str, str]]:
+        before = utc_now() - timedelta(days=retention_days)
+        self.__logger.info("Iniciando compactação das alterações de usuários anteriores a %s na camada repositório", before.isoformat())
+        deleted, error_type, error_msg = await self.repository.compact_changes(before)
+        return self.__handle_response_from_repository(deleted, error_type, error_msg)
+
+    @handle_exceptions(__log_service.get_logger(__name__))
+    async def get_all_users(self) -> Union[List[UserModel], Tuple[str, str]]:
+        self.__logger.info("Iniciando seleção de todos os usuários na camada repositório")
+        users, error_type, error_msg = await self.__coalesce("get_all_users", None, self.repository.select_all)
+        return self.__handle_response_from_repository(users, error_type, error_msg)
+
+    @handle_exceptions(__log_service.get_logger(__name__))
+    async def get_users_page(self, limit: int, after_id: Optional[int] = None) -> Union[List[UserModel], Tuple[str, str]]:
+        self.__logger.info("Iniciando seleção de página de usuários (limit=%s, after_id=%s) na camada repositório", limit, after_id)
+        users, error_type, error_msg = await self.repository.select_page(limit=limit, after_id=after_id)
+        return self.__handle_response_from_repository(users, error_type, error_msg)
+
+    @handle_exceptions(__log_service.get_logger(__name__))
+    async def get_user_rows(self, limit: Optional[int] = None, after_id: Optional[int] = None, fields: Optional[Sequence[str]] = None) -> Union[List[dict], Tuple[str, str]]:
+        fields = normalize_fields(fields)
+        if isinstance(fields, tuple):
+            return self.__handle_response_from_repository(None, *fields)
+        self.__logger.info("Iniciando seleção de usuários como registros simples (limit=%s, after_id=%s, fields=%s) na camada repositório", limit, after_id, fields)
+        rows, error_type, error_msg = await self.repository.select_rows(limit=limit, after_id=after_id, fields=fields)
+        return self.__handle_response_from_repository(rows, error_type, error_msg)
+
+    @handle_exceptions(__log_service.get_logger(__name__))
+    async def stream_users(self, after_id: Optional[int] = None, chunk_size: int = 1000) -> Union[AsyncIterator[UserModel], Tuple[str, str]]:
+        self.__logger.info("Iniciando streaming de usuários (after_id=%s) na camada repositório", after_id)
+        users, error_type, error_msg = await self.repository.stream_all(after_id=after_id, chunk_size=chunk_size)
+        return self.__handle_response_from_repository(users, error_type, error_msg)
+
+    @handle_exceptions(__log_service.get_logger(__name__))
+    async def search_users(self, email: Optional[str] = None, name_prefix: Optional[str] = None, query: Optional[str] = None, limit: int = 50) -> Union[List[UserModel], Tuple[str, str]]:
+        criteria = {"email": email, "name_prefix": name_prefix, "query": query}
+        informed_criteria = [name for name, value in criteria.items() if value]
+        if len(informed_criteria) != 1:
+            return self.__handle_response_from_repository(None, "InvalidSearch", "Exactly one search criteria must be informed: email, name_prefix or q.")
+
+        self.__logger.info("Iniciando busca de usuários por %s na camada repositório", informed_criteria[0])
+        if email:
+            users, error_type, error_msg = await self.repository.select_by_email(email, limit=limit)
+        elif name_prefix:
+            users, error_type, error_msg = await self.repository.select_by_name_prefix(name_prefix, limit=limit)
+        else:
+            users, error_type, error_msg = await self.repository.search_full_text(query, limit=limit)
+        return self.__handle_response_from_repository(users, error_type, error_msg)
+
+    @handle_exceptions(__log_service.get_logger(__name__))
+    async def update_user(self, user_id: int, new_user_data: dict, expected_version: Optional[int] = None) -> Union[UserModel, Tuple[str, str]]:
+        self.__logger.info("Iniciando atualização do usuário %s na camada repositório", user_id)
+        user, error_type, error_msg = await self.repository.update(user_id, new_user_data, expected_version=expected_version)
+        self.__forget_in_flight()
+        return self.__handle_response_from_repository(user, error_type, error_msg)
+
+    @handle_exceptions(__log_service.get_logger(__name__))
+    async def delete_user(self, user_id: int) -> Union[UserModel, Tuple[str, str]]:
+        self.__logger.info("Iniciando deleção do usuário %s na camada repositório", user_id)
+        user, error_type, error_msg = await self.repository.delete_by_id(user_id)
+        self.__forget_in_flight()
+        return self.__handle_response_from_repository(user, error_type, error_msg)
+
+
+    @handle_exceptions(__log_service.get_logger(__name__))
+    async def create_users(self, users_data: List[dict]) -> Union[List[Union[UserModel, Tuple[str, str]]], Tuple[str, str]]:
+        self.__logger.info("Iniciando criação em lote de %s usuário(s) na camada repositório", len(users_data))
+        results, error_type, error_msg = await self.repository.bulk_create(users_data)
+        self.__forget_in_flight()
+        return self.__handle_bulk_response_from_repository(results, error_type, error_msg)
+
+    @handle_exceptions(__log_service.get_logger(__name__))
+    async def update_users(self, users_data: List[dict]) -> Union[List[Union[UserModel, Tuple[str, str]]], Tuple[str, str]]:
+        self.__logger.info("Iniciando atualização em lote de %s usuário(s) na camada repositório", len(users_data))
+        results, error_type, error_msg = await self.repository.bulk_update(users_data)
+        self.__forget_in_flight()
+        return self.__handle_bulk_response_from_repository(results, error_type, error_msg)
+
+    @handle_exceptions(__log_service.get_logger(__name__))
+    async def delete_users(self, user_ids: List[int]) -> Union[List[Union[UserModel, Tuple[str, str]]], Tuple[str, str]]:
+        self.__logger.info("Iniciando deleção em lote de %s usuário(s) na camada repositório", len(user_ids))
+        results, error_type, error_msg = await self.repository.bulk_delete(user_ids)
+        self.__forget_in_flight()
+        return self.__handle_bulk_response_from_repository(results, error_type, error_msg)
\ No newline at end of file
@@ -0,0 +1,101 @@
+from datetime import datetime
+from typing import List, Union, Tuple, Optional, AsyncIterator, Sequence
+from models.user_model import UserModel, UserChangeModel
+from abc import ABC, abstractmethod
+
+
+class IAsyncUserService(ABC):
+    """Interface que representa uma visão genérica e assíncrona do serviço de Usuário, com os mesmos contratos e regras de negócio da IUserService, mas com métodos aguardáveis (awaitable).
+
+        Depende do repositório assíncrono de usuário (IAsyncUserRepository) para conectar com o banco de dados sem bloquear o event loop.
+    """
+    @abstractmethod
+    async def create_user(self, first_name: str, email: str, last_name: str = None) -> Union[UserModel, Tuple[str, str]]:
+        """Versão assíncrona de IUserService.create_user."""
+        pass
+
+    @abstractmethod
+    async def get_user(self, user_id: int) -> Union[UserModel, Tuple[str, str]]:
+        """Versão assíncrona de IUserService.get_user."""
+        pass
+
+    @abstractmethod
+    async def get_user_row(self, user_id: int, fields: Optional[Sequence[str]] = None) -> Union[dict, Tuple[str, str]]:
+        """Versão assíncrona de IUserService.get_user_row."""
+        pass
+
+    @abstractmethod
+    async def get_user_version(self, user_id: int) -> Union[Tuple[int, Optional[datetime]], Tuple[str, str]]:
+        """Versão assíncrona de IUserService.get_user_version."""
+        pass
+
+    @abstractmethod
+    async def get_collection_version(self) -> Union[Tuple[int, Optional[datetime]], Tuple[str, str]]:
+        """Versão assíncrona de IUserService.get_collection_version."""
+        pass
+
+    @abstractmethod
+    async def get_changes(self, since: int, limit: int) -> Union[List[UserChangeModel], Tuple[str, str]]:
+        """Versão assíncrona de IUserService.get_changes."""
+        pass
+
+    @abstractmethod
+    async def get_last_change_sequence(self) -> Union[int, Tuple[str, str]]:
+        """Versão assíncrona de IUserService.get_last_change_sequence."""
+        pass
+
+    @abstractmethod
+    async def compact_changes(self, retention_days: int) -> Union[int, Tuple[str, str]]:
+        """Versão assíncrona de IUserService.compact_changes."""
+        pass
+
+    @abstractmethod
+    async def get_all_users(self) -> Union[List[UserModel], Tuple[str, str]]:
+        """Versão assíncrona de IUserService.get_all_users."""
+        pass
+
+    @abstractmethod
+    async def get_users_page(self, limit: int, after_id: Optional[int] = None) -> Union[List[UserModel], Tuple[str, str]]:
+        """Versão assíncrona de IUserService.get_users_page."""
+        pass
+
+    @abstractmethod
+    async def get_user_rows(self, limit: Optional[int] = None, after_id: Optional[int] = None, fields: Optional[Sequence[str]] = None) -> Union[List[dict], Tuple[str, str]]:
+        """Versão assíncrona de IUserService.get_user_rows."""
+        pass
+
+    @abstractmethod
+    async def stream_users(self, after_id: Optional[int] = None, chunk_size: int = 1000) -> Union[AsyncIterator[UserModel], Tuple[str, str]]:
+        """Versão assíncrona de IUserService.stream_users, retornando um iterador assíncrono de usuários."""
+        pass
+
+    @abstractmethod
+    async def search_users(self, email: Optional[str] = None, name_prefix: Optional[str] = None, query: Optional[str] = None, limit: int = 50) -> Union[List[UserModel], Tuple[str, str]]:
+        """Versão assíncrona de IUserService.search_users."""
+        pass
+
+    @abstractmethod
+    async def update_user(self, user_id: int, new_user_data: dict, expected_version: Optional[int] = None) -> Union[UserModel, Tuple[str, str]]:
+        """Versão assíncrona de IUserService.update_user."""
+        pass
+
+    @abstractmethod
+    async def delete_user(self, user_id: int) -> Union[UserModel, Tuple[str, str]]:
+        """Versão assíncrona de IUserService.delete_user."""
+        pass
+
+
+    @abstractmethod
+    async def create_users(self, users_data: List[dict]) -> Union[List[Union[UserModel, Tuple[str, str]]], Tuple[str, str]]:
+        """Versão assíncrona de IUserService.create_users."""
+        pass
+
+    @abstractmethod
+    async def update_users(self, users_data: List[dict]) -> Union[List[Union[UserModel, Tuple[str, str]]], Tuple[str, str]]:
+        """Versão assíncrona de IUserService.update_users."""
+        pass
+
+    @abstractmethod
+    async def delete_users(self, user_ids: List[int]) -> Union[List[Union[UserModel, Tuple[str, str]]], Tuple[str, str]]:
+        """Versão assíncrona de IUserService.delete_users."""
+        pass
\ No newline at end of file
@@ -1,5 +1,6 @@
-from typing import List, Union, Tuple
-from models.user_model import UserModel
+from datetime import datetime
+from typing import List, Union, Tuple, Optional, Iterator, Sequence
+from models.user_model import UserModel, UserChangeModel
 from abc import ABC, abstractmethod
 
 
@@ -38,6 +39,74 @@ class IUserService(ABC):
         """
         pass
     
+    @abstractmethod
+    def get_user_row(self, user_id: int, fields: Optional[Sequence[str]] = None) -> Union[dict, Tuple[str, str]]:
+        """Obtém usuário (User) como dicionário simples contendo apenas os campos informados (projeção, sem objeto ORM), acrescido da versão (version) e da data da última alteração (updated_at). O id é sempre incluído.
+
+        Args:
+            user_id (int): ID do usuário (User) que deseja selecionar.
+            fields (Sequence[str], optional): Campos desejados, entre id, first_name, last_name e email. Padrão para None (todos os campos).
+
+        Returns:
+            Union[dict, Tuple[str, str]]: Retorna o usuário como dicionário ou uma Tupla com informações de erro (título e descrição, respectivamente), como InvalidFields para campos desconhecidos.
+        """
+        pass
+
+    @abstractmethod
+    def get_user_version(self, user_id: int) -> Union[Tuple[int, Optional[datetime]], Tuple[str, str]]:
+        """Obtém apenas a versão e a data da última alteração (updated_at) do usuário (User), sem carregá-lo. Utilizado para requisições condicionais (ETag/If-None-Match).
+
+        Args:
+            user_id (int): ID do usuário (User).
+
+        Returns:
+            Union[Tuple[int, Optional[datetime]], Tuple[str, str]]: Retorna (versão, updated_at) ou uma Tupla com informações de erro (título e descrição, respectivamente) em caso de alguma falha esperada/identificada (Tuple[str, str]).
+        """
+        pass
+
+    @abstractmethod
+    def get_collection_version(self) -> Union[Tuple[int, Optional[datetime]], Tuple[str, str]]:
+        """Obtém a versão da coleção de usuários e a data da última alteração, que muda a cada criação, atualização ou deleção de usuário. Utilizado para requisições condicionais da listagem.
+
+        Returns:
+            Union[Tuple[int, Optional[datetime]], Tuple[str, str]]: Retorna (versão, updated_at) ou uma Tupla com informações de erro (título e descrição, respectivamente).
+        """
+        pass
+
+    @abstractmethod
+    def get_changes(self, since: int, limit: int) -> Union[List[UserChangeModel], Tuple[str, str]]:
+        """Coleta as alterações de usuários (criação, atualização e deleção) posteriores à sequência informada, permitindo que consumidores sincronizem apenas as diferenças.
+
+        Args:
+            since (int): Última sequência já consumida.
+            limit (int): Quantidade máxima de alterações.
+
+        Returns:
+            Union[List[UserChangeModel], Tuple[str, str]]: Retorna a lista de alterações em ordem de sequência ou uma Tupla com informações de erro (título e descrição, respectivamente), como ChangesCompacted quando o cursor é anterior à compactação.
+        """
+        pass
+
+    @abstractmethod
+    def get_last_change_sequence(self) -> Union[int, Tuple[str, str]]:
+        """Obtém a sequência da última alteração de usuários, ponto de partida da sincronização incremental após uma cópia completa.
+
+        Returns:
+            Union[int, Tuple[str, str]]: Retorna a última sequência ou uma Tupla com informações de erro (título e descrição, respectivamente).
+        """
+        pass
+
+    @abstractmethod
+    def compact_changes(self, retention_days: int) -> Union[int, Tuple[str, str]]:
+        """Remove as alterações de usuários mais antigas que o período de retenção.
+
+        Args:
+            retention_days (int): Período de retenção, em dias.
+
+        Returns:
+            Union[int, Tuple[str, str]]: Retorna a quantidade de alterações removidas ou uma Tupla com informações de erro (título e descrição, respectivamente).
+        """
+        pass
+
     @abstractmethod
     def get_all_users(self) -> Union[List[UserModel], Tuple[str, str]]:
         """Coleta todos os usuários (User) existentes no negócio, contendo as informações de primeiro nome (first_name), sobrenome (last_name) e email de cada um.
@@ -48,12 +117,68 @@ class IUserService(ABC):
         pass
 
     @abstractmethod
-    def update_user(self, user_id: int, new_user_data: dict) -> Union[UserModel, Tuple[str, str]]:
+    def get_users_page(self, limit: int, after_id: Optional[int] = None) -> Union[List[UserModel], Tuple[str, str]]:
+        """Coleta uma página de usuários (User) ordenados pelo id, utilizando paginação por cursor (keyset). Para obter a próxima página, utilize o id do último usuário retornado como after_id.
+
+        Args:
+            limit (int): Quantidade máxima de usuários na página.
+            after_id (int, optional): Id do último usuário da página anterior. Padrão para None (primeira página).
+
+        Returns:
+            Union[List[UserModel], Tuple[str, str]]: Retorna a lista de usuários da página (podendo ser vazia quando não houver mais páginas) ou uma Tupla com informações de erro (título e descrição, respectivamente) em caso de alguma falha esperada/identificada (Tuple[str, str]).
+        """
+        pass
+
+    @abstractmethod
+    def get_user_rows(self, limit: Optional[int] = None, after_id: Optional[int] = None, fields: Optional[Sequence[str]] = None) -> Union[List[dict], Tuple[str, str]]:
+        """Coleta usuários (User) ordenados pelo id como dicionários simples (id, first_name, last_name, email), sem objetos ORM. Utilizado pelo modo de resposta rápida e pelas projeções (fields=) do controller, em que os registros são serializados diretamente, sem validação pelo schema de resposta.
+
+        Args:
+            limit (int, optional): Quantidade máxima de usuários. Padrão para None (todos os usuários).
+            after_id (int, optional): Id do último usuário da página anterior. Padrão para None (primeira página).
+            fields (Sequence[str], optional): Campos desejados, entre id, first_name, last_name e email; o id é sempre incluído. Campos desconhecidos retornam o erro InvalidFields. Padrão para None (todos os campos).
+
+        Returns:
+            Union[List[dict], Tuple[str, str]]: Retorna a lista de usuários como dicionários ou uma Tupla com informações de erro (título e descrição, respectivamente) em caso de alguma falha esperada/identificada (Tuple[str, str]).
+        """
+        pass
+
+    @abstractmethod
+    def stream_users(self, after_id: Optional[int] = None, chunk_size: int = 1000) -> Union[Iterator[UserModel], Tuple[str, str]]:
+        """Coleta todos os usuários (User) ordenados pelo id como um iterador, carregando os registros do banco de dados em blocos (chunks) sob demanda. Indicado para respostas em streaming, mantendo o uso de memória constante.
+
+        Args:
+            after_id (int, optional): Apenas usuários com id maior que esse valor serão retornados. Padrão para None.
+            chunk_size (int, optional): Quantidade de registros carregados por bloco. Padrão para 1000.
+
+        Returns:
+            Union[Iterator[UserModel], Tuple[str, str]]: Retorna o iterador de usuários ou uma Tupla com informações de erro (título e descrição, respectivamente) em caso de alguma falha esperada/identificada (Tuple[str, str]).
+        """
+        pass
+
+    @abstractmethod
+    def search_users(self, email: Optional[str] = None, name_prefix: Optional[str] = None, query: Optional[str] = None, limit: int = 50) -> Union[List[UserModel], Tuple[str, str]]:
+        """Busca usuários (User) por exatamente um dos critérios: email exato, prefixo do primeiro nome ou busca textual nos nomes.
+
+        Args:
+            email (str, optional): Email exato do usuário.
+            name_prefix (str, optional): Prefixo do primeiro nome (sem diferenciar maiúsculas e minúsculas).
+            query (str, optional): Termos da busca textual em first_name e last_name.
+            limit (int, optional): Quantidade máxima de usuários retornados. Padrão para 50.
+
+        Returns:
+            Union[List[UserModel], Tuple[str, str]]: Retorna a lista de usuários encontrados (podendo ser vazia) ou uma Tupla com informações de erro (título e descrição, respectivamente), como 'InvalidSearch' quando nenhum ou mais de um critério for informado.
+        """
+        pass
+
+    @abstractmethod
+    def update_user(self, user_id: int, new_user_data: dict, expected_version: Optional[int] = None) -> Union[UserModel, Tuple[str, str]]:
         """Atualiza alguma informação de usuário (User) dentro dos atributos disponiveis (first_name: str, last_name: str, email: str)
 
         Args:
             user_id (int): ID do usuário (User) que deseja realizar alguma atualicação no valor de atributo.
             new_user_data(dict): Dicionário com os atributos e seus novos valores para serem atualizados. Os atributos faltantes serão considerados como inalterados, mantendo o valor original.
+            expected_version (int, optional): Versão esperada do usuário (concorrência otimista, ex: If-Match). Se a versão atual for diferente, retorna o erro 'VersionConflict'. Padrão para None (sem verificação).
 
         Returns:
             Union[UserModel, Tuple[str, str]]: Retorna o usuário atualizado no banco de dados pelo repositório (UserModel) ou uma Tupla com informações de erro (título e descrição, respectivamente) em caso de alguma falha esperada/identificada (Tuple[str, str]).
@@ -71,4 +196,40 @@ class IUserService(ABC):
         Returns:
             Union[UserModel, Tuple[str, str]]: Retorna o usuário deletado no banco de dados pelo repositório (UserModel) ou uma Tupla com informações de erro (título e descrição, respectivamente) em caso de alguma falha esperada/identificada (Tuple[str, str]).
         """
+        pass
+
+    @abstractmethod
+    def create_users(self, users_data: List[dict]) -> Union[List[Union[UserModel, Tuple[str, str]]], Tuple[str, str]]:
+        """Cria vários usuários (User) em uma única operação em lote (uma transação no banco de dados).
+
+        Args:
+            users_data (List[dict]): Lista de dicionários com first_name, email e, opcionalmente, last_name de cada usuário.
+
+        Returns:
+            Union[List[Union[UserModel, Tuple[str, str]]], Tuple[str, str]]: Retorna a lista de resultados por item, na mesma ordem da entrada (UserModel criado ou Tupla de erro do item), ou uma Tupla com informações de erro (título e descrição, respectivamente) em caso de falha da operação como um todo.
+        """
+        pass
+
+    @abstractmethod
+    def update_users(self, users_data: List[dict]) -> Union[List[Union[UserModel, Tuple[str, str]]], Tuple[str, str]]:
+        """Atualiza vários usuários (User) em uma única operação em lote. Cada item deve conter o id e os atributos a serem atualizados.
+
+        Args:
+            users_data (List[dict]): Lista de dicionários contendo 'id' e os novos valores dos atributos.
+
+        Returns:
+            Union[List[Union[UserModel, Tuple[str, str]]], Tuple[str, str]]: Retorna a lista de resultados por item, na mesma ordem da entrada (UserModel atualizado ou Tupla de erro do item, como 'UserDoesNotExist'), ou uma Tupla com informações de erro em caso de falha da operação como um todo.
+        """
+        pass
+
+    @abstractmethod
+    def delete_users(self, user_ids: List[int]) -> Union[List[Union[UserModel, Tuple[str, str]]], Tuple[str, str]]:
+        """Deleta vários usuários (User) pelos ids em uma única operação em lote.
+
+        Args:
+            user_ids (List[int]): Lista de ids dos usuários que serão deletados.
+
+        Returns:
+            Union[List[Union[UserModel, Tuple[str, str]]], Tuple[str, str]]: Retorna a lista de resultados por item, na mesma ordem da entrada (UserModel deletado ou Tupla de erro do item, como 'UserDoesNotExist'), ou uma Tupla com informações de erro em caso de falha da operação como um todo.
+        """
         pass
\ No newline at end of file
@@ -0,0 +1,438 @@
+import asyncio
+import copy
+import csv
+import json
+import os
+import re
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from itertools import islice
+from typing import AsyncIterator, Dict, Iterator, List, Optional, Tuple, Union
+from models.user_model import UserModel
+from service.meta.interface_user_service import IUserService
+from service.meta.interface_async_user_service import IAsyncUserService
+from infra.log_config import LogService, handle_exceptions
+from infra.metrics import metrics_registry
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:  # pyarrow é opcional (extra 'export'): sem ele, apenas exportações CSV são aceitas
+    pyarrow = None
+
+
+USER_EXPORT_JOBS = metrics_registry.counter(
+    "user_export_jobs_total", "Exportações de usuários encerradas, por formato e situação final (completed ou failed).", ("format", "status"))
+USER_EXPORT_ROWS = metrics_registry.counter(
+    "user_export_rows_total", "Usuários gravados nos arquivos de exportação.", ("format",))
+USER_EXPORT_DURATION = metrics_registry.histogram(
+    "user_export_duration_seconds", "Duração de cada exportação de usuários concluída, em segundos.", ("format",),
+    buckets=(0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 600.0, 1800.0))
+
+# Colunas dos arquivos exportados, na ordem das colunas do CSV e do schema Parquet.
+EXPORT_COLUMNS = ("id", "first_name", "last_name", "email", "version", "updated_at")
+EXPORT_ID_PATTERN = re.compile(r"[0-9a-f]{32}")
+
+
+def export_row(user: UserModel) -> tuple:
+    return (user.id, user.first_name, user.last_name, user.email, user.version, user.updated_at)
+
+
+def chunked(users: Iterator[UserModel], chunk_size: int) -> Iterator[List[UserModel]]:
+    while True:
+        chunk = list(islice(users, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+async def async_chunked(users: AsyncIterator[UserModel], chunk_size: int) -> AsyncIterator[List[UserModel]]:
+    chunk = []
+    async for user in users:
+        chunk.append(user)
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+class CsvExportWriter:
+    """Grava os usuários em CSV (UTF-8, com cabeçalho), um bloco por vez. Datas no formato ISO 8601, em UTC."""
+    extension = "csv"
+    media_type = "text/csv; charset=utf-8"
+
+    def __init__(self, path: str) -> None:
+        self.file = open(path, "w", encoding="utf-8", newline="")
+        self.writer = csv.writer(self.file)
+        self.writer.writerow(EXPORT_COLUMNS)
+
+    def write(self, users: List[UserModel]) -> None:
+        self.writer.writerows((*row[:-1], row[-1].isoformat() if row[-1] is not None else None)
+                              for row in map(export_row, users))
+        self.file.flush()
+
+    def close(self) -> None:
+        self.file.close()
+
+
+class ParquetExportWriter:
+    """Grava os usuários em Parquet (pyarrow), um row group por bloco: apenas o bloco em gravação é mantido em memória."""
+    extension = "parquet"
+    media_type = "application/vnd.apache.parquet"
+
+    def __init__(self, path: str) -> None:
+        self.schema = pyarrow.schema([("id", pyarrow.int64()), ("first_name", pyarrow.string()), ("last_name", pyarrow.string()),
+                                      ("email", pyarrow.string()), ("version", pyarrow.int64()), ("updated_at", pyarrow.timestamp("us", tz="UTC"))])
+        self.writer = pyarrow.parquet.ParquetWriter(path, self.schema)
+
+    def write(self, users: List[UserModel]) -> None:
+        columns = zip(*map(export_row, users))
+        arrays = [pyarrow.array(values, type=field.type) for values, field in zip(columns, self.schema)]
+        self.writer.write_table(pyarrow.Table.from_arrays(arrays, schema=self.schema))
+
+    def close(self) -> None:
+        self.writer.close()
+
+
+# Formatos disponíveis neste ambiente (formato -> gravador).
+EXPORT_WRITERS = {"csv": CsvExportWriter}
+if pyarrow is not None:
+    EXPORT_WRITERS["parquet"] = ParquetExportWriter
+EXPORT_FORMATS = ("csv", "parquet")
+
+
+class UserExportJob:
+    """Estado de uma exportação: situação (pending, running, completed ou failed), progresso e erro, quando houver."""
+    __slots__ = ("id", "format", "status", "rows_written", "bytes_written", "created_at", "started_at", "finished_at", "error_code", "error_msg")
+    DATETIME_FIELDS = ("created_at", "started_at", "finished_at")
+
+    def __init__(self, id: str, format: str, status: str = "pending", rows_written: int = 0, bytes_written: int = 0,
+                 created_at: Optional[datetime] = None, started_at: Optional[datetime] = None, finished_at: Optional[datetime] = None,
+                 error_code: Optional[str] = None, error_msg: Optional[str] = None) -> None:
+        self.id = id
+        self.format = format
+        self.status = status
+        self.rows_written = rows_written
+        self.bytes_written = bytes_written
+        self.created_at = created_at or datetime.now(timezone.utc)
+        self.started_at = started_at
+        self.finished_at = finished_at
+        self.error_code = error_code
+        self.error_msg = error_msg
+
+    @property
+    def file_name(self) -> str:
+        return f"users-{self.id}.{EXPORT_WRITERS[self.format].extension}"
+
+    @property
+    def media_type(self) -> str:
+        return EXPORT_WRITERS[self.format].media_type
+
+    def to_dict(self) -> Dict[str, object]:
+        return {field: getattr(self, field) for field in self.__slots__}
+
+    def to_json(self) -> str:
+        return json.dumps({field: value.isoformat() if field in self.DATETIME_FIELDS and value is not None else value
+                           for field, value in self.to_dict().items()})
+
+    @classmethod
+    def from_json(cls, content: str) -> "UserExportJob":
+        data = json.loads(content)
+        for field in cls.DATETIME_FIELDS:
+            if data[field] is not None:
+                data[field] = datetime.fromisoformat(data[field])
+        return cls(**data)
+
+
+class UserExportStore:
+    """Diretório local das exportações: cada exportação possui o arquivo de dados (users-{id}.{formato}, gravado como .part até a conclusão) e um manifesto JSON com o seu estado ({id}.json), visível a todos os workers."""
+
+    def __init__(self, directory: str) -> None:
+        self.directory = directory
+
+    def file_path(self, job: UserExportJob) -> str:
+        return os.path.join(self.directory, job.file_name)
+
+    def partial_path(self, job: UserExportJob) -> str:
+        return self.file_path(job) + ".part"
+
+    def manifest_path(self, export_id: str) -> str:
+        return os.path.join(self.directory, f"{export_id}.json")
+
+    def save(self, job: UserExportJob) -> None:
+        """Grava o manifesto de forma atômica (arquivo temporário + os.replace): leitores nunca encontram um manifesto pela metade."""
+        os.makedirs(self.directory, exist_ok=True)
+        temporary_path = self.manifest_path(job.id) + ".tmp"
+        with open(temporary_path, "w", encoding="utf-8") as file:
+            file.write(job.to_json())
+        os.replace(temporary_path, self.manifest_path(job.id))
+
+    def load(self, export_id: str) -> Optional[UserExportJob]:
+        if not EXPORT_ID_PATTERN.fullmatch(export_id):
+            return None
+        try:
+            with open(self.manifest_path(export_id), encoding="utf-8") as file:
+                return UserExportJob.from_json(file.read())
+        except FileNotFoundError:
+            return None
+
+
+class UserExportRun:
+    """Etapas da execução de uma exportação (abertura do arquivo, gravação de cada bloco, conclusão e falha), compartilhadas pelas versões síncrona e assíncrona."""
+
+    def __init__(self, store: UserExportStore, job: UserExportJob) -> None:
+        self.store = store
+        self.job = job
+        self.writer = None
+        self.started = None
+
+    def start(self) -> None:
+        self.started = time.perf_counter()
+        self.writer = EXPORT_WRITERS[self.job.format](self.store.partial_path(self.job))
+        self.job.status = "running"
+        self.job.started_at = datetime.now(timezone.utc)
+        self.store.save(self.job)
+
+    def write(self, users: List[UserModel]) -> None:
+        self.writer.write(users)
+        self.job.rows_written += len(users)
+        self.job.bytes_written = os.path.getsize(self.store.partial_path(self.job))
+        USER_EXPORT_ROWS.inc(len(users), format=self.job.format)
+        self.store.save(self.job)
+
+    def complete(self) -> None:
+        self.writer.close()
+        os.replace(self.store.partial_path(self.job), self.store.file_path(self.job))
+        self.job.bytes_written = os.path.getsize(self.store.file_path(self.job))
+        self.job.status = "completed"
+        self.job.finished_at = datetime.now(timezone.utc)
+        self.store.save(self.job)
+        USER_EXPORT_JOBS.inc(format=self.job.format, status="completed")
+        USER_EXPORT_DURATION.observe(time.perf_counter() - self.started, format=self.job.format)
+
+    def fail(self, error_code: str, error_msg: str) -> None:
+        """Descarta o arquivo parcial e registra o erro no manifesto."""
+        if self.writer is not None:
+            try:
+                self.writer.close()
+            except Exception:
+                pass
+        try:
+            os.remove(self.store.partial_path(self.job))
+        except FileNotFoundError:
+            pass
+        self.job.status = "failed"
+        self.job.error_code = error_code
+        self.job.error_msg = error_msg
+        self.job.finished_at = datetime.now(timezone.utc)
+        self.store.save(self.job)
+        USER_EXPORT_JOBS.inc(format=self.job.format, status="failed")
+
+
+def validate_export_format(export_format: str) -> Optional[Tuple[str, str]]:
+    if export_format not in EXPORT_FORMATS:
+        return ("InvalidExportFormat", f"Unknown export format {export_format}. Allowed formats: {', '.join(EXPORT_FORMATS)}.")
+    if export_format not in EXPORT_WRITERS:
+        return ("ExportFormatUnavailable", f"Export format {export_format} requires the pyarrow package.")
+    return None
+
+
+def completed_export(job: Optional[UserExportJob], export_id: str) -> Union[UserExportJob, Tuple[str, str]]:
+    if job is None:
+        return ("ExportDoesNotExist", f"Export with id {export_id} does not exist.")
+    if job.status != "completed":
+        return ("ExportNotReady", f"Export with id {export_id} is {job.status}.")
+    return job
+
+
+class UserExportService:
+    """
+        Exportação assíncrona da tabela de usuários para arquivos CSV ou Parquet no disco local, sobre a camada de serviço síncrona (IUserService).
+
+        Cada exportação é executada por uma thread de background, que percorre os usuários com o stream_users em blocos de chunk_size registros e grava cada bloco no arquivo. No máximo max_concurrent exportações são executadas ao mesmo tempo por processo; as demais aguardam como pending.
+
+        Args:
+            service (IUserService): Camada de serviço de usuários.
+            directory (str): Diretório dos arquivos e manifestos das exportações.
+            chunk_size (int, optional): Usuários lidos e gravados por bloco. Padrão para 10000.
+            max_concurrent (int, optional): Exportações executadas simultaneamente por processo. Padrão para 1.
+    """
+    __log_service = LogService()
+
+    def __init__(self, service: IUserService, directory: str, chunk_size: int = 10000, max_concurrent: int = 1) -> None:
+        self.service = service
+        self.store = UserExportStore(directory)
+        self.chunk_size = chunk_size
+        self.__slots = threading.BoundedSemaphore(max_concurrent)
+        self.__workers: Dict[str, threading.Thread] = {}
+        self.__stopping = threading.Event()
+        self.__logger = self.__log_service.get_logger(__name__)
+
+    @handle_exceptions(__log_service.get_logger(__name__))
+    def create_export(self, export_format: str = "csv") -> Union[UserExportJob, Tuple[str, str]]:
+        """Registra uma exportação (pending) e inicia a sua execução em background.
+
+        Returns:
+            Union[UserExportJob, Tuple[str, str]]: Retorna a exportação criada ou uma Tupla com informações de erro (título e descrição, respectivamente) para formatos desconhecidos ou indisponíveis no ambiente.
+        """
+        error = validate_export_format(export_format)
+        if error is not None:
+            return error
+        job = UserExportJob(id=uuid.uuid4().hex, format=export_format)
+        self.store.save(job)
+        self.__logger.info("Exportação %s (%s) registrada", job.id, export_format)
+        # A thread atualiza a própria cópia do estado; a exportação retornada ao chamador permanece como registrada (pending).
+        worker = self.__workers[job.id] = threading.Thread(target=self.__run, args=(copy.copy(job),), name=f"user-export-{job.id}", daemon=True)
+        worker.start()
+        return job
+
+    @handle_exceptions(__log_service.get_logger(__name__))
+    def get_export(self, export_id: str) -> Union[UserExportJob, Tuple[str, str]]:
+        job = self.store.load(export_id)
+        if job is None:
+            return ("ExportDoesNotExist", f"Export with id {export_id} does not exist.")
+        return job
+
+    @handle_exceptions(__log_service.get_logger(__name__))
+    def get_export_file(self, export_id: str) -> Union[UserExportJob, Tuple[str, str]]:
+        """Retorna a exportação apenas quando concluída (o arquivo está em store.file_path(job)); ExportNotReady enquanto em andamento ou após uma falha."""
+        return completed_export(self.store.load(export_id), export_id)
+
+    def wait(self, export_id: str, timeout: Optional[float] = None) -> None:
+        """Aguarda o fim de uma exportação iniciada por este processo."""
+        worker = self.__workers.get(export_id)
+        if worker is not None:
+            worker.join(timeout)
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Interrompe as exportações em andamento ao fim do bloco atual (registradas como failed, ExportInterrupted) e aguarda até timeout segundos pelo fim das threads."""
+        self.__stopping.set()
+        deadline = time.monotonic() + timeout
+        for worker in list(self.__workers.values()):
+            worker.join(max(0.0, deadline - time.monotonic()))
+
+    def __run(self, job: UserExportJob) -> None:
+        run = UserExportRun(self.store, job)
+        with self.__slots:
+            users = None
+            try:
+                if self.__stopping.is_set():
+                    run.fail("ExportInterrupted", "The export was interrupted by a server shutdown.")
+                    return
+                users = self.service.stream_users(chunk_size=self.chunk_size)
+                if isinstance(users, tuple):
+                    run.fail(*users)
+                    return
+                run.start()
+                self.__logger.info("Exportação %s iniciada", job.id)
+                for chunk in chunked(users, self.chunk_size):
+                    if self.__stopping.is_set():
+                        run.fail("ExportInterrupted", "The export was interrupted by a server shutdown.")
+                        return
+                    run.write(chunk)
+                run.complete()
+                self.__logger.info("Exportação %s concluída: %s usuários", job.id, job.rows_written)
+            except Exception as error:
+                self.__logger.critical("Erro Inesperado na exportação %s: %s", job.id, error.__class__.__name__, exc_info=error)
+                run.fail("UnexpectedError", f"{error.__class__.__name__}: {error}")
+            finally:
+                if hasattr(users, "close"):
+                    users.close()
+                self.__workers.pop(job.id, None)
+
+
+class AsyncUserExportService:
+    """
+        Versão assíncrona do UserExportService: cada exportação é uma task no event loop, e a gravação em disco é feita fora do event loop (asyncio.to_thread).
+
+        Args:
+            service (IAsyncUserService): Camada de serviço de usuários assíncrona.
+            directory (str): Diretório dos arquivos e manifestos das exportações.
+            chunk_size (int, optional): Usuários lidos e gravados por bloco. Padrão para 10000.
+            max_concurrent (int, optional): Exportações executadas simultaneamente por processo. Padrão para 1.
+    """
+    __log_service = LogService()
+
+    def __init__(self, service: IAsyncUserService, directory: str, chunk_size: int = 10000, max_concurrent: int = 1) -> None:
+        self.service = service
+        self.store = UserExportStore(directory)
+        self.chunk_size = chunk_size
+        self.max_concurrent = max_concurrent
+        self.__slots = None
+        self.__loop = None
+        self.__tasks: Dict[str, asyncio.Task] = {}
+        self.__logger = self.__log_service.get_logger(__name__)
+
+    def __ensure_slots(self) -> asyncio.Semaphore:
+        """O semáforo pertence ao event loop em execução; um novo event loop (ex: após o fork de um worker) recebe um semáforo próprio."""
+        loop = asyncio.get_running_loop()
+        if self.__loop is not loop:
+            self.__loop = loop
+            self.__slots = asyncio.Semaphore(self.max_concurrent)
+        return self.__slots
+
+    @handle_exceptions(__log_service.get_logger(__name__))
+    async def create_export(self, export_format: str = "csv") -> Union[UserExportJob, Tuple[str, str]]:
+        """Versão assíncrona de UserExportService.create_export."""
+        error = validate_export_format(export_format)
+        if error is not None:
+            return error
+        job = UserExportJob(id=uuid.uuid4().hex, format=export_format)
+        await asyncio.to_thread(self.store.save, job)
+        self.__logger.info("Exportação %s (%s) registrada", job.id, export_format)
+        task = self.__tasks[job.id] = asyncio.get_running_loop().create_task(self.__run(copy.copy(job), self.__ensure_slots()))
+        task.add_done_callback(lambda _: self.__tasks.pop(job.id, None))
+        return job
+
+    @handle_exceptions(__log_service.get_logger(__name__))
+    async def get_export(self, export_id: str) -> Union[UserExportJob, Tuple[str, str]]:
+        job = await asyncio.to_thread(self.store.load, export_id)
+        if job is None:
+            return ("ExportDoesNotExist", f"Export with id {export_id} does not exist.")
+        return job
+
+    @handle_exceptions(__log_service.get_logger(__name__))
+    async def get_export_file(self, export_id: str) -> Union[UserExportJob, Tuple[str, str]]:
+        """Versão assíncrona de UserExportService.get_export_file."""
+        return completed_export(await asyncio.to_thread(self.store.load, export_id), export_id)
+
+    async def wait(self, export_id: str) -> None:
+        task = self.__tasks.get(export_id)
+        if task is not None:
+            await asyncio.wait([task])
+
+    async def close(self) -> None:
+        """Cancela as exportações em andamento (registradas como failed, ExportInterrupted) e aguarda o seu encerramento."""
+        tasks = list(self.__tasks.values())
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.wait(tasks)
+
+    async def __run(self, job: UserExportJob, slots: asyncio.Semaphore) -> None:
+        run = UserExportRun(self.store, job)
+        async with slots:
+            users = None
+            try:
+                users = await self.service.stream_users(chunk_size=self.chunk_size)
+                if isinstance(users, tuple):
+                    await asyncio.to_thread(run.fail, *users)
+                    return
+                await asyncio.to_thread(run.start)
+                self.__logger.info("Exportação %s iniciada", job.id)
+                async for chunk in async_chunked(users, self.chunk_size):
+                    await asyncio.to_thread(run.write, chunk)
+                await asyncio.to_thread(run.complete)
+                self.__logger.info("Exportação %s concluída: %s usuários", job.id, job.rows_written)
+            except asyncio.CancelledError:
+                await asyncio.to_thread(run.fail, "ExportInterrupted", "The export was interrupted by a server shutdown.")
+                raise
+            except Exception as error:
+                self.__logger.critical("Erro Inesperado na exportação %s: %s", job.id, error.__class__.__name__, exc_info=error)
+                await asyncio.to_thread(run.fail, "UnexpectedError", f"{error.__class__.__name__}: {error}")
+            finally:
+                if hasattr(users, "aclose"):
+                    await users.aclose()
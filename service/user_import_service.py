@@ -0,0 +1,431 @@
+import asyncio
+import codecs
+import collections
+import csv
+import inspect
+import json
+import multiprocessing
+import os
+import re
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from typing import AsyncIterator, Dict, List, Optional, Tuple, Union
+from pydantic import ValidationError
+from starlette.concurrency import run_in_threadpool
+from starlette.requests import ClientDisconnect
+from schemas.user_schema import UserCreateRequest
+from models.user_model import UserModel
+from service.meta.interface_user_service import IUserService
+from service.meta.interface_async_user_service import IAsyncUserService
+from infra.log_config import LogService, handle_exceptions
+from infra.metrics import metrics_registry
+
+
+USER_IMPORT_ROWS = metrics_registry.counter(
+    "user_import_rows_total", "Linhas processadas pelas importações de usuários, por formato e resultado (imported ou failed).", ("format", "result"))
+USER_IMPORT_CHUNK_DURATION = metrics_registry.histogram(
+    "user_import_chunk_duration_seconds", "Duração da transação de criação de cada bloco de uma importação de usuários, em segundos.", ("format",))
+
+IMPORT_FORMATS = ("csv", "ndjson")
+IMPORT_ID_PATTERN = re.compile(r"[0-9a-f]{32}")
+
+
+class ImportFileError(Exception):
+    """Falha que impede a leitura do restante do arquivo enviado (codificação inválida, linha acima do limite, cabeçalho sem as colunas obrigatórias)."""
+
+    def __init__(self, code: str, msg: str) -> None:
+        super().__init__(msg)
+        self.code = code
+        self.msg = msg
+
+
+def validation_error_message(error: ValidationError) -> str:
+    first_error = error.errors()[0]
+    location = ".".join(str(part) for part in first_error["loc"])
+    return f"{location}: {first_error['msg']}" if location else first_error["msg"]
+
+
+def validate_rows(import_format: str, header: Optional[List[str]], rows: List[Tuple[int, str]]) -> Tuple[List[Tuple[int, dict]], List[Tuple[int, str, str]]]:
+    """Interpreta e valida um bloco de linhas do arquivo contra o UserCreateRequest (inclusive o EmailStr). Executada no pool de validação: recebe e retorna apenas tipos simples, serializáveis entre processos.
+
+    Returns:
+        Tuple[List[Tuple[int, dict]], List[Tuple[int, str, str]]]: Linhas válidas (número da linha, dados do usuário) e inválidas (número da linha, código e mensagem do erro).
+    """
+    valid, errors = [], []
+    for row, text in rows:
+        try:
+            if import_format == "csv":
+                values = next(csv.reader([text]))
+                if len(values) != len(header):
+                    errors.append((row, "InvalidRow", f"Expected {len(header)} columns, found {len(values)}."))
+                    continue
+                data = {name: value or None for name, value in zip(header, values)}
+            else:
+                data = json.loads(text)
+                if not isinstance(data, dict):
+                    errors.append((row, "InvalidRow", "Row must be a JSON object."))
+                    continue
+            valid.append((row, UserCreateRequest.model_validate(data).model_dump()))
+        except ValidationError as error:
+            errors.append((row, "ValidationError", validation_error_message(error)))
+        except (ValueError, csv.Error) as error:
+            errors.append((row, "InvalidRow", str(error)))
+    return valid, errors
+
+
+async def decode_lines(body: AsyncIterator[bytes], max_row_length: int) -> AsyncIterator[str]:
+    """Decodifica o corpo enviado (UTF-8, com ou sem BOM) à medida que chega e o separa em linhas. Apenas a linha incompleta do último bloco recebido fica em memória."""
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    pending = ""
+    try:
+        async for chunk in body:
+            lines = (pending + decoder.decode(chunk)).split("\n")
+            pending = lines.pop()
+            if len(pending) > max_row_length:
+                raise ImportFileError("RowTooLarge", f"A row exceeds the limit of {max_row_length} characters.")
+            for line in lines:
+                yield line
+        pending += decoder.decode(b"", final=True)
+    except UnicodeDecodeError as error:
+        raise ImportFileError("InvalidEncoding", f"The file is not valid UTF-8: {error.reason}.")
+    if pending:
+        yield pending
+
+
+async def csv_records(lines: AsyncIterator[str], max_row_length: int) -> AsyncIterator[str]:
+    """Agrupa as linhas em registros CSV: um campo entre aspas pode conter quebras de linha, e o registro termina na primeira quebra de linha com uma quantidade par de aspas (aspas escapadas são duplicadas e não alteram a paridade)."""
+    record, quotes, size = [], 0, 0
+    async for line in lines:
+        record.append(line)
+        quotes += line.count('"')
+        size += len(line)
+        if size > max_row_length:
+            raise ImportFileError("RowTooLarge", f"A row exceeds the limit of {max_row_length} characters.")
+        if quotes % 2 == 0:
+            text = "\n".join(record)
+            record, quotes, size = [], 0, 0
+            if text.strip():
+                yield text
+    if record:
+        yield "\n".join(record)
+
+
+async def ndjson_records(lines: AsyncIterator[str]) -> AsyncIterator[str]:
+    async for line in lines:
+        if line.strip():
+            yield line
+
+
+def parse_csv_header(text: str) -> List[str]:
+    header = [name.strip().lower() for name in next(csv.reader([text]))]
+    missing = [name for name in ("first_name", "email") if name not in header]
+    if missing:
+        raise ImportFileError("InvalidImportFile", f"CSV header is missing the columns: {', '.join(missing)}.")
+    return header
+
+
+class UserImportJob:
+    """Estado de uma importação, atualizado a cada bloco confirmado (checkpoint): rows_processed é a última linha do arquivo cuja criação (ou erro) já foi registrada, a partir da qual uma nova tentativa continua."""
+    __slots__ = ("id", "format", "status", "rows_processed", "rows_imported", "rows_failed", "errors_bytes",
+                 "created_at", "updated_at", "finished_at", "error_code", "error_msg")
+    DATETIME_FIELDS = ("created_at", "updated_at", "finished_at")
+
+    def __init__(self, id: str, format: str, status: str = "running", rows_processed: int = 0, rows_imported: int = 0, rows_failed: int = 0,
+                 errors_bytes: int = 0, created_at: Optional[datetime] = None, updated_at: Optional[datetime] = None,
+                 finished_at: Optional[datetime] = None, error_code: Optional[str] = None, error_msg: Optional[str] = None) -> None:
+        self.id = id
+        self.format = format
+        self.status = status
+        self.rows_processed = rows_processed
+        self.rows_imported = rows_imported
+        self.rows_failed = rows_failed
+        self.errors_bytes = errors_bytes
+        self.created_at = created_at or datetime.now(timezone.utc)
+        self.updated_at = updated_at or self.created_at
+        self.finished_at = finished_at
+        self.error_code = error_code
+        self.error_msg = error_msg
+
+    def to_dict(self) -> Dict[str, object]:
+        return {field: getattr(self, field) for field in self.__slots__}
+
+    def to_json(self) -> str:
+        return json.dumps({field: value.isoformat() if field in self.DATETIME_FIELDS and value is not None else value
+                           for field, value in self.to_dict().items()})
+
+    @classmethod
+    def from_json(cls, content: str) -> "UserImportJob":
+        data = json.loads(content)
+        for field in cls.DATETIME_FIELDS:
+            if data[field] is not None:
+                data[field] = datetime.fromisoformat(data[field])
+        return cls(**data)
+
+
+class UserImportStore:
+    """Diretório local das importações: o manifesto com o estado de cada importação ({id}.json), o relatório de erros por linha ({id}.errors.ndjson, um objeto JSON por linha rejeitada) e o lock da importação em andamento ({id}.lock)."""
+
+    def __init__(self, directory: str) -> None:
+        self.directory = directory
+
+    def manifest_path(self, import_id: str) -> str:
+        return os.path.join(self.directory, f"{import_id}.json")
+
+    def errors_path(self, job: UserImportJob) -> str:
+        return os.path.join(self.directory, f"{job.id}.errors.ndjson")
+
+    def lock_path(self, import_id: str) -> str:
+        return os.path.join(self.directory, f"{import_id}.lock")
+
+    def acquire_lock(self, import_id: str, stale_after: float) -> bool:
+        """Reserva a importação para uma única execução com a criação exclusiva (O_CREAT | O_EXCL) do lock. Um lock sem atualização há mais de stale_after segundos pertence a uma execução interrompida e é descartado.
+
+        Returns:
+            bool: True se o lock foi obtido, False se outra execução da importação está em andamento.
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        path = self.lock_path(import_id)
+        for _ in range(2):
+            try:
+                os.close(os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+                return True
+            except FileExistsError:
+                try:
+                    if time.time() - os.path.getmtime(path) <= stale_after:
+                        return False
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+        return False
+
+    def touch_lock(self, import_id: str) -> None:
+        os.utime(self.lock_path(import_id))
+
+    def release_lock(self, import_id: str) -> None:
+        try:
+            os.remove(self.lock_path(import_id))
+        except FileNotFoundError:
+            pass
+
+    def save(self, job: UserImportJob) -> None:
+        """Grava o manifesto de forma atômica (arquivo temporário + os.replace)."""
+        os.makedirs(self.directory, exist_ok=True)
+        temporary_path = self.manifest_path(job.id) + ".tmp"
+        with open(temporary_path, "w", encoding="utf-8") as file:
+            file.write(job.to_json())
+        os.replace(temporary_path, self.manifest_path(job.id))
+
+    def load(self, import_id: str) -> Optional[UserImportJob]:
+        if not IMPORT_ID_PATTERN.fullmatch(import_id):
+            return None
+        try:
+            with open(self.manifest_path(import_id), encoding="utf-8") as file:
+                return UserImportJob.from_json(file.read())
+        except FileNotFoundError:
+            return None
+
+
+class UserImportRun:
+    """Gravação do progresso de uma importação, que detém o lock da importação: relatório de erros e manifesto. Ao retomar, o relatório é truncado no tamanho do último checkpoint, descartando erros de um bloco que não chegou a ser confirmado."""
+
+    def __init__(self, store: UserImportStore, job: UserImportJob) -> None:
+        self.store = store
+        self.job = job
+        os.makedirs(store.directory, exist_ok=True)
+        self.errors_file = open(store.errors_path(job), "a+b")
+        self.errors_file.truncate(job.errors_bytes)
+        self.store.save(job)
+
+    def checkpoint(self, last_row: int, imported: int, errors: List[Tuple[int, str, str]]) -> None:
+        self.errors_file.write(b"".join(json.dumps({"row": row, "code": code, "msg": msg}).encode("utf-8") + b"\n"
+                                        for row, code, msg in sorted(errors)))
+        self.errors_file.flush()
+        self.job.rows_processed = last_row
+        self.job.rows_imported += imported
+        self.job.rows_failed += len(errors)
+        self.job.errors_bytes = self.errors_file.tell()
+        self.job.updated_at = datetime.now(timezone.utc)
+        self.store.save(self.job)
+        self.store.touch_lock(self.job.id)
+        USER_IMPORT_ROWS.inc(imported, format=self.job.format, result="imported")
+        USER_IMPORT_ROWS.inc(len(errors), format=self.job.format, result="failed")
+
+    def finish(self, error_code: Optional[str] = None, error_msg: Optional[str] = None) -> None:
+        self.errors_file.close()
+        self.job.status = "failed" if error_code else "completed"
+        self.job.error_code = error_code
+        self.job.error_msg = error_msg
+        self.job.finished_at = self.job.updated_at = datetime.now(timezone.utc)
+        self.store.save(self.job)
+        self.store.release_lock(self.job.id)
+
+
+class UserImportService:
+    """
+        Importação em massa de usuários a partir de um arquivo CSV (com cabeçalho) ou NDJSON enviado em streaming, sobre a camada de serviço de usuários (IUserService ou IAsyncUserService).
+
+        O corpo é lido à medida que chega e separado em linhas, sem que o arquivo seja mantido em memória. As linhas são agrupadas em blocos de chunk_size, interpretadas e validadas contra o UserCreateRequest no pool de validação (processos, com validation_workers > 0, ou o threadpool) e criadas com o create_users, uma transação por bloco. Enquanto um bloco é gravado, os próximos são validados; no máximo validation_workers + 1 blocos (ao menos 2) ficam em memória, o que limita a leitura do corpo (backpressure).
+
+        Cada bloco confirmado é um checkpoint: linhas rejeitadas vão para o relatório de erros e o manifesto registra a última linha processada. Se a importação falhar (banco de dados, conexão do cliente, queda do servidor), o cliente reenvia o mesmo arquivo com o import_id e as linhas já processadas são ignoradas.
+
+        Args:
+            service (Union[IUserService, IAsyncUserService]): Camada de serviço de usuários.
+            directory (str): Diretório dos manifestos e relatórios de erros das importações.
+            chunk_size (int, optional): Linhas validadas e gravadas por transação. Padrão para 1000.
+            validation_workers (int, optional): Processos do pool de validação. Com 0, a validação é executada no threadpool. Padrão para 0.
+            max_row_length (int, optional): Tamanho máximo, em caracteres, de uma linha (registro) do arquivo. Padrão para 65536.
+            running_timeout (float, optional): Segundos sem checkpoint após os quais o lock de uma importação em andamento é considerado abandonado (ex: queda do worker) e a importação pode ser retomada. Padrão para 300.
+    """
+    __log_service = LogService()
+
+    def __init__(self, service: Union[IUserService, IAsyncUserService], directory: str, chunk_size: int = 1000,
+                 validation_workers: int = 0, max_row_length: int = 65536, running_timeout: float = 300) -> None:
+        self.service = service
+        self.store = UserImportStore(directory)
+        self.chunk_size = chunk_size
+        self.validation_workers = validation_workers
+        self.max_row_length = max_row_length
+        self.running_timeout = running_timeout
+        self.__pool = None
+        self.__logger = self.__log_service.get_logger(__name__)
+
+    def __executor(self) -> Optional[ProcessPoolExecutor]:
+        """Pool de processos criado no primeiro uso, com spawn: um fork do worker levaria junto threads e locks (logging, pools de conexão) em estado indefinido."""
+        if self.validation_workers > 0 and self.__pool is None:
+            self.__pool = ProcessPoolExecutor(self.validation_workers, mp_context=multiprocessing.get_context("spawn"))
+        return self.__pool
+
+    async def __call_service(self, method, *args):
+        if inspect.iscoroutinefunction(method):
+            return await method(*args)
+        return await run_in_threadpool(method, *args)
+
+    def __start(self, import_format: str, import_id: Optional[str]) -> Union[UserImportJob, Tuple[str, str]]:
+        """Cria a importação ou prepara a retomada de import_id, obtendo o lock da importação antes de carregar o checkpoint."""
+        if import_id is None:
+            job = UserImportJob(id=uuid.uuid4().hex, format=import_format)
+            self.store.acquire_lock(job.id, self.running_timeout)
+            return job
+        job = self.store.load(import_id)
+        if job is None:
+            return ("ImportDoesNotExist", f"Import with id {import_id} does not exist.")
+        if job.format != import_format:
+            return ("InvalidImportFormat", f"Import with id {import_id} was started with format {job.format}.")
+        if job.status == "completed":
+            return job
+        if not self.store.acquire_lock(import_id, self.running_timeout):
+            return ("ImportInProgress", f"Import with id {import_id} is running.")
+        # O manifesto é relido com o lock: a execução anterior pode ter gravado um checkpoint (ou concluído) após a primeira leitura.
+        job = self.store.load(import_id)
+        if job.status == "completed":
+            self.store.release_lock(import_id)
+            return job
+        job.status, job.error_code, job.error_msg, job.finished_at = "running", None, None, None
+        return job
+
+    @handle_exceptions(__log_service.get_logger(__name__))
+    async def import_users(self, body: AsyncIterator[bytes], import_format: str, import_id: Optional[str] = None) -> Union[UserImportJob, Tuple[str, str]]:
+        """Importa os usuários do arquivo enviado em body, ou retoma a importação import_id a partir da última linha confirmada.
+
+        Args:
+            body (AsyncIterator[bytes]): Corpo da requisição, recebido em blocos.
+            import_format (str): 'csv' (com cabeçalho, contendo ao menos first_name e email) ou 'ndjson'.
+            import_id (str, optional): Importação a ser retomada, com o mesmo arquivo do início. Padrão para None (nova importação).
+
+        Returns:
+            Union[UserImportJob, Tuple[str, str]]: Retorna a importação (completed, ou failed com o erro que a interrompeu e o checkpoint para a retomada) ou uma Tupla com informações de erro (título e descrição, respectivamente) quando a importação não pôde ser iniciada.
+        """
+        if import_format not in IMPORT_FORMATS:
+            return ("InvalidImportFormat", f"Unknown import format {import_format}. Allowed formats: {', '.join(IMPORT_FORMATS)}.")
+        job = await asyncio.to_thread(self.__start, import_format, import_id)
+        if not isinstance(job, UserImportJob) or job.status == "completed":
+            return job
+
+        try:
+            run = await asyncio.to_thread(UserImportRun, self.store, job)
+        except BaseException:
+            await asyncio.to_thread(self.store.release_lock, job.id)
+            raise
+        self.__logger.info("Importação %s (%s) iniciada a partir da linha %s", job.id, import_format, job.rows_processed + 1)
+        try:
+            await self.__import_chunks(run, body)
+        except ClientDisconnect:
+            await asyncio.to_thread(run.finish, "ImportInterrupted", "The client disconnected before the upload was complete.")
+        except asyncio.CancelledError:
+            # A tarefa cancelada não deve aguardar o threadpool: o encerramento (manifesto e lock) é gravado diretamente.
+            run.finish("ImportInterrupted", "The import was cancelled before the upload was complete.")
+            raise
+        except ImportFileError as error:
+            await asyncio.to_thread(run.finish, error.code, error.msg)
+        except Exception as error:
+            self.__logger.critical("Erro Inesperado na importação %s: %s", job.id, error.__class__.__name__, exc_info=error)
+            await asyncio.to_thread(run.finish, "UnexpectedError", f"{error.__class__.__name__}: {error}")
+        else:
+            if job.status == "running":
+                await asyncio.to_thread(run.finish)
+        self.__logger.info("Importação %s %s: %s usuários criados e %s linhas rejeitadas", job.id, job.status, job.rows_imported, job.rows_failed)
+        return job
+
+    async def __import_chunks(self, run: UserImportRun, body: AsyncIterator[bytes]) -> None:
+        job = run.job
+        lines = decode_lines(body, self.max_row_length)
+        records = csv_records(lines, self.max_row_length) if job.format == "csv" else ndjson_records(lines)
+        loop = asyncio.get_running_loop()
+        in_flight = collections.deque()
+        header, chunk, row = None, [], 0
+
+        async def submit() -> None:
+            in_flight.append((chunk[-1][0], loop.run_in_executor(self.__executor(), validate_rows, job.format, header, chunk)))
+            if len(in_flight) > max(self.validation_workers, 1):
+                await self.__create_chunk(run, *in_flight.popleft())
+
+        async for record in records:
+            if job.format == "csv" and header is None:
+                header = parse_csv_header(record)
+                continue
+            row += 1
+            if row <= job.rows_processed:
+                continue
+            chunk.append((row, record))
+            if len(chunk) >= self.chunk_size:
+                await submit()
+                chunk = []
+            if job.status != "running":
+                return
+        if chunk:
+            await submit()
+        while in_flight and job.status == "running":
+            await self.__create_chunk(run, *in_flight.popleft())
+
+    async def __create_chunk(self, run: UserImportRun, last_row: int, validation) -> None:
+        """Aguarda a validação do bloco, cria os usuários válidos em uma transação e registra o checkpoint. Se a criação do bloco falhar como um todo, a importação é encerrada como failed, com o checkpoint do bloco anterior."""
+        valid, errors = await validation
+        created = 0
+        if valid:
+            started = time.perf_counter()
+            results = await self.__call_service(self.service.create_users, [data for _, data in valid])
+            if not isinstance(results, list):
+                await asyncio.to_thread(run.finish, *results)
+                return
+            USER_IMPORT_CHUNK_DURATION.observe(time.perf_counter() - started, format=run.job.format)
+            for (row, _), result in zip(valid, results):
+                if isinstance(result, UserModel):
+                    created += 1
+                else:
+                    errors.append((row, *result))
+        await asyncio.to_thread(run.checkpoint, last_row, created, errors)
+
+    @handle_exceptions(__log_service.get_logger(__name__))
+    async def get_import(self, import_id: str) -> Union[UserImportJob, Tuple[str, str]]:
+        job = await asyncio.to_thread(self.store.load, import_id)
+        if job is None:
+            return ("ImportDoesNotExist", f"Import with id {import_id} does not exist.")
+        return job
+
+    def close(self) -> None:
+        """Encerra o pool de validação."""
+        if self.__pool is not None:
+            self.__pool.shutdown(cancel_futures=True)
+            self.__pool = None
@@ -1,3 +1,4 @@
+import os
 import pytest
 from fastapi import FastAPI
 from unittest.mock import AsyncMock, MagicMock
@@ -6,10 +7,19 @@ from fastapi.testclient import TestClient
 
 from controller.v1.user_controller import UserController, get_user_service
 from service.user_service import UserService
+from service.async_user_service import AsyncUserService
 from repositories.meta.interface_user_repository import IUserRepository
+from repositories.meta.interface_async_user_repository import IAsyncUserRepository
+from repositories.cached_user_repository import CachedUserRepository
+from infra.cache import InMemoryLRUCache
+from db.sqllite_client import SqLiteBase, SqLiteClient
+from repositories.sqlite_user_repository import SQLiteUserRepository
 
 from tests.config.test_sqlite_client import TestSqLiteClient 
 from tests.config.test_sqlite_user_repository import TestSQLiteUserRepository
+from tests.config.test_async_sqlite_user_repository import TestAsyncSQLiteUserRepository
+from tests.config.test_postgres_client import LocalPostgresServer
+from tests.config.test_postgres_user_repository import TestPostgresUserRepository, TestAsyncPostgresUserRepository
 
 
 @pytest.fixture
@@ -19,11 +29,50 @@ def db_session() -> Session:
     with next(db_client()) as session:
         yield session
 
-@pytest.fixture
-def user_repo():
+@pytest.fixture(scope="session")
+def postgres_dsn(tmp_path_factory):
+    """URL de conexão do PostgreSQL de testes: POSTGRES_TEST_DSN ou um servidor descartável criado com os binários locais (PG_BIN_DIR ou PATH). Sem nenhum dos dois, os testes do PostgreSQL são ignorados."""
+    pytest.importorskip("psycopg")
+    if os.getenv("POSTGRES_TEST_DSN"):
+        yield os.getenv("POSTGRES_TEST_DSN")
+        return
+    server = LocalPostgresServer(os.getenv("PG_BIN_DIR"), str(tmp_path_factory.mktemp("postgres")))
+    if server.initdb is None or server.pg_ctl is None:
+        pytest.skip("PostgreSQL is not available: set POSTGRES_TEST_DSN or PG_BIN_DIR")
+    if hasattr(os, "geteuid") and os.geteuid() == 0:
+        pytest.skip("initdb cannot run as root: set POSTGRES_TEST_DSN")
+    server.start()
+    try:
+        yield server.dsn
+    finally:
+        server.stop()
+
+@pytest.fixture(params=["sqlite", "postgres"])
+def user_repo(request):
+    if request.param == "postgres":
+        return TestPostgresUserRepository(request.getfixturevalue("postgres_dsn"))
     return TestSQLiteUserRepository()
 
 
+@pytest.fixture
+def sqlite_file_user_repo(tmp_path):
+    """Repositório em um arquivo SQLite (WAL), para cenários em que o repositório é utilizado por outras threads (ex: exportações e importações), o que não é possível com o banco de dados em memória."""
+    class FileSQLiteUserRepository(SQLiteUserRepository):
+        _instance = None
+    repository = FileSQLiteUserRepository()
+    repository.db_client = SqLiteClient(replica_files=[], database_file=str(tmp_path / "users.db"))
+    SqLiteBase.metadata.create_all(repository.db_client._engine)
+    yield repository
+    repository.close()
+
+
+@pytest.fixture(params=["sqlite", "postgres"])
+def async_user_repo(request):
+    if request.param == "postgres":
+        return TestAsyncPostgresUserRepository(request.getfixturevalue("postgres_dsn"))
+    return TestAsyncSQLiteUserRepository()
+
+
 @pytest.fixture
 def mock_sqlite_user_repository():
     return MagicMock(spec=IUserRepository)
@@ -32,14 +81,33 @@ def mock_sqlite_user_repository():
 def user_service(mock_sqlite_user_repository):
     return UserService(mock_sqlite_user_repository)
 
+@pytest.fixture
+def mock_async_user_repository():
+    return AsyncMock(spec=IAsyncUserRepository)
+
+@pytest.fixture
+def async_user_service(mock_async_user_repository):
+    return AsyncUserService(mock_async_user_repository)
+
 @pytest.fixture
 def mock_user_service():
     mock_service = MagicMock()
     mock_service.create_user = MagicMock()
     mock_service.get_all_users = MagicMock()
     mock_service.get_user = MagicMock()
+    mock_service.get_user_version = MagicMock()
+    mock_service.get_collection_version = MagicMock(return_value=(1, None))
+    mock_service.get_users_page = MagicMock()
+    mock_service.stream_users = MagicMock()
+    mock_service.get_user_rows = MagicMock()
+    mock_service.search_users = MagicMock()
+    mock_service.get_changes = MagicMock()
+    mock_service.get_last_change_sequence = MagicMock()
     mock_service.update_user = MagicMock()
     mock_service.delete_user = MagicMock()
+    mock_service.create_users = MagicMock()
+    mock_service.update_users = MagicMock()
+    mock_service.delete_users = MagicMock()
     return mock_service
 
 @pytest.fixture
@@ -48,4 +116,7 @@ def fastapi_app_client(mock_user_service):
     app.include_router(UserController.router)
     client = TestClient(app)
     app.dependency_overrides[get_user_service] = lambda: mock_user_service
-    return client
\ No newline at end of file
+    return client
+@pytest.fixture
+def cached_user_repo(mock_sqlite_user_repository):
+    return CachedUserRepository(mock_sqlite_user_repository, InMemoryLRUCache(max_size=100, ttl_seconds=30))
@@ -0,0 +1,9 @@
+from repositories.async_sqlite_user_repository import AsyncSQLiteUserRepository
+
+from tests.config.test_sqlite_client import TestAsyncSqLiteClient
+
+class TestAsyncSQLiteUserRepository(AsyncSQLiteUserRepository):
+    """Repositório assíncrono para cenário de Testes no contexto de SQLite do UserRepository, instanciando o TestAsyncSqLiteClient para se conectar com o SQLite em nivel de memória.
+    """
+    def __init__(self) -> None:
+        self.db_client = TestAsyncSqLiteClient()
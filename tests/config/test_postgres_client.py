@@ -0,0 +1,65 @@
+import os
+import shutil
+import subprocess
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from db.sqllite_client import SqLiteBase
+from db.postgres_client import PostgresClient, AsyncPostgresClient, POSTGRES_CONNECT_ARGS
+
+
+RESET_SCHEMA_STATEMENTS = ("DROP SCHEMA IF EXISTS public CASCADE", "CREATE SCHEMA public")
+
+
+class LocalPostgresServer:
+    """Servidor PostgreSQL descartável para os testes, criado com os binários locais (initdb/pg_ctl) em um diretório temporário e acessado apenas por socket Unix, sem ocupar portas TCP.
+
+    Args:
+        bin_dir (str): Diretório dos binários do PostgreSQL. Com None, utiliza os binários do PATH.
+        directory (str): Diretório temporário dos dados e do socket.
+    """
+
+    def __init__(self, bin_dir: str, directory: str) -> None:
+        self.initdb = shutil.which("initdb", path=bin_dir)
+        self.pg_ctl = shutil.which("pg_ctl", path=bin_dir)
+        self.data_directory = os.path.join(directory, "data")
+        self.socket_directory = directory
+        self.dsn = f"postgresql+psycopg://postgres@/postgres?host={directory}"
+
+    def start(self) -> None:
+        subprocess.run([self.initdb, "-D", self.data_directory, "-U", "postgres", "-A", "trust", "-E", "UTF8", "--locale=C", "--no-sync"],
+                       check=True, capture_output=True)
+        subprocess.run([self.pg_ctl, "-D", self.data_directory, "-w", "-l", os.path.join(self.socket_directory, "postgres.log"),
+                        "-o", f"-k {self.socket_directory} -c listen_addresses= -F", "start"], check=True, capture_output=True)
+
+    def stop(self) -> None:
+        subprocess.run([self.pg_ctl, "-D", self.data_directory, "-w", "-m", "immediate", "stop"], capture_output=True)
+
+
+class TestPostgresClient(PostgresClient):
+    """Cliente PostgreSQL para testes: recria o schema a cada instância, deixando o banco de dados vazio como o SQLite em memória. Sem pool de conexões, para que nenhuma conexão ociosa sobreviva ao teste."""
+
+    def __init__(self, dsn: str) -> None:
+        self.database_path = dsn
+        self._engine = create_engine(dsn, poolclass=NullPool, connect_args=POSTGRES_CONNECT_ARGS)
+        self._session = sessionmaker(bind=self._engine, autocommit=False, autoflush=False, expire_on_commit=False)
+        with self._engine.begin() as connection:
+            for statement in RESET_SCHEMA_STATEMENTS:
+                connection.exec_driver_sql(statement)
+            SqLiteBase.metadata.create_all(connection)
+
+
+class TestAsyncPostgresClient(AsyncPostgresClient):
+    """Cliente PostgreSQL assíncrono para testes, com o mesmo contrato do TestAsyncSqLiteClient: o schema é recriado em create_all."""
+
+    def __init__(self, dsn: str) -> None:
+        self.database_path = dsn
+        self._engine = create_async_engine(dsn, poolclass=NullPool, connect_args=POSTGRES_CONNECT_ARGS)
+        self._session = async_sessionmaker(bind=self._engine, autoflush=False, expire_on_commit=False)
+
+    async def create_all(self) -> None:
+        async with self._engine.begin() as connection:
+            for statement in RESET_SCHEMA_STATEMENTS:
+                await connection.exec_driver_sql(statement)
+            await connection.run_sync(SqLiteBase.metadata.create_all)
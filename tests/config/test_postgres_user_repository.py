@@ -0,0 +1,17 @@
+from repositories.postgres_user_repository import PostgresUserRepository
+from repositories.async_postgres_user_repository import AsyncPostgresUserRepository
+
+from tests.config.test_postgres_client import TestPostgresClient, TestAsyncPostgresClient
+
+
+class TestPostgresUserRepository(PostgresUserRepository):
+    """Repositório para cenário de Testes no contexto de PostgreSQL do UserRepository, instanciando o TestPostgresClient para se conectar com o servidor de testes em um schema vazio.
+    """
+    def __init__(self, dsn: str) -> None:
+        self.db_client = TestPostgresClient(dsn)
+
+
+class TestAsyncPostgresUserRepository(AsyncPostgresUserRepository):
+    """Versão assíncrona do TestPostgresUserRepository, utilizando o TestAsyncPostgresClient."""
+    def __init__(self, dsn: str) -> None:
+        self.db_client = TestAsyncPostgresClient(dsn)
@@ -1,7 +1,9 @@
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from db.sqllite_client import SqLiteBase
-from db.sqllite_client import SqLiteClient
+from db.sqllite_client import SqLiteClient, AsyncSqLiteClient, register_functions_on_connect
 
 
 class TestSqLiteClient(SqLiteClient):
@@ -11,5 +13,20 @@ class TestSqLiteClient(SqLiteClient):
 
     def __init__(self) -> None:
         self._engine = create_engine(self.database_path)
-        self._session = sessionmaker(bind=self._engine, autocommit=False, autoflush=False)
-        SqLiteBase.metadata.create_all(self._engine)
\ No newline at end of file
+        register_functions_on_connect(self._engine)
+        self._session = sessionmaker(bind=self._engine, autocommit=False, autoflush=False, expire_on_commit=False)
+        SqLiteBase.metadata.create_all(self._engine)
+
+class TestAsyncSqLiteClient(AsyncSqLiteClient):
+    """Cliente SQLite assíncrono para testes, utilizando um banco de dados em memória compartilhado por uma única conexão (StaticPool)."""
+
+    database_path = "sqlite+aiosqlite:///:memory:"
+
+    def __init__(self) -> None:
+        self._engine = create_async_engine(self.database_path, poolclass=StaticPool)
+        register_functions_on_connect(self._engine.sync_engine)
+        self._session = async_sessionmaker(bind=self._engine, autoflush=False, expire_on_commit=False)
+
+    async def create_all(self) -> None:
+        async with self._engine.begin() as connection:
+            await connection.run_sync(SqLiteBase.metadata.create_all)
@@ -0,0 +1,68 @@
+import pytest
+from unittest.mock import MagicMock
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+import api.app
+import controller.v1.user_controller
+from controller.v1.user_controller import UserController
+from models.user_model import UserModel
+from infra.settings import Settings
+
+
+def test_lifespan_builds_service_once_and_closes_repository(monkeypatch):
+    service = MagicMock()
+    service.get_user.return_value = UserModel(id=1, first_name="Iury", email="rosal@gmail.com")
+    build_user_service = MagicMock(return_value=service)
+    monkeypatch.setattr(api.app, "build_user_service", build_user_service)
+
+    with TestClient(api.app.app) as client:
+        responses = [client.get("/api/v1/users/1") for _ in range(3)]
+    del api.app.app.state.user_service
+
+    assert [response.status_code for response in responses] == [200, 200, 200]
+    build_user_service.assert_called_once_with()
+    assert service.get_user.call_count == 3
+    service.repository.close.assert_called_once_with()
+
+
+def test_get_user_service_without_lifespan_builds_on_first_request(monkeypatch):
+    service = MagicMock()
+    service.get_user.return_value = UserModel(id=1, first_name="Iury", email="rosal@gmail.com")
+    build_user_service = MagicMock(return_value=service)
+    monkeypatch.setattr(controller.v1.user_controller, "build_user_service", build_user_service)
+    app = FastAPI()
+    app.include_router(UserController.router)
+
+    client = TestClient(app)
+    client.get("/users/1")
+    client.get("/users/1")
+
+    build_user_service.assert_called_once_with()
+    assert app.state.user_service is service
+
+
+def test_build_user_service_rejects_cache_in_async_mode(monkeypatch):
+    settings = Settings()
+    settings.service_mode = "async"
+    settings.database_backend = "sqlite"
+    settings.user_cache_enabled = True
+    monkeypatch.setattr(controller.v1.user_controller, "get_settings", lambda: settings)
+
+    with pytest.raises(ValueError, match="USER_CACHE_ENABLED is not supported with USER_SERVICE_MODE=async"):
+        controller.v1.user_controller.build_user_service()
+
+
+def test_build_user_service_disables_cache_invalidation_without_change_feed(monkeypatch):
+    settings = Settings()
+    settings.service_mode = "sync"
+    settings.database_backend = "sqlite_sharded"
+    settings.user_cache_enabled = True
+    settings.user_create_batching = False
+    settings.user_cache_invalidation_interval = 1.0
+    monkeypatch.setattr(controller.v1.user_controller, "get_settings", lambda: settings)
+    monkeypatch.setattr(controller.v1.user_controller, "get_user_repository_backend", lambda backend: (MagicMock, None))
+
+    service = controller.v1.user_controller.build_user_service()
+
+    assert service.repository.invalidation_interval is None
@@ -0,0 +1,143 @@
+import asyncio
+from tests.config.fixtures import async_user_repo, postgres_dsn
+from datetime import timedelta
+from models.user_model import UserModel, utc_now
+
+
+def run_scenario(repository, scenario):
+    """Executa o cenário assíncrono em um event loop dedicado, criando as tabelas antes e liberando a conexão em memória no final."""
+    async def runner():
+        await repository.db_client.create_all()
+        try:
+            await scenario()
+        finally:
+            await repository.db_client._engine.dispose()
+    asyncio.run(runner())
+
+
+def test_create_user(async_user_repo):
+    async def scenario():
+        user, err_code, err_msg = await async_user_repo.create(first_name="Iury", last_name="Rosal", email="rosal@gmail.com")
+
+        assert user.id is not None
+        assert user.first_name == "Iury"
+        assert user.last_name == "Rosal"
+        assert err_code is None
+        assert err_msg is None
+    run_scenario(async_user_repo, scenario)
+
+def test_select_all_and_page(async_user_repo):
+    async def scenario():
+        for _ in range(5):
+            await async_user_repo.create(first_name="Iury", email="rosal@gmail.com")
+
+        users, _, _ = await async_user_repo.select_all()
+        page, _, _ = await async_user_repo.select_page(limit=2, after_id=2)
+
+        assert len(users) == 5
+        assert all(isinstance(item, UserModel) for item in users)
+        assert [user.id for user in page] == [3, 4]
+    run_scenario(async_user_repo, scenario)
+
+def test_select_rows(async_user_repo):
+    async def scenario():
+        for _ in range(3):
+            await async_user_repo.create(first_name="Iury", email="rosal@gmail.com")
+
+        rows, _, _ = await async_user_repo.select_rows(limit=2, after_id=1)
+
+        assert rows == [{"id": 2, "first_name": "Iury", "last_name": None, "email": "rosal@gmail.com"},
+                        {"id": 3, "first_name": "Iury", "last_name": None, "email": "rosal@gmail.com"}]
+    run_scenario(async_user_repo, scenario)
+
+def test_stream_all(async_user_repo):
+    async def scenario():
+        for _ in range(3):
+            await async_user_repo.create(first_name="Iury", email="rosal@gmail.com")
+
+        users, _, _ = await async_user_repo.stream_all(chunk_size=2)
+
+        assert [user.id async for user in users] == [1, 2, 3]
+    run_scenario(async_user_repo, scenario)
+
+def test_select_update_and_delete_by_id(async_user_repo):
+    async def scenario():
+        user, _, _ = await async_user_repo.create(first_name="Iury", last_name="Rosal", email="rosal@gmail.com")
+
+        updated_user, _, _ = await async_user_repo.update(user.id, {"first_name": "Davi", "last_name": None})
+        retrieved_user, _, _ = await async_user_repo.select_by_id(user.id)
+        deleted_user, _, _ = await async_user_repo.delete_by_id(user.id)
+        missing_user, err_code, err_msg = await async_user_repo.select_by_id(user.id)
+
+        assert updated_user.first_name == "Davi"
+        assert updated_user.last_name == "Rosal"
+        assert retrieved_user.first_name == "Davi"
+        assert deleted_user.id == user.id
+        assert missing_user is None
+        assert err_code == "UserDoesNotExist"
+        assert err_msg == f"User with id {user.id} does not exist."
+    run_scenario(async_user_repo, scenario)
+
+def test_update_and_delete_not_exists(async_user_repo):
+    async def scenario():
+        updated_user, update_err_code, _ = await async_user_repo.update(1, {"first_name": "Davi"})
+        deleted_user, delete_err_code, _ = await async_user_repo.delete_by_id(1)
+
+        assert updated_user is None
+        assert update_err_code == "UserDoesNotExist"
+        assert deleted_user is None
+        assert delete_err_code == "UserDoesNotExist"
+    run_scenario(async_user_repo, scenario)
+
+def test_bulk_operations(async_user_repo):
+    async def scenario():
+        created, _, _ = await async_user_repo.bulk_create([{"first_name": "Iury", "email": "rosal@gmail.com"},
+                                                            {"first_name": "Davi", "email": "davi@gmail.com"}])
+        updated, _, _ = await async_user_repo.bulk_update([{"id": 2, "last_name": "Oliveira"}, {"id": 99, "last_name": "X"}])
+        deleted, _, _ = await async_user_repo.bulk_delete([1, 99])
+
+        assert [user.id for user, _, _ in created] == [1, 2]
+        assert updated[0][0].last_name == "Oliveira"
+        assert updated[1][1] == "UserDoesNotExist"
+        assert deleted[0][0].id == 1
+        assert deleted[1][1] == "UserDoesNotExist"
+    run_scenario(async_user_repo, scenario)
+
+def test_versioning(async_user_repo):
+    async def scenario():
+        user, _, _ = await async_user_repo.create(first_name="Iury", last_name="Rosal", email="rosal@gmail.com")
+        initial_collection_version, _, _ = await async_user_repo.select_collection_version()
+
+        updated_user, _, _ = await async_user_repo.update(user.id, {"first_name": "Davi"}, expected_version=1)
+        stale_user, err_code, _ = await async_user_repo.update(user.id, {"first_name": "Ana"}, expected_version=1)
+        version, _, _ = await async_user_repo.select_version(user.id)
+        collection_version, _, _ = await async_user_repo.select_collection_version()
+        missing_version, missing_err_code, _ = await async_user_repo.select_version(99)
+
+        assert user.version == 1
+        assert updated_user.version == 2
+        assert stale_user is None
+        assert err_code == "VersionConflict"
+        assert version == (2, updated_user.updated_at)
+        assert collection_version[0] == initial_collection_version[0] + 1
+        assert missing_version is None
+        assert missing_err_code == "UserDoesNotExist"
+    run_scenario(async_user_repo, scenario)
+
+def test_changes(async_user_repo):
+    async def scenario():
+        user, _, _ = await async_user_repo.create(first_name="Iury", email="rosal@gmail.com")
+        await async_user_repo.update(user.id, {"last_name": "Rosal"})
+        await async_user_repo.delete_by_id(user.id)
+
+        changes, _, _ = await async_user_repo.select_changes(since=0, limit=10)
+        last_sequence, _, _ = await async_user_repo.select_last_change_sequence()
+        deleted, _, _ = await async_user_repo.compact_changes(before=utc_now() + timedelta(seconds=1))
+        stale_changes, err_code, _ = await async_user_repo.select_changes(since=0, limit=10)
+
+        assert [change.operation for change in changes] == ["create", "update", "delete"]
+        assert last_sequence == changes[-1].sequence
+        assert deleted == 2
+        assert stale_changes is None
+        assert err_code == "ChangesCompacted"
+    run_scenario(async_user_repo, scenario)
@@ -0,0 +1,86 @@
+import asyncio
+from tests.config.fixtures import async_user_service, mock_async_user_repository
+
+from models.user_model import UserModel
+
+
+def test_create_user(async_user_service, mock_async_user_repository):
+    mock_user = UserModel(id=1, first_name="Iury", last_name="Rosal", email="rosal@gmail.com")
+    mock_async_user_repository.create.return_value = (mock_user, None, None)
+
+    result = asyncio.run(async_user_service.create_user(first_name="Iury",
+                                                        email="rosal@gmail.com",
+                                                        last_name="Rosal"))
+
+    assert result == mock_user
+
+def test_get_user_not_exist(async_user_service, mock_async_user_repository):
+    user_id = 1 # Does Not Exist
+    mock_async_user_repository.select_by_id.return_value = (None, "UserDoesNotExist", f"User with id {user_id} does not exist.")
+
+    result = asyncio.run(async_user_service.get_user(user_id=user_id))
+
+    assert result == ("UserDoesNotExist", f"User with id {user_id} does not exist.")
+
+def test_get_users_page(async_user_service, mock_async_user_repository):
+    mock_users = [UserModel(id=1, first_name="Iury", last_name="Rosal", email="rosal@gmail.com")]
+    mock_async_user_repository.select_page.return_value = (mock_users, None, None)
+
+    result = asyncio.run(async_user_service.get_users_page(limit=1))
+
+    assert result == mock_users
+
+def test_get_user_version(async_user_service, mock_async_user_repository):
+    mock_async_user_repository.select_version.return_value = (None, "UserDoesNotExist", "User with id 1 does not exist.")
+    mock_async_user_repository.select_collection_version.return_value = ((7, None), None, None)
+
+    assert asyncio.run(async_user_service.get_user_version(user_id=1)) == ("UserDoesNotExist", "User with id 1 does not exist.")
+    assert asyncio.run(async_user_service.get_collection_version()) == (7, None)
+
+def test_get_changes(async_user_service, mock_async_user_repository):
+    mock_async_user_repository.select_changes.return_value = ([], None, None)
+    mock_async_user_repository.select_last_change_sequence.return_value = (42, None, None)
+
+    assert asyncio.run(async_user_service.get_changes(since=42, limit=10)) == []
+    assert asyncio.run(async_user_service.get_last_change_sequence()) == 42
+
+def test_unexpected_error(async_user_service, mock_async_user_repository):
+    mock_async_user_repository.delete_by_id.side_effect = RuntimeError("database is locked")
+
+    result = asyncio.run(async_user_service.delete_user(user_id=1))
+
+    assert result == ("UnexpectedError", "RuntimeError: database is locked")
+
+def test_concurrent_get_user_shares_a_single_query(async_user_service, mock_async_user_repository):
+    mock_user = UserModel(id=1, first_name="Iury", last_name="Rosal", email="rosal@gmail.com")
+    async def select_by_id(user_id):
+        await asyncio.sleep(0.01)
+        return (mock_user, None, None)
+    mock_async_user_repository.select_by_id.side_effect = select_by_id
+
+    async def run():
+        concurrent = await asyncio.gather(*(async_user_service.get_user(user_id=1) for _ in range(50)))
+        return concurrent, await async_user_service.get_user(user_id=1)
+    results, later = asyncio.run(run())
+
+    assert mock_async_user_repository.select_by_id.await_count == 2
+    assert all(result is mock_user for result in results)
+    assert later is mock_user
+
+def test_cancelled_caller_does_not_cancel_shared_query(async_user_service, mock_async_user_repository):
+    mock_users = [UserModel(id=1, first_name="Iury", last_name="Rosal", email="rosal@gmail.com")]
+    async def select_all():
+        await asyncio.sleep(0.01)
+        return (mock_users, None, None)
+    mock_async_user_repository.select_all.side_effect = select_all
+
+    async def run():
+        leader = asyncio.ensure_future(async_user_service.get_all_users())
+        follower = asyncio.ensure_future(async_user_service.get_all_users())
+        await asyncio.sleep(0)
+        leader.cancel()
+        return await follower
+    result = asyncio.run(run())
+
+    assert mock_async_user_repository.select_all.await_count == 1
+    assert result == mock_users
@@ -0,0 +1,90 @@
+import asyncio
+import threading
+from unittest.mock import MagicMock
+from tests.config.fixtures import async_user_repo, mock_sqlite_user_repository, postgres_dsn
+
+from models.user_model import UserModel
+from repositories.batching_user_repository import (BatchingUserRepository, AsyncBatchingUserRepository,
+                                                   USER_CREATE_BATCH_FALLBACKS, USER_CREATE_BATCH_SIZE)
+
+
+def bulk_create_with_ids(users_data):
+    return ([(UserModel(id=index, **user_data), None, None) for index, user_data in enumerate(users_data, start=1)], None, None)
+
+
+def create_concurrently(repository, count):
+    results = [None] * count
+    def create(index):
+        results[index] = repository.create(first_name=f"User {index}", email=f"user{index}@gmail.com")
+    threads = [threading.Thread(target=create, args=(index,)) for index in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def test_concurrent_creates_are_grouped_in_one_transaction(mock_sqlite_user_repository):
+    mock_sqlite_user_repository.bulk_create.side_effect = bulk_create_with_ids
+    repository = BatchingUserRepository(mock_sqlite_user_repository, max_batch_size=10, max_delay=1)
+
+    results = create_concurrently(repository, 10)
+    repository.close()
+
+    mock_sqlite_user_repository.bulk_create.assert_called_once()
+    mock_sqlite_user_repository.create.assert_not_called()
+    assert sorted(user.id for user, _, _ in results) == list(range(1, 11))
+    assert all(user.email == f"user{int(user.first_name.split()[1])}@gmail.com" for user, _, _ in results)
+    assert USER_CREATE_BATCH_SIZE.snapshot(repository=type(mock_sqlite_user_repository).__name__)["count"] >= 1
+
+def test_batch_is_flushed_after_max_delay(mock_sqlite_user_repository):
+    mock_sqlite_user_repository.bulk_create.side_effect = bulk_create_with_ids
+    repository = BatchingUserRepository(mock_sqlite_user_repository, max_batch_size=100, max_delay=0.001)
+
+    user, err_code, _ = repository.create(first_name="Iury", email="rosal@gmail.com")
+    repository.close()
+
+    assert user.id == 1
+    assert err_code is None
+    mock_sqlite_user_repository.bulk_create.assert_called_once_with([{"first_name": "Iury", "last_name": None, "email": "rosal@gmail.com"}])
+
+def test_failed_batch_falls_back_to_individual_creates(mock_sqlite_user_repository):
+    mock_sqlite_user_repository.bulk_create.side_effect = Exception("database is locked")
+    mock_sqlite_user_repository.create.side_effect = lambda **user_data: (UserModel(id=1, **user_data), None, None)
+    repository = BatchingUserRepository(mock_sqlite_user_repository, max_batch_size=1, max_delay=0)
+    repository_name = type(mock_sqlite_user_repository).__name__
+    fallbacks = USER_CREATE_BATCH_FALLBACKS.value(repository=repository_name)
+
+    user, err_code, _ = repository.create(first_name="Iury", email="rosal@gmail.com")
+    repository.close()
+
+    assert user.first_name == "Iury"
+    assert err_code is None
+    assert USER_CREATE_BATCH_FALLBACKS.value(repository=repository_name) == fallbacks + 1
+
+def test_create_after_close_is_not_batched(mock_sqlite_user_repository):
+    mock_sqlite_user_repository.create.return_value = (UserModel(id=1, first_name="Iury", email="rosal@gmail.com"), None, None)
+    repository = BatchingUserRepository(mock_sqlite_user_repository)
+    repository.close()
+
+    user, _, _ = repository.create(first_name="Iury", email="rosal@gmail.com")
+
+    assert user.id == 1
+    mock_sqlite_user_repository.bulk_create.assert_not_called()
+    mock_sqlite_user_repository.close.assert_called_once()
+
+def test_async_concurrent_creates_get_their_own_ids(async_user_repo):
+    async def scenario():
+        await async_user_repo.db_client.create_all()
+        repository = AsyncBatchingUserRepository(async_user_repo, max_batch_size=50, max_delay=0.05)
+        async_user_repo.bulk_create = MagicMock(wraps=async_user_repo.bulk_create)
+        try:
+            results = await asyncio.gather(*(repository.create(first_name=f"User {index}", email=f"user{index}@gmail.com")
+                                             for index in range(20)))
+        finally:
+            await repository.close()
+
+        assert async_user_repo.bulk_create.call_count == 1
+        assert [user.email for user, _, _ in results] == [f"user{index}@gmail.com" for index in range(20)]
+        assert len({user.id for user, _, _ in results}) == 20
+    asyncio.run(scenario())
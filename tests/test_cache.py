@@ -0,0 +1,108 @@
+from infra.cache import CACHE_EVICTIONS, CACHE_REQUESTS, CACHE_SIZE, InMemoryLRUCache
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_get_and_set():
+    cache = InMemoryLRUCache(max_size=10, ttl_seconds=30)
+
+    cache.set("user:1", "Iury")
+
+    assert cache.get("user:1") == "Iury"
+    assert cache.get("user:2") is None
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+    assert cache.stats()["hit_ratio"] == 0.5
+
+def test_evicts_least_recently_used():
+    cache = InMemoryLRUCache(max_size=2, ttl_seconds=30)
+    cache.set("user:1", "Iury")
+    cache.set("user:2", "Davi")
+    cache.get("user:1")
+
+    cache.set("user:3", "Maria")
+
+    assert cache.get("user:2") is None
+    assert cache.get("user:1") == "Iury"
+    assert cache.get("user:3") == "Maria"
+    assert cache.stats()["evictions"] == 1
+    assert cache.stats()["size"] == 2
+
+def test_expires_after_ttl():
+    clock = FakeClock()
+    cache = InMemoryLRUCache(max_size=10, ttl_seconds=30, clock=clock)
+    cache.set("user:1", "Iury")
+
+    clock.now = 29.9
+    assert cache.get("user:1") == "Iury"
+    clock.now = 30.0
+    assert cache.get("user:1") is None
+    assert cache.stats()["expirations"] == 1
+    assert cache.stats()["size"] == 0
+
+def test_delete_and_clear():
+    cache = InMemoryLRUCache(max_size=10, ttl_seconds=30)
+    cache.set("user:1", "Iury")
+    cache.set("user:2", "Davi")
+
+    cache.delete("user:1")
+    cache.delete("user:99")
+    assert cache.get("user:1") is None
+    cache.clear()
+    assert cache.get("user:2") is None
+
+def test_set_if_newer_only_replaces_older_versions():
+    clock = FakeClock()
+    cache = InMemoryLRUCache(max_size=10, ttl_seconds=30, clock=clock)
+
+    assert cache.set_if_newer("user:1", "Iury v2", 2) is True
+    assert cache.set_if_newer("user:1", "Iury v1", 1) is False
+    assert cache.set_if_newer("user:1", "Iury v2 again", 2) is False
+    assert cache.get("user:1") == "Iury v2"
+    assert cache.set_if_newer("user:1", "Iury v3", 3) is True
+    assert cache.get("user:1") == "Iury v3"
+    clock.now = 30.0
+    assert cache.set_if_newer("user:1", "Iury v1", 1) is True
+
+def test_tombstone_blocks_older_versions_until_it_expires():
+    clock = FakeClock()
+    cache = InMemoryLRUCache(max_size=10, ttl_seconds=30, tombstone_ttl_seconds=5, clock=clock)
+    cache.set_if_newer("user:1", "Iury v1", 1)
+    cache.set_if_newer("user:2", "Davi v3", 3)
+
+    cache.tombstone("user:1")
+    cache.tombstone("user:2", min_version=3)
+    cache.tombstone("user:3", min_version=2)
+
+    assert cache.get("user:1") is None
+    assert cache.set_if_newer("user:1", "Iury v1", 1) is False
+    assert cache.set_if_newer("user:1", "Iury v9", 9) is False
+    assert cache.get("user:2") == "Davi v3"
+    assert cache.set_if_newer("user:3", "Maria v1", 1) is False
+    assert cache.set_if_newer("user:3", "Maria v2", 2) is True
+    assert cache.get("user:3") == "Maria v2"
+    clock.now = 5.0
+    assert cache.set_if_newer("user:1", "Iury v1", 1) is True
+
+def test_exports_counters_to_metrics_registry():
+    clock = FakeClock()
+    cache = InMemoryLRUCache(max_size=1, ttl_seconds=30, name="test_metrics", clock=clock)
+
+    cache.set("user:1", "Iury")
+    cache.set("user:2", "Davi")
+    cache.get("user:2")
+    cache.get("user:1")
+    clock.now = 30.0
+    cache.get("user:2")
+
+    assert CACHE_REQUESTS.value(cache="test_metrics", result="hit") == 1
+    assert CACHE_REQUESTS.value(cache="test_metrics", result="miss") == 2
+    assert CACHE_EVICTIONS.value(cache="test_metrics", reason="capacity") == 1
+    assert CACHE_EVICTIONS.value(cache="test_metrics", reason="expired") == 1
+    assert CACHE_SIZE.value(cache="test_metrics") == 0
@@ -0,0 +1,169 @@
+from tests.config.fixtures import cached_user_repo, mock_sqlite_user_repository
+
+from models.user_model import UserModel, UserChangeModel
+from repositories.cached_user_repository import CachedUserRepository
+from infra.cache import InMemoryLRUCache
+
+
+def test_select_by_id_reads_through_cache(cached_user_repo, mock_sqlite_user_repository):
+    mock_user = UserModel(id=1, first_name="Iury", last_name="Rosal", email="rosal@gmail.com")
+    mock_sqlite_user_repository.select_by_id.return_value = (mock_user, None, None)
+
+    first_result = cached_user_repo.select_by_id(1)
+    second_result = cached_user_repo.select_by_id(1)
+
+    assert first_result == (mock_user, None, None)
+    assert second_result == (mock_user, None, None)
+    mock_sqlite_user_repository.select_by_id.assert_called_once_with(1)
+    assert cached_user_repo.cache.stats()["hits"] == 1
+    assert cached_user_repo.cache.stats()["misses"] == 1
+
+def test_select_row_by_id_projects_cached_user(cached_user_repo, mock_sqlite_user_repository):
+    mock_user = UserModel(id=1, first_name="Iury", last_name="Rosal", email="rosal@gmail.com", version=3)
+    mock_sqlite_user_repository.select_by_id.return_value = (mock_user, None, None)
+    mock_sqlite_user_repository.select_row_by_id.return_value = ({"id": 2, "version": 1, "updated_at": None}, None, None)
+    cached_user_repo.select_by_id(1)
+
+    cached_row, _, _ = cached_user_repo.select_row_by_id(1, ["id", "email"])
+    missed_row, _, _ = cached_user_repo.select_row_by_id(2, ["id"])
+
+    assert cached_row == {"id": 1, "email": "rosal@gmail.com", "version": 3, "updated_at": None}
+    assert missed_row == {"id": 2, "version": 1, "updated_at": None}
+    mock_sqlite_user_repository.select_row_by_id.assert_called_once_with(2, ["id"])
+
+def test_select_by_id_not_exists_is_not_cached(cached_user_repo, mock_sqlite_user_repository):
+    mock_sqlite_user_repository.select_by_id.return_value = (None, "UserDoesNotExist", "User with id 1 does not exist.")
+
+    cached_user_repo.select_by_id(1)
+    result = cached_user_repo.select_by_id(1)
+
+    assert result == (None, "UserDoesNotExist", "User with id 1 does not exist.")
+    assert mock_sqlite_user_repository.select_by_id.call_count == 2
+
+def test_update_writes_through(cached_user_repo, mock_sqlite_user_repository):
+    old_user = UserModel(id=1, first_name="Iury", last_name="Rosal", email="rosal@gmail.com", version=1)
+    new_user = UserModel(id=1, first_name="Davi", last_name="Rosal", email="rosal@gmail.com", version=2)
+    mock_sqlite_user_repository.select_by_id.return_value = (old_user, None, None)
+    mock_sqlite_user_repository.update.return_value = (new_user, None, None)
+    cached_user_repo.select_by_id(1)
+
+    cached_user_repo.update(1, {"first_name": "Davi"})
+    user, _, _ = cached_user_repo.select_by_id(1)
+
+    assert user.first_name == "Davi"
+    mock_sqlite_user_repository.select_by_id.assert_called_once_with(1)
+
+def test_select_by_id_fill_does_not_overwrite_concurrent_update(cached_user_repo, mock_sqlite_user_repository):
+    old_user = UserModel(id=1, first_name="Iury", last_name="Rosal", email="rosal@gmail.com", version=1)
+    new_user = UserModel(id=1, first_name="Davi", last_name="Rosal", email="rosal@gmail.com", version=2)
+    mock_sqlite_user_repository.update.return_value = (new_user, None, None)
+
+    def select_by_id(user_id):
+        # A atualização conclui entre a leitura do banco e o preenchimento do cache.
+        cached_user_repo.update(user_id, {"first_name": "Davi"})
+        return (old_user, None, None)
+
+    mock_sqlite_user_repository.select_by_id.side_effect = select_by_id
+    first_result = cached_user_repo.select_by_id(1)
+    second_result = cached_user_repo.select_by_id(1)
+
+    assert first_result == (old_user, None, None)
+    assert second_result == (new_user, None, None)
+    assert cached_user_repo.select_version(1) == ((2, None), None, None)
+
+def test_out_of_order_updates_keep_the_newest_version(cached_user_repo, mock_sqlite_user_repository):
+    newer_user = UserModel(id=1, first_name="Davi", email="rosal@gmail.com", version=3)
+    older_user = UserModel(id=1, first_name="Iury", email="rosal@gmail.com", version=2)
+    mock_sqlite_user_repository.update.side_effect = [(newer_user, None, None), (older_user, None, None)]
+
+    cached_user_repo.update(1, {"first_name": "Davi"})
+    cached_user_repo.update(1, {"first_name": "Iury"})
+
+    assert cached_user_repo.select_by_id(1) == (newer_user, None, None)
+    mock_sqlite_user_repository.select_by_id.assert_not_called()
+
+def test_select_by_id_fill_does_not_restore_concurrently_deleted_user(cached_user_repo, mock_sqlite_user_repository):
+    deleted_user = UserModel(id=1, first_name="Iury", email="rosal@gmail.com", version=1)
+    mock_sqlite_user_repository.delete_by_id.return_value = (deleted_user, None, None)
+
+    def select_by_id(user_id):
+        # A deleção conclui entre a leitura do banco e o preenchimento do cache.
+        cached_user_repo.delete_by_id(user_id)
+        return (deleted_user, None, None)
+
+    mock_sqlite_user_repository.select_by_id.side_effect = select_by_id
+    cached_user_repo.select_by_id(1)
+    mock_sqlite_user_repository.select_by_id.side_effect = None
+    mock_sqlite_user_repository.select_by_id.return_value = (None, "UserDoesNotExist", "User with id 1 does not exist.")
+
+    assert cached_user_repo.select_by_id(1) == (None, "UserDoesNotExist", "User with id 1 does not exist.")
+
+def test_delete_invalidates(cached_user_repo, mock_sqlite_user_repository):
+    mock_user = UserModel(id=1, first_name="Iury", last_name="Rosal", email="rosal@gmail.com")
+    mock_sqlite_user_repository.select_by_id.return_value = (mock_user, None, None)
+    mock_sqlite_user_repository.delete_by_id.return_value = (mock_user, None, None)
+    cached_user_repo.select_by_id(1)
+
+    cached_user_repo.delete_by_id(1)
+    mock_sqlite_user_repository.select_by_id.return_value = (None, "UserDoesNotExist", "User with id 1 does not exist.")
+    user, err_code, _ = cached_user_repo.select_by_id(1)
+
+    assert user is None
+    assert err_code == "UserDoesNotExist"
+
+def test_bulk_delete_invalidates(cached_user_repo, mock_sqlite_user_repository):
+    mock_user = UserModel(id=1, first_name="Iury", last_name="Rosal", email="rosal@gmail.com")
+    mock_sqlite_user_repository.bulk_create.return_value = ([(mock_user, None, None)], None, None)
+    mock_sqlite_user_repository.bulk_delete.return_value = ([(mock_user, None, None)], None, None)
+    mock_sqlite_user_repository.select_by_id.return_value = (None, "UserDoesNotExist", "User with id 1 does not exist.")
+
+    cached_user_repo.bulk_create([{"first_name": "Iury", "last_name": "Rosal", "email": "rosal@gmail.com"}])
+    assert cached_user_repo.select_by_id(1)[0] is mock_user
+    cached_user_repo.bulk_delete([1])
+
+    assert cached_user_repo.select_by_id(1)[0] is None
+
+def test_list_operations_are_delegated(cached_user_repo, mock_sqlite_user_repository):
+    mock_sqlite_user_repository.select_page.return_value = ([], None, None)
+
+    result = cached_user_repo.select_page(limit=10, after_id=5)
+
+    mock_sqlite_user_repository.select_page.assert_called_once_with(limit=10, after_id=5)
+    assert result == ([], None, None)
+
+def test_select_by_id_invalidates_external_changes(mock_sqlite_user_repository, monkeypatch):
+    clock = [100.0]
+    monkeypatch.setattr("repositories.cached_user_repository.time.monotonic", lambda: clock[0])
+    cached_user_repo = CachedUserRepository(mock_sqlite_user_repository, InMemoryLRUCache(max_size=100, ttl_seconds=30),
+                                            invalidation_interval=1.0)
+    old_user = UserModel(id=1, first_name="Iury", email="rosal@gmail.com", version=1)
+    new_user = UserModel(id=1, first_name="Davi", email="rosal@gmail.com", version=2)
+    mock_sqlite_user_repository.select_last_change_sequence.return_value = (10, None, None)
+    mock_sqlite_user_repository.select_changes.return_value = ([UserChangeModel(sequence=11, user_id=1, operation="update", version=2)], None, None)
+    mock_sqlite_user_repository.select_by_id.side_effect = [(old_user, None, None), (new_user, None, None)]
+
+    first_user, _, _ = cached_user_repo.select_by_id(1)
+    cached_user, _, _ = cached_user_repo.select_by_id(1)
+    clock[0] += 1.5
+    refreshed_user, _, _ = cached_user_repo.select_by_id(1)
+
+    assert first_user.first_name == cached_user.first_name == "Iury"
+    assert refreshed_user.first_name == "Davi"
+    mock_sqlite_user_repository.select_last_change_sequence.assert_called_once_with()
+    mock_sqlite_user_repository.select_changes.assert_called_once_with(10, CachedUserRepository.invalidation_batch_size)
+
+def test_compacted_change_log_clears_cache(mock_sqlite_user_repository, monkeypatch):
+    clock = [100.0]
+    monkeypatch.setattr("repositories.cached_user_repository.time.monotonic", lambda: clock[0])
+    cached_user_repo = CachedUserRepository(mock_sqlite_user_repository, InMemoryLRUCache(max_size=100, ttl_seconds=30),
+                                            invalidation_interval=1.0)
+    mock_sqlite_user_repository.select_last_change_sequence.side_effect = [(10, None, None), (50, None, None)]
+    mock_sqlite_user_repository.select_changes.return_value = (None, "ChangesCompacted", "Changes up to sequence 40 were compacted.")
+    mock_sqlite_user_repository.select_by_id.return_value = (UserModel(id=1, first_name="Iury", email="rosal@gmail.com"), None, None)
+
+    cached_user_repo.select_by_id(1)
+    clock[0] += 1.5
+    cached_user_repo.select_by_id(1)
+
+    assert mock_sqlite_user_repository.select_by_id.call_count == 2
+    assert mock_sqlite_user_repository.select_last_change_sequence.call_count == 2
@@ -0,0 +1,166 @@
+import gzip
+import zlib
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import FileResponse, JSONResponse, PlainTextResponse, StreamingResponse
+from fastapi.testclient import TestClient
+
+from infra.compression import (CompressionMiddleware, GzipStream, HTTP_COMPRESSION_CPU_SECONDS, HTTP_COMPRESSION_INPUT_BYTES,
+                               HTTP_COMPRESSION_OUTPUT_BYTES, HTTP_COMPRESSION_RATIO, negotiate_encoding)
+
+
+USERS = [{"id": index, "first_name": f"User {index}", "last_name": "Rosal", "email": f"user{index}@gmail.com"} for index in range(200)]
+
+
+def build_client(**options):
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, **options)
+
+    @app.get("/users")
+    async def users():
+        return JSONResponse(USERS, headers={"ETag": '"7"'})
+
+    @app.get("/small")
+    async def small():
+        return {"message": "ok"}
+
+    @app.get("/stream")
+    async def stream():
+        async def lines():
+            for user in USERS:
+                yield f'{{"id": {user["id"]}, "email": "{user["email"]}"}}\n'
+        return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+    @app.get("/no-transform")
+    async def no_transform():
+        return PlainTextResponse("x" * 4096, headers={"Cache-Control": "no-transform"})
+
+    @app.get("/encoded")
+    async def encoded():
+        return PlainTextResponse(gzip.compress(b"x" * 4096), headers={"Content-Encoding": "gzip"})
+
+    return TestClient(app)
+
+
+def test_negotiate_encoding():
+    encodings = ["zstd", "br", "gzip"]
+
+    assert negotiate_encoding("gzip, deflate, br, zstd", encodings) == "zstd"
+    assert negotiate_encoding("gzip;q=1.0, br;q=0.5", encodings) == "gzip"
+    assert negotiate_encoding("*;q=0.1, gzip;q=0", ["gzip", "br"]) == "br"
+    assert negotiate_encoding("identity", encodings) is None
+    assert negotiate_encoding("gzip;q=0", encodings) is None
+    assert negotiate_encoding(None, encodings) is None
+
+def test_gzip_stream_flushes_each_chunk():
+    stream = GzipStream()
+
+    first = stream.compress(b"a" * 100, final=False)
+    decompressor = zlib.decompressobj(zlib.MAX_WBITS | 16)
+
+    assert decompressor.decompress(first) == b"a" * 100
+    assert decompressor.decompress(stream.compress(b"b" * 100, final=True)) == b"b" * 100
+    assert decompressor.eof
+
+def test_large_response_is_compressed_and_etag_weakened():
+    client = build_client(encodings=("gzip",))
+    labels = {"route": "/users", "encoding": "gzip"}
+    before_input = HTTP_COMPRESSION_INPUT_BYTES.value(**labels)
+    before_output = HTTP_COMPRESSION_OUTPUT_BYTES.value(**labels)
+
+    response = client.get("/users", headers={"Accept-Encoding": "gzip"})
+
+    input_bytes = HTTP_COMPRESSION_INPUT_BYTES.value(**labels) - before_input
+    output_bytes = HTTP_COMPRESSION_OUTPUT_BYTES.value(**labels) - before_output
+    assert response.status_code == 200
+    assert response.json() == USERS
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert response.headers["etag"] == 'W/"7"'
+    assert int(response.headers["content-length"]) == output_bytes
+    assert input_bytes == len(response.content)
+    assert output_bytes < input_bytes / 4
+    assert HTTP_COMPRESSION_RATIO.snapshot(**labels)["count"] >= 1
+    assert HTTP_COMPRESSION_CPU_SECONDS.snapshot(**labels)["count"] >= 1
+
+def test_small_and_unaccepted_responses_are_not_compressed():
+    client = build_client()
+
+    small = client.get("/small", headers={"Accept-Encoding": "gzip"})
+    identity = client.get("/users", headers={"Accept-Encoding": "identity"})
+
+    assert "content-encoding" not in small.headers
+    assert small.json() == {"message": "ok"}
+    assert "content-encoding" not in identity.headers
+    assert identity.headers["etag"] == '"7"'
+
+def test_streamed_response_is_compressed_in_chunks():
+    client = build_client(offload_size=64)
+
+    with client.stream("GET", "/stream", headers={"Accept-Encoding": "gzip"}) as response:
+        raw = b"".join(response.iter_raw())
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert "content-length" not in response.headers
+    assert gzip.decompress(raw).decode().splitlines() == [f'{{"id": {user["id"]}, "email": "{user["email"]}"}}' for user in USERS]
+
+def test_no_transform_and_encoded_responses_pass_through():
+    client = build_client()
+
+    no_transform = client.get("/no-transform", headers={"Accept-Encoding": "gzip"})
+    encoded = client.get("/encoded", headers={"Accept-Encoding": "gzip"})
+
+    assert "content-encoding" not in no_transform.headers
+    assert no_transform.text == "x" * 4096
+    assert encoded.headers["content-encoding"] == "gzip"
+    assert encoded.content == b"x" * 4096
+
+def test_multi_chunk_responses_pass_through_uncompressed(tmp_path):
+    content = bytes(range(256)) * 1024
+    (tmp_path / "users.parquet").write_bytes(content)
+    (tmp_path / "users.csv").write_text("id,email\n" + "".join(f"{user['id']},{user['email']}\n" for user in USERS) * 50)
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware)
+
+    @app.get("/events")
+    async def events():
+        async def messages():
+            for user in USERS[:3]:
+                yield f"data: {user['id']}\n\n"
+        return StreamingResponse(messages(), media_type="text/event-stream")
+
+    @app.get("/parquet")
+    async def parquet():
+        return FileResponse(tmp_path / "users.parquet", media_type="application/octet-stream")
+
+    @app.get("/csv")
+    async def csv():
+        return FileResponse(tmp_path / "users.csv", media_type="text/csv")
+
+    client = TestClient(app)
+    headers = {"Accept-Encoding": "gzip"}
+
+    events = client.get("/events", headers=headers)
+    parquet = client.get("/parquet", headers=headers)
+    parquet_range = client.get("/parquet", headers={**headers, "Range": "bytes=1000-"})
+    csv_range = client.get("/csv", headers={**headers, "Range": "bytes=10-"})
+
+    assert events.status_code == 200
+    assert "content-encoding" not in events.headers
+    assert events.text == "data: 0\n\ndata: 1\n\ndata: 2\n\n"
+    assert (parquet.status_code, parquet.content) == (200, content)
+    assert "content-encoding" not in parquet.headers
+    assert (parquet_range.status_code, parquet_range.content) == (206, content[1000:])
+    assert "content-encoding" not in parquet_range.headers
+    assert (csv_range.status_code, csv_range.content) == (206, (tmp_path / "users.csv").read_bytes()[10:])
+
+def test_optional_encodings_are_negotiated_when_installed():
+    zstandard = pytest.importorskip("zstandard")
+    client = build_client()
+
+    with client.stream("GET", "/users", headers={"Accept-Encoding": "gzip, zstd"}) as response:
+        raw = b"".join(response.iter_raw())
+
+    assert response.headers["content-encoding"] == "zstd"
+    assert zstandard.ZstdDecompressor().decompressobj().decompress(raw).startswith(b'[{"id":0')
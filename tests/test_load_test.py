@@ -0,0 +1,44 @@
+from benchmarks.load_test import compare_with_baseline, metadata_mismatches, percentile, summarize
+
+
+def build_report(**metrics):
+    result = {"users": 10000, "scenario": "get_user", "concurrency": 10,
+              "rps": 100.0, "p95_ms": 10.0, "errors": 0}
+    result.update(metrics)
+    return {"results": [result]}
+
+
+def test_percentile_nearest_rank():
+    values = [float(value) for value in range(1, 101)]
+
+    assert percentile(values, 50) == 50.0
+    assert percentile(values, 95) == 95.0
+    assert percentile(values, 99) == 99.0
+    assert percentile([], 99) == 0.0
+
+def test_summarize():
+    summary = summarize([0.003, 0.001, 0.002], errors=1, elapsed=0.5)
+
+    assert summary["requests"] == 3
+    assert summary["errors"] == 1
+    assert summary["rps"] == 6.0
+    assert summary["p50_ms"] == 2.0
+    assert summary["max_ms"] == 3.0
+
+def test_compare_with_baseline_within_tolerance():
+    assert compare_with_baseline(build_report(p95_ms=11.0, rps=90.0), build_report(), tolerance=0.2) == []
+
+def test_compare_with_baseline_detects_regressions():
+    regressions = compare_with_baseline(build_report(p95_ms=15.0, rps=50.0, errors=2), build_report(), tolerance=0.2)
+
+    assert len(regressions) == 3
+    assert "p95_ms 15.0 > baseline 10.0" in regressions[0]
+
+def test_compare_with_baseline_ignores_unknown_scenarios():
+    assert compare_with_baseline(build_report(scenario="list_page", p95_ms=100.0), build_report(), tolerance=0.2) == []
+
+def test_metadata_mismatches():
+    metadata = {"cpu_count": 8, "workers": 1, "requests": 1000, "python": "3.11.7", "settings": {}, "timestamp": "2026-10-18"}
+
+    assert metadata_mismatches(metadata, {**metadata, "timestamp": "2026-10-01"}) == []
+    assert metadata_mismatches(metadata, {**metadata, "cpu_count": 1, "requests": 100}) == ["cpu_count: 8 != baseline 1", "requests: 1000 != baseline 100"]
@@ -0,0 +1,67 @@
+import asyncio
+import json
+import logging
+import queue
+
+from infra.log_config import (CustomFormatter, JsonFormatter, DeferredFormattingQueueHandler,
+                              LogService, handle_exceptions)
+
+
+def build_record(msg="Iniciando seleção do usuário %s na camada repositório", args=(1,), created=1700000000.5):
+    record = logging.LogRecord("service.user_service", logging.INFO, __file__, 1, msg, args, None)
+    record.created = created
+    return record
+
+
+def test_custom_formatter_uses_sao_paulo_timezone():
+    formatter = CustomFormatter(fmt="%(asctime)s : %(levelname)s : %(message)s", datefmt="%Y-%m-%d %H:%M:%S")
+
+    output = formatter.format(build_record())
+
+    assert output == "2023-11-14 19:13:20 : INFO : Iniciando seleção do usuário 1 na camada repositório"
+
+def test_custom_formatter_reuses_time_within_same_second():
+    formatter = CustomFormatter(datefmt="%Y-%m-%d %H:%M:%S")
+
+    first_time = formatter.formatTime(build_record(created=1700000000.1), formatter.datefmt)
+    second_time = formatter.formatTime(build_record(created=1700000000.9), formatter.datefmt)
+    next_second_time = formatter.formatTime(build_record(created=1700000001.0), formatter.datefmt)
+
+    assert first_time is second_time
+    assert next_second_time == "2023-11-14 19:13:21"
+
+def test_json_formatter():
+    formatter = JsonFormatter(datefmt="%Y-%m-%d %H:%M:%S")
+
+    output = json.loads(formatter.format(build_record()))
+
+    assert output == {"timestamp": "2023-11-14 19:13:20",
+                      "level": "INFO",
+                      "logger": "service.user_service",
+                      "message": "Iniciando seleção do usuário 1 na camada repositório"}
+
+def test_queue_handler_defers_formatting():
+    log_queue = queue.SimpleQueue()
+    handler = DeferredFormattingQueueHandler(log_queue)
+    record = build_record()
+
+    handler.handle(record)
+    queued_record = log_queue.get_nowait()
+
+    assert queued_record.msg == "Iniciando seleção do usuário %s na camada repositório"
+    assert queued_record.args == (1,)
+
+def test_app_logger_enqueues_records():
+    logger = LogService().get_logger("tests.test_log_config")
+
+    assert logger.level == logging.INFO
+    assert isinstance(logger.handlers[0], DeferredFormattingQueueHandler)
+
+def test_handle_exceptions_on_coroutine():
+    @handle_exceptions(LogService().get_logger("tests.test_log_config"))
+    async def failing_operation():
+        raise ValueError("invalid value")
+
+    result = asyncio.run(failing_operation())
+
+    assert result == ("UnexpectedError", "ValueError: invalid value")
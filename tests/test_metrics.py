@@ -0,0 +1,159 @@
+import json
+import os
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+
+from controller.v1.user_controller import UserController, get_user_service
+from infra.instrumentation import (MetricsMiddleware, install_sqlalchemy_instrumentation, instrument_repository,
+                                   instrument_service, DB_STATEMENT_DURATION, DB_STATEMENT_ROWS_AFFECTED,
+                                   HTTP_REQUEST_DURATION, REPOSITORY_CALL_DURATION, REPOSITORY_ROWS_RETURNED,
+                                   SERVICE_CALL_DURATION)
+from infra.metrics import Counter, Gauge, Histogram, MetricsRegistry, MultiProcessMetrics
+from tests.config.fixtures import mock_user_service
+
+
+def count_of(histogram, **labels):
+    snapshot = histogram.snapshot(**labels)
+    return 0 if snapshot is None else snapshot["count"]
+
+
+def test_counter_render():
+    registry = MetricsRegistry()
+    counter = registry.counter("requests_total", "Total de requisições.", ("method",))
+    counter.inc(method="GET")
+    counter.inc(2, method="GET")
+
+    output = registry.render()
+
+    assert "# HELP requests_total Total de requisições." in output
+    assert "# TYPE requests_total counter" in output
+    assert 'requests_total{method="GET"} 3' in output
+
+def test_counter_rejects_unknown_labels():
+    counter = Counter("requests_total", "Total de requisições.", ("method",))
+
+    with pytest.raises(ValueError):
+        counter.inc(route="/users")
+
+def test_histogram_cumulative_buckets():
+    histogram = Histogram("latency_seconds", "Latência.", buckets=(0.1, 1.0))
+    histogram.observe(0.05)
+    histogram.observe(0.5)
+    histogram.observe(5)
+
+    output = "\n".join(histogram.collect())
+
+    assert 'latency_seconds_bucket{le="0.1"} 1' in output
+    assert 'latency_seconds_bucket{le="1"} 2' in output
+    assert 'latency_seconds_bucket{le="+Inf"} 3' in output
+    assert "latency_seconds_sum 5.55" in output
+    assert "latency_seconds_count 3" in output
+
+def test_gauge_function_and_label_escaping():
+    gauge = Gauge("pool_size", "Tamanho do pool.", ("profile",))
+    gauge.set_function(lambda: [({"profile": 'bal"anced'}, 5)])
+
+    assert gauge.collect() == ['pool_size{profile="bal\\"anced"} 5']
+
+def test_registry_returns_existing_metric():
+    registry = MetricsRegistry()
+
+    first = registry.counter("requests_total", "Total de requisições.")
+    second = registry.counter("requests_total", "Total de requisições.")
+
+    assert first is second
+
+def test_instrument_service_and_repository():
+    @instrument_service
+    class FakeService:
+        def get_user(self, user_id):
+            return user_id
+
+    @instrument_repository
+    class FakeRepository:
+        def select_all(self):
+            return ([1, 2, 3], None, None)
+
+    before_service = count_of(SERVICE_CALL_DURATION, service="FakeService", method="get_user")
+    before_repository = count_of(REPOSITORY_CALL_DURATION, repository="FakeRepository", method="select_all")
+
+    assert FakeService().get_user(1) == 1
+    FakeRepository().select_all()
+
+    assert count_of(SERVICE_CALL_DURATION, service="FakeService", method="get_user") == before_service + 1
+    assert count_of(REPOSITORY_CALL_DURATION, repository="FakeRepository", method="select_all") == before_repository + 1
+    assert REPOSITORY_ROWS_RETURNED.snapshot(repository="FakeRepository", method="select_all")["sum"] >= 3
+
+def test_sqlalchemy_statement_timing():
+    engine = create_engine("sqlite:///:memory:")
+    install_sqlalchemy_instrumentation()
+    install_sqlalchemy_instrumentation()
+    before_select = count_of(DB_STATEMENT_DURATION, operation="SELECT")
+    before_insert = DB_STATEMENT_ROWS_AFFECTED.value(operation="INSERT")
+
+    with engine.begin() as connection:
+        connection.execute(text("CREATE TABLE t (id INTEGER)"))
+        connection.execute(text("INSERT INTO t (id) VALUES (1), (2)"))
+        connection.execute(text("SELECT id FROM t")).all()
+
+    assert count_of(DB_STATEMENT_DURATION, operation="SELECT") == before_select + 1
+    assert DB_STATEMENT_ROWS_AFFECTED.value(operation="INSERT") == before_insert + 2
+
+def test_middleware_records_route_template(mock_user_service):
+    app = FastAPI()
+    app.add_middleware(MetricsMiddleware)
+    app.include_router(UserController.router, prefix="/api/v1")
+    app.dependency_overrides[get_user_service] = lambda: mock_user_service
+    mock_user_service.get_user.return_value = ("UserDoesNotExist", "User with id 7 does not exist.")
+    labels = {"method": "GET", "route": "/api/v1/users/{user_id}", "status": "404"}
+    before = count_of(HTTP_REQUEST_DURATION, **labels)
+
+    response = TestClient(app).get("/api/v1/users/7")
+
+    assert response.status_code == 404
+    assert count_of(HTTP_REQUEST_DURATION, **labels) == before + 1
+
+def test_metrics_endpoint():
+    from api.app import app
+
+    client = TestClient(app)
+    client.get("/")
+    response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert 'http_request_duration_seconds_count{method="GET",route="/",status="200"}' in response.text
+    assert "# TYPE db_statement_duration_seconds histogram" in response.text
+
+def test_multiprocess_metrics_merges_workers(tmp_path):
+    registry = MetricsRegistry()
+    counter = registry.counter("requests_total", "Total de requisições.", ("method",))
+    histogram = registry.histogram("latency_seconds", "Latência.", buckets=(0.1, 1.0))
+    in_progress = registry.gauge("in_progress", "Requisições em andamento.", multiprocess_mode="sum")
+    ratio = registry.gauge("hit_ratio", "Fração de acertos.")
+    counter.inc(2, method="GET")
+    histogram.observe(0.05)
+    in_progress.set(1)
+    ratio.set(0.5)
+    MultiProcessMetrics.prepare_directory(str(tmp_path))
+    exporter = MultiProcessMetrics(registry, str(tmp_path))
+    other_worker, finished_worker = os.getppid(), 2 ** 30
+    for pid in (other_worker, finished_worker):
+        with open(tmp_path / f"{pid}.json", "w", encoding="utf-8") as file:
+            json.dump({"requests_total": [[{"method": "GET"}, 3]],
+                       "latency_seconds": [[{}, {"buckets": [0, 1, 0], "sum": 0.5, "count": 1}]],
+                       "in_progress": [[{}, 2]],
+                       "hit_ratio": [[{}, 0.25]]}, file)
+
+    output = exporter.render()
+
+    assert 'requests_total{method="GET"} 8' in output
+    assert 'latency_seconds_bucket{le="0.1"} 1' in output
+    assert 'latency_seconds_bucket{le="1"} 3' in output
+    assert "latency_seconds_count 3" in output
+    assert "in_progress 3" in output
+    assert f'hit_ratio{{pid="{os.getpid()}"}} 0.5' in output
+    assert f'hit_ratio{{pid="{other_worker}"}} 0.25' in output
+    assert f'pid="{finished_worker}"' not in output
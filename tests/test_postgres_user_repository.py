@@ -0,0 +1,78 @@
+import asyncio
+import io
+import pytest
+from tests.config.fixtures import postgres_dsn
+
+from db.seed import seed_users
+from models.user_model import UserModel
+from repositories.backends import get_user_repository_backend
+from repositories.postgres_user_repository import PostgresUserRepository, full_text_query_expression
+from repositories.async_postgres_user_repository import AsyncPostgresUserRepository
+from tests.config.test_postgres_user_repository import TestPostgresUserRepository, TestAsyncPostgresUserRepository
+
+
+def test_get_user_repository_backend():
+    repository_class, async_repository_class = get_user_repository_backend("postgres")
+
+    assert repository_class is PostgresUserRepository
+    assert async_repository_class is AsyncPostgresUserRepository
+    with pytest.raises(ValueError):
+        get_user_repository_backend("mysql")
+
+def test_full_text_query_expression():
+    assert full_text_query_expression('ros "oliv') == "ros:* & oliv:*"
+    assert full_text_query_expression("!!") == ""
+
+def test_bulk_create_with_copy(postgres_dsn, monkeypatch):
+    user_repo = TestPostgresUserRepository(postgres_dsn)
+    monkeypatch.setattr(user_repo, "copy_threshold", 2)
+    initial_version, _, _ = user_repo.select_collection_version()
+
+    results, err_code, _ = user_repo.bulk_create([{"first_name": "Iury", "last_name": "Rosal", "email": "rosal@gmail.com"},
+                                                  {"first_name": "Davi", "email": "davi@gmail.com"},
+                                                  {"first_name": "Ana", "last_name": "Lima", "email": "ana@gmail.com"}])
+    changes, _, _ = user_repo.select_changes(since=0, limit=10)
+    collection_version, _, _ = user_repo.select_collection_version()
+
+    assert err_code is None
+    assert [(user.id, user.first_name, user.last_name, user.version) for user, _, _ in results] == [(1, "Iury", "Rosal", 1), (2, "Davi", None, 1), (3, "Ana", "Lima", 1)]
+    assert all(user.updated_at is not None for user, _, _ in results)
+    assert [(change.user_id, change.operation) for change in changes] == [(1, "create"), (2, "create"), (3, "create")]
+    assert collection_version[0] == initial_version[0] + 1
+
+def test_async_bulk_create_with_copy(postgres_dsn, monkeypatch):
+    async def scenario():
+        user_repo = TestAsyncPostgresUserRepository(postgres_dsn)
+        monkeypatch.setattr(user_repo, "copy_threshold", 2)
+        await user_repo.db_client.create_all()
+        try:
+            results, err_code, _ = await user_repo.bulk_create([{"first_name": "Iury", "email": "rosal@gmail.com"},
+                                                                {"first_name": "Davi", "email": "davi@gmail.com"}])
+            users, _, _ = await user_repo.select_all()
+            rows, _, _ = await user_repo.select_rows()
+        finally:
+            await user_repo.db_client._engine.dispose()
+
+        assert err_code is None
+        assert [user.email for user, _, _ in results] == ["rosal@gmail.com", "davi@gmail.com"]
+        assert sorted(user.id for user in users) == [1, 2]
+        assert [row["email"] for row in rows] == ["rosal@gmail.com", "davi@gmail.com"]
+    asyncio.run(scenario())
+
+def test_seed_users_with_copy(postgres_dsn):
+    user_repo = TestPostgresUserRepository(postgres_dsn)
+
+    report = seed_users(250, batch_size=100, engine=user_repo.db_client._engine, full_text=True, out=io.StringIO())
+    users, _, _ = user_repo.select_all()
+    changes, _, _ = user_repo.select_changes(since=0, limit=10)
+    _, err_code, _ = user_repo.search_full_text(users[0].first_name)
+    user, _, _ = user_repo.create(first_name="Iury", email="rosal@gmail.com")
+    new_changes, _, _ = user_repo.select_changes(since=0, limit=10)
+
+    assert report["rows"] == 250
+    assert len(users) == 250
+    assert all(isinstance(user, UserModel) and user.version == 1 for user in users)
+    assert changes == []
+    assert err_code is None
+    assert users[0].id in {user.id for user in user_repo.search_full_text(f"{users[0].first_name} {users[0].last_name}", limit=250)[0]}
+    assert [change.user_id for change in new_changes] == [user.id]
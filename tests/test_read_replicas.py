@@ -0,0 +1,141 @@
+import asyncio
+import sqlite3
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+
+from db.sqllite_client import SqLiteBase, SqLiteClient, AsyncSqLiteClient
+from db.replicas import DB_READ_ROUTING, DB_REPLICA_HEALTHY, DB_REPLICA_LAG_CHANGES
+from infra.read_consistency import ReadYourWritesMiddleware, primary_reads, primary_reads_requested
+from repositories.sqlite_user_repository import SQLiteUserRepository
+from repositories.async_sqlite_user_repository import AsyncSQLiteUserRepository
+
+
+class ReplicatedSQLiteUserRepository(SQLiteUserRepository):
+    _instance = None
+
+    def __init__(self, db_client: SqLiteClient) -> None:
+        self.db_client = db_client
+
+
+class ReplicatedAsyncSQLiteUserRepository(AsyncSQLiteUserRepository):
+    _instance = None
+
+    def __init__(self, db_client: AsyncSqLiteClient) -> None:
+        self.db_client = db_client
+
+
+def build_primary_and_replica(tmp_path, max_lag_seconds=60):
+    """Cria o banco de dados principal com um usuário, copia o arquivo para a réplica (que deixa de acompanhar o principal) e retorna o repositório com a réplica configurada."""
+    primary_file, replica_file = tmp_path / "primary.db", tmp_path / "replica.db"
+
+    class PrimarySqLiteClient(SqLiteClient):
+        database_path = f"sqlite:///{primary_file}"
+
+    SqLiteBase.metadata.create_all(PrimarySqLiteClient(replica_files=[])._engine)
+    repository = ReplicatedSQLiteUserRepository(PrimarySqLiteClient(replica_files=[]))
+    replicated_user, _, _ = repository.create(first_name="Iury", email="rosal@gmail.com")
+    with sqlite3.connect(primary_file) as source, sqlite3.connect(replica_file) as target:
+        source.backup(target)
+
+    repository = ReplicatedSQLiteUserRepository(PrimarySqLiteClient(replica_files=[str(replica_file)]))
+    repository.db_client._replicas.max_lag_seconds = max_lag_seconds
+    return repository, replicated_user, str(replica_file)
+
+
+def test_reads_are_routed_to_replica_and_writes_to_primary(tmp_path):
+    repository, replicated_user, replica_file = build_primary_and_replica(tmp_path)
+    new_user, err_code, _ = repository.create(first_name="Davi", email="davi@gmail.com")
+    repository.db_client._replicas.check_lag()
+    replica_reads = DB_READ_ROUTING.value(target="replica", reason="replica")
+
+    from_replica, replica_err_code, _ = repository.select_by_id(new_user.id)
+    replicated, _, _ = repository.select_by_id(replicated_user.id)
+    with primary_reads():
+        from_primary, _, _ = repository.select_by_id(new_user.id)
+    updated, _, _ = repository.update(new_user.id, {})
+
+    assert err_code is None
+    assert from_replica is None and replica_err_code == "UserDoesNotExist"
+    assert replicated.email == "rosal@gmail.com"
+    assert from_primary.email == "davi@gmail.com"
+    assert updated.email == "davi@gmail.com"
+    assert DB_READ_ROUTING.value(target="replica", reason="replica") == replica_reads + 2
+    assert DB_REPLICA_LAG_CHANGES.value(replica=replica_file) == 1
+    assert DB_REPLICA_HEALTHY.value(replica=replica_file) == 1
+
+def test_lagging_replica_is_skipped(tmp_path):
+    repository, _, replica_file = build_primary_and_replica(tmp_path, max_lag_seconds=0)
+    new_user, _, _ = repository.create(first_name="Davi", email="davi@gmail.com")
+    repository.db_client._replicas.check_lag()
+    primary_reads_count = DB_READ_ROUTING.value(target="primary", reason="replica_unavailable")
+
+    user, err_code, _ = repository.select_by_id(new_user.id)
+
+    assert err_code is None
+    assert user.email == "davi@gmail.com"
+    assert DB_READ_ROUTING.value(target="primary", reason="replica_unavailable") == primary_reads_count + 1
+    assert DB_REPLICA_HEALTHY.value(replica=replica_file) == 0
+
+def test_unreachable_replica_is_skipped(tmp_path):
+    repository, replicated_user, _ = build_primary_and_replica(tmp_path)
+    (tmp_path / "replica.db").unlink()
+    repository.db_client._replicas.check_lag()
+
+    user, err_code, _ = repository.select_by_id(replicated_user.id)
+
+    assert err_code is None
+    assert user.email == "rosal@gmail.com"
+    assert repository.db_client._replicas.stats()[0]["healthy"] is False
+
+def test_async_reads_are_routed_to_replica(tmp_path):
+    sync_repository, replicated_user, replica_file = build_primary_and_replica(tmp_path)
+    new_user, _, _ = sync_repository.create(first_name="Davi", email="davi@gmail.com")
+
+    class PrimaryAsyncSqLiteClient(AsyncSqLiteClient):
+        database_path = f"sqlite+aiosqlite:///{tmp_path / 'primary.db'}"
+
+    async def scenario():
+        repository = ReplicatedAsyncSQLiteUserRepository(PrimaryAsyncSqLiteClient(replica_files=[replica_file]))
+        repository.db_client._replicas.max_lag_seconds = 60
+        repository.db_client._replicas.check_lag()
+        try:
+            replicated, _, _ = await repository.select_by_id(replicated_user.id)
+            _, replica_err_code, _ = await repository.select_by_id(new_user.id)
+            with primary_reads():
+                from_primary, _, _ = await repository.select_by_id(new_user.id)
+        finally:
+            await repository.db_client._engine.dispose()
+            for read_session in repository.db_client._read_sessions:
+                await read_session.kw["bind"].dispose()
+
+        assert replicated.email == "rosal@gmail.com"
+        assert replica_err_code == "UserDoesNotExist"
+        assert from_primary.email == "davi@gmail.com"
+    asyncio.run(scenario())
+
+def test_read_your_writes_middleware():
+    app = FastAPI()
+    app.add_middleware(ReadYourWritesMiddleware, window_seconds=5)
+
+    @app.get("/reads")
+    def reads():
+        return {"primary": primary_reads_requested()}
+
+    @app.post("/writes")
+    def writes(fail: bool = False):
+        if fail:
+            raise HTTPException(status_code=409)
+        return {}
+
+    client = TestClient(app)
+    assert client.get("/reads").json() == {"primary": False}
+    assert "primary_reads_until" not in client.post("/writes", params={"fail": True}).cookies
+
+    response = client.post("/writes")
+    assert "primary_reads_until" in response.cookies
+    assert client.get("/reads").json() == {"primary": True}
+
+    client.cookies.clear()
+    assert client.get("/reads").json() == {"primary": False}
+    assert client.get("/reads", headers={"X-Primary-Reads-Until": response.headers["x-primary-reads-until"]}).json() == {"primary": True}
+    assert client.get("/reads", headers={"X-Primary-Reads-Until": "1"}).json() == {"primary": False}
@@ -0,0 +1,81 @@
+import time
+from contextlib import contextmanager
+import pytest
+from sqlalchemy import event
+
+from infra.instrumentation import DB_STATEMENT_CACHE, install_sqlalchemy_instrumentation
+from repositories.sqlite_user_repository import select_rows_statement, update_user_statement
+from tests.config.fixtures import user_repo, postgres_dsn
+
+
+@contextmanager
+def count_statements(engine):
+    """Registra as instruções SQL enviadas ao cursor da engine enquanto o contexto estiver ativo. COMMIT e ROLLBACK não passam pelo cursor e, portanto, não são contados."""
+    statements = []
+
+    def before_cursor_execute(connection, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+
+OPERATIONS = {
+    "create": (lambda repo, user_id: repo.create(first_name="Iury", last_name="Rosal", email="rosal@gmail.com"), 1),
+    "select_by_id": (lambda repo, user_id: repo.select_by_id(user_id), 1),
+    "select_page": (lambda repo, user_id: repo.select_page(limit=10, after_id=user_id), 1),
+    "update": (lambda repo, user_id: repo.update(user_id, {"first_name": "Davi"}), 1),
+    "update_expected_version": (lambda repo, user_id: repo.update(user_id, {"first_name": "Davi"}, expected_version=1), 1),
+    "update_not_exists": (lambda repo, user_id: repo.update(user_id + 10_000, {"first_name": "Davi"}), 1),
+    "select_version": (lambda repo, user_id: repo.select_version(user_id), 1),
+    "select_collection_version": (lambda repo, user_id: repo.select_collection_version(), 1),
+    "select_changes": (lambda repo, user_id: repo.select_changes(since=user_id, limit=10), 1),
+    "delete_by_id": (lambda repo, user_id: repo.delete_by_id(user_id), 1),
+    "delete_by_id_not_exists": (lambda repo, user_id: repo.delete_by_id(user_id + 10_000), 1),
+    "bulk_create": (lambda repo, user_id: repo.bulk_create([{"first_name": "Iury", "email": "rosal@gmail.com"}] * 50), 1),
+    "bulk_update": (lambda repo, user_id: repo.bulk_update([{"id": user_id, "first_name": "Davi"}, {"id": user_id + 10_000, "first_name": "Davi"}]), 2),
+    "bulk_delete": (lambda repo, user_id: repo.bulk_delete([user_id, user_id + 10_000]), 1),
+}
+
+
+@pytest.mark.parametrize("operation", OPERATIONS)
+def test_statements_per_operation(user_repo, operation):
+    """Micro-benchmark do caminho crítico do repositório: executa a operação repetidas vezes e garante a quantidade de instruções SQL (round trips) por chamada, evitando regressões como SELECT adicional após escrita ou refresh."""
+    run_operation, expected_statements = OPERATIONS[operation]
+    iterations = 50
+    user_ids = [user.id for user, _, _ in user_repo.bulk_create([{"first_name": "Iury", "email": "rosal@gmail.com"}] * iterations)[0]]
+
+    with count_statements(user_repo.db_client._engine) as statements:
+        started = time.perf_counter()
+        for user_id in user_ids:
+            run_operation(user_repo, user_id)
+        elapsed = time.perf_counter() - started
+
+    per_call = len(statements) / iterations
+    assert per_call == expected_statements, (
+        f"{operation}: {per_call} statements per call (expected {expected_statements}), "
+        f"{elapsed / iterations * 1e6:.0f}us per call: {statements[:expected_statements + 2]}"
+    )
+
+def test_hot_paths_reuse_compiled_statements(user_repo):
+    """Os statements pré-construídos são compilados uma única vez: após o aquecimento, nenhuma operação volta a compilar (miss no cache de statements compilados da engine)."""
+    install_sqlalchemy_instrumentation()
+    user_ids = [user.id for user, _, _ in user_repo.bulk_create([{"first_name": "Iury", "email": "rosal@gmail.com"}] * 4)[0]]
+    for run_operation, _ in OPERATIONS.values():
+        run_operation(user_repo, user_ids[0])
+    misses, hits = DB_STATEMENT_CACHE.value(result="miss"), DB_STATEMENT_CACHE.value(result="hit")
+
+    for user_id in user_ids[1:]:
+        for run_operation, _ in OPERATIONS.values():
+            run_operation(user_repo, user_id)
+
+    assert DB_STATEMENT_CACHE.value(result="miss") == misses
+    assert DB_STATEMENT_CACHE.value(result="hit") > hits
+
+def test_statements_are_built_once():
+    assert update_user_statement(("first_name",), False) is update_user_statement(("first_name",), False)
+    assert update_user_statement(("first_name",), False) is not update_user_statement(("first_name",), True)
+    assert select_rows_statement(10, 5, ["id", "email"]) == (select_rows_statement(20, 7, ("id", "email"))[0], {"after_id": 5, "limit": 10})
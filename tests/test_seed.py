@@ -0,0 +1,99 @@
+import io
+
+import pytest
+from sqlalchemy import create_engine
+
+import db.seed
+from db.sqllite_client import register_functions_on_connect
+from db.seed import UserDataGenerator, seed_users, to_ascii_slug
+
+
+def build_engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'seed.db'}")
+    register_functions_on_connect(engine)
+    return engine
+
+
+def test_to_ascii_slug():
+    assert to_ascii_slug("João da Conceição") == "joaodaconceicao"
+
+def test_generate_batch_is_reproducible_and_unique():
+    generator = UserDataGenerator(seed=7, pool_size=50)
+
+    batch = generator.generate_batch(100, 500)
+
+    assert batch == UserDataGenerator(seed=7, pool_size=50).generate_batch(100, 500)
+    assert len(batch) == 500
+    assert len({email for _, _, email in batch}) == 500
+    assert batch[0][2].split("@")[0].endswith("100")
+
+def test_seed_users_inserts_rows_and_rebuilds_indexes(tmp_path):
+    engine = build_engine(tmp_path)
+
+    report = seed_users(2500, batch_size=1000, engine=engine, full_text=True, out=io.StringIO())
+
+    assert report["rows"] == 2500
+    assert report["rows_per_second"] > 0
+    with engine.connect() as connection:
+        assert connection.exec_driver_sql('SELECT count(*), count(DISTINCT email) FROM "user"').one() == (2500, 2500)
+        objects = {name for (name,) in connection.exec_driver_sql("SELECT name FROM sqlite_master")}
+        assert {"ix_user_email", "ix_user_first_name_lower", "user_fts", "user_fts_after_insert"} <= objects
+        first_name = connection.exec_driver_sql('SELECT first_name FROM "user" LIMIT 1').scalar()
+        assert connection.exec_driver_sql("SELECT count(*) FROM user_fts WHERE user_fts MATCH ?", (f'"{first_name}"',)).scalar() > 0
+        assert connection.exec_driver_sql("PRAGMA journal_mode").scalar() == "wal"
+
+def test_seed_users_failure_restores_indexes_and_triggers(tmp_path, monkeypatch):
+    engine = build_engine(tmp_path)
+    seed_users(10, engine=engine, full_text=True, out=io.StringIO())
+    write_users = db.seed.write_users
+    calls = []
+
+    def failing_write_users(connection, users):
+        calls.append(len(users))
+        if len(calls) == 2:
+            raise RuntimeError("disk full")
+        write_users(connection, users)
+
+    monkeypatch.setattr(db.seed, "write_users", failing_write_users)
+    with pytest.raises(RuntimeError):
+        seed_users(300, batch_size=100, engine=engine, full_text=False, out=io.StringIO())
+
+    with engine.connect() as connection:
+        objects = {name for (name,) in connection.exec_driver_sql("SELECT name FROM sqlite_master")}
+        assert connection.exec_driver_sql('SELECT count(*) FROM "user"').scalar() == 110
+        assert connection.exec_driver_sql("PRAGMA journal_mode").scalar() == "wal"
+    assert {"ix_user_email", "ix_user_first_name_lower", "user_fts_after_insert", "user_change_after_insert"} <= objects
+
+def test_seed_users_appends_and_resets(tmp_path):
+    engine = build_engine(tmp_path)
+
+    seed_users(100, engine=engine, full_text=False, out=io.StringIO())
+    seed_users(100, engine=engine, full_text=False, out=io.StringIO())
+    with engine.connect() as connection:
+        assert connection.exec_driver_sql('SELECT count(DISTINCT email) FROM "user"').scalar() == 200
+
+    seed_users(50, engine=engine, full_text=False, reset=True, out=io.StringIO())
+    with engine.connect() as connection:
+        assert connection.exec_driver_sql('SELECT count(*) FROM "user"').scalar() == 50
+
+def test_seed_users_with_process_pool(tmp_path):
+    engine = build_engine(tmp_path)
+
+    seed_users(300, batch_size=100, workers=2, engine=engine, full_text=False, out=io.StringIO())
+
+    with engine.connect() as connection:
+        assert connection.exec_driver_sql('SELECT count(DISTINCT email) FROM "user"').scalar() == 300
+
+def test_seed_users_without_rows_only_creates_schema(tmp_path):
+    engine = build_engine(tmp_path)
+    seed_users(10, engine=engine, full_text=True, out=io.StringIO())
+    with engine.begin() as connection:
+        connection.exec_driver_sql("DROP INDEX ix_user_email")
+
+    report = seed_users(0, engine=engine, full_text=True, out=io.StringIO())
+
+    with engine.connect() as connection:
+        names = {name for (name,) in connection.exec_driver_sql("SELECT name FROM sqlite_master")}
+        assert connection.exec_driver_sql('SELECT count(*) FROM "user"').scalar() == 10
+    assert report["rows"] == 0
+    assert {"ix_user_email", "ix_user_first_name_lower", "user_fts", "user_change"} <= names
@@ -0,0 +1,158 @@
+import io
+from contextlib import redirect_stdout
+
+from db.rebalance_shards import main as rebalance_shards, rebalance_plan
+from repositories.sharded_user_repository import ShardedUserRepository
+
+
+class IsolatedShardedUserRepository(ShardedUserRepository):
+    _instance = None
+
+
+def build_sharded_repository(tmp_path, shards=3):
+    catalog_file = str(tmp_path / "catalog.db")
+    rebalance_shards(["--catalog", catalog_file, "init", "--shards", str(shards), "--slots", "16"])
+    return IsolatedShardedUserRepository(catalog_file), catalog_file
+
+
+def create_users(repository, count):
+    results, _, _ = repository.bulk_create([{"first_name": f"User {index}", "email": f"user{index}@gmail.com"} for index in range(count)])
+    return [user for user, _, _ in results]
+
+
+def test_writes_are_routed_to_the_shard_of_the_id(tmp_path):
+    repository, _ = build_sharded_repository(tmp_path)
+
+    user, err_code, _ = repository.create(first_name="Iury", last_name="Rosal", email="rosal@gmail.com")
+    users = create_users(repository, 6)
+    updated, _, _ = repository.update(user.id, {"first_name": "Davi"})
+    found, _, _ = repository.select_by_id(user.id)
+    deleted, _, _ = repository.delete_by_id(users[0].id)
+    repository.close()
+
+    assert err_code is None
+    assert [user.id] + [created.id for created in users] == list(range(1, 8))
+    assert [created.email for created in users] == [f"user{index}@gmail.com" for index in range(6)]
+    assert len({repository.shard_for(created.id).shard_file for created in users}) == 3
+    assert repository.shard_for(user.id).select_by_id(user.id)[0].first_name == "Davi"
+    assert (updated.version, found.first_name) == (2, "Davi")
+    assert deleted.id == users[0].id
+    assert repository.select_by_id(users[0].id)[1] == "UserDoesNotExist"
+
+def test_listing_and_pagination_merge_all_shards(tmp_path):
+    repository, _ = build_sharded_repository(tmp_path)
+    users = create_users(repository, 10)
+
+    pages, after_id = [], None
+    while True:
+        page, _, _ = repository.select_page(limit=3, after_id=after_id)
+        if not page:
+            break
+        pages.append([user.id for user in page])
+        after_id = page[-1].id
+    all_users, _, _ = repository.select_all()
+    rows, _, _ = repository.select_rows(limit=4, after_id=2)
+    streamed, _, _ = repository.stream_all(after_id=5, chunk_size=2)
+    by_prefix, _, _ = repository.select_by_name_prefix("user", limit=4)
+    repository.close()
+
+    assert pages == [[1, 2, 3], [4, 5, 6], [7, 8, 9], [10]]
+    assert [user.id for user in all_users] == [user.id for user in users]
+    assert [row["id"] for row in rows] == [3, 4, 5, 6]
+    assert [user.id for user in streamed] == [6, 7, 8, 9, 10]
+    assert [user.first_name for user in by_prefix] == ["User 0", "User 1", "User 2", "User 3"]
+
+def test_bulk_operations_keep_input_order(tmp_path):
+    repository, _ = build_sharded_repository(tmp_path)
+    create_users(repository, 5)
+
+    updated, err_code, _ = repository.bulk_update([{"id": 5, "first_name": "E"}, {"id": 99, "first_name": "X"}, {"id": 1, "first_name": "A"}])
+    deleted, _, _ = repository.bulk_delete([4, 42, 2])
+    remaining, _, _ = repository.select_all()
+    repository.close()
+
+    assert err_code is None
+    assert [(user.id, user.first_name) if user else error for user, error, _ in updated] == [(5, "E"), "UserDoesNotExist", (1, "A")]
+    assert [user.id if user else error for user, error, _ in deleted] == [4, "UserDoesNotExist", 2]
+    assert [user.id for user in remaining] == [1, 3, 5]
+
+def test_bulk_operations_report_only_the_failing_shard(tmp_path, monkeypatch):
+    repository, _ = build_sharded_repository(tmp_path)
+    create_users(repository, 6)
+    failing_shard = repository.shard_for(1)
+
+    def fail(*args, **kwargs):
+        raise RuntimeError("database is locked")
+
+    monkeypatch.setattr(failing_shard, "insert_users", fail)
+    monkeypatch.setattr(failing_shard, "bulk_update", lambda users_data: ([], "UnexpectedError", "OperationalError: disk I/O error"))
+    monkeypatch.setattr(failing_shard, "select_all", lambda: ([], "UnexpectedError", "OperationalError: disk I/O error"))
+    created, create_err_code, _ = repository.bulk_create([{"first_name": f"New {index}", "email": f"new{index}@gmail.com"} for index in range(6)])
+    updated, update_err_code, _ = repository.bulk_update([{"id": user_id, "first_name": "Updated"} for user_id in range(1, 7)])
+    all_users = repository.select_all()
+    stored = [repository.shard_for(user.id).select_by_id(user.id)[0] for user, _, _ in created if user is not None]
+    repository.close()
+
+    assert (create_err_code, update_err_code) == (None, None)
+    assert [user is None for user, _, _ in created] == [repository.shard_for(user_id) is failing_shard for user_id in range(7, 13)]
+    assert {error for _, error, _ in created} == {None, "UnexpectedError"}
+    assert "RuntimeError: database is locked" in {msg for _, _, msg in created}
+    assert [user.first_name for user in stored] == [user.first_name for user, _, _ in created if user is not None]
+    assert [user.first_name if user else error for user, error, _ in updated] == [
+        "UnexpectedError" if repository.shard_for(user_id) is failing_shard else "Updated" for user_id in range(1, 7)]
+    assert all_users == (None, "UnexpectedError", "OperationalError: disk I/O error")
+
+def test_collection_version_and_change_feed(tmp_path):
+    repository, _ = build_sharded_repository(tmp_path)
+    (initial_version, _), _, _ = repository.select_collection_version()
+    create_users(repository, 3)
+
+    (version, updated_at), _, _ = repository.select_collection_version()
+    _, changes_err_code, _ = repository.select_changes(since=0, limit=10)
+    repository.close()
+
+    assert version > initial_version
+    assert updated_at is not None
+    assert changes_err_code == "ChangesUnavailable"
+
+def test_ids_are_unique_across_processes(tmp_path, monkeypatch):
+    first, catalog_file = build_sharded_repository(tmp_path)
+    monkeypatch.setattr(first.id_allocator, "block_size", 4)
+    first_ids = [user.id for user in create_users(first, 3)]
+
+    class SecondShardedUserRepository(ShardedUserRepository):
+        _instance = None
+    second = SecondShardedUserRepository(catalog_file)
+    monkeypatch.setattr(second.id_allocator, "block_size", 4)
+    second_ids = [user.id for user in create_users(second, 3)]
+    first_ids += [user.id for user in create_users(first, 3)]
+    first.close()
+    second.close()
+
+    assert first_ids == [1, 2, 3, 4, 9, 10]
+    assert second_ids == [5, 6, 7]
+
+def test_rebalance_plan_moves_the_minimum():
+    slot_map = ["a", "b"] * 4
+
+    plan = rebalance_plan(slot_map, ["a", "b", "c", "d"])
+
+    assert {shard_file: len(slots) for shard_file, slots in plan.items()} == {"c": 2, "d": 2}
+    assert all(slot_map[slot] in ("a", "b") for slots in plan.values() for slot in slots)
+
+def test_split_moves_users_to_the_new_shard(tmp_path):
+    repository, catalog_file = build_sharded_repository(tmp_path, shards=1)
+    users = create_users(repository, 20)
+    repository.close()
+
+    with redirect_stdout(io.StringIO()) as output:
+        assert rebalance_shards(["--catalog", catalog_file, "split",
+                                 "--source", str(tmp_path / "shard-0.db"), "--target", str(tmp_path / "shard-1.db")]) == 0
+    repository = IsolatedShardedUserRepository(catalog_file)
+    all_users, _, _ = repository.select_all()
+    shard_sizes = {shard_file: len(shard.select_all()[0]) for shard_file, shard in repository.shards.items()}
+    repository.close()
+
+    assert [user.id for user in all_users] == [user.id for user in users]
+    assert sorted(shard_sizes.values()) == [8, 12]
+    assert "8 slots" in output.getvalue()
@@ -1,5 +1,10 @@
+import os
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+from sqlalchemy import create_engine, text
 from tests.config.fixtures import db_session
-from models.user_model import UserModel
+from models.user_model import UserModel, migrate_user_table
+from db.sqllite_client import SqLiteClient, SqLiteBase, register_functions_on_connect
 
 
 
@@ -17,4 +22,98 @@ def test_user_model(db_session):
     assert user is not None
     assert user.first_name == "iury"
     assert user.last_name == None
-    assert user.email == "iury@email.com"
\ No newline at end of file
+    assert user.email == "iury@email.com"
+
+def build_file_client(tmp_path, profile):
+    class FileSqLiteClient(SqLiteClient):
+        database_path = f"sqlite:///{tmp_path / 'database.db'}"
+
+    client = FileSqLiteClient(profile=profile)
+    SqLiteBase.metadata.create_all(client._engine)
+    return client
+
+@pytest.mark.parametrize("profile, synchronous", [("durable", 2), ("balanced", 1), ("throughput", 0)])
+def test_engine_profile_pragmas(tmp_path, profile, synchronous):
+    client = build_file_client(tmp_path, profile)
+
+    with client._engine.connect() as connection:
+        assert connection.exec_driver_sql("PRAGMA journal_mode").scalar() == "wal"
+        assert connection.exec_driver_sql("PRAGMA synchronous").scalar() == synchronous
+        assert connection.exec_driver_sql("PRAGMA busy_timeout").scalar() > 0
+
+def test_invalid_engine_profile(tmp_path):
+    with pytest.raises(ValueError):
+        build_file_client(tmp_path, "unsafe")
+
+def test_pool_stats(tmp_path):
+    client = build_file_client(tmp_path, "balanced")
+
+    with client._get_session() as db_session:
+        db_session.execute(text("SELECT 1"))
+        stats = client.pool_stats()
+
+    assert stats["profile"] == "balanced"
+    assert stats["size"] == 10
+    assert stats["checked_out"] == 1
+    assert client.pool_stats()["checked_out"] == 0
+
+def test_mixed_read_write_load(tmp_path):
+    client = build_file_client(tmp_path, "balanced")
+
+    def writer(index):
+        with client._get_session() as db_session:
+            db_session.add(UserModel(first_name=f"user{index}", email=f"user{index}@email.com"))
+            db_session.commit()
+
+    def reader(_):
+        with client._get_session() as db_session:
+            return db_session.query(UserModel).count()
+
+    with ThreadPoolExecutor(max_workers=16) as executor:
+        futures = [executor.submit(writer if index % 2 else reader, index) for index in range(400)]
+        for future in futures:
+            future.result()
+
+    with client._get_session() as db_session:
+        assert db_session.query(UserModel).count() == 200
+
+
+def test_migrate_user_table(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'database.db'}")
+    register_functions_on_connect(engine)
+    with engine.begin() as connection:
+        connection.exec_driver_sql('CREATE TABLE "user" (id INTEGER PRIMARY KEY, first_name VARCHAR, last_name VARCHAR, email VARCHAR NOT NULL)')
+        connection.exec_driver_sql('CREATE INDEX ix_user_first_name_lower ON "user" (lower(first_name))')
+        connection.exec_driver_sql("INSERT INTO \"user\" (first_name, email) VALUES ('iury', 'iury@email.com')")
+
+    migrate_user_table(engine)
+    migrate_user_table(engine)
+    with engine.begin() as connection:
+        version, updated_at = connection.exec_driver_sql('SELECT version, updated_at FROM "user"').one()
+        initial_collection_version = connection.exec_driver_sql("SELECT version FROM user_collection_version").scalar()
+        connection.exec_driver_sql('UPDATE "user" SET first_name = \'davi\'')
+        collection_version = connection.exec_driver_sql("SELECT version FROM user_collection_version").scalar()
+        changes = connection.exec_driver_sql("SELECT user_id, operation, first_name FROM user_change").all()
+        index_sql = connection.exec_driver_sql("SELECT sql FROM sqlite_master WHERE name = 'ix_user_first_name_lower'").scalar()
+
+    assert version == 1
+    assert updated_at is not None
+    assert collection_version == initial_collection_version + 1
+    assert changes == [(1, "update", "davi")]
+    assert "unicode_lower(first_name)" in index_sql
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="fork indisponível")
+def test_pool_is_discarded_after_fork(tmp_path):
+    client = build_file_client(tmp_path, "balanced")
+    with client._get_session() as session:
+        session.execute(text("SELECT 1"))
+    assert client._engine.pool.checkedin() == 1
+
+    pid = os.fork()
+    if pid == 0:
+        os._exit(0 if client._engine.pool.checkedin() == 0 else 1)
+    _, status = os.waitpid(pid, 0)
+
+    assert os.waitstatus_to_exitcode(status) == 0
+    assert client._engine.pool.checkedin() == 1
@@ -1,7 +1,11 @@
+import json
+from datetime import datetime
+from unittest.mock import AsyncMock, MagicMock
 from tests.config.fixtures import mock_user_service
 from tests.config.fixtures import fastapi_app_client
 
-from models.user_model import UserModel
+from models.user_model import UserModel, UserChangeModel
+from controller.v1.user_controller import UserController
 
 
 def test_create_user(fastapi_app_client, mock_user_service):
@@ -83,4 +87,455 @@ def test_delete_user_not_found(fastapi_app_client, mock_user_service):
     response = fastapi_app_client.delete("/users/99")
 
     assert response.status_code == 404
-    assert response.json()["code"] == "UserDoesNotExist"
\ No newline at end of file
+    assert response.json()["code"] == "UserDoesNotExist"
+
+def test_get_users_page(fastapi_app_client, mock_user_service):
+    mock_user_service.get_users_page.return_value = [
+        UserModel(id=3, first_name="Iury", last_name="Rosal", email="rosal@gmail.com"),
+        UserModel(id=4, first_name="Davi", last_name="Oliveira", email="davi@gmail.com"),
+    ]
+
+    response = fastapi_app_client.get("/users/?limit=2&after_id=2")
+
+    mock_user_service.get_users_page.assert_called_once_with(limit=2, after_id=2)
+    assert response.status_code == 200
+    assert len(response.json()) == 2
+    assert response.headers["X-Next-After-Id"] == "4"
+
+
+def test_get_users_last_page(fastapi_app_client, mock_user_service):
+    mock_user_service.get_users_page.return_value = []
+
+    response = fastapi_app_client.get("/users/?limit=2&after_id=4")
+
+    assert response.status_code == 200
+    assert response.json() == []
+    assert "X-Next-After-Id" not in response.headers
+
+
+def test_get_users_page_limit_above_maximum(fastapi_app_client, mock_user_service):
+    response = fastapi_app_client.get("/users/?limit=100000")
+
+    assert response.status_code == 422
+
+
+def test_get_users_fast_response(fastapi_app_client, mock_user_service, monkeypatch):
+    monkeypatch.setattr(UserController, "fast_response", True)
+    mock_user_service.get_user_rows.return_value = [
+        {"id": 3, "first_name": "Iury", "last_name": "Rosal", "email": "rosal@gmail.com"},
+        {"id": 4, "first_name": "Davi", "last_name": None, "email": "davi@gmail.com"},
+    ]
+
+    response = fastapi_app_client.get("/users/?limit=2&after_id=2")
+
+    mock_user_service.get_user_rows.assert_called_once_with(limit=2, after_id=2, fields=None)
+    mock_user_service.get_users_page.assert_not_called()
+    assert response.status_code == 200
+    assert response.json()[1] == {"id": 4, "first_name": "Davi", "last_name": None, "email": "davi@gmail.com"}
+    assert response.headers["X-Next-After-Id"] == "4"
+
+
+def test_get_users_with_fields(fastapi_app_client, mock_user_service):
+    mock_user_service.get_user_rows.return_value = [{"id": 3, "email": "rosal@gmail.com"}, {"id": 4, "email": "davi@gmail.com"}]
+
+    response = fastapi_app_client.get("/users/?fields=email, id&limit=2")
+    stream_response = fastapi_app_client.get("/users/?fields=email&stream=true")
+
+    mock_user_service.get_user_rows.assert_called_once_with(limit=2, after_id=None, fields=["email", "id"])
+    mock_user_service.get_users_page.assert_not_called()
+    assert response.json() == [{"id": 3, "email": "rosal@gmail.com"}, {"id": 4, "email": "davi@gmail.com"}]
+    assert response.headers["X-Next-After-Id"] == "4"
+    assert stream_response.status_code == 400
+
+
+def test_get_user_with_fields(fastapi_app_client, mock_user_service):
+    mock_user_service.get_user_row.return_value = {"id": 1, "email": "rosal@gmail.com", "version": 2, "updated_at": None}
+
+    response = fastapi_app_client.get("/users/1?fields=email")
+
+    mock_user_service.get_user_row.assert_called_once_with(user_id=1, fields=["email"])
+    mock_user_service.get_user.assert_not_called()
+    assert response.json() == {"id": 1, "email": "rosal@gmail.com"}
+    assert response.headers["ETag"] == '"1-2"'
+
+
+def test_get_user_with_invalid_fields(fastapi_app_client, mock_user_service):
+    mock_user_service.get_user_row.return_value = ("InvalidFields", "Unknown fields: password. Allowed fields: id, first_name, last_name, email.")
+
+    response = fastapi_app_client.get("/users/1?fields=password")
+
+    assert response.status_code == 400
+    assert response.json()["code"] == "InvalidFields"
+
+
+def test_get_all_users_fast_response(fastapi_app_client, mock_user_service, monkeypatch):
+    monkeypatch.setattr(UserController, "fast_response", True)
+    mock_user_service.get_user_rows.return_value = ("UnexpectedError", "OperationalError: database is locked")
+
+    response = fastapi_app_client.get("/users/")
+
+    mock_user_service.get_user_rows.assert_called_once_with(limit=None, after_id=None, fields=None)
+    assert response.status_code == 500
+    assert response.json()["code"] == "UnexpectedError"
+
+
+def test_get_users_stream(fastapi_app_client, mock_user_service):
+    mock_user_service.stream_users.return_value = iter([
+        UserModel(id=1, first_name="Iury", last_name="Rosal", email="rosal@gmail.com"),
+        UserModel(id=2, first_name="Davi", last_name=None, email="davi@gmail.com"),
+    ])
+
+    response = fastapi_app_client.get("/users/?stream=true")
+
+    lines = response.text.splitlines()
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    assert len(lines) == 2
+    assert json.loads(lines[1]) == {"id": 2, "first_name": "Davi", "last_name": None, "email": "davi@gmail.com"}
+
+
+def test_get_user_with_async_service(fastapi_app_client, mock_user_service):
+    mock_user_service.get_user = AsyncMock(return_value=UserModel(id=1, first_name="Iury", last_name="Rosal", email="rosal@gmail.com"))
+
+    response = fastapi_app_client.get("/users/1")
+
+    mock_user_service.get_user.assert_awaited_once_with(user_id=1)
+    assert response.status_code == 200
+    assert response.json()["first_name"] == "Iury"
+
+
+def test_create_users_batch(fastapi_app_client, mock_user_service):
+    mock_user_service.create_users.return_value = [
+        UserModel(id=1, first_name="Iury", last_name="Rosal", email="rosal@gmail.com"),
+        UserModel(id=2, first_name="Davi", last_name=None, email="davi@gmail.com"),
+    ]
+    users_data = [{"first_name": "Iury", "last_name": "Rosal", "email": "rosal@gmail.com"},
+                  {"first_name": "Sem Email"},
+                  {"first_name": "Davi", "email": "davi@gmail.com"}]
+
+    response = fastapi_app_client.post("/users/batch", json=users_data)
+
+    mock_user_service.create_users.assert_called_once_with([
+        {"first_name": "Iury", "last_name": "Rosal", "email": "rosal@gmail.com"},
+        {"first_name": "Davi", "last_name": None, "email": "davi@gmail.com"},
+    ])
+    assert response.status_code == 200
+    assert response.json()["succeeded"] == 2
+    assert response.json()["failed"] == 1
+    items = response.json()["items"]
+    assert [item["status"] for item in items] == [201, 422, 201]
+    assert items[1]["code"] == "ValidationError"
+    assert items[2]["user"]["id"] == 2
+
+
+def test_update_users_batch(fastapi_app_client, mock_user_service):
+    mock_user_service.update_users.return_value = [
+        UserModel(id=1, first_name="Iury Atualizado", last_name="Rosal", email="rosal@gmail.com"),
+        ("UserDoesNotExist", "User with id 99 does not exist."),
+    ]
+
+    response = fastapi_app_client.patch("/users/batch", json=[{"id": 1, "first_name": "Iury Atualizado"},
+                                                             {"id": 99, "first_name": "Inexistente"}])
+
+    items = response.json()["items"]
+    assert response.status_code == 200
+    assert items[0]["user"]["first_name"] == "Iury Atualizado"
+    assert items[1]["status"] == 404
+    assert items[1]["code"] == "UserDoesNotExist"
+
+
+def test_delete_users_batch(fastapi_app_client, mock_user_service):
+    mock_user_service.delete_users.return_value = [
+        UserModel(id=1, first_name="Iury", last_name="Rosal", email="rosal@gmail.com"),
+    ]
+
+    response = fastapi_app_client.request("DELETE", "/users/batch", json=[1])
+
+    mock_user_service.delete_users.assert_called_once_with([1])
+    assert response.status_code == 200
+    assert response.json()["items"][0]["status"] == 200
+
+
+def test_batch_above_maximum_size(fastapi_app_client, mock_user_service):
+    response = fastapi_app_client.request("DELETE", "/users/batch", json=list(range(1001)))
+
+    assert response.status_code == 422
+    mock_user_service.delete_users.assert_not_called()
+
+
+def test_batch_service_failure(fastapi_app_client, mock_user_service):
+    mock_user_service.delete_users.return_value = ("UnexpectedError", "RuntimeError: database is locked")
+
+    response = fastapi_app_client.request("DELETE", "/users/batch", json=[1, 2])
+
+    assert response.status_code == 500
+    assert response.json()["code"] == "UnexpectedError"
+
+
+def test_search_users(fastapi_app_client, mock_user_service):
+    mock_user_service.search_users.return_value = [
+        UserModel(id=1, first_name="Iury", last_name="Rosal", email="rosal@gmail.com"),
+    ]
+
+    response = fastapi_app_client.get("/users/search?name_prefix=Iu&limit=10")
+
+    mock_user_service.search_users.assert_called_once_with(email=None, name_prefix="Iu", query=None, limit=10)
+    assert response.status_code == 200
+    assert response.json()[0]["first_name"] == "Iury"
+
+
+def test_search_users_invalid_criteria(fastapi_app_client, mock_user_service):
+    mock_user_service.search_users.return_value = ("InvalidSearch", "Exactly one search criteria must be informed: email, name_prefix or q.")
+
+    response = fastapi_app_client.get("/users/search")
+
+    assert response.status_code == 400
+    assert response.json()["code"] == "InvalidSearch"
+
+
+def test_get_user_etag_headers(fastapi_app_client, mock_user_service):
+    mock_user_service.get_user.return_value = UserModel(id=1, first_name="Iury", email="rosal@gmail.com",
+                                                        version=3, updated_at=datetime(2024, 5, 1, 12, 30))
+
+    response = fastapi_app_client.get("/users/1")
+
+    assert response.status_code == 200
+    assert response.headers["ETag"] == '"1-3"'
+    assert response.headers["Last-Modified"] == "Wed, 01 May 2024 12:30:00 GMT"
+    mock_user_service.get_user_version.assert_not_called()
+
+
+def test_get_user_not_modified(fastapi_app_client, mock_user_service):
+    mock_user_service.get_user_version.return_value = (3, datetime(2024, 5, 1, 12, 30))
+
+    response = fastapi_app_client.get("/users/1", headers={"If-None-Match": 'W/"1-2", "1-3"'})
+
+    assert response.status_code == 304
+    assert response.headers["ETag"] == '"1-3"'
+    assert response.content == b""
+    mock_user_service.get_user.assert_not_called()
+
+
+def test_get_user_modified_since_etag(fastapi_app_client, mock_user_service):
+    mock_user_service.get_user_version.return_value = (4, None)
+    mock_user_service.get_user.return_value = UserModel(id=1, first_name="Iury", email="rosal@gmail.com", version=4)
+
+    response = fastapi_app_client.get("/users/1", headers={"If-None-Match": '"1-3"'})
+
+    assert response.status_code == 200
+    assert response.headers["ETag"] == '"1-4"'
+    assert "Last-Modified" not in response.headers
+
+
+def test_get_users_not_modified(fastapi_app_client, mock_user_service):
+    mock_user_service.get_collection_version.return_value = (8, datetime(2024, 5, 1, 12, 30))
+    mock_user_service.get_all_users.return_value = [UserModel(id=1, first_name="Iury", email="rosal@gmail.com")]
+
+    modified = fastapi_app_client.get("/users/", headers={"If-None-Match": '"users-7"'})
+    not_modified = fastapi_app_client.get("/users/", headers={"If-None-Match": '"users-8"'})
+
+    assert modified.status_code == 200
+    assert modified.headers["ETag"] == '"users-8"'
+    assert not_modified.status_code == 304
+    assert mock_user_service.get_all_users.call_count == 1
+
+
+def test_update_user_if_match(fastapi_app_client, mock_user_service):
+    mock_user_service.update_user.return_value = UserModel(id=1, first_name="Davi", email="rosal@gmail.com", version=4)
+
+    response = fastapi_app_client.put("/users/1", json={"first_name": "Davi"}, headers={"If-Match": '"1-3"'})
+
+    mock_user_service.update_user.assert_called_once_with(1, {"first_name": "Davi", "last_name": None, "email": None}, expected_version=3)
+    assert response.status_code == 200
+    assert response.headers["ETag"] == '"1-4"'
+
+
+def test_update_user_precondition_failed(fastapi_app_client, mock_user_service):
+    mock_user_service.update_user.return_value = ("VersionConflict", "User with id 1 has version 4, expected 3.")
+
+    conflict = fastapi_app_client.put("/users/1", json={"first_name": "Davi"}, headers={"If-Match": '"1-3"'})
+    other_user = fastapi_app_client.put("/users/1", json={"first_name": "Davi"}, headers={"If-Match": '"2-3"'})
+
+    assert conflict.status_code == 412
+    assert conflict.json()["code"] == "VersionConflict"
+    assert other_user.status_code == 412
+    assert other_user.json()["code"] == "PreconditionFailed"
+    assert mock_user_service.update_user.call_count == 1
+
+
+def build_change(sequence, operation="update"):
+    return UserChangeModel(sequence=sequence, user_id=1, operation=operation, version=sequence, first_name="Iury",
+                           email="rosal@gmail.com", changed_at=datetime(2024, 5, 1, 12, 30))
+
+
+def test_get_user_changes(fastapi_app_client, mock_user_service):
+    mock_user_service.get_changes.return_value = [build_change(4), build_change(5)]
+
+    response = fastapi_app_client.get("/users/changes?since=3&limit=2")
+
+    mock_user_service.get_changes.assert_called_once_with(since=3, limit=2)
+    assert response.status_code == 200
+    assert response.json()["next_since"] == 5
+    assert response.json()["has_more"] is True
+    assert response.json()["changes"][0] == {"sequence": 4, "user_id": 1, "operation": "update", "version": 4, "first_name": "Iury",
+                                             "last_name": None, "email": "rosal@gmail.com", "changed_at": "2024-05-01T12:30:00"}
+
+
+def test_get_user_changes_long_poll(fastapi_app_client, mock_user_service, monkeypatch):
+    monkeypatch.setattr(UserController, "changes_poll_interval", 0.01)
+    mock_user_service.get_changes.side_effect = [[], [], [build_change(4)]]
+
+    response = fastapi_app_client.get("/users/changes?since=3&wait=5")
+
+    assert response.status_code == 200
+    assert [change["sequence"] for change in response.json()["changes"]] == [4]
+    assert response.json()["has_more"] is False
+    assert mock_user_service.get_changes.call_count == 3
+
+
+def test_get_user_changes_empty_after_wait(fastapi_app_client, mock_user_service, monkeypatch):
+    monkeypatch.setattr(UserController, "changes_poll_interval", 0.01)
+    mock_user_service.get_changes.return_value = []
+
+    response = fastapi_app_client.get("/users/changes?since=3&wait=0.05")
+
+    assert response.status_code == 200
+    assert response.json() == {"changes": [], "next_since": 3, "has_more": False}
+
+
+def test_get_user_changes_compacted(fastapi_app_client, mock_user_service):
+    mock_user_service.get_changes.return_value = ("ChangesCompacted", "Changes up to sequence 5 were compacted. Resynchronize from a full snapshot.")
+
+    response = fastapi_app_client.get("/users/changes?since=1")
+
+    assert response.status_code == 410
+    assert response.json()["code"] == "ChangesCompacted"
+
+
+def test_get_user_changes_server_sent_events(fastapi_app_client, mock_user_service):
+    changes = iter([[build_change(8)], [build_change(9, "delete")]])
+    mock_user_service.get_changes.side_effect = lambda since, limit: next(changes, [])
+
+    response = fastapi_app_client.get("/users/changes?stream=true&wait=0.05&limit=1", headers={"Last-Event-ID": "7"})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    events = [event for event in response.text.split("\n\n") if event.startswith("id:")]
+    assert [event.splitlines()[0] for event in events] == ["id: 8", "id: 9"]
+    assert json.loads(events[1].splitlines()[2].removeprefix("data: "))["operation"] == "delete"
+    assert mock_user_service.get_changes.call_args_list[0].kwargs == {"since": 7, "limit": 1}
+    assert mock_user_service.get_changes.call_args_list[1].kwargs == {"since": 8, "limit": 1}
+
+
+def test_get_user_changes_head(fastapi_app_client, mock_user_service):
+    mock_user_service.get_last_change_sequence.return_value = 42
+
+    response = fastapi_app_client.get("/users/changes/head")
+
+    assert response.status_code == 200
+    assert response.json() == {"last_sequence": 42}
+
+
+def test_user_export_lifecycle(fastapi_app_client, mock_user_service, tmp_path):
+    from controller.v1.user_controller import get_user_export_service
+    from service.user_export_service import UserExportService
+    mock_user_service.stream_users.side_effect = lambda chunk_size: iter([UserModel(id=index, first_name=f"User {index}", email=f"user{index}@gmail.com", version=1)
+                                                                          for index in range(1, 101)])
+    export_service = UserExportService(mock_user_service, str(tmp_path), chunk_size=10)
+    fastapi_app_client.app.dependency_overrides[get_user_export_service] = lambda: export_service
+
+    created = fastapi_app_client.post("/users/exports", json={"format": "csv"})
+    export_service.wait(created.json()["id"], timeout=10)
+    status = fastapi_app_client.get(created.headers["location"])
+    content = fastapi_app_client.get(status.json()["file_url"])
+    partial = fastapi_app_client.get(status.json()["file_url"], headers={"Range": "bytes=0-24"})
+
+    assert created.status_code == 202
+    assert created.json()["status"] == "pending"
+    assert status.status_code == 200
+    assert status.json()["status"] == "completed"
+    assert status.json()["rows_written"] == 100
+    assert content.status_code == 200
+    assert content.headers["content-type"].startswith("text/csv")
+    assert content.text.splitlines()[1].startswith("1,User 1,,user1@gmail.com,1")
+    assert partial.status_code == 206
+    assert partial.headers["content-range"] == f"bytes 0-24/{len(content.content)}"
+    assert partial.content == content.content[:25]
+
+
+def test_user_export_download_is_not_compressed(fastapi_app_client, mock_user_service, tmp_path):
+    from controller.v1.user_controller import get_user_export_service
+    from infra.compression import CompressionMiddleware
+    from service.user_export_service import UserExportService
+    mock_user_service.stream_users.side_effect = lambda chunk_size: iter([UserModel(id=index, first_name=f"User {index}", email=f"user{index}@gmail.com", version=1)
+                                                                          for index in range(1, 1001)])
+    export_service = UserExportService(mock_user_service, str(tmp_path), chunk_size=100)
+    fastapi_app_client.app.dependency_overrides[get_user_export_service] = lambda: export_service
+    fastapi_app_client.app.add_middleware(CompressionMiddleware)
+    export_id = fastapi_app_client.post("/users/exports", json={"format": "csv"}).json()["id"]
+    export_service.wait(export_id, timeout=10)
+
+    content = fastapi_app_client.get(f"/users/exports/{export_id}/file", headers={"Accept-Encoding": "gzip"})
+    resumed = fastapi_app_client.get(f"/users/exports/{export_id}/file", headers={"Accept-Encoding": "gzip", "Range": "bytes=1000-"})
+
+    assert "content-encoding" not in content.headers
+    assert content.headers["cache-control"] == "no-transform"
+    assert not content.headers["etag"].startswith("W/")
+    assert content.headers["accept-ranges"] == "bytes"
+    assert resumed.status_code == 206
+    assert content.content[:1000] + resumed.content == content.content
+
+
+def test_user_export_errors(fastapi_app_client, mock_user_service):
+    from controller.v1.user_controller import get_user_export_service
+    export_service = MagicMock()
+    export_service.get_export.return_value = ("ExportDoesNotExist", "Export with id 1 does not exist.")
+    export_service.get_export_file.return_value = ("ExportNotReady", "Export with id 1 is running.")
+    export_service.create_export.return_value = ("ExportFormatUnavailable", "Export format parquet requires the pyarrow package.")
+    fastapi_app_client.app.dependency_overrides[get_user_export_service] = lambda: export_service
+
+    assert fastapi_app_client.get("/users/exports/1").status_code == 404
+    assert fastapi_app_client.get("/users/exports/1/file").status_code == 409
+    assert fastapi_app_client.post("/users/exports", json={"format": "parquet"}).status_code == 501
+    assert fastapi_app_client.post("/users/exports", json={"format": "xlsx"}).status_code == 422
+
+
+def test_import_users(fastapi_app_client, mock_user_service, tmp_path):
+    from controller.v1.user_controller import get_user_import_service
+    from service.user_import_service import UserImportService
+    mock_user_service.create_users.side_effect = lambda users: [UserModel(id=index, **user) for index, user in enumerate(users, start=1)]
+    fastapi_app_client.app.dependency_overrides[get_user_import_service] = lambda: UserImportService(mock_user_service, str(tmp_path))
+
+    def upload():
+        yield b"first_name,last_name,email\nIury,Rosal,rosal@gmail.com\n"
+        yield b"Davi,Oliveira,davi@\n"
+
+    response = fastapi_app_client.post("/users/import", content=upload(), headers={"Content-Type": "text/csv"})
+    status = fastapi_app_client.get(response.headers["location"])
+    errors = fastapi_app_client.get(response.json()["errors_url"])
+    unsupported = fastapi_app_client.post("/users/import", content=b"<users/>", headers={"Content-Type": "application/xml"})
+
+    assert response.status_code == 200
+    assert response.json()["status"] == "completed"
+    assert (response.json()["rows_imported"], response.json()["rows_failed"]) == (1, 1)
+    assert status.json() == response.json()
+    assert [json.loads(line)["row"] for line in errors.text.splitlines()] == [2]
+    assert unsupported.status_code == 415
+    assert mock_user_service.create_users.call_args.args[0] == [{"first_name": "Iury", "last_name": "Rosal", "email": "rosal@gmail.com"}]
+
+
+def test_import_users_failure_keeps_checkpoint(fastapi_app_client, mock_user_service, tmp_path):
+    from controller.v1.user_controller import get_user_import_service
+    from service.user_import_service import UserImportService
+    mock_user_service.create_users.return_value = ("UnexpectedError", "OperationalError: disk I/O error")
+    fastapi_app_client.app.dependency_overrides[get_user_import_service] = lambda: UserImportService(mock_user_service, str(tmp_path))
+
+    response = fastapi_app_client.post("/users/import", content=b'{"first_name": "Iury", "email": "rosal@gmail.com"}\n',
+                                       headers={"Content-Type": "application/x-ndjson"})
+
+    assert response.status_code == 500
+    assert response.json()["status"] == "failed"
+    assert response.json()["error_code"] == "UnexpectedError"
+    assert response.json()["rows_processed"] == 0
+    assert fastapi_app_client.post(f"/users/import?import_id={response.json()['id']}", content=b"",
+                                   headers={"Content-Type": "text/csv"}).status_code == 415
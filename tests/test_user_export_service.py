@@ -0,0 +1,112 @@
+import asyncio
+import csv
+import os
+import pytest
+from unittest.mock import MagicMock
+from tests.config.fixtures import async_user_repo, postgres_dsn, sqlite_file_user_repo
+
+from models.user_model import UserModel
+from service.async_user_service import AsyncUserService
+from service.user_export_service import UserExportService, AsyncUserExportService, UserExportJob, EXPORT_COLUMNS, pyarrow
+
+
+def read_csv(path):
+    with open(path, encoding="utf-8", newline="") as file:
+        return list(csv.reader(file))
+
+
+def test_export_csv(sqlite_file_user_repo, tmp_path):
+    repository = sqlite_file_user_repo
+    repository.bulk_create([{"first_name": f"User {index}", "last_name": "Rosal", "email": f"user{index}@gmail.com"} for index in range(25)])
+    export_service = UserExportService(MagicMock(stream_users=lambda chunk_size: repository.stream_all(chunk_size=chunk_size)[0]),
+                                       str(tmp_path / "exports"), chunk_size=10)
+
+    job = export_service.create_export("csv")
+    export_service.wait(job.id, timeout=10)
+    job = export_service.get_export(job.id)
+
+    assert job.status == "completed"
+    assert job.rows_written == 25
+    assert job.bytes_written == os.path.getsize(export_service.store.file_path(job))
+    rows = read_csv(export_service.store.file_path(job))
+    assert rows[0] == list(EXPORT_COLUMNS)
+    assert [row[:4] for row in rows[1:]] == [[str(index + 1), f"User {index}", "Rosal", f"user{index}@gmail.com"] for index in range(25)]
+    assert export_service.get_export_file(job.id).id == job.id
+
+def test_export_reads_a_consistent_snapshot(sqlite_file_user_repo, tmp_path):
+    repository = sqlite_file_user_repo
+    repository.bulk_create([{"first_name": f"User {index}", "email": f"user{index}@gmail.com"} for index in range(30)])
+
+    def stream_users(chunk_size):
+        users = repository.stream_all(chunk_size=chunk_size)[0]
+        yield next(users)
+        # Escritas concluídas durante a exportação não aparecem no arquivo: a consulta única lê o snapshot do início.
+        repository.create(first_name="Late", email="late@gmail.com")
+        repository.delete_by_id(30)
+        yield from users
+
+    export_service = UserExportService(MagicMock(stream_users=stream_users), str(tmp_path / "exports"), chunk_size=7)
+    job = export_service.create_export("csv")
+    export_service.wait(job.id, timeout=10)
+
+    rows = read_csv(export_service.store.file_path(export_service.get_export(job.id)))
+    assert [int(row[0]) for row in rows[1:]] == list(range(1, 31))
+
+def test_failed_export_discards_partial_file(tmp_path):
+    def stream_users(chunk_size):
+        yield UserModel(id=1, first_name="Iury", email="rosal@gmail.com", version=1)
+        raise RuntimeError("connection lost")
+
+    export_service = UserExportService(MagicMock(stream_users=stream_users), str(tmp_path), chunk_size=1)
+    job = export_service.create_export("csv")
+    export_service.wait(job.id, timeout=10)
+    job = export_service.get_export(job.id)
+
+    assert job.status == "failed"
+    assert job.error_code == "UnexpectedError"
+    assert "connection lost" in job.error_msg
+    assert not os.path.exists(export_service.store.partial_path(job))
+    assert export_service.get_export_file(job.id) == ("ExportNotReady", f"Export with id {job.id} is failed.")
+
+def test_export_errors(tmp_path):
+    export_service = UserExportService(MagicMock(), str(tmp_path))
+
+    assert export_service.create_export("xlsx")[0] == "InvalidExportFormat"
+    assert export_service.get_export("0" * 32) == ("ExportDoesNotExist", f"Export with id {'0' * 32} does not exist.")
+    assert export_service.get_export("../users")[0] == "ExportDoesNotExist"
+    if pyarrow is None:
+        assert export_service.create_export("parquet") == ("ExportFormatUnavailable", "Export format parquet requires the pyarrow package.")
+
+def test_export_parquet(tmp_path):
+    pytest.importorskip("pyarrow")
+    import pyarrow.parquet
+    users = [UserModel(id=index, first_name=f"User {index}", email=f"user{index}@gmail.com", version=1) for index in range(1, 6)]
+    export_service = UserExportService(MagicMock(stream_users=lambda chunk_size: iter(users)), str(tmp_path), chunk_size=2)
+
+    job = export_service.create_export("parquet")
+    export_service.wait(job.id, timeout=10)
+    job = export_service.get_export(job.id)
+
+    table = pyarrow.parquet.read_table(export_service.store.file_path(job))
+    assert job.status == "completed"
+    assert table.column("id").to_pylist() == [1, 2, 3, 4, 5]
+    assert pyarrow.parquet.ParquetFile(export_service.store.file_path(job)).num_row_groups == 3
+
+def test_async_export_csv(async_user_repo, tmp_path):
+    async def scenario():
+        await async_user_repo.db_client.create_all()
+        await async_user_repo.bulk_create([{"first_name": f"User {index}", "email": f"user{index}@gmail.com"} for index in range(12)])
+        export_service = AsyncUserExportService(AsyncUserService(async_user_repo, single_flight=False), str(tmp_path), chunk_size=5)
+        try:
+            job = await export_service.create_export("csv")
+            await export_service.wait(job.id)
+            return await export_service.get_export(job.id), export_service.store
+        finally:
+            await async_user_repo.db_client._engine.dispose()
+
+    job, store = asyncio.run(scenario())
+
+    assert isinstance(job, UserExportJob)
+    assert job.status == "completed"
+    assert job.rows_written == 12
+    assert [row[1] for row in read_csv(store.file_path(job))[1:]] == [f"User {index}" for index in range(12)]
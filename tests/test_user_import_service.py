@@ -0,0 +1,154 @@
+import asyncio
+import json
+import os
+import time
+from unittest.mock import MagicMock
+from tests.config.fixtures import async_user_repo, postgres_dsn, sqlite_file_user_repo
+
+from models.user_model import UserModel
+from service.async_user_service import AsyncUserService
+from service.user_import_service import UserImportService, UserImportJob
+
+
+CSV_FILE = ("first_name,last_name,email\n"
+            "Iury,Rosal,rosal@gmail.com\n"
+            'Davi,"Oliveira\nSegunda Linha",davi@gmail.com\n'
+            "Ana,,not-an-email\n"
+            "Bia,Souza\n"
+            "Caio,Lima,caio@gmail.com\n").encode("utf-8")
+
+
+async def stream(content: bytes, size: int = 7):
+    """Corpo da requisição em blocos pequenos, que cortam linhas (e caracteres UTF-8) ao meio."""
+    for start in range(0, len(content), size):
+        yield content[start:start + size]
+
+
+def read_errors(import_service, job):
+    with open(import_service.store.errors_path(job), encoding="utf-8") as file:
+        return [json.loads(line) for line in file]
+
+
+def run_import(import_service, content: bytes, import_format: str, import_id: str = None):
+    return asyncio.run(import_service.import_users(stream(content), import_format, import_id=import_id))
+
+
+def test_import_csv(sqlite_file_user_repo, tmp_path):
+    service = MagicMock(create_users=lambda users: [user for user, _, _ in sqlite_file_user_repo.bulk_create(users)[0]])
+    import_service = UserImportService(service, str(tmp_path), chunk_size=2)
+
+    job = run_import(import_service, CSV_FILE, "csv")
+
+    users, _, _ = sqlite_file_user_repo.select_all()
+    assert job.status == "completed"
+    assert (job.rows_processed, job.rows_imported, job.rows_failed) == (5, 3, 2)
+    assert [(user.first_name, user.last_name) for user in users] == [("Iury", "Rosal"), ("Davi", "Oliveira\nSegunda Linha"), ("Caio", "Lima")]
+    errors = read_errors(import_service, job)
+    assert [(error["row"], error["code"]) for error in errors] == [(3, "ValidationError"), (4, "InvalidRow")]
+    assert errors[0]["msg"].startswith("email: value is not a valid email address")
+    assert asyncio.run(import_service.get_import(job.id)).to_dict() == job.to_dict()
+
+def test_import_resumes_after_failure(sqlite_file_user_repo, tmp_path):
+    content = "".join(json.dumps({"first_name": f"User {index}", "email": f"user{index}@gmail.com"}) + "\n" for index in range(10)).encode("utf-8")
+    calls = []
+
+    def create_users(users):
+        calls.append(len(users))
+        if len(calls) == 3:
+            return ("UnexpectedError", "OperationalError: database is locked")
+        return [user for user, _, _ in sqlite_file_user_repo.bulk_create(users)[0]]
+
+    import_service = UserImportService(MagicMock(create_users=create_users), str(tmp_path), chunk_size=3)
+    failed = run_import(import_service, content, "ndjson")
+    resumed = run_import(import_service, content, "ndjson", import_id=failed.id)
+
+    users, _, _ = sqlite_file_user_repo.select_all()
+    assert failed.status == "failed"
+    assert failed.error_code == "UnexpectedError"
+    assert failed.rows_processed == 6
+    assert resumed.id == failed.id
+    assert resumed.status == "completed"
+    assert (resumed.rows_processed, resumed.rows_imported, resumed.rows_failed) == (10, 10, 0)
+    assert [user.first_name for user in users] == [f"User {index}" for index in range(10)]
+
+def test_concurrent_resumes_take_the_import_lock(sqlite_file_user_repo, tmp_path):
+    content = "".join(json.dumps({"first_name": f"User {index}", "email": f"user{index}@gmail.com"}) + "\n" for index in range(6)).encode("utf-8")
+    calls = []
+
+    def create_users(users):
+        calls.append(len(users))
+        if len(calls) == 1:
+            return ("UnexpectedError", "OperationalError: database is locked")
+        return [user for user, _, _ in sqlite_file_user_repo.bulk_create(users)[0]]
+
+    import_service = UserImportService(MagicMock(create_users=create_users), str(tmp_path), chunk_size=2, running_timeout=60)
+    failed = run_import(import_service, content, "ndjson")
+    lock_path = import_service.store.lock_path(failed.id)
+    os.close(os.open(lock_path, os.O_CREAT | os.O_WRONLY))
+    while_locked = run_import(import_service, content, "ndjson", import_id=failed.id)
+    os.utime(lock_path, (time.time() - 120, time.time() - 120))
+    upload_paused = asyncio.Event()
+
+    async def paused_stream():
+        await upload_paused.wait()
+        async for block in stream(content):
+            yield block
+
+    async def scenario():
+        first = asyncio.create_task(import_service.import_users(paused_stream(), "ndjson", import_id=failed.id))
+        await asyncio.sleep(0.1)
+        second = await import_service.import_users(stream(content), "ndjson", import_id=failed.id)
+        upload_paused.set()
+        return await first, second
+
+    resumed, rejected = asyncio.run(scenario())
+
+    users, _, _ = sqlite_file_user_repo.select_all()
+    assert while_locked == ("ImportInProgress", f"Import with id {failed.id} is running.")
+    assert rejected == ("ImportInProgress", f"Import with id {failed.id} is running.")
+    assert (resumed.status, resumed.rows_imported) == ("completed", 6)
+    assert [user.first_name for user in users] == [f"User {index}" for index in range(6)]
+    assert not os.path.exists(lock_path)
+
+def test_import_validates_in_process_pool(tmp_path):
+    content = b'{"first_name": "Iury", "email": "rosal@gmail.com"}\n[1, 2]\n{"first_name": "Davi", "email": "davi@"}\n'
+    service = MagicMock(create_users=lambda users: [UserModel(id=index, **user) for index, user in enumerate(users, start=1)])
+    import_service = UserImportService(service, str(tmp_path), validation_workers=1)
+    try:
+        job = run_import(import_service, content, "ndjson")
+    finally:
+        import_service.close()
+
+    assert (job.status, job.rows_imported, job.rows_failed) == ("completed", 1, 2)
+    assert [(error["row"], error["code"]) for error in read_errors(import_service, job)] == [(2, "InvalidRow"), (3, "ValidationError")]
+
+def test_import_errors(tmp_path):
+    import_service = UserImportService(MagicMock(), str(tmp_path), max_row_length=100)
+
+    assert run_import(import_service, CSV_FILE, "xlsx")[0] == "InvalidImportFormat"
+    assert run_import(import_service, CSV_FILE, "csv", import_id="0" * 32)[0] == "ImportDoesNotExist"
+    missing_header = run_import(import_service, b"name,email\nIury,rosal@gmail.com\n", "csv")
+    too_large = run_import(import_service, b"first_name,email\n" + b"x" * 200, "csv")
+    invalid_encoding = run_import(import_service, b"first_name,email\n\xff\xfe,rosal@gmail.com\n", "csv")
+    assert (missing_header.status, missing_header.error_code) == ("failed", "InvalidImportFile")
+    assert too_large.error_code == "RowTooLarge"
+    assert invalid_encoding.error_code == "InvalidEncoding"
+
+def test_async_import_ndjson(async_user_repo, tmp_path):
+    content = b'{"first_name": "Iury", "last_name": "Rosal", "email": "rosal@gmail.com"}\n\n{"first_name": "Davi", "email": "davi@gmail.com"}\n'
+
+    async def scenario():
+        await async_user_repo.db_client.create_all()
+        import_service = UserImportService(AsyncUserService(async_user_repo, single_flight=False), str(tmp_path))
+        try:
+            job = await import_service.import_users(stream(content), "ndjson")
+            users, _, _ = await async_user_repo.select_all()
+            return job, users
+        finally:
+            await async_user_repo.db_client._engine.dispose()
+
+    job, users = asyncio.run(scenario())
+
+    assert isinstance(job, UserImportJob)
+    assert (job.status, job.rows_imported) == ("completed", 2)
+    assert [user.email for user in users] == ["rosal@gmail.com", "davi@gmail.com"]
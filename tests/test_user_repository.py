@@ -1,5 +1,9 @@
-from tests.config.fixtures import user_repo
-from models.user_model import UserModel
+from tests.config.fixtures import user_repo, postgres_dsn, sqlite_file_user_repo
+from tests.config.test_postgres_user_repository import TestPostgresUserRepository
+from concurrent.futures import ThreadPoolExecutor
+import threading
+from datetime import timedelta
+from models.user_model import UserModel, create_user_full_text_index, utc_now
 import pytest
 
 
@@ -115,4 +119,281 @@ def test_delete_user_not_exists(user_repo):
 
     assert deleted_user is None
     assert err_code == "UserDoesNotExist"
-    assert err_msg == f"User with id {user_id} does not exist."
\ No newline at end of file
+    assert err_msg == f"User with id {user_id} does not exist."
+
+
+def test_select_page(user_repo):
+    for _ in range(5):
+        user_repo.create(first_name="Iury", last_name="Rosal", email="rosal@gmail.com")
+
+    first_page, err_code, err_msg = user_repo.select_page(limit=2)
+    second_page, _, _ = user_repo.select_page(limit=2, after_id=first_page[-1].id)
+    last_page, _, _ = user_repo.select_page(limit=2, after_id=5)
+
+    assert [user.id for user in first_page] == [1, 2]
+    assert [user.id for user in second_page] == [3, 4]
+    assert last_page == []
+    assert err_code is None
+    assert err_msg is None
+
+def test_select_rows(user_repo):
+    for _ in range(3):
+        user_repo.create(first_name="Iury", last_name="Rosal", email="rosal@gmail.com")
+
+    rows, err_code, err_msg = user_repo.select_rows()
+    page, _, _ = user_repo.select_rows(limit=1, after_id=1)
+
+    assert rows[0] == {"id": 1, "first_name": "Iury", "last_name": "Rosal", "email": "rosal@gmail.com"}
+    assert [row["id"] for row in rows] == [1, 2, 3]
+    assert [row["id"] for row in page] == [2]
+    assert err_code is None
+    assert err_msg is None
+
+def test_select_rows_and_row_by_id_with_fields(user_repo):
+    for _ in range(3):
+        user_repo.create(first_name="Iury", last_name="Rosal", email="rosal@gmail.com")
+    user_repo.update(2, {"last_name": "Lima"})
+
+    rows, err_code, _ = user_repo.select_rows(limit=2, after_id=1, fields=["id", "email"])
+    row, _, _ = user_repo.select_row_by_id(2, fields=["id", "last_name"])
+    _, missing_err_code, _ = user_repo.select_row_by_id(99, fields=["id"])
+
+    assert err_code is None
+    assert rows == [{"id": 2, "email": "rosal@gmail.com"}, {"id": 3, "email": "rosal@gmail.com"}]
+    assert {key: row[key] for key in ("id", "last_name", "version")} == {"id": 2, "last_name": "Lima", "version": 2}
+    assert set(row) == {"id", "last_name", "version", "updated_at"}
+    assert missing_err_code == "UserDoesNotExist"
+
+def test_stream_all(user_repo):
+    for _ in range(5):
+        user_repo.create(first_name="Iury", last_name="Rosal", email="rosal@gmail.com")
+
+    users, err_code, err_msg = user_repo.stream_all(after_id=1, chunk_size=2)
+
+    assert [user.id for user in users] == [2, 3, 4, 5]
+    assert err_code is None
+    assert err_msg is None
+
+def test_bulk_create(user_repo):
+    users_data = [{"first_name": "Iury", "last_name": "Rosal", "email": "rosal@gmail.com"},
+                  {"first_name": "Davi", "email": "davi@gmail.com"}]
+
+    results, err_code, err_msg = user_repo.bulk_create(users_data)
+
+    assert [user.id for user, _, _ in results] == [1, 2]
+    assert results[1][0].last_name is None
+    assert all(item_err_code is None for _, item_err_code, _ in results)
+    assert len(user_repo.select_all()[0]) == 2
+    assert err_code is None
+    assert err_msg is None
+
+def test_bulk_update(user_repo):
+    user_repo.bulk_create([{"first_name": "Iury", "last_name": "Rosal", "email": "rosal@gmail.com"},
+                           {"first_name": "Davi", "last_name": "Oliveira", "email": "davi@gmail.com"}])
+
+    results, err_code, _ = user_repo.bulk_update([{"id": 1, "first_name": "Iury Atualizado", "last_name": None},
+                                                  {"id": 99, "first_name": "Inexistente"},
+                                                  {"id": 2, "email": "davi@outlook.com"}])
+
+    assert results[0][0].first_name == "Iury Atualizado"
+    assert results[0][0].last_name == "Rosal"
+    assert results[1] == (None, "UserDoesNotExist", "User with id 99 does not exist.")
+    assert results[2][0].email == "davi@outlook.com"
+    assert user_repo.select_by_id(2)[0].email == "davi@outlook.com"
+    assert err_code is None
+
+def test_bulk_delete(user_repo):
+    user_repo.bulk_create([{"first_name": "Iury", "email": "rosal@gmail.com"},
+                           {"first_name": "Davi", "email": "davi@gmail.com"}])
+
+    results, err_code, _ = user_repo.bulk_delete([2, 99])
+
+    assert results[0][0].id == 2
+    assert results[1] == (None, "UserDoesNotExist", "User with id 99 does not exist.")
+    assert [user.id for user in user_repo.select_all()[0]] == [1]
+    assert err_code is None
+
+def test_select_by_email(user_repo):
+    user_repo.bulk_create([{"first_name": "Iury", "email": "rosal@gmail.com"},
+                           {"first_name": "Davi", "email": "davi@gmail.com"},
+                           {"first_name": "Iury", "last_name": "Rosal", "email": "rosal@gmail.com"}])
+
+    users, err_code, err_msg = user_repo.select_by_email("rosal@gmail.com")
+    missing_users, _, _ = user_repo.select_by_email("maria@gmail.com")
+
+    assert [user.id for user in users] == [1, 3]
+    assert missing_users == []
+    assert err_code is None
+    assert err_msg is None
+
+def test_select_by_name_prefix(user_repo):
+    user_repo.bulk_create([{"first_name": "Iury", "email": "rosal@gmail.com"},
+                           {"first_name": "ivan", "email": "ivan@gmail.com"},
+                           {"first_name": "Davi", "email": "davi@gmail.com"}])
+
+    users, err_code, _ = user_repo.select_by_name_prefix("I")
+    single_user, _, _ = user_repo.select_by_name_prefix("iur")
+
+    assert [user.first_name for user in users] == ["Iury", "ivan"]
+    assert [user.first_name for user in single_user] == ["Iury"]
+    assert err_code is None
+
+def test_select_by_name_prefix_accented_names(user_repo):
+    if user_repo.db_client._engine.dialect.name == "postgresql":
+        with user_repo.db_client._engine.connect() as connection:
+            if connection.exec_driver_sql("SELECT lower('Á')").scalar() != "á":
+                pytest.skip("PostgreSQL database without a UTF-8 LC_CTYPE: lower() converts only ASCII letters")
+    user_repo.bulk_create([{"first_name": "Ágata", "email": "agata@gmail.com"},
+                           {"first_name": "Érica", "email": "erica@gmail.com"},
+                           {"first_name": "Agnes", "email": "agnes@gmail.com"}])
+
+    results = {prefix: [user.first_name for user in user_repo.select_by_name_prefix(prefix)[0]] for prefix in ("Á", "á", "Ága", "É", "a")}
+
+    assert results == {"Á": ["Ágata"], "á": ["Ágata"], "Ága": ["Ágata"], "É": ["Érica"], "a": ["Agnes"]}
+
+def test_select_by_name_prefix_last_unicode_character(user_repo):
+    user_repo.bulk_create([{"first_name": "\U0010ffff", "email": "last@gmail.com"},
+                           {"first_name": "z\U0010ffffy", "email": "z@gmail.com"},
+                           {"first_name": "zz", "email": "zz@gmail.com"}])
+
+    users, err_code, _ = user_repo.select_by_name_prefix("\U0010ffff")
+    z_users, _, _ = user_repo.select_by_name_prefix("z\U0010ffff")
+
+    assert [user.first_name for user in users] == ["\U0010ffff"]
+    assert [user.first_name for user in z_users] == ["z\U0010ffffy"]
+    assert err_code is None
+
+def test_search_full_text(user_repo):
+    create_user_full_text_index(user_repo.db_client._engine)
+    user_repo.bulk_create([{"first_name": "Iury", "last_name": "Rosal", "email": "rosal@gmail.com"},
+                           {"first_name": "Davi", "last_name": "Oliveira", "email": "davi@gmail.com"}])
+
+    users, err_code, _ = user_repo.search_full_text("ros")
+    user_repo.update(1, {"last_name": "Souza"})
+    users_after_update, _, _ = user_repo.search_full_text("ros")
+    user_repo.delete_by_id(2)
+    users_after_delete, _, _ = user_repo.search_full_text('oliv "')
+
+    assert [user.id for user in users] == [1]
+    assert users_after_update == []
+    assert users_after_delete == []
+    assert err_code is None
+
+def test_search_full_text_unavailable(user_repo):
+    users, err_code, _ = user_repo.search_full_text("ros")
+
+    assert users is None
+    assert err_code == "FullTextSearchUnavailable"
+
+def test_update_increments_version(user_repo):
+    user, _, _ = user_repo.create(first_name="Iury", last_name="Rosal", email="rosal@gmail.com")
+
+    updated_user, err_code, _ = user_repo.update(user.id, {"first_name": "Davi"})
+    version, _, _ = user_repo.select_version(user.id)
+
+    assert user.version == 1
+    assert err_code is None
+    assert updated_user.version == 2
+    assert updated_user.updated_at is not None
+    assert version == (2, updated_user.updated_at)
+
+def test_update_with_expected_version(user_repo):
+    user, _, _ = user_repo.create(first_name="Iury", last_name="Rosal", email="rosal@gmail.com")
+
+    updated_user, _, _ = user_repo.update(user.id, {"first_name": "Davi"}, expected_version=1)
+    stale_user, err_code, err_msg = user_repo.update(user.id, {"first_name": "Ana"}, expected_version=1)
+    missing_user, missing_err_code, _ = user_repo.update(99, {"first_name": "Ana"}, expected_version=1)
+
+    assert updated_user.version == 2
+    assert stale_user is None
+    assert err_code == "VersionConflict"
+    assert err_msg == f"User with id {user.id} has version 2, expected 1."
+    assert missing_user is None
+    assert missing_err_code == "UserDoesNotExist"
+
+def test_select_version_not_exists(user_repo):
+    version, err_code, _ = user_repo.select_version(1)
+
+    assert version is None
+    assert err_code == "UserDoesNotExist"
+
+def test_collection_version_changes_on_write(user_repo):
+    initial_version, _, _ = user_repo.select_collection_version()
+    user, _, _ = user_repo.create(first_name="Iury", email="rosal@gmail.com")
+    created_version, _, _ = user_repo.select_collection_version()
+    user_repo.bulk_update([{"id": user.id, "last_name": "Rosal"}])
+    updated_version, _, _ = user_repo.select_collection_version()
+    user_repo.delete_by_id(user.id)
+    deleted_version, _, _ = user_repo.select_collection_version()
+    user_repo.select_all()
+
+    assert initial_version[0] < created_version[0] < updated_version[0] < deleted_version[0]
+    assert user_repo.select_collection_version()[0] == deleted_version
+
+def test_bulk_update_increments_version(user_repo):
+    user, _, _ = user_repo.create(first_name="Iury", email="rosal@gmail.com")
+
+    updated, _, _ = user_repo.bulk_update([{"id": user.id, "last_name": "Rosal"}, {"id": user.id, "last_name": "Lima"}])
+
+    assert updated[1][0].last_name == "Lima"
+    assert updated[1][0].version == 3
+
+@pytest.mark.parametrize("backend", ["sqlite", "postgres"])
+def test_concurrent_bulk_updates_increment_version_atomically(backend, request):
+    if backend == "postgres":
+        user_repo = TestPostgresUserRepository(request.getfixturevalue("postgres_dsn"))
+    else:
+        user_repo = request.getfixturevalue("sqlite_file_user_repo")
+    user, _, _ = user_repo.create(first_name="Iury", email="rosal@gmail.com")
+    workers, updates = 4, 10
+    barrier = threading.Barrier(workers)
+
+    def update_many(worker):
+        barrier.wait()
+        return [user_repo.bulk_update([{"id": user.id, "last_name": f"{worker}-{update}"}]) for update in range(updates)]
+
+    with ThreadPoolExecutor(workers) as executor:
+        responses = [response for responses in executor.map(update_many, range(workers)) for response in responses]
+
+    assert all(err_code is None and results[0][1] is None for results, err_code, _ in responses)
+    # Cada estado do usuário possui uma versão (e, portanto, um ETag) própria.
+    assert sorted(results[0][0].version for results, _, _ in responses) == list(range(2, workers * updates + 2))
+    assert user_repo.select_by_id(user.id)[0].version == workers * updates + 1
+
+def test_select_changes(user_repo):
+    user, _, _ = user_repo.create(first_name="Iury", email="rosal@gmail.com")
+    user_repo.update(user.id, {"last_name": "Rosal"})
+    user_repo.bulk_create([{"first_name": "Davi", "email": "davi@gmail.com"}])
+    user_repo.delete_by_id(user.id)
+
+    changes, err_code, _ = user_repo.select_changes(since=0, limit=10)
+    next_changes, _, _ = user_repo.select_changes(since=changes[1].sequence, limit=1)
+    last_sequence, _, _ = user_repo.select_last_change_sequence()
+
+    assert err_code is None
+    assert [(change.user_id, change.operation, change.version) for change in changes] == [(1, "create", 1), (1, "update", 2), (2, "create", 1), (1, "delete", 2)]
+    assert changes[1].last_name == "Rosal"
+    assert changes[3].email is None
+    assert [change.operation for change in next_changes] == ["create"]
+    assert last_sequence == changes[-1].sequence
+
+def test_compact_changes(user_repo):
+    for index in range(5):
+        user_repo.create(first_name="Iury", email=f"rosal{index}@gmail.com")
+    last_sequence, _, _ = user_repo.select_last_change_sequence()
+
+    kept, _, _ = user_repo.compact_changes(before=utc_now() - timedelta(days=1))
+    deleted, _, _ = user_repo.compact_changes(before=utc_now() + timedelta(seconds=1))
+    stale_changes, err_code, err_msg = user_repo.select_changes(since=0, limit=10)
+    changes, _, _ = user_repo.select_changes(since=last_sequence - 1, limit=10)
+    user_repo.create(first_name="Davi", email="davi@gmail.com")
+    new_changes, new_err_code, _ = user_repo.select_changes(since=last_sequence, limit=10)
+
+    assert kept == 0
+    assert deleted == 4
+    assert stale_changes is None
+    assert err_code == "ChangesCompacted"
+    assert err_msg == f"Changes up to sequence {last_sequence - 1} were compacted. Resynchronize from a full snapshot."
+    assert [change.sequence for change in changes] == [last_sequence]
+    assert new_err_code is None
+    assert [change.sequence for change in new_changes] == [last_sequence + 1]
@@ -1,6 +1,10 @@
 from tests.config.fixtures import user_service, mock_sqlite_user_repository
 
-from models.user_model import UserModel
+import threading
+import time
+from datetime import timedelta
+from models.user_model import UserModel, utc_now
+from infra.single_flight import SINGLE_FLIGHT_CALLS
 
 
 def test_create_user(user_service, mock_sqlite_user_repository):
@@ -45,10 +49,209 @@ def test_update_user(user_service, mock_sqlite_user_repository):
 
     assert result == mock_user
 
+def test_update_user_with_expected_version(user_service, mock_sqlite_user_repository):
+    mock_sqlite_user_repository.update.return_value = (None, "VersionConflict", "User with id 1 has version 3, expected 2.")
+
+    result = user_service.update_user(user_id=1, new_user_data={"last_name": "Lima"}, expected_version=2)
+
+    mock_sqlite_user_repository.update.assert_called_once_with(1, {"last_name": "Lima"}, expected_version=2)
+    assert result == ("VersionConflict", "User with id 1 has version 3, expected 2.")
+
+def test_get_user_version(user_service, mock_sqlite_user_repository):
+    mock_sqlite_user_repository.select_version.return_value = ((2, None), None, None)
+    mock_sqlite_user_repository.select_collection_version.return_value = ((7, None), None, None)
+
+    assert user_service.get_user_version(user_id=1) == (2, None)
+    assert user_service.get_collection_version() == (7, None)
+
+def test_compact_changes(user_service, mock_sqlite_user_repository):
+    mock_sqlite_user_repository.compact_changes.return_value = (10, None, None)
+
+    result = user_service.compact_changes(retention_days=7)
+
+    before = mock_sqlite_user_repository.compact_changes.call_args.args[0]
+    assert result == 10
+    assert timedelta(days=6, hours=23) < utc_now() - before <= timedelta(days=7, minutes=1)
+
+def test_get_changes_compacted(user_service, mock_sqlite_user_repository):
+    mock_sqlite_user_repository.select_changes.return_value = (None, "ChangesCompacted", "Changes up to sequence 5 were compacted. Resynchronize from a full snapshot.")
+
+    result = user_service.get_changes(since=1, limit=10)
+
+    mock_sqlite_user_repository.select_changes.assert_called_once_with(since=1, limit=10)
+    assert result == ("ChangesCompacted", "Changes up to sequence 5 were compacted. Resynchronize from a full snapshot.")
+
 def test_delete_user(user_service, mock_sqlite_user_repository):
     mock_user = [UserModel(id=1, first_name="Iury", last_name="Rosal", email="rosal@gmail.com")]
     mock_sqlite_user_repository.delete_by_id.return_value = (mock_user, None, None)
 
     result = user_service.delete_user(user_id=1)
 
-    assert result == mock_user
\ No newline at end of file
+    assert result == mock_user
+
+
+def test_get_users_page(user_service, mock_sqlite_user_repository):
+    mock_users = [UserModel(id=3, first_name="Iury", last_name="Rosal", email="rosal@gmail.com")]
+    mock_sqlite_user_repository.select_page.return_value = (mock_users, None, None)
+
+    result = user_service.get_users_page(limit=1, after_id=2)
+
+    mock_sqlite_user_repository.select_page.assert_called_once_with(limit=1, after_id=2)
+    assert result == mock_users
+
+def test_get_users_page_empty(user_service, mock_sqlite_user_repository):
+    mock_sqlite_user_repository.select_page.return_value = ([], None, None)
+
+    result = user_service.get_users_page(limit=10, after_id=100)
+
+    assert result == []
+
+def test_get_user_rows(user_service, mock_sqlite_user_repository):
+    mock_rows = [{"id": 1, "first_name": "Iury", "last_name": "Rosal", "email": "rosal@gmail.com"}]
+    mock_sqlite_user_repository.select_rows.return_value = (mock_rows, None, None)
+
+    result = user_service.get_user_rows(limit=1, after_id=0)
+
+    mock_sqlite_user_repository.select_rows.assert_called_once_with(limit=1, after_id=0, fields=None)
+    assert result == mock_rows
+
+def test_get_user_rows_with_fields(user_service, mock_sqlite_user_repository):
+    mock_sqlite_user_repository.select_rows.return_value = ([{"id": 1, "email": "rosal@gmail.com"}], None, None)
+    mock_sqlite_user_repository.select_row_by_id.return_value = ({"id": 1, "first_name": "Iury", "version": 1, "updated_at": None}, None, None)
+
+    rows = user_service.get_user_rows(fields=["email", "email"])
+    row = user_service.get_user_row(user_id=1, fields=["first_name"])
+    invalid = user_service.get_user_rows(fields=["email", "password"])
+
+    mock_sqlite_user_repository.select_rows.assert_called_once_with(limit=None, after_id=None, fields=["id", "email"])
+    mock_sqlite_user_repository.select_row_by_id.assert_called_once_with(1, ["id", "first_name"])
+    assert rows == [{"id": 1, "email": "rosal@gmail.com"}]
+    assert row["first_name"] == "Iury"
+    assert invalid == ("InvalidFields", "Unknown fields: password. Allowed fields: id, first_name, last_name, email.")
+
+def test_stream_users(user_service, mock_sqlite_user_repository):
+    mock_users = iter([UserModel(id=1, first_name="Iury", last_name="Rosal", email="rosal@gmail.com")])
+    mock_sqlite_user_repository.stream_all.return_value = (mock_users, None, None)
+
+    result = user_service.stream_users(chunk_size=10)
+
+    assert result is mock_users
+
+def test_create_users(user_service, mock_sqlite_user_repository):
+    mock_users = [UserModel(id=1, first_name="Iury", last_name="Rosal", email="rosal@gmail.com"),
+                  UserModel(id=2, first_name="Davi", last_name=None, email="davi@gmail.com")]
+    mock_sqlite_user_repository.bulk_create.return_value = ([(user, None, None) for user in mock_users], None, None)
+
+    result = user_service.create_users([{"first_name": "Iury", "last_name": "Rosal", "email": "rosal@gmail.com"},
+                                        {"first_name": "Davi", "email": "davi@gmail.com"}])
+
+    assert result == mock_users
+
+def test_update_users_with_item_error(user_service, mock_sqlite_user_repository):
+    mock_user = UserModel(id=1, first_name="Iury", last_name="Lima", email="rosal@gmail.com")
+    mock_sqlite_user_repository.bulk_update.return_value = ([(mock_user, None, None),
+                                                             (None, "UserDoesNotExist", "User with id 99 does not exist.")], None, None)
+
+    result = user_service.update_users([{"id": 1, "last_name": "Lima"}, {"id": 99, "last_name": "Lima"}])
+
+    assert result == [mock_user, ("UserDoesNotExist", "User with id 99 does not exist.")]
+
+def test_delete_users_unexpected_error(user_service, mock_sqlite_user_repository):
+    mock_sqlite_user_repository.bulk_delete.side_effect = RuntimeError("database is locked")
+
+    result = user_service.delete_users([1, 2])
+
+    assert result == ("UnexpectedError", "RuntimeError: database is locked")
+
+def test_search_users_by_email(user_service, mock_sqlite_user_repository):
+    mock_users = [UserModel(id=1, first_name="Iury", last_name="Rosal", email="rosal@gmail.com")]
+    mock_sqlite_user_repository.select_by_email.return_value = (mock_users, None, None)
+
+    result = user_service.search_users(email="rosal@gmail.com", limit=10)
+
+    mock_sqlite_user_repository.select_by_email.assert_called_once_with("rosal@gmail.com", limit=10)
+    assert result == mock_users
+
+def test_search_users_by_full_text(user_service, mock_sqlite_user_repository):
+    mock_sqlite_user_repository.search_full_text.return_value = ([], None, None)
+
+    result = user_service.search_users(query="iury rosal")
+
+    mock_sqlite_user_repository.search_full_text.assert_called_once_with("iury rosal", limit=50)
+    assert result == []
+
+def test_search_users_invalid_criteria(user_service, mock_sqlite_user_repository):
+    result = user_service.search_users(email="rosal@gmail.com", name_prefix="Iu")
+
+    assert result[0] == "InvalidSearch"
+    mock_sqlite_user_repository.select_by_email.assert_not_called()
+
+def run_concurrently(func, callers):
+    results = [None] * callers
+    def call(index):
+        results[index] = func()
+    threads = [threading.Thread(target=call, args=(index,)) for index in range(callers)]
+    for thread in threads:
+        thread.start()
+    return threads, results
+
+def wait_for_followers(method, expected, timeout=5):
+    deadline = time.monotonic() + timeout
+    while SINGLE_FLIGHT_CALLS.value(service="UserService", method=method, role="follower") < expected and time.monotonic() < deadline:
+        time.sleep(0.001)
+
+def test_concurrent_get_user_shares_a_single_query(user_service, mock_sqlite_user_repository):
+    mock_user = UserModel(id=1, first_name="Iury", last_name="Rosal", email="rosal@gmail.com")
+    release = threading.Event()
+    mock_sqlite_user_repository.select_by_id.side_effect = lambda user_id: release.wait() and (mock_user, None, None)
+    followers = SINGLE_FLIGHT_CALLS.value(service="UserService", method="get_user", role="follower")
+
+    threads, results = run_concurrently(lambda: user_service.get_user(user_id=1), 50)
+    wait_for_followers("get_user", followers + 49)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert mock_sqlite_user_repository.select_by_id.call_count == 1
+    assert all(result is mock_user for result in results)
+    assert user_service.get_user(user_id=1) is mock_user
+    assert mock_sqlite_user_repository.select_by_id.call_count == 2
+
+def test_concurrent_get_all_users_share_errors(user_service, mock_sqlite_user_repository):
+    release = threading.Event()
+    def select_all():
+        release.wait()
+        raise RuntimeError("database is locked")
+    mock_sqlite_user_repository.select_all.side_effect = select_all
+    followers = SINGLE_FLIGHT_CALLS.value(service="UserService", method="get_all_users", role="follower")
+
+    threads, results = run_concurrently(user_service.get_all_users, 10)
+    wait_for_followers("get_all_users", followers + 9)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert mock_sqlite_user_repository.select_all.call_count == 1
+    assert all(result[0] == "UnexpectedError" for result in results)
+
+def test_reads_after_a_write_do_not_join_earlier_queries(user_service, mock_sqlite_user_repository):
+    stale = UserModel(id=1, first_name="Iury", last_name="Rosal", email="rosal@gmail.com")
+    fresh = UserModel(id=1, first_name="Iury", last_name="Lima", email="rosal@gmail.com")
+    release = threading.Event()
+    def select_by_id(user_id):
+        user = [stale, fresh][mock_sqlite_user_repository.select_by_id.call_count - 1]
+        release.wait()
+        return (user, None, None)
+    mock_sqlite_user_repository.select_by_id.side_effect = select_by_id
+    mock_sqlite_user_repository.update.return_value = (fresh, None, None)
+
+    threads, results = run_concurrently(lambda: user_service.get_user(user_id=1), 1)
+    while mock_sqlite_user_repository.select_by_id.call_count == 0:
+        time.sleep(0.001)
+    user_service.update_user(user_id=1, new_user_data={"last_name": "Lima"})
+    release.set()
+    after_write = user_service.get_user(user_id=1)
+    threads[0].join()
+
+    assert results == [stale]
+    assert after_write is fresh